@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+経路依存インジケータ（OBV・Parabolic SAR）のベンチマークスクリプト
+旧実装（pandas .iloc ループ）と新カーネルの計算結果の一致と速度を比較いたします
+
+使用例:
+    python scripts/benchmark_indicator_kernels.py
+    python scripts/benchmark_indicator_kernels.py --sizes 10000 100000 --legacy-limit 100000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# プロジェクトルートをPythonパスに追加
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from services.indicators.core.kernels import (  # noqa: E402
+    obv_kernel,
+    parabolic_sar_kernel,
+)
+
+
+def legacy_obv(df: pd.DataFrame) -> pd.Series:
+    """旧OBV実装（比較用）"""
+    price_change = df['price'].diff()
+    obv = pd.Series(0.0, index=df.index)
+    obv.iloc[0] = df['volume'].iloc[0]
+    for i in range(1, len(df)):
+        if price_change.iloc[i] > 0:
+            obv.iloc[i] = obv.iloc[i-1] + df['volume'].iloc[i]
+        elif price_change.iloc[i] < 0:
+            obv.iloc[i] = obv.iloc[i-1] - df['volume'].iloc[i]
+        else:
+            obv.iloc[i] = obv.iloc[i-1]
+    return obv
+
+
+def legacy_parabolic_sar(
+    df: pd.DataFrame,
+    acceleration: float = 0.02,
+    maximum: float = 0.2
+) -> pd.Series:
+    """旧Parabolic SAR実装（比較用）"""
+    sar = pd.Series(0.0, index=df.index)
+    ep = pd.Series(0.0, index=df.index)
+    af = pd.Series(0.0, index=df.index)
+    sar.iloc[0] = df['low'].iloc[0]
+    ep.iloc[0] = df['high'].iloc[0]
+    af.iloc[0] = acceleration
+    trend_up = True
+
+    for i in range(1, len(df)):
+        sar.iloc[i] = sar.iloc[i-1] + af.iloc[i-1] * \
+            (ep.iloc[i-1] - sar.iloc[i-1])
+        if trend_up:
+            if sar.iloc[i] > df['low'].iloc[i-1]:
+                sar.iloc[i] = df['low'].iloc[i-1]
+            if df['high'].iloc[i] > ep.iloc[i-1]:
+                ep.iloc[i] = df['high'].iloc[i]
+                af.iloc[i] = min(af.iloc[i-1] + acceleration, maximum)
+            else:
+                ep.iloc[i] = ep.iloc[i-1]
+                af.iloc[i] = af.iloc[i-1]
+            if df['low'].iloc[i] < sar.iloc[i-1]:
+                trend_up = False
+                sar.iloc[i] = ep.iloc[i-1]
+                ep.iloc[i] = df['low'].iloc[i]
+                af.iloc[i] = acceleration
+        else:
+            if sar.iloc[i] < df['high'].iloc[i-1]:
+                sar.iloc[i] = df['high'].iloc[i-1]
+            if df['low'].iloc[i] < ep.iloc[i-1]:
+                ep.iloc[i] = df['low'].iloc[i]
+                af.iloc[i] = min(af.iloc[i-1] + acceleration, maximum)
+            else:
+                ep.iloc[i] = ep.iloc[i-1]
+                af.iloc[i] = af.iloc[i-1]
+            if df['high'].iloc[i] > sar.iloc[i-1]:
+                trend_up = True
+                sar.iloc[i] = ep.iloc[i-1]
+                ep.iloc[i] = df['high'].iloc[i]
+                af.iloc[i] = acceleration
+    return sar
+
+
+def make_bars(size: int, seed: int = 42) -> pd.DataFrame:
+    """ランダムウォークのテスト用OHLCVを生成"""
+    rng = np.random.default_rng(seed)
+    close = 30000 + np.cumsum(rng.normal(0, 25, size))
+    # 終値が変化しない足も含める
+    close[rng.random(size) < 0.05] = np.nan
+    close = pd.Series(close).ffill().bfill().to_numpy()
+    spread = rng.random(size) * 40
+    return pd.DataFrame({
+        'high': close + spread,
+        'low': close - spread,
+        'price': close,
+        'volume': rng.random(size) * 1000
+    })
+
+
+def timed(func, *args):
+    """関数の実行時間を計測"""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000],
+        help="計測するバー数")
+    parser.add_argument(
+        "--legacy-limit", type=int, default=None,
+        help="旧実装を計測する最大バー数（超えるサイズは旧実装をスキップ）")
+    args = parser.parse_args()
+
+    print(f"{'indicator':<14}{'bars':>10}{'legacy[s]':>12}"
+          f"{'kernel[s]':>12}{'speedup':>10}  identical")
+    print("-" * 68)
+
+    for size in args.sizes:
+        df = make_bars(size)
+        cases = [
+            ("OBV", legacy_obv, (df,),
+             obv_kernel, (df['price'].to_numpy(), df['volume'].to_numpy())),
+            ("ParabolicSAR", legacy_parabolic_sar, (df,),
+             parabolic_sar_kernel,
+             (df['high'].to_numpy(), df['low'].to_numpy())),
+        ]
+
+        for name, legacy, legacy_args, kernel, kernel_args in cases:
+            new, new_time = timed(kernel, *kernel_args)
+
+            if args.legacy_limit is not None and size > args.legacy_limit:
+                print(f"{name:<14}{size:>10}{'skipped':>12}"
+                      f"{new_time:>12.4f}{'-':>10}  -")
+                continue
+
+            old, old_time = timed(legacy, *legacy_args)
+            identical = np.array_equal(old.to_numpy(), new, equal_nan=True)
+            print(f"{name:<14}{size:>10}{old_time:>12.4f}"
+                  f"{new_time:>12.4f}{old_time / new_time:>9.0f}x  {identical}")
+
+
+if __name__ == "__main__":
+    main()
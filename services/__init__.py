@@ -5,11 +5,15 @@
 
 from .data import data_service
 from .indicators.services import indicator_analysis_service, indicator_service
+from .refresh import refresh_service
 from .storage import storage_service
+from .stream import stream_service
 
 __all__ = [
     "data_service",
     "indicator_service",
     "indicator_analysis_service",
-    "storage_service"
+    "refresh_service",
+    "storage_service",
+    "stream_service"
 ]
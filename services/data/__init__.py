@@ -0,0 +1,7 @@
+"""
+Data services module.
+"""
+
+from .data_service import data_service
+
+__all__ = ["data_service"]
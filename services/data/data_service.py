@@ -0,0 +1,666 @@
+"""
+市場データ取得サービス
+Yahoo Financeから価格・履歴データを取得し、TTLキャッシュと
+同一リクエストの集約（single-flight）で上流へのアクセスを最小限に抑えます
+
+同じ (シンボル, 期間, 間隔) の取得が同時に要求された場合、上流への取得は
+1回だけ行い、全ての呼び出し元がその結果を共有いたします。取得結果は
+バイト数で上限を設けたTTLキャッシュに保持されます。
+
+確定済みの足はバーストア（services/storage/bar_store.py）に保存し、次回以降は
+保存済みの最後の足より新しい部分だけを上流から取得します（差分バックフィル）。
+
+複数通貨をまとめて要求された場合は、キャッシュにない通貨の上流への取得を
+1回の一括ダウンロードにまとめ、結果を通貨ごとのバーストア・キャッシュに反映します。
+"""
+
+import asyncio
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import pytz
+import yfinance as yf
+
+from services.storage.bar_store import BarStore, bar_store
+from src.core.cache import TTLCache
+from src.core.config import AppConfig
+from src.models.ohlcv import OHLCVFrame
+from src.models.schemas import CurrencyPairData, HistoricalData
+
+from .intervals import (
+    closed_mask,
+    interval_offset,
+    period_start,
+    upstream_earliest,
+    upstream_windows,
+    utc_now,
+)
+from .resampler import bucket_start, resample, source_interval
+
+logger = logging.getLogger(__name__)
+
+# 期間 max の取得済み範囲を表す値（全期間を取得済み）
+_UNBOUNDED = int(np.iinfo(np.int64).min)
+
+# 現在価格の算出に使う履歴（前日比を求めるため直近数日分の日足）
+_CURRENT_PRICE_PERIOD = "5d"
+_CURRENT_PRICE_INTERVAL = "1d"
+
+# 一括取得で最後の足が離れている通貨をまとめる上限（この本数を超えて離れた通貨は別に取得）
+_BATCH_TAIL_SLACK_BARS = 100
+
+HistoryKey = Tuple[str, str, str]
+
+
+@dataclass(frozen=True)
+class CachedHistory:
+    """キャッシュに保持する履歴データ
+
+    保持するのは列指向のフレームのみで、足ごとの MarketDataPoint は
+    get_historical_data() が呼ばれた場合にだけ作成します。
+    """
+    symbol: str
+    period: str
+    interval: str
+    frame: OHLCVFrame
+
+    @property
+    def nbytes(self) -> int:
+        return self.frame.nbytes
+
+
+class DataService:
+    """市場データ取得サービス"""
+
+    def __init__(self, store: Optional[BarStore] = None):
+        self._store = bar_store if store is None else store
+        self._cache = TTLCache(
+            ttl=AppConfig.get_cache_ttl(),
+            max_bytes=AppConfig.DATA_CACHE_MAX_BYTES,
+            sizeof=lambda entry: entry.nbytes
+        )
+        # 取得中のリクエスト（キー -> 共有Task）
+        self._inflight: Dict[HistoryKey, "asyncio.Task[Optional[CachedHistory]]"] = {}
+        self._upstream_requests = 0
+        self._batch_requests = 0
+        self._coalesced_requests = 0
+        self._upstream_bars = 0
+        self._stats_lock = threading.Lock()
+        # (シンボル, 間隔) -> 直近に上流から取得した最新部分（この間は再取得しない）
+        self._recent_tails = TTLCache(ttl=AppConfig.get_cache_ttl())
+        # (シンボル, 間隔) ごとのバーストア更新ロック
+        self._series_locks: Dict[Tuple[str, str], threading.Lock] = {}
+
+    def to_symbol(self, pair: str) -> str:
+        """通貨ペアをYahoo Financeのシンボルに変換（例: BTC -> BTC-USD）"""
+        symbol = pair.strip().upper()
+        if "-" not in symbol and symbol in AppConfig.VALID_CURRENCIES:
+            return f"{symbol}-USD"
+        return symbol
+
+    async def get_historical_data(
+            self, pair: str, period: str = AppConfig.DEFAULT_PERIOD,
+            interval: str = AppConfig.DEFAULT_INTERVAL) -> Optional[HistoricalData]:
+        """履歴データを取得（足ごとのポイントはこの呼び出しで作成）"""
+        entry = await self._get_history(pair, period, interval)
+        if entry is None:
+            return None
+        points = entry.frame.to_points()
+        return HistoricalData(
+            symbol=entry.symbol,
+            period=entry.period,
+            interval=entry.interval,
+            data_count=len(points),
+            data=points
+        )
+
+    async def get_historical_frame(
+            self, pair: str, period: str = AppConfig.DEFAULT_PERIOD,
+            interval: str = AppConfig.DEFAULT_INTERVAL) -> Optional[OHLCVFrame]:
+        """履歴データを列指向フレームとして取得
+
+        キャッシュ済みのフレームをそのまま返すため、同じデータに対する
+        インジケータ計算では共有の中間系列やフィンガープリントも再利用されます。
+        """
+        entry = await self._get_history(pair, period, interval)
+        return entry.frame if entry else None
+
+    async def get_historical_range(
+            self, pair: str, period: str, interval: str,
+            start: Optional[int] = None,
+            end: Optional[int] = None) -> Optional[OHLCVFrame]:
+        """期間 period の履歴のうち [start, end) を含むフレームを取得
+
+        キャッシュになく、その間隔の保存済みの足が期間を含んでいる場合は、期間全体の
+        フレームを作らずに範囲内の保存済みの足（コピーなし）と最新部分だけを返します。
+        それ以外は期間全体のフレームを返すため、呼び出し元で範囲を切り出してください。
+        """
+        symbol = self.to_symbol(pair)
+        key = (symbol, period, interval)
+        cached = AppConfig.CACHE_ENABLED and key in self._cache
+        if cached or key in self._inflight or not self._covers(
+                symbol, interval, period_start(period)):
+            return await self.get_historical_frame(pair, period, interval)
+
+        try:
+            return await asyncio.to_thread(
+                self._load_series, symbol, period, interval,
+                period_start(period), start, end)
+        except Exception as e:
+            logger.error(f"履歴データ取得エラー: {symbol} ({period}, {interval}): {e}")
+            return None
+
+    async def refresh_historical_frame(
+            self, pair: str, period: str = AppConfig.DEFAULT_PERIOD,
+            interval: str = AppConfig.DEFAULT_INTERVAL) -> Optional[OHLCVFrame]:
+        """キャッシュを使わずに最新の足まで取得（上流には保存済みの足以降のみ問い合わせ）"""
+        symbol = self.to_symbol(pair)
+        key = (symbol, period, interval)
+        # 取得中であればその結果を共有する
+        if key not in self._inflight:
+            self._cache.delete(key)
+            for series in (interval, source_interval(interval)):
+                if series is not None:
+                    self._recent_tails.delete((symbol, series))
+        entry = await self._get_history(pair, period, interval)
+        return entry.frame if entry else None
+
+    async def get_historical_frames(
+            self, pairs: Sequence[str], period: str = AppConfig.DEFAULT_PERIOD,
+            interval: str = AppConfig.DEFAULT_INTERVAL) -> Dict[str, Optional[OHLCVFrame]]:
+        """複数通貨の履歴データをまとめて取得（シンボル -> フレーム）"""
+        entries = await self._get_histories(pairs, period, interval)
+        return {symbol: entry.frame if entry else None for symbol, entry in entries.items()}
+
+    async def get_current_price(self, pair: str) -> Optional[CurrencyPairData]:
+        """現在価格と前日比を取得"""
+        entry = await self._get_history(
+            pair, _CURRENT_PRICE_PERIOD, _CURRENT_PRICE_INTERVAL)
+        return self._current_price(entry) if entry else None
+
+    async def get_current_prices(
+            self, pairs: Sequence[str]) -> Dict[str, Optional[CurrencyPairData]]:
+        """複数通貨の現在価格をまとめて取得（シンボル -> 価格）"""
+        entries = await self._get_histories(
+            pairs, _CURRENT_PRICE_PERIOD, _CURRENT_PRICE_INTERVAL)
+        return {
+            symbol: self._current_price(entry) if entry else None
+            for symbol, entry in entries.items()
+        }
+
+    @staticmethod
+    def _current_price(entry: CachedHistory) -> CurrencyPairData:
+        frame = entry.frame
+        symbol = entry.symbol
+        price = float(frame.close[-1])
+        volume = float(frame.volume[-1])
+
+        change_24h = None
+        change_24h_percent = None
+        if len(frame) >= 2:
+            previous = float(frame.close[-2])
+            change_24h = price - previous
+            if previous:
+                change_24h_percent = change_24h / previous * 100
+
+        return CurrencyPairData(
+            symbol=symbol,
+            price=price,
+            currency=symbol.split("-")[-1] if "-" in symbol else "USD",
+            timestamp=datetime.now(pytz.UTC),
+            volume=None if volume != volume else volume,
+            change_24h=change_24h,
+            change_24h_percent=change_24h_percent
+        )
+
+    def get_cache_stats(self) -> Dict:
+        """キャッシュと上流リクエストの統計情報を取得"""
+        stats = self._cache.stats()
+        stats.update({
+            "inflight": len(self._inflight),
+            "upstream_requests": self._upstream_requests,
+            "batch_requests": self._batch_requests,
+            "upstream_bars": self._upstream_bars,
+            "coalesced_requests": self._coalesced_requests
+        })
+        return stats
+
+    def clear_cache(self) -> None:
+        """キャッシュをクリア"""
+        self._cache.clear()
+        self._recent_tails.clear()
+
+    async def _get_history(
+            self, pair: str, period: str,
+            interval: str) -> Optional[CachedHistory]:
+        """キャッシュ → 取得中のリクエスト → 上流の順に履歴データを取得"""
+        key = (self.to_symbol(pair), period, interval)
+
+        if AppConfig.CACHE_ENABLED:
+            entry = self._cache.get(key)
+            if entry is not None:
+                return entry
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_and_store(key))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self._coalesced_requests += 1
+
+        # 呼び出し元がキャンセルされても共有の取得は継続させる
+        return await asyncio.shield(task)
+
+    async def _get_histories(
+            self, pairs: Sequence[str], period: str,
+            interval: str) -> Dict[str, Optional[CachedHistory]]:
+        """複数通貨の履歴データを取得
+
+        キャッシュにも取得中のリクエストにもない通貨が複数あれば、先に上流から
+        一括で取得してバーストアに反映します。その後の通貨ごとの取得は保存済みの足と
+        一括取得した最新部分から構築されるため、上流への問い合わせは発生しません。
+        一括取得に失敗した場合は、同時実行数を制限して通貨ごとに取得します。
+        """
+        symbols = list(dict.fromkeys(self.to_symbol(pair) for pair in pairs))
+        missing = [
+            symbol for symbol in symbols
+            if not (AppConfig.CACHE_ENABLED and (symbol, period, interval) in self._cache)
+            and (symbol, period, interval) not in self._inflight
+        ]
+        if len(missing) > 1:
+            try:
+                await asyncio.to_thread(self._prefetch, missing, period, interval)
+            except Exception as e:
+                logger.warning(f"一括取得に失敗したため通貨ごとに取得: {e}")
+
+        semaphore = asyncio.Semaphore(AppConfig.BATCH_CONCURRENCY)
+
+        async def get(symbol: str) -> Optional[CachedHistory]:
+            async with semaphore:
+                return await self._get_history(symbol, period, interval)
+
+        entries = await asyncio.gather(*[get(symbol) for symbol in symbols])
+        return dict(zip(symbols, entries))
+
+    def _prefetch(self, symbols: List[str], period: str, interval: str) -> None:
+        """通貨ごとの取得で上流に問い合わせる分を一括で取得（ブロッキング処理）
+
+        未保存の通貨は期間全体を1回で、保存済みの通貨は最後の足が近いものごとに
+        最後の足以降をまとめて取得します。保存済みの足からリサンプリングできる通貨、
+        過去方向の拡張が必要な部分、最後の足が他の通貨と離れている・上流の1リクエストで
+        取得できない通貨は通常の取得に任せます。
+        """
+        now = utc_now()
+        start = period_start(period)
+        required_from = _UNBOUNDED if start is None else start
+        source = source_interval(interval)
+
+        empty, stale = [], []
+        for symbol in symbols:
+            if (not self._covers(symbol, interval, start) and source is not None
+                    and self._covers(symbol, source, start)):
+                continue
+            if self._store.first_timestamp(symbol, interval) is None:
+                empty.append(symbol)
+            elif (symbol, interval) not in self._recent_tails:
+                stale.append(symbol)
+
+        if empty:
+            frames = self._upstream_batch(empty, interval, period=period)
+            for symbol, frame in frames.items():
+                with self._series_lock(symbol, interval):
+                    if self._store.first_timestamp(symbol, interval) is None:
+                        self._store_history(symbol, interval, frame, required_from, now)
+
+        groups = self._tail_groups(stale, interval, now)
+        for group in groups:
+            lasts = {symbol: self._store.last_timestamp(symbol, interval) for symbol in group}
+            frames = self._upstream_batch(group, interval, start=min(lasts.values()))
+            for symbol, frame in frames.items():
+                tail = frame.take(frame.timestamp >= lasts[symbol])
+                if len(tail) > 0:
+                    with self._series_lock(symbol, interval):
+                        self._store_tail(symbol, interval, tail, now)
+
+        logger.info(
+            f"一括取得完了: ({period}, {interval}) - 未保存{len(empty)}件・"
+            f"差分{sum(len(group) for group in groups)}件（{len(groups)}回）")
+
+    def _tail_groups(
+            self, symbols: List[str], interval: str,
+            now: pd.Timestamp) -> List[List[str]]:
+        """最後の足が近い通貨をまとめる（2通貨以上のグループのみ）
+
+        一括取得の開始時刻はグループ内で最も古い最後の足になるため、他の通貨と
+        _BATCH_TAIL_SLACK_BARS 本を超えて離れた通貨は同じグループに入れません。
+        """
+        lasts = []
+        for symbol in symbols:
+            last = self._store.last_timestamp(symbol, interval)
+            # 上流の1リクエストで取得できない差分は通貨ごとの取得（分割・再取得）に任せる
+            if (last is not None and not self._beyond_lookback(interval, last, now)
+                    and len(upstream_windows(interval, last, None, now)) == 1):
+                lasts.append((last, symbol))
+        lasts.sort()
+
+        slack = interval_offset(interval) * _BATCH_TAIL_SLACK_BARS
+        groups: List[List[str]] = []
+        group_start: Optional[pd.Timestamp] = None
+        for last, symbol in lasts:
+            if group_start is None or pd.Timestamp(last, tz="UTC") > group_start + slack:
+                groups.append([])
+                group_start = pd.Timestamp(last, tz="UTC")
+            groups[-1].append(symbol)
+        return [group for group in groups if len(group) > 1]
+
+    async def _fetch_and_store(self, key: HistoryKey) -> Optional[CachedHistory]:
+        """履歴データを構築してキャッシュに登録（失敗・空の結果はキャッシュしない）"""
+        symbol, period, interval = key
+        try:
+            frame = await asyncio.to_thread(
+                self._load_history, symbol, period, interval)
+        except Exception as e:
+            logger.error(f"履歴データ取得エラー: {symbol} ({period}, {interval}): {e}")
+            return None
+
+        if frame is None or len(frame) == 0:
+            logger.warning(f"履歴データが空です: {symbol} ({period}, {interval})")
+            return None
+
+        entry = CachedHistory(symbol=symbol, period=period, interval=interval, frame=frame)
+        if AppConfig.CACHE_ENABLED:
+            self._cache.set(key, entry)
+
+        logger.info(f"履歴データ取得完了: {symbol} ({period}, {interval}) - {len(frame)}件")
+        return entry
+
+    def _load_history(
+            self, symbol: str, period: str,
+            interval: str) -> Optional[OHLCVFrame]:
+        """期間分の履歴を構築（ブロッキング処理のためスレッドで実行）
+
+        その間隔の保存済みの足が期間を含んでいればそれを使い、含んでいない場合でも
+        元にする細かい間隔（1分足・日足）が期間を含んでいれば、上流には問い合わせず
+        ローカルでリサンプリングします。
+        """
+        start = period_start(period)
+        if not self._covers(symbol, interval, start):
+            source = source_interval(interval)
+            if source is not None and self._covers(symbol, source, start):
+                return self._resample_history(symbol, period, interval, source, start)
+
+        return self._load_series(symbol, period, interval, start)
+
+    def _resample_history(
+            self, symbol: str, period: str, interval: str,
+            source: str, start: Optional[int]) -> Optional[OHLCVFrame]:
+        """細かい間隔の保存済みの足から粗い間隔の足を作成"""
+        # 最初のバケットが欠けないよう、保存済みであればバケットの先頭から読み込む
+        # （保存済みでない場合は start を含むバケットが不完全になるため除外する）
+        read_from = start
+        if start is not None and self._covers(symbol, source, bucket_start(start, interval)):
+            read_from = bucket_start(start, interval)
+
+        base = self._load_series(symbol, period, source, read_from)
+        if base is None or len(base) == 0:
+            return base
+
+        frame = resample(base, interval)
+        if read_from is not None:
+            frame = frame.take(frame.timestamp >= read_from)
+        logger.info(
+            f"履歴データをリサンプリング: {symbol} {source} -> {interval} ({period}) - {len(frame)}件")
+        return frame
+
+    def _covers(self, symbol: str, interval: str, start: Optional[int]) -> bool:
+        """保存済みの足が start 以降の全期間を含むか"""
+        if self._store.count(symbol, interval) == 0:
+            return False
+        covered_from = self._store.get_metadata(symbol, interval).get("covered_from")
+        required_from = _UNBOUNDED if start is None else start
+        return covered_from is not None and covered_from <= required_from
+
+    def _load_series(
+            self, symbol: str, period: str, interval: str,
+            start: Optional[int], read_start: Optional[int] = None,
+            read_end: Optional[int] = None) -> Optional[OHLCVFrame]:
+        """保存済みの足と上流からの差分を合わせて start 以降の履歴を構築
+
+        1. 保存済みの範囲が start を含まない場合は、不足分だけを上流から取得
+        2. 保存済みの最後の足以降を上流から取得（直近に取得済みの場合は省略）
+        3. 確定済みの足をバーストアに保存し、start 以降を保存済みの足から返す
+           （形成中の最新足は保存せず、取得した結果をそのまま末尾に付ける）
+
+        最後の足が上流の遡れる範囲（1分足は30日など）より古い場合は、差分では
+        空白が埋まらないため、期間全体を取得し直して保存済みの足を置き換えます。
+        read_start・read_end を指定した場合は、返すのはその範囲 [read_start, read_end) のみです。
+        """
+        with self._series_lock(symbol, interval):
+            store = self._store
+            now = utc_now()
+            required_from = _UNBOUNDED if start is None else start
+
+            first = store.first_timestamp(symbol, interval)
+            last = store.last_timestamp(symbol, interval)
+            covered_from = store.get_metadata(symbol, interval).get("covered_from")
+            fetched: Optional[OHLCVFrame] = None
+
+            if first is None:
+                # 未保存の場合は期間全体を取得
+                frame = self._upstream(self._fetch_history, symbol, period, interval)
+                if frame is None or len(frame) == 0:
+                    return None
+                self._store_history(symbol, interval, frame, required_from, now)
+                fetched = frame
+            elif self._beyond_lookback(interval, last, now):
+                fetched = self._reset_series(symbol, period, interval, required_from, now)
+            else:
+                if covered_from is None or covered_from > required_from:
+                    self._backfill_head(symbol, period, interval, start, first, now)
+                    store.update_metadata(symbol, interval, covered_from=required_from)
+
+                fetched = self._recent_tails.get((symbol, interval))
+                if fetched is None:
+                    fetched = self._fetch_tail(symbol, interval, last, now)
+
+            # 保存済みの足より新しい（形成中の）足を末尾に付ける
+            read_from = start if read_start is None else max(read_start, required_from)
+            stored = store.read(symbol, interval, start=read_from, end=read_end)
+            newest = store.last_timestamp(symbol, interval)
+            if fetched is not None and newest is not None:
+                fetched = fetched.take(fetched.timestamp > newest)
+            if fetched is not None and read_start is not None:
+                fetched = fetched.take(fetched.timestamp >= read_from)
+            if fetched is not None and read_end is not None:
+                fetched = fetched.take(fetched.timestamp < read_end)
+            if fetched is None or len(fetched) == 0:
+                return stored
+            return OHLCVFrame.concat([stored, fetched])
+
+    def _fetch_tail(
+            self, symbol: str, interval: str,
+            last: int, now: pd.Timestamp) -> Optional[OHLCVFrame]:
+        """保存済みの最後の足以降を取得して確定済みの足を保存
+
+        1リクエストで取得できる範囲に上限のある間隔（1分足は7日）は分割して取得します。
+        """
+        try:
+            tail = self._fetch_windows(symbol, interval, last, None, now)
+        except Exception as e:
+            # 上流の障害時は保存済みの足のみで応答
+            logger.warning(f"最新データの取得に失敗したため保存済みデータを使用: {symbol}: {e}")
+            return None
+        if tail is None or len(tail) == 0:
+            return None
+
+        self._store_tail(symbol, interval, tail, now)
+        return tail
+
+    @staticmethod
+    def _beyond_lookback(interval: str, last: int, now: pd.Timestamp) -> bool:
+        """保存済みの最後の足が上流の遡れる範囲より古いか"""
+        earliest = upstream_earliest(interval, now)
+        return earliest is not None and last < earliest
+
+    def _reset_series(
+            self, symbol: str, period: str, interval: str,
+            required_from: int, now: pd.Timestamp) -> Optional[OHLCVFrame]:
+        """期間全体を取得し直して保存済みの足を置き換え、取得済みの範囲を記録し直す"""
+        try:
+            frame = self._upstream(self._fetch_history, symbol, period, interval)
+        except Exception as e:
+            logger.warning(f"履歴データの再取得に失敗したため保存済みデータを使用: {symbol}: {e}")
+            return None
+        if frame is None or len(frame) == 0:
+            return None
+
+        self._store.replace(symbol, interval, self._closed(frame, interval, now))
+        self._store.update_metadata(symbol, interval, covered_from=required_from)
+        self._recent_tails.set((symbol, interval), frame)
+        logger.info(
+            f"保存済みの足が上流の取得可能範囲より古いため再取得: {symbol} ({interval}) - {len(frame)}件")
+        return frame
+
+    def _fetch_windows(
+            self, symbol: str, interval: str, start: int,
+            end: Optional[int], now: pd.Timestamp) -> Optional[OHLCVFrame]:
+        """時刻範囲 [start, end) を上流の制限に合わせて分割して取得"""
+        parts = []
+        for window_start, window_end in upstream_windows(interval, start, end, now):
+            part = self._upstream(self._fetch_range, symbol, interval, window_start, window_end)
+            if part is not None and len(part) > 0:
+                parts.append(part)
+        if not parts:
+            return None
+        return parts[0] if len(parts) == 1 else OHLCVFrame.concat(parts)
+
+    def _store_history(
+            self, symbol: str, interval: str, frame: OHLCVFrame,
+            required_from: int, now: pd.Timestamp) -> None:
+        """期間全体の取得結果のうち確定済みの足を保存し、取得済みの範囲を記録"""
+        self._store.append(symbol, interval, self._closed(frame, interval, now))
+        self._store.update_metadata(symbol, interval, covered_from=required_from)
+        self._recent_tails.set((symbol, interval), frame)
+
+    def _store_tail(
+            self, symbol: str, interval: str,
+            tail: OHLCVFrame, now: pd.Timestamp) -> None:
+        """最新部分の取得結果のうち確定済みの足を保存（形成中の足は直近の取得として保持）"""
+        self._store.append(symbol, interval, self._closed(tail, interval, now))
+        self._recent_tails.set((symbol, interval), tail)
+
+    def _backfill_head(
+            self, symbol: str, period: str, interval: str,
+            start: Optional[int], first: int, now: pd.Timestamp) -> None:
+        """保存済みの最初の足より前の不足分を取得して先頭に結合"""
+        if start is None:
+            head = self._upstream(self._fetch_history, symbol, period, interval)
+        else:
+            head = self._fetch_windows(symbol, interval, start, first, now)
+        if head is None or len(head) == 0:
+            return
+
+        head = self._closed(head, interval, now)
+        head = head.take(head.timestamp < first)
+        if len(head) == 0:
+            return
+
+        stored = self._store.read(symbol, interval)
+        self._store.replace(symbol, interval, OHLCVFrame.concat([head, stored]))
+        logger.info(f"履歴データを過去方向に拡張: {symbol} ({interval}) - {len(head)}件")
+
+    def _series_lock(self, symbol: str, interval: str) -> threading.Lock:
+        with self._stats_lock:
+            return self._series_locks.setdefault((symbol, interval), threading.Lock())
+
+    def _upstream(self, fetch, *args) -> Optional[OHLCVFrame]:
+        """上流から取得（リクエスト数と取得本数を記録）"""
+        with self._stats_lock:
+            self._upstream_requests += 1
+        frame = fetch(*args)
+        if frame is not None:
+            with self._stats_lock:
+                self._upstream_bars += len(frame)
+        return frame
+
+    def _upstream_batch(
+            self, symbols: List[str], interval: str,
+            period: Optional[str] = None,
+            start: Optional[int] = None) -> Dict[str, OHLCVFrame]:
+        """上流から複数通貨を一括取得（1リクエストとして記録）"""
+        with self._stats_lock:
+            self._upstream_requests += 1
+            self._batch_requests += 1
+        frames = self._fetch_batch(symbols, interval, period, start)
+        with self._stats_lock:
+            self._upstream_bars += sum(len(frame) for frame in frames.values())
+        return frames
+
+    @staticmethod
+    def _closed(frame: OHLCVFrame, interval: str, now: pd.Timestamp) -> OHLCVFrame:
+        """確定済みの足のみを取り出す"""
+        return frame.take(closed_mask(frame.timestamp, interval, now))
+
+    def _fetch_history(
+            self, symbol: str, period: str,
+            interval: str) -> Optional[OHLCVFrame]:
+        """Yahoo Financeから期間指定で履歴データを取得"""
+        df = yf.Ticker(symbol).history(period=period, interval=interval)
+        if df is None or df.empty:
+            return None
+        return OHLCVFrame.from_dataframe(df)
+
+    def _fetch_range(
+            self, symbol: str, interval: str,
+            start: int, end: Optional[int]) -> Optional[OHLCVFrame]:
+        """Yahoo Financeから時刻範囲 [start, end) の履歴データを取得"""
+        df = yf.Ticker(symbol).history(
+            start=pd.Timestamp(start, tz="UTC").to_pydatetime(),
+            end=None if end is None else pd.Timestamp(end, tz="UTC").to_pydatetime(),
+            interval=interval)
+        if df is None or df.empty:
+            return None
+        frame = OHLCVFrame.from_dataframe(df)
+        mask = frame.timestamp >= start
+        if end is not None:
+            mask &= frame.timestamp < end
+        return frame.take(mask)
+
+    def _fetch_batch(
+            self, symbols: List[str], interval: str,
+            period: Optional[str], start: Optional[int]) -> Dict[str, OHLCVFrame]:
+        """Yahoo Financeから複数通貨を一括ダウンロード（期間指定または start 以降）"""
+        window = (
+            {"period": period} if start is None
+            else {"start": pd.Timestamp(start, tz="UTC").to_pydatetime()})
+        df = yf.download(
+            symbols, interval=interval, group_by="ticker", auto_adjust=True,
+            ignore_tz=False, threads=min(len(symbols), AppConfig.BATCH_CONCURRENCY),
+            progress=False, **window)
+        if df is None or df.empty:
+            return {}
+
+        frames = {}
+        tickers = set(df.columns.get_level_values(0))
+        for symbol in symbols:
+            if symbol not in tickers:
+                continue
+            # 取引時間の異なる通貨の行は欠損値で埋められるため除外
+            part = df[symbol].dropna(how="all")
+            if part.empty:
+                continue
+            frame = OHLCVFrame.from_dataframe(part)
+            if start is not None:
+                frame = frame.take(frame.timestamp >= start)
+            frames[symbol] = frame
+        return frames
+
+
+# シングルトンインスタンス
+data_service = DataService()
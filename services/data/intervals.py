@@ -0,0 +1,143 @@
+"""
+期間・間隔の換算
+Yahoo Financeの期間（1mo・1yなど）と間隔（1m・1dなど）を時刻の範囲に変換いたします
+"""
+
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+Offset = Union[pd.Timedelta, pd.DateOffset]
+
+# 期間 -> 開始時刻を求めるオフセット（ytd・maxは個別に扱う）
+PERIOD_OFFSETS = {
+    "1d": pd.Timedelta(days=1),
+    "5d": pd.Timedelta(days=5),
+    "1mo": pd.DateOffset(months=1),
+    "3mo": pd.DateOffset(months=3),
+    "6mo": pd.DateOffset(months=6),
+    "1y": pd.DateOffset(years=1),
+    "2y": pd.DateOffset(years=2),
+    "5y": pd.DateOffset(years=5),
+    "10y": pd.DateOffset(years=10),
+}
+
+# 間隔 -> 1本の長さ
+INTERVAL_OFFSETS = {
+    "1m": pd.Timedelta(minutes=1),
+    "2m": pd.Timedelta(minutes=2),
+    "5m": pd.Timedelta(minutes=5),
+    "15m": pd.Timedelta(minutes=15),
+    "30m": pd.Timedelta(minutes=30),
+    "60m": pd.Timedelta(hours=1),
+    "90m": pd.Timedelta(minutes=90),
+    "1h": pd.Timedelta(hours=1),
+    "1d": pd.Timedelta(days=1),
+    "5d": pd.Timedelta(days=5),
+    "1wk": pd.Timedelta(weeks=1),
+    "1mo": pd.DateOffset(months=1),
+    "3mo": pd.DateOffset(months=3),
+}
+
+# 間隔 -> Yahoo Financeが遡って返す範囲（これより古い開始時刻のリクエストは拒否される）
+UPSTREAM_LOOKBACK = {
+    "1m": pd.Timedelta(days=30),
+    "2m": pd.Timedelta(days=60),
+    "5m": pd.Timedelta(days=60),
+    "15m": pd.Timedelta(days=60),
+    "30m": pd.Timedelta(days=60),
+    "60m": pd.Timedelta(days=730),
+    "90m": pd.Timedelta(days=60),
+    "1h": pd.Timedelta(days=730),
+}
+
+# 間隔 -> 1リクエストで取得できる最大の範囲
+UPSTREAM_MAX_SPAN = {
+    "1m": pd.Timedelta(days=7),
+}
+
+# 遡れる範囲の境界ちょうどの開始時刻は、リクエストが届くまでに範囲外になるため余裕を持たせる
+_LOOKBACK_MARGIN = pd.Timedelta(hours=1)
+
+
+def utc_now() -> pd.Timestamp:
+    return pd.Timestamp.now(tz="UTC")
+
+
+def period_start(period: str, now: Optional[pd.Timestamp] = None) -> Optional[int]:
+    """期間の開始時刻（ナノ秒）。max の場合は None"""
+    now = utc_now() if now is None else now
+    if period == "max":
+        return None
+    if period == "ytd":
+        return pd.Timestamp(year=now.year, month=1, day=1, tz="UTC").value
+    if period not in PERIOD_OFFSETS:
+        raise ValueError(f"無効な期間: {period}")
+    return (now - PERIOD_OFFSETS[period]).value
+
+
+def covering_period(start: int, now: Optional[pd.Timestamp] = None) -> str:
+    """開始時刻 start（ナノ秒）以降を含む最も短い期間"""
+    now = utc_now() if now is None else now
+    for period in PERIOD_OFFSETS:
+        if period_start(period, now) <= start:
+            return period
+    return "max"
+
+
+def interval_offset(interval: str) -> Offset:
+    """間隔1本の長さ"""
+    if interval not in INTERVAL_OFFSETS:
+        raise ValueError(f"無効な間隔: {interval}")
+    return INTERVAL_OFFSETS[interval]
+
+
+def closed_mask(
+    timestamps: np.ndarray,
+    interval: str,
+    now: Optional[pd.Timestamp] = None
+) -> np.ndarray:
+    """確定済み（終了時刻が現在以前）の足を示すマスク"""
+    now = utc_now() if now is None else now
+    ends = pd.to_datetime(timestamps, unit="ns", utc=True) + interval_offset(interval)
+    return np.asarray(ends <= now)
+
+
+def upstream_earliest(interval: str, now: Optional[pd.Timestamp] = None) -> Optional[int]:
+    """上流から取得できる最も古い時刻（ナノ秒）。制限のない間隔は None"""
+    if interval not in UPSTREAM_LOOKBACK:
+        return None
+    now = utc_now() if now is None else now
+    return (now - UPSTREAM_LOOKBACK[interval] + _LOOKBACK_MARGIN).value
+
+
+def upstream_windows(
+    interval: str,
+    start: int,
+    end: Optional[int] = None,
+    now: Optional[pd.Timestamp] = None
+) -> List[Tuple[int, Optional[int]]]:
+    """時刻範囲 [start, end) を上流の1リクエストで取得できる範囲に分割
+
+    遡れる範囲より古い部分は切り詰めます（取得できる部分がなければ空のリスト）。
+    end が None の場合、最後の範囲は現在（形成中の足）までです。
+    """
+    now = utc_now() if now is None else now
+    earliest = upstream_earliest(interval, now)
+    if earliest is not None:
+        start = max(start, earliest)
+    stop = now.value if end is None else end
+    if start >= stop:
+        return []
+
+    span = UPSTREAM_MAX_SPAN.get(interval)
+    if span is None:
+        return [(start, end)]
+
+    windows = []
+    while start + span.value < stop:
+        windows.append((start, start + span.value))
+        start += span.value
+    windows.append((start, end))
+    return windows
@@ -0,0 +1,101 @@
+"""
+履歴データのページング
+ソート済みの時刻列を索引として二分探索し、期間 [start, end) の1ページ分を
+フレームのビュー（コピーなし）として切り出します
+
+カーソルは次のページの開始時刻と終了時刻を含む不透明な文字列で、
+2ページ目以降は cursor のみを指定すれば続きを取得できます。
+"""
+
+import base64
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from services.data.intervals import covering_period, period_start, utc_now
+from services.storage.bar_store import TimeLike, to_nanoseconds
+from src.models.ohlcv import OHLCVFrame
+
+
+def encode_cursor(after: int, end: Optional[int]) -> str:
+    """(次のページの開始時刻, 終了時刻) をカーソルに変換"""
+    raw = f"{after}:{'' if end is None else end}".encode("ascii")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[int, Optional[int]]:
+    """カーソルを (次のページの開始時刻, 終了時刻) に変換"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("ascii")
+        after, _, end = raw.partition(":")
+        return int(after), int(end) if end else None
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError(f"無効なカーソル: {cursor}")
+
+
+def page_frame(
+    frame: OHLCVFrame,
+    limit: int,
+    start: Optional[TimeLike] = None,
+    end: Optional[TimeLike] = None,
+    cursor: Optional[str] = None
+) -> Tuple[OHLCVFrame, Optional[str]]:
+    """期間 [start, end) の先頭から limit 本を切り出し、(ページ, 次のカーソル) を返す
+
+    cursor を指定した場合は start・end の代わりにカーソルの位置から続けます。
+    """
+    if limit <= 0:
+        raise ValueError(f"無効な件数: {limit}")
+    start_ns, end_ns = resolve_range(start, end, cursor)
+
+    timestamps = frame.timestamp
+    lo = 0 if start_ns is None else int(np.searchsorted(timestamps, start_ns, side="left"))
+    hi = len(frame) if end_ns is None else int(np.searchsorted(timestamps, end_ns, side="left"))
+    stop = min(max(lo, hi), lo + limit)
+
+    next_cursor = encode_cursor(int(timestamps[stop]), end_ns) if stop < hi else None
+    return frame.take(slice(lo, stop)), next_cursor
+
+
+def resolve_range(
+    start: Optional[TimeLike] = None,
+    end: Optional[TimeLike] = None,
+    cursor: Optional[str] = None
+) -> Tuple[Optional[int], Optional[int]]:
+    """要求された期間 [start, end) をナノ秒に変換（cursor を指定した場合はカーソルの位置から）"""
+    if cursor:
+        return decode_cursor(cursor)
+    start_ns = None if start is None else _nanoseconds(start)
+    end_ns = None if end is None else _nanoseconds(end)
+    return start_ns, end_ns
+
+
+def range_period(
+    period: Optional[str],
+    start: Optional[int],
+    end: Optional[int],
+    now: Optional[pd.Timestamp] = None
+) -> str:
+    """範囲 [start, end) を読み込む期間
+
+    period を省略した場合は start を含む最も短い期間を選びます（start もなければ 1d）。
+    指定された期間が範囲を含まない場合は、空のページを返さずに ValueError を送出します。
+    """
+    now = utc_now() if now is None else now
+    if period is None:
+        return "1d" if start is None else covering_period(start, now)
+
+    lower = period_start(period, now)
+    if lower is None:
+        return period
+    if (start is not None and start < lower) or (end is not None and end <= lower):
+        raise ValueError(f"要求された範囲が期間 {period} の外です")
+    return period
+
+
+def _nanoseconds(value: TimeLike) -> int:
+    try:
+        return to_nanoseconds(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"無効な時刻: {value}")
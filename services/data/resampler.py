@@ -0,0 +1,125 @@
+"""
+OHLCVバーのリサンプリング
+保存済みの細かい足から粗い間隔の足をローカルで作成いたします
+
+1分足からは 2m/5m/15m/30m/60m/1h/90m/1d、日足からは 1wk/1mo/3mo を作成します。
+各バケットは UTC で区切り、始値はバケット最初の足の始値、終値は最後の足の終値、
+高値・安値はバケット内の最大・最小、出来高は合計です。
+
+バケットの境界（各バケットの先頭位置と時刻）はフレームの中間系列として
+キャッシュされるため、同じフレームから同じ間隔を再度作成する場合は
+集計のみが行われます。
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+from src.models.ohlcv import OHLCVFrame
+
+MINUTE_NS = 60 * 10**9
+DAY_NS = 24 * 60 * MINUTE_NS
+# 1970-01-01 は木曜日のため、最初の月曜日は4日後
+_FIRST_MONDAY = 4
+
+# 作成する間隔 -> 元にする間隔
+SOURCE_INTERVALS = {
+    "2m": "1m",
+    "5m": "1m",
+    "15m": "1m",
+    "30m": "1m",
+    "60m": "1m",
+    "1h": "1m",
+    "90m": "1m",
+    "1d": "1m",
+    "1wk": "1d",
+    "1mo": "1d",
+    "3mo": "1d",
+}
+
+# 固定長の間隔（ナノ秒）
+_FIXED_WIDTHS = {
+    "1m": MINUTE_NS,
+    "2m": 2 * MINUTE_NS,
+    "5m": 5 * MINUTE_NS,
+    "15m": 15 * MINUTE_NS,
+    "30m": 30 * MINUTE_NS,
+    "60m": 60 * MINUTE_NS,
+    "1h": 60 * MINUTE_NS,
+    "90m": 90 * MINUTE_NS,
+    "1d": DAY_NS,
+    "1wk": 7 * DAY_NS,
+}
+
+
+def source_interval(interval: str) -> Optional[str]:
+    """リサンプリングの元にする間隔（ローカルで作成できない場合は None）"""
+    return SOURCE_INTERVALS.get(interval)
+
+
+def bucket_labels(timestamps: np.ndarray, interval: str) -> np.ndarray:
+    """各足が属するバケットの開始時刻（ナノ秒）"""
+    timestamps = np.asarray(timestamps, dtype=np.int64)
+
+    if interval == "1wk":
+        # 週は月曜日の 00:00 UTC 始まり
+        days = timestamps // DAY_NS
+        return ((days - _FIRST_MONDAY) // 7 * 7 + _FIRST_MONDAY) * DAY_NS
+
+    if interval in _FIXED_WIDTHS:
+        width = _FIXED_WIDTHS[interval]
+        return timestamps // width * width
+
+    if interval in ("1mo", "3mo"):
+        months = timestamps.astype("datetime64[ns]").astype("datetime64[M]").astype(np.int64)
+        if interval == "3mo":
+            # 四半期は 1/4/7/10月始まり
+            months = months // 3 * 3
+        return months.astype("datetime64[M]").astype("datetime64[ns]").astype(np.int64)
+
+    raise ValueError(f"リサンプリングできない間隔: {interval}")
+
+
+def bucket_start(timestamp: int, interval: str) -> int:
+    """時刻が属するバケットの開始時刻（ナノ秒）"""
+    return int(bucket_labels(np.array([timestamp], dtype=np.int64), interval)[0])
+
+
+def bucket_bounds(frame: OHLCVFrame, interval: str) -> Tuple[np.ndarray, np.ndarray]:
+    """バケットの先頭位置とバケットの開始時刻（フレームごとにキャッシュ）"""
+    def starts() -> np.ndarray:
+        labels = bucket_labels(frame.timestamp, interval)
+        if len(labels) == 0:
+            return np.empty(0, dtype=np.int64)
+        return np.flatnonzero(np.r_[True, labels[1:] != labels[:-1]])
+
+    positions = frame.intermediate(("bucket_starts", interval), starts, dtype=np.int64)
+    labels = frame.intermediate(
+        ("bucket_labels", interval),
+        lambda: bucket_labels(frame.timestamp[positions], interval),
+        dtype=np.int64
+    )
+    return positions, labels
+
+
+def resample(frame: OHLCVFrame, interval: str) -> OHLCVFrame:
+    """時刻順のフレームを指定した間隔の足に集計"""
+    if len(frame) == 0:
+        return OHLCVFrame.empty()
+
+    positions, labels = bucket_bounds(frame, interval)
+    ends = np.r_[positions[1:], len(frame)] - 1
+
+    volume = np.add.reduceat(np.nan_to_num(frame.volume), positions)
+    # 出来高が全て欠損しているバケットは欠損のまま
+    has_volume = np.add.reduceat(~np.isnan(frame.volume), positions) > 0
+    volume[~has_volume] = np.nan
+
+    return OHLCVFrame(
+        labels,
+        frame.open[positions],
+        np.maximum.reduceat(frame.high, positions),
+        np.minimum.reduceat(frame.low, positions),
+        frame.close[ends],
+        volume
+    )
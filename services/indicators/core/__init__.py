@@ -20,6 +20,11 @@ from .google_trends_indicator import GoogleTrendsIndicator
 from .hash_rate_indicator import HashRateIndicator
 from .ichimoku_indicator import IchimokuIndicator
 from .implied_volatility_indicator import ImpliedVolatilityIndicator
+from .incremental import (
+    IncrementalIndicator,
+    create_incremental,
+    restore_incremental,
+)
 from .keltner_channel_indicator import KeltnerChannelIndicator
 from .macd_indicator import MACDIndicator
 from .money_flow_index_indicator import MoneyFlowIndexIndicator
@@ -64,5 +69,8 @@ __all__ = [
     'ImpliedVolatilityIndicator',
     'ATRIndicator',
     'WilliamsRIndicator',
-    'CCIIndicator'
+    'CCIIndicator',
+    'IncrementalIndicator',
+    'create_incremental',
+    'restore_incremental'
 ]
@@ -7,12 +7,12 @@ import logging
 from typing import List
 
 import pandas as pd
-import requests
 
-from src.core.config import IndicatorType
-from src.models.schemas import IndicatorValue, MarketDataPoint
+from src.core.config import AppConfig, IndicatorType
+from src.core.http_client import http_client, run_sync
+from src.models.schemas import IndicatorValue
 
-from .base_indicator import BaseIndicator
+from .base_indicator import BaseIndicator, MarketData
 
 logger = logging.getLogger(__name__)
 
@@ -26,26 +26,31 @@ class ActiveAddressesIndicator(BaseIndicator):
 
     def calculate(
         self,
-        data: List[MarketDataPoint],
+        data: MarketData,
         period: int = 7
     ) -> List[IndicatorValue]:
         """アクティブアドレス数を計算"""
+        return run_sync(self.calculate_async(data, period=period))
+
+    async def calculate_async(
+        self,
+        data: MarketData,
+        period: int = 7
+    ) -> List[IndicatorValue]:
+        """アクティブアドレス数を計算（非同期）"""
         if len(data) < period:
             return []
 
         try:
             # Blockchain.com APIからアクティブアドレス数を取得
-            url = "https://api.blockchain.info/charts/n-unique-addresses"
+            url = f"{AppConfig.BLOCKCHAIN_INFO_BASE_URL}/charts/n-unique-addresses"
             params = {
                 "timespan": f"{period}days",
                 "rollingAverage": "24hours",
                 "format": "json"
             }
 
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-
-            addresses_data = response.json()
+            addresses_data = await http_client.get_json(url, params=params)
 
             results = []
 
@@ -67,7 +72,7 @@ class ActiveAddressesIndicator(BaseIndicator):
             logger.error(f"アクティブアドレス数計算エラー: {str(e)}")
             return []
 
-    def _estimate_from_volume(self, data: List[MarketDataPoint], period: int) -> List[IndicatorValue]:
+    def _estimate_from_volume(self, data: MarketData, period: int) -> List[IndicatorValue]:
         """取引量からアクティブアドレス数を推定（フォールバック）"""
         df = self._to_dataframe(data)
 
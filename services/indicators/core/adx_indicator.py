@@ -3,14 +3,13 @@ ADX (Average Directional Index) インジケータ
 トレンドの強さを測定するトレンド系インジケータ
 """
 
-from typing import List
-
 import pandas as pd
 
 from src.core.config import IndicatorType
-from src.models.schemas import IndicatorValue, MarketDataPoint
+from src.models.indicator_series import IndicatorResult
 
-from .base_indicator import BaseIndicator
+from .base_indicator import BaseIndicator, MarketData
+from .intermediates import sma
 
 
 class ADXIndicator(BaseIndicator):
@@ -22,23 +21,16 @@ class ADXIndicator(BaseIndicator):
 
     def calculate(
         self,
-        data: List[MarketDataPoint],
+        data: MarketData,
         period: int = 14
-    ) -> List[IndicatorValue]:
+    ) -> IndicatorResult:
         """ADXを計算"""
-        df = self._to_dataframe(data)
+        frame = self._to_frame(data)
+        df = frame.to_dataframe()
 
         if len(df) < period + 1:
             return []
 
-        # True Range (TR) の計算
-        high_low = df['high'] - df['low']
-        high_close_prev = abs(df['high'] - df['price'].shift(1))
-        low_close_prev = abs(df['low'] - df['price'].shift(1))
-
-        tr_data = [high_low, high_close_prev, low_close_prev]
-        tr = pd.concat(tr_data, axis=1).max(axis=1)
-
         # Directional Movement (DM) の計算
         up_move = df['high'] - df['high'].shift(1)
         down_move = df['low'].shift(1) - df['low']
@@ -54,8 +46,8 @@ class ADXIndicator(BaseIndicator):
         minus_condition = (down_move > up_move) & (down_move > 0)
         minus_dm[minus_condition] = down_move[minus_condition]
 
-        # 平滑化されたTR、+DM、-DM
-        tr_smooth = tr.rolling(window=period).mean()
+        # 平滑化されたTR（True RangeはATR・Keltner Channelと共有）、+DM、-DM
+        tr_smooth = sma(frame, period, of="true_range")
         plus_dm_smooth = plus_dm.rolling(window=period).mean()
         minus_dm_smooth = minus_dm.rolling(window=period).mean()
 
@@ -69,14 +61,10 @@ class ADXIndicator(BaseIndicator):
         # Average Directional Index (ADX)
         adx = dx.rolling(window=period).mean()
 
-        results = []
-        for timestamp, value in zip(df['timestamp'], adx):
-            if not pd.isna(value):
-                results.append(self._create_indicator_value(
-                    timestamp=timestamp,
-                    value=round(value, 2),
-                    name=f"ADX({period})",
-                    parameters={"period": period}
-                ))
-
-        return results
+        return self._create_series(
+            df['timestamp'],
+            adx,
+            name=f"ADX({period})",
+            parameters={"period": period},
+            decimals=2
+        )
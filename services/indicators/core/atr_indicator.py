@@ -2,15 +2,11 @@
 平均真の範囲（ATR）インジケータ
 """
 
-from typing import List
-
-import numpy as np
-import pandas as pd
-
 from src.core.config import IndicatorType
-from src.models.schemas import IndicatorValue, MarketDataPoint
+from src.models.indicator_series import IndicatorResult
 
-from .base_indicator import BaseIndicator
+from .base_indicator import BaseIndicator, MarketData
+from .intermediates import ema
 
 
 class ATRIndicator(BaseIndicator):
@@ -22,31 +18,19 @@ class ATRIndicator(BaseIndicator):
 
     def calculate(
         self,
-        data: List[MarketDataPoint],
+        data: MarketData,
         period: int = 14
-    ) -> List[IndicatorValue]:
+    ) -> IndicatorResult:
         """平均真の範囲（ATR）を計算"""
-        df = self._to_dataframe(data)
-
-        # True Rangeを計算
-        high_low = df['high'] - df['low']
-        high_close_prev = np.abs(df['high'] - df['price'].shift(1))
-        low_close_prev = np.abs(df['low'] - df['price'].shift(1))
-
-        true_range = pd.concat(
-            [high_low, high_close_prev, low_close_prev], axis=1).max(axis=1)
-
-        # ATRを計算（指数移動平均）
-        atr = true_range.ewm(span=period).mean()
-
-        results = []
-        for timestamp, value in zip(df['timestamp'], atr):
-            if not pd.isna(value):
-                results.append(self._create_indicator_value(
-                    timestamp=timestamp,
-                    value=round(value, 6),
-                    name=f"ATR({period})",
-                    parameters={"period": period}
-                ))
-
-        return results
+        frame = self._to_frame(data)
+
+        # True Rangeの指数移動平均（True RangeはADX・Keltner Channelと共有）
+        atr = ema(frame, period, of="true_range")
+
+        return self._create_series(
+            frame.timestamp,
+            atr,
+            name=f"ATR({period})",
+            parameters={"period": period},
+            decimals=6
+        )
@@ -4,15 +4,21 @@
 
 import logging
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Union
 
+import numpy as np
 import pandas as pd
 
 from src.core.config import IndicatorType
+from src.models.indicator_series import IndicatorResult, IndicatorSeries
+from src.models.ohlcv import OHLCVFrame
 from src.models.schemas import IndicatorValue, MarketDataPoint
 
 logger = logging.getLogger(__name__)
 
+# インジケータの入力として受け付けるデータ形式
+MarketData = Union[List[MarketDataPoint], OHLCVFrame]
+
 
 class BaseIndicator(ABC):
     """インジケータの基底クラス"""
@@ -24,26 +30,37 @@ class BaseIndicator(ABC):
     @abstractmethod
     def calculate(
         self,
-        data: List[MarketDataPoint],
+        data: MarketData,
         **kwargs
-    ) -> List[IndicatorValue]:
+    ) -> IndicatorResult:
         """インジケータを計算する抽象メソッド"""
         pass
 
-    def _to_dataframe(self, data: List[MarketDataPoint]) -> pd.DataFrame:
-        """MarketDataPointのリストをDataFrameに変換"""
-        records = []
-        for point in data:
-            records.append({
-                'timestamp': point.timestamp,
-                'open': point.open,
-                'high': point.high,
-                'low': point.low,
-                'price': point.price,  # price属性を使用
-                'volume': point.volume
-            })
-
-        return pd.DataFrame(records)
+    async def calculate_async(
+        self,
+        data: MarketData,
+        **kwargs
+    ) -> IndicatorResult:
+        """インジケータを非同期で計算
+
+        外部APIからデータを取得するインジケータはオーバーライドし、共有の
+        非同期HTTPクライアントで取得します。それ以外は calculate() をそのまま実行します。
+        """
+        return self.calculate(data, **kwargs)
+
+    def _to_frame(self, data: MarketData) -> OHLCVFrame:
+        """入力データをOHLCVFrameに揃える"""
+        if isinstance(data, OHLCVFrame):
+            return data
+        return OHLCVFrame.from_points(data)
+
+    def _to_dataframe(self, data: MarketData) -> pd.DataFrame:
+        """入力データをDataFrameに変換
+
+        OHLCVFrameが渡された場合はフレーム側でキャッシュされた
+        DataFrameを再利用するため、インジケータごとの再構築は発生しません。
+        """
+        return self._to_frame(data).to_dataframe()
 
     def _create_indicator_value(
         self,
@@ -60,3 +77,28 @@ class BaseIndicator(ABC):
             value=value,
             parameters=parameters
         )
+
+    def _create_series(
+        self,
+        timestamps: Any,
+        values: Any,
+        name: str,
+        parameters: Dict[str, Any],
+        decimals: int = 6,
+        extras: Optional[Dict[str, Any]] = None
+    ) -> IndicatorSeries:
+        """値の配列からIndicatorSeriesを作成（値がNaNのポイントは除外）"""
+        values = np.asarray(values, dtype=np.float64)
+        mask = ~np.isnan(values)
+
+        return IndicatorSeries(
+            name=name,
+            type=self.indicator_type.value,
+            parameters=parameters,
+            timestamp=pd.DatetimeIndex(timestamps).asi8[mask],
+            values=np.round(values[mask], decimals),
+            extras={
+                key: np.asarray(array, dtype=np.float64)[mask]
+                for key, array in (extras or {}).items()
+            }
+        )
@@ -4,14 +4,13 @@
 """
 
 import logging
-from typing import List
 
 import numpy as np
 
 from src.core.config import IndicatorType
-from src.models.schemas import IndicatorValue, MarketDataPoint
+from src.models.indicator_series import IndicatorResult
 
-from .base_indicator import BaseIndicator
+from .base_indicator import BaseIndicator, MarketData
 
 logger = logging.getLogger(__name__)
 
@@ -25,10 +24,10 @@ class BetaIndicator(BaseIndicator):
 
     def calculate(
         self,
-        data: List[MarketDataPoint],
+        data: MarketData,
         period: int = 20,
-        market_data: List[MarketDataPoint] = None
-    ) -> List[IndicatorValue]:
+        market_data: MarketData = None
+    ) -> IndicatorResult:
         """ベータを計算"""
         if len(data) < period:
             return []
@@ -61,18 +60,17 @@ class BetaIndicator(BaseIndicator):
                 # 市場データがない場合、単純な価格変動性を計算
                 beta = returns.std() * np.sqrt(252)
 
-            results = []
-            for timestamp in df['timestamp']:
-                results.append(self._create_indicator_value(
-                    timestamp=timestamp,
-                    value=round(beta, 4),
-                    name="Beta",
-                    parameters={
-                        "period": period,
-                        "method": ("market_correlation" if market_data
-                                   else "volatility_based")
-                    }
-                ))
+            results = self._create_series(
+                df['timestamp'],
+                np.full(len(df), beta),
+                name="Beta",
+                parameters={
+                    "period": period,
+                    "method": ("market_correlation" if market_data
+                               else "volatility_based")
+                },
+                decimals=4
+            )
 
             logger.info(f"ベータ計算完了: {len(results)}件")
             return results
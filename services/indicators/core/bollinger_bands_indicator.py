@@ -2,14 +2,14 @@
 ボリンジャーバンドインジケータ
 """
 
-from typing import List
-
+import numpy as np
 import pandas as pd
 
 from src.core.config import IndicatorType
-from src.models.schemas import IndicatorValue, MarketDataPoint
+from src.models.indicator_series import IndicatorResult
 
-from .base_indicator import BaseIndicator
+from .base_indicator import BaseIndicator, MarketData
+from .intermediates import sma
 
 
 class BollingerBandsIndicator(BaseIndicator):
@@ -21,41 +21,36 @@ class BollingerBandsIndicator(BaseIndicator):
 
     def calculate(
         self,
-        data: List[MarketDataPoint],
+        data: MarketData,
         period: int = 20,
         std_dev: float = 2.0
-    ) -> List[IndicatorValue]:
+    ) -> IndicatorResult:
         """ボリンジャーバンドを計算"""
-        df = self._to_dataframe(data)
+        frame = self._to_frame(data)
 
         # 中央線（SMA）を計算
-        middle = df['price'].rolling(window=period).mean()
+        middle = sma(frame, period)
 
         # 標準偏差を計算
-        std = df['price'].rolling(window=period).std()
+        std = pd.Series(frame.close).rolling(window=period).std().to_numpy()
 
         # 上下バンドを計算
         upper = middle + (std * std_dev)
         lower = middle - (std * std_dev)
 
-        results = []
-        for i, timestamp in enumerate(df['timestamp']):
-            if not pd.isna(middle.iloc[i]):
-                results.append(self._create_indicator_value(
-                    timestamp=timestamp,
-                    value=round(middle.iloc[i], 6),
-                    name=f"Bollinger Bands({period}, {std_dev})",
-                    parameters={
-                        "period": period,
-                        "std_dev": std_dev,
-                        "upper": round(upper.iloc[i], 6),
-                        "lower": round(lower.iloc[i], 6),
-                        "bandwidth": round(
-                            ((upper.iloc[i] - lower.iloc[i]) /
-                             middle.iloc[i]) * 100,
-                            2
-                        )
-                    }
-                ))
-
-        return results
+        # バンド幅（%）
+        with np.errstate(divide='ignore', invalid='ignore'):
+            bandwidth = ((upper - lower) / middle) * 100
+
+        return self._create_series(
+            frame.timestamp,
+            middle,
+            name=f"Bollinger Bands({period}, {std_dev})",
+            parameters={"period": period, "std_dev": std_dev},
+            decimals=6,
+            extras={
+                "upper": np.round(upper, 6),
+                "lower": np.round(lower, 6),
+                "bandwidth": np.round(bandwidth, 2)
+            }
+        )
@@ -3,14 +3,14 @@ CCI (Commodity Channel Index) インジケータ
 価格の周期性とトレンドを測定するオシレーター系インジケータ
 """
 
-from typing import List
-
-import pandas as pd
+import numpy as np
 
 from src.core.config import IndicatorType
-from src.models.schemas import IndicatorValue, MarketDataPoint
+from src.models.indicator_series import IndicatorResult
 
-from .base_indicator import BaseIndicator
+from .base_indicator import BaseIndicator, MarketData
+from .intermediates import sma, typical_price
+from .rolling import rolling_mean_absolute_deviation
 
 
 class CCIIndicator(BaseIndicator):
@@ -22,37 +22,32 @@ class CCIIndicator(BaseIndicator):
 
     def calculate(
         self,
-        data: List[MarketDataPoint],
+        data: MarketData,
         period: int = 20
-    ) -> List[IndicatorValue]:
+    ) -> IndicatorResult:
         """CCIを計算"""
-        df = self._to_dataframe(data)
+        frame = self._to_frame(data)
 
-        if len(df) < period:
+        if len(frame) < period:
             return []
 
         # 典型的価格 (Typical Price) = (High + Low + Close) / 3
-        typical_price = (df['high'] + df['low'] + df['price']) / 3
+        tp = typical_price(frame)
 
         # 移動平均
-        sma_tp = typical_price.rolling(window=period).mean()
+        sma_tp = sma(frame, period, of="typical_price")
 
         # 平均偏差
-        mean_deviation = typical_price.rolling(window=period).apply(
-            lambda x: abs(x - x.mean()).mean()
-        )
+        mean_deviation = rolling_mean_absolute_deviation(tp, period)
 
         # CCI = (典型的価格 - 移動平均) / (0.015 × 平均偏差)
-        cci = (typical_price - sma_tp) / (0.015 * mean_deviation)
-
-        results = []
-        for timestamp, value in zip(df['timestamp'], cci):
-            if not pd.isna(value):
-                results.append(self._create_indicator_value(
-                    timestamp=timestamp,
-                    value=round(value, 2),
-                    name=f"CCI({period})",
-                    parameters={"period": period}
-                ))
-
-        return results
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cci = (tp - sma_tp) / (0.015 * mean_deviation)
+
+        return self._create_series(
+            frame.timestamp,
+            cci,
+            name=f"CCI({period})",
+            parameters={"period": period},
+            decimals=2
+        )
@@ -4,15 +4,14 @@ S&P500などのベンチマークとの相関係数を計算します
 """
 
 import logging
-from typing import List
 
 import pandas as pd
-import yfinance as yf
 
-from src.core.config import IndicatorType
-from src.models.schemas import IndicatorValue, MarketDataPoint
+from src.core.config import AppConfig, IndicatorType
+from src.core.http_client import http_client, run_sync
+from src.models.indicator_series import IndicatorResult
 
-from .base_indicator import BaseIndicator
+from .base_indicator import BaseIndicator, MarketData
 
 logger = logging.getLogger(__name__)
 
@@ -26,17 +25,27 @@ class CorrelationIndicator(BaseIndicator):
 
     def calculate(
         self,
-        data: List[MarketDataPoint],
+        data: MarketData,
         period: int = 30,
         benchmark: str = "SPY"
-    ) -> List[IndicatorValue]:
+    ) -> IndicatorResult:
         """相関係数を計算"""
+        return run_sync(self.calculate_async(
+            data, period=period, benchmark=benchmark))
+
+    async def calculate_async(
+        self,
+        data: MarketData,
+        period: int = 30,
+        benchmark: str = "SPY"
+    ) -> IndicatorResult:
+        """相関係数を計算（非同期）"""
         if len(data) < period:
             return []
 
         try:
             # ベンチマークデータを取得
-            benchmark_data = self._get_benchmark_data(benchmark, period)
+            benchmark_data = await self._get_benchmark_data(benchmark, period)
 
             if benchmark_data is None or len(benchmark_data) < period:
                 return []
@@ -55,16 +64,13 @@ class CorrelationIndicator(BaseIndicator):
             correlation = df['price'].rolling(
                 window=period).corr(df['benchmark'])
 
-            results = []
-
-            for timestamp, value in zip(df['timestamp'], correlation):
-                if not pd.isna(value):
-                    results.append(self._create_indicator_value(
-                        timestamp=timestamp,
-                        value=round(value, 4),
-                        name=f"Correlation vs {benchmark}",
-                        parameters={"period": period, "benchmark": benchmark}
-                    ))
+            results = self._create_series(
+                df['timestamp'],
+                correlation,
+                name=f"Correlation vs {benchmark}",
+                parameters={"period": period, "benchmark": benchmark},
+                decimals=4
+            )
 
             logger.info(f"相関係数計算完了: {len(results)}件")
             return results
@@ -73,11 +79,22 @@ class CorrelationIndicator(BaseIndicator):
             logger.error(f"相関係数計算エラー: {str(e)}")
             return []
 
-    def _get_benchmark_data(self, symbol: str, period: int) -> pd.DataFrame:
-        """ベンチマークデータを取得"""
+    async def _get_benchmark_data(self, symbol: str, period: int) -> pd.DataFrame:
+        """ベンチマークデータを取得（Yahoo Financeのチャート API）"""
         try:
-            ticker = yf.Ticker(symbol)
-            data = ticker.history(period=f"{period + 10}d")
+            url = f"{AppConfig.YAHOO_FINANCE_BASE_URL}/v8/finance/chart/{symbol}"
+            params = {"range": f"{period + 10}d", "interval": "1d"}
+            chart = await http_client.get_json(url, params=params)
+
+            result = (chart.get("chart", {}).get("result") or [None])[0]
+            if not result or not result.get("timestamp"):
+                return None
+
+            quote = result["indicators"]["quote"][0]
+            data = pd.DataFrame(
+                {"Close": quote["close"]},
+                index=pd.to_datetime(result["timestamp"], unit="s", utc=True)
+            ).dropna()
 
             if data.empty:
                 return None
@@ -88,7 +105,7 @@ class CorrelationIndicator(BaseIndicator):
             logger.error(f"ベンチマークデータ取得エラー: {str(e)}")
             return None
 
-    def _estimate_from_price_patterns(self, data: List[MarketDataPoint], period: int) -> List[IndicatorValue]:
+    def _estimate_from_price_patterns(self, data: MarketData, period: int) -> IndicatorResult:
         """価格パターンから相関係数を推定（フォールバック）"""
         df = self._to_dataframe(data)
 
@@ -103,16 +120,11 @@ class CorrelationIndicator(BaseIndicator):
             (price_returns.rolling(window=period).mean() * 10)
         estimated_correlation = estimated_correlation.clip(-1, 1)
 
-        results = []
-
-        for timestamp, value in zip(df['timestamp'], estimated_correlation):
-            if not pd.isna(value):
-                results.append(self._create_indicator_value(
-                    timestamp=timestamp,
-                    value=round(value, 4),
-                    name="Estimated Correlation",
-                    parameters={"period": period,
-                                "method": "price_pattern_based"}
-                ))
-
-        return results
+        return self._create_series(
+            df['timestamp'],
+            estimated_correlation,
+            name="Estimated Correlation",
+            parameters={"period": period,
+                        "method": "price_pattern_based"},
+            decimals=4
+        )
@@ -1,11 +1,8 @@
-from typing import List
-
-import pandas as pd
-
 from src.core.config import IndicatorType
-from src.models.schemas import IndicatorValue, MarketDataPoint
+from src.models.indicator_series import IndicatorResult, IndicatorSeriesGroup
 
-from .base_indicator import BaseIndicator
+from .base_indicator import BaseIndicator, MarketData
+from .intermediates import highest, lowest
 
 
 class DonchianChannelIndicator(BaseIndicator):
@@ -17,54 +14,38 @@ class DonchianChannelIndicator(BaseIndicator):
 
     def calculate(
         self,
-        data: List[MarketDataPoint],
+        data: MarketData,
         period: int = 20
-    ) -> List[IndicatorValue]:
+    ) -> IndicatorResult:
         """Donchian Channelを計算"""
-        df = self._to_dataframe(data)
+        frame = self._to_frame(data)
 
-        if len(df) < period:
+        if len(frame) < period:
             return []
 
         # 上線（期間内の最高値）
-        upper_line = df['high'].rolling(window=period).max()
+        upper_line = highest(frame, period)
 
         # 下線（期間内の最安値）
-        lower_line = df['low'].rolling(window=period).min()
+        lower_line = lowest(frame, period)
 
         # 中線（上線と下線の平均）
         middle_line = (upper_line + lower_line) / 2
 
-        results = []
-
-        # 上線
-        for timestamp, value in zip(df['timestamp'], upper_line):
-            if not pd.isna(value):
-                results.append(self._create_indicator_value(
-                    timestamp=timestamp,
-                    value=round(value, 2),
-                    name=f"Donchian Upper({period})",
-                    parameters={"period": period}
-                ))
-
-        # 中線
-        for timestamp, value in zip(df['timestamp'], middle_line):
-            if not pd.isna(value):
-                results.append(self._create_indicator_value(
-                    timestamp=timestamp,
-                    value=round(value, 2),
-                    name=f"Donchian Middle({period})",
-                    parameters={"period": period}
-                ))
-
-        # 下線
-        for timestamp, value in zip(df['timestamp'], lower_line):
-            if not pd.isna(value):
-                results.append(self._create_indicator_value(
-                    timestamp=timestamp,
-                    value=round(value, 2),
-                    name=f"Donchian Lower({period})",
-                    parameters={"period": period}
-                ))
-
-        return results
+        parameters = {"period": period}
+        lines = [
+            ("Upper", upper_line),    # 上線
+            ("Middle", middle_line),  # 中線
+            ("Lower", lower_line),    # 下線
+        ]
+
+        return IndicatorSeriesGroup([
+            self._create_series(
+                frame.timestamp,
+                line,
+                name=f"Donchian {label}({period})",
+                parameters=parameters,
+                decimals=2
+            )
+            for label, line in lines
+        ])
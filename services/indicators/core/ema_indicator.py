@@ -2,14 +2,11 @@
 指数移動平均（EMA）インジケータ
 """
 
-from typing import List
-
-import pandas as pd
-
 from src.core.config import IndicatorType
-from src.models.schemas import IndicatorValue, MarketDataPoint
+from src.models.indicator_series import IndicatorResult
 
-from .base_indicator import BaseIndicator
+from .base_indicator import BaseIndicator, MarketData
+from .intermediates import ema
 
 
 class EMAIndicator(BaseIndicator):
@@ -21,21 +18,16 @@ class EMAIndicator(BaseIndicator):
 
     def calculate(
         self,
-        data: List[MarketDataPoint],
+        data: MarketData,
         period: int
-    ) -> List[IndicatorValue]:
+    ) -> IndicatorResult:
         """指数移動平均（EMA）を計算"""
-        df = self._to_dataframe(data)
-        ema = df['price'].ewm(span=period).mean()
-
-        results = []
-        for timestamp, value in zip(df['timestamp'], ema):
-            if not pd.isna(value):
-                results.append(self._create_indicator_value(
-                    timestamp=timestamp,
-                    value=round(value, 6),
-                    name=f"EMA({period})",
-                    parameters={"period": period}
-                ))
-
-        return results
+        frame = self._to_frame(data)
+
+        return self._create_series(
+            frame.timestamp,
+            ema(frame, period),
+            name=f"EMA({period})",
+            parameters={"period": period},
+            decimals=6
+        )
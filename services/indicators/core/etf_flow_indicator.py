@@ -1,11 +1,7 @@
-from typing import List
-
-import pandas as pd
-
 from src.core.config import IndicatorType
-from src.models.schemas import IndicatorValue, MarketDataPoint
+from src.models.indicator_series import IndicatorResult, IndicatorSeriesGroup
 
-from .base_indicator import BaseIndicator
+from .base_indicator import BaseIndicator, MarketData
 
 
 class ETFFlowIndicator(BaseIndicator):
@@ -17,9 +13,9 @@ class ETFFlowIndicator(BaseIndicator):
 
     def calculate(
         self,
-        data: List[MarketDataPoint],
+        data: MarketData,
         period: int = 20
-    ) -> List[IndicatorValue]:
+    ) -> IndicatorResult:
         """ETF Flowを計算"""
         df = self._to_dataframe(data)
 
@@ -46,46 +42,21 @@ class ETFFlowIndicator(BaseIndicator):
         print(f"ETF Flow計算: データ件数={len(df)}, 列名={list(df.columns)}")
         print(f"  最初の価格: {df['price'].iloc[0] if len(df) > 0 else 'N/A'}")
 
-        results = []
-
-        # 価格変化率
-        for timestamp, value in zip(df['timestamp'], price_change):
-            if not pd.isna(value):
-                results.append(self._create_indicator_value(
-                    timestamp=timestamp,
-                    value=round(value, 2),
-                    name="ETF Flow Change(%)",
-                    parameters={"period": period}
-                ))
-
-        # 価格強度
-        for timestamp, value in zip(df['timestamp'], price_strength):
-            if not pd.isna(value):
-                results.append(self._create_indicator_value(
-                    timestamp=timestamp,
-                    value=round(value, 2),
-                    name="ETF Flow Strength",
-                    parameters={"period": period}
-                ))
-
-        # 価格ボラティリティ
-        for timestamp, value in zip(df['timestamp'], price_volatility):
-            if not pd.isna(value):
-                results.append(self._create_indicator_value(
-                    timestamp=timestamp,
-                    value=round(value, 2),
-                    name="ETF Flow Volatility",
-                    parameters={"period": period}
-                ))
-
-        # 変化率移動平均
-        for timestamp, value in zip(df['timestamp'], change_ma):
-            if not pd.isna(value):
-                results.append(self._create_indicator_value(
-                    timestamp=timestamp,
-                    value=round(value, 2),
-                    name=f"ETF Flow Change MA({period})",
-                    parameters={"period": period}
-                ))
-
-        return results
+        parameters = {"period": period}
+        lines = [
+            ("ETF Flow Change(%)", price_change),            # 価格変化率
+            ("ETF Flow Strength", price_strength),           # 価格強度
+            ("ETF Flow Volatility", price_volatility),       # 価格ボラティリティ
+            (f"ETF Flow Change MA({period})", change_ma),    # 変化率移動平均
+        ]
+
+        return IndicatorSeriesGroup([
+            self._create_series(
+                df['timestamp'],
+                line,
+                name=name,
+                parameters=parameters,
+                decimals=2
+            )
+            for name, line in lines
+        ])
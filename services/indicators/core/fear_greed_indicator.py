@@ -7,12 +7,12 @@ import logging
 from typing import List
 
 import pandas as pd
-import requests
 
-from src.core.config import IndicatorType
-from src.models.schemas import IndicatorValue, MarketDataPoint
+from src.core.config import AppConfig, IndicatorType
+from src.core.http_client import http_client, run_sync
+from src.models.schemas import IndicatorValue
 
-from .base_indicator import BaseIndicator
+from .base_indicator import BaseIndicator, MarketData
 
 logger = logging.getLogger(__name__)
 
@@ -26,24 +26,29 @@ class FearGreedIndicator(BaseIndicator):
 
     def calculate(
         self,
-        data: List[MarketDataPoint],
+        data: MarketData,
         period: int = 7
     ) -> List[IndicatorValue]:
         """Fear & Greed Indexを取得"""
+        return run_sync(self.calculate_async(data, period=period))
+
+    async def calculate_async(
+        self,
+        data: MarketData,
+        period: int = 7
+    ) -> List[IndicatorValue]:
+        """Fear & Greed Indexを取得（非同期）"""
         if len(data) < period:
             return []
 
         try:
             # Alternative.me APIからFear & Greed Indexを取得
-            url = "https://api.alternative.me/fng/"
+            url = f"{AppConfig.FEAR_GREED_BASE_URL}/fng/"
             params = {
                 "limit": period
             }
 
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-
-            fng_data = response.json()
+            fng_data = await http_client.get_json(url, params=params)
 
             results = []
 
@@ -76,7 +81,7 @@ class FearGreedIndicator(BaseIndicator):
             logger.error(f"Fear & Greed Index計算エラー: {str(e)}")
             return []
 
-    def _estimate_from_price_momentum(self, data: List[MarketDataPoint], period: int) -> List[IndicatorValue]:
+    def _estimate_from_price_momentum(self, data: MarketData, period: int) -> List[IndicatorValue]:
         """価格モメンタムからFear & Greed Indexを推定（フォールバック）"""
         df = self._to_dataframe(data)
 
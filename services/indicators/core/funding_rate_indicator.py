@@ -7,12 +7,13 @@ import logging
 from typing import List
 
 import pandas as pd
-import requests
 
-from src.core.config import IndicatorType
-from src.models.schemas import IndicatorValue, MarketDataPoint
+from src.core.config import AppConfig, IndicatorType
+from src.core.http_client import http_client, run_sync
+from src.models.indicator_series import IndicatorResult
+from src.models.schemas import IndicatorValue
 
-from .base_indicator import BaseIndicator
+from .base_indicator import BaseIndicator, MarketData
 
 logger = logging.getLogger(__name__)
 
@@ -26,25 +27,30 @@ class FundingRateIndicator(BaseIndicator):
 
     def calculate(
         self,
-        data: List[MarketDataPoint],
+        data: MarketData,
         period: int = 8
     ) -> List[IndicatorValue]:
         """ファンディングレートを計算"""
+        return run_sync(self.calculate_async(data, period=period))
+
+    async def calculate_async(
+        self,
+        data: MarketData,
+        period: int = 8
+    ) -> List[IndicatorValue]:
+        """ファンディングレートを計算（非同期）"""
         if len(data) < period:
             return []
 
         try:
             # Binance APIからファンディングレートを取得
-            url = "https://fapi.binance.com/fapi/v1/fundingRate"
+            url = f"{AppConfig.BINANCE_FUTURES_BASE_URL}/fapi/v1/fundingRate"
             params = {
                 "symbol": "BTCUSDT",
                 "limit": period * 3  # 8時間ごとなので3倍
             }
 
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-
-            funding_data = response.json()
+            funding_data = await http_client.get_json(url, params=params)
 
             results = []
 
@@ -66,7 +72,7 @@ class FundingRateIndicator(BaseIndicator):
             logger.error(f"ファンディングレート計算エラー: {str(e)}")
             return []
 
-    def _estimate_from_price_volatility(self, data: List[MarketDataPoint], period: int) -> List[IndicatorValue]:
+    def _estimate_from_price_volatility(self, data: MarketData, period: int) -> IndicatorResult:
         """価格ボラティリティからファンディングレートを推定（フォールバック）"""
         df = self._to_dataframe(data)
 
@@ -80,15 +86,10 @@ class FundingRateIndicator(BaseIndicator):
         # ボラティリティが高いとファンディングレートも高くなる傾向
         estimated_funding_rate = volatility * 100  # パーセントに変換
 
-        results = []
-
-        for timestamp, value in zip(df['timestamp'], estimated_funding_rate):
-            if not pd.isna(value):
-                results.append(self._create_indicator_value(
-                    timestamp=timestamp,
-                    value=round(value, 4),
-                    name="Estimated Funding Rate (%)",
-                    parameters={"period": period, "method": "volatility_based"}
-                ))
-
-        return results
+        return self._create_series(
+            df['timestamp'],
+            estimated_funding_rate,
+            name="Estimated Funding Rate (%)",
+            parameters={"period": period, "method": "volatility_based"},
+            decimals=4
+        )
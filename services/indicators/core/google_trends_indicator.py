@@ -6,12 +6,10 @@ Google Trends（グーグルトレンド）インジケータ
 import logging
 from typing import List
 
-import pandas as pd
-
 from src.core.config import IndicatorType
-from src.models.schemas import IndicatorValue, MarketDataPoint
+from src.models.indicator_series import IndicatorResult
 
-from .base_indicator import BaseIndicator
+from .base_indicator import BaseIndicator, MarketData
 
 logger = logging.getLogger(__name__)
 
@@ -25,10 +23,10 @@ class GoogleTrendsIndicator(BaseIndicator):
 
     def calculate(
         self,
-        data: List[MarketDataPoint],
+        data: MarketData,
         period: int = 20,
         search_terms: List[str] = None
-    ) -> List[IndicatorValue]:
+    ) -> IndicatorResult:
         """Google Trendsを計算"""
         if len(data) < period:
             return []
@@ -51,19 +49,17 @@ class GoogleTrendsIndicator(BaseIndicator):
             else:
                 normalized_trends = rolling_volatility * 0
 
-            results = []
-            for timestamp, value in zip(df['timestamp'], normalized_trends):
-                if not pd.isna(value):
-                    results.append(self._create_indicator_value(
-                        timestamp=timestamp,
-                        value=round(value, 2),
-                        name="Google Trends",
-                        parameters={
-                            "period": period,
-                            "method": "price_volatility_based",
-                            "search_terms": search_terms or ["BTC", "Bitcoin"]
-                        }
-                    ))
+            results = self._create_series(
+                df['timestamp'],
+                normalized_trends,
+                name="Google Trends",
+                parameters={
+                    "period": period,
+                    "method": "price_volatility_based",
+                    "search_terms": search_terms or ["BTC", "Bitcoin"]
+                },
+                decimals=2
+            )
 
             logger.info(f"Google Trends計算完了: {len(results)}件")
             return results
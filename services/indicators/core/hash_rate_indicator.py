@@ -7,12 +7,13 @@ import logging
 from typing import List
 
 import pandas as pd
-import requests
 
-from src.core.config import IndicatorType
-from src.models.schemas import IndicatorValue, MarketDataPoint
+from src.core.config import AppConfig, IndicatorType
+from src.core.http_client import http_client, run_sync
+from src.models.indicator_series import IndicatorResult
+from src.models.schemas import IndicatorValue
 
-from .base_indicator import BaseIndicator
+from .base_indicator import BaseIndicator, MarketData
 
 logger = logging.getLogger(__name__)
 
@@ -26,26 +27,31 @@ class HashRateIndicator(BaseIndicator):
 
     def calculate(
         self,
-        data: List[MarketDataPoint],
+        data: MarketData,
         period: int = 14
     ) -> List[IndicatorValue]:
         """ハッシュレートを計算"""
+        return run_sync(self.calculate_async(data, period=period))
+
+    async def calculate_async(
+        self,
+        data: MarketData,
+        period: int = 14
+    ) -> List[IndicatorValue]:
+        """ハッシュレートを計算（非同期）"""
         if len(data) < period:
             return []
 
         try:
             # Blockchain.com APIからハッシュレートデータを取得
-            url = "https://api.blockchain.info/charts/hash-rate"
+            url = f"{AppConfig.BLOCKCHAIN_INFO_BASE_URL}/charts/hash-rate"
             params = {
                 "timespan": f"{period}days",
                 "rollingAverage": "24hours",
                 "format": "json"
             }
 
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-
-            hash_rate_data = response.json()
+            hash_rate_data = await http_client.get_json(url, params=params)
 
             results = []
 
@@ -67,7 +73,7 @@ class HashRateIndicator(BaseIndicator):
             logger.error(f"ハッシュレート計算エラー: {str(e)}")
             return []
 
-    def _get_hash_rate_from_price(self, data: List[MarketDataPoint], period: int) -> List[IndicatorValue]:
+    def _get_hash_rate_from_price(self, data: MarketData, period: int) -> IndicatorResult:
         """価格データからハッシュレートを推定（フォールバック）"""
         df = self._to_dataframe(data)
 
@@ -80,15 +86,10 @@ class HashRateIndicator(BaseIndicator):
         # ハッシュレートは価格と正の相関があると仮定
         estimated_hash_rate = 100 + (price_change * 50)  # ベースライン100 TH/s
 
-        results = []
-
-        for timestamp, value in zip(df['timestamp'], estimated_hash_rate):
-            if not pd.isna(value):
-                results.append(self._create_indicator_value(
-                    timestamp=timestamp,
-                    value=round(value, 2),
-                    name="Estimated Hash Rate (TH/s)",
-                    parameters={"period": period, "method": "price_based"}
-                ))
-
-        return results
+        return self._create_series(
+            df['timestamp'],
+            estimated_hash_rate,
+            name="Estimated Hash Rate (TH/s)",
+            parameters={"period": period, "method": "price_based"},
+            decimals=2
+        )
@@ -4,15 +4,13 @@
 """
 
 import logging
-from typing import List
 
 import numpy as np
-import pandas as pd
 
 from src.core.config import IndicatorType
-from src.models.schemas import IndicatorValue, MarketDataPoint
+from src.models.indicator_series import IndicatorResult
 
-from .base_indicator import BaseIndicator
+from .base_indicator import BaseIndicator, MarketData
 
 logger = logging.getLogger(__name__)
 
@@ -26,9 +24,9 @@ class ImpliedVolatilityIndicator(BaseIndicator):
 
     def calculate(
         self,
-        data: List[MarketDataPoint],
+        data: MarketData,
         period: int = 20
-    ) -> List[IndicatorValue]:
+    ) -> IndicatorResult:
         """インプライドボラティリティを計算"""
         if len(data) < period:
             return []
@@ -46,20 +44,17 @@ class ImpliedVolatilityIndicator(BaseIndicator):
             # ボラティリティ（年率換算）
             implied_vol = rolling_std * np.sqrt(252) * 100
 
-            results = []
-
-            for timestamp, value in zip(df['timestamp'], implied_vol):
-                if not pd.isna(value):
-                    results.append(self._create_indicator_value(
-                        timestamp=timestamp,
-                        value=round(value, 2),
-                        name="Implied Volatility (%)",
-                        parameters={
-                            "period": period,
-                            "method": "price_changes",
-                            "annualized": True
-                        }
-                    ))
+            results = self._create_series(
+                df['timestamp'],
+                implied_vol,
+                name="Implied Volatility (%)",
+                parameters={
+                    "period": period,
+                    "method": "price_changes",
+                    "annualized": True
+                },
+                decimals=2
+            )
 
             logger.info(f"インプライドボラティリティ計算完了: {len(results)}件")
             return results
@@ -70,10 +65,10 @@ class ImpliedVolatilityIndicator(BaseIndicator):
 
     def calculate_black_scholes_iv(
         self,
-        data: List[MarketDataPoint],
+        data: MarketData,
         risk_free_rate: float = 0.02,
         time_to_maturity: float = 30/365
-    ) -> List[IndicatorValue]:
+    ) -> IndicatorResult:
         """Black-Scholesモデルを使用したインプライドボラティリティ計算"""
         if len(data) < 1:
             return []
@@ -88,22 +83,18 @@ class ImpliedVolatilityIndicator(BaseIndicator):
             # 年率ボラティリティを計算
             annual_vol = price_changes.std() * np.sqrt(252) * 100
 
-            results = []
-
-            for timestamp in df['timestamp']:
-                results.append(self._create_indicator_value(
-                    timestamp=timestamp,
-                    value=round(annual_vol, 2),
-                    name="Black-Scholes IV (%)",
-                    parameters={
-                        "risk_free_rate": risk_free_rate,
-                        "time_to_maturity": time_to_maturity,
-                        "method": "black_scholes",
-                        "annualized": True
-                    }
-                ))
-
-            return results
+            return self._create_series(
+                df['timestamp'],
+                np.full(len(df), annual_vol),
+                name="Black-Scholes IV (%)",
+                parameters={
+                    "risk_free_rate": risk_free_rate,
+                    "time_to_maturity": time_to_maturity,
+                    "method": "black_scholes",
+                    "annualized": True
+                },
+                decimals=2
+            )
 
         except Exception as e:
             logger.error(f"Black-Scholes IV計算エラー: {str(e)}")
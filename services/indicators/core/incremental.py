@@ -0,0 +1,852 @@
+"""
+インクリメンタル（ストリーミング）インジケータ
+履歴データで初期化した後、確定足ごとに1本ずつ状態を進めて計算いたします
+
+- seed(data): 履歴データから状態を構築（初回のみ O(n)）
+- update(bar): 確定した足で状態を進め、最新値を返す（1本あたり O(1)）
+- peek(bar): 形成中の足で評価した値を返す（状態は変更しない）
+- get_state() / restore_incremental(state): 状態をJSON互換の辞書として保存・復元
+
+計算結果はバッチ計算（calculate）と同じ名前・パラメータ・丸め桁で返します。
+"""
+
+import math
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+import numpy as np
+import pandas as pd
+
+from src.core.config import IndicatorType
+from src.models.ohlcv import OHLCVFrame
+from src.models.schemas import IndicatorValue, MarketDataPoint
+
+from .base_indicator import MarketData
+
+# 1本分の計算結果（値と、パラメータに含める付随値）
+StepResult = Optional[Tuple[float, Dict[str, float]]]
+
+
+def _nan_to_none(value: Any) -> Any:
+    """状態に含まれるNaNをNoneに置換（JSONにNaNは存在しないため）"""
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if isinstance(value, dict):
+        return {key: _nan_to_none(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_nan_to_none(item) for item in value]
+    return value
+
+
+def _none_to_nan(value: Any) -> Any:
+    """_nan_to_none() で保存した状態のNoneをNaNに戻す"""
+    if value is None:
+        return math.nan
+    if isinstance(value, dict):
+        return {key: _none_to_nan(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_none_to_nan(item) for item in value]
+    return value
+
+
+class RollingWindow:
+    """固定長ウィンドウの合計・二乗和を O(1) で更新するバッファ
+
+    合計は最初の値を基準にずらして保持し（大きな価格水準での桁落ち対策）、
+    ウィンドウ長ごとにバッファから再計算して丸め誤差の蓄積を防ぎます。
+    NaNを含むウィンドウの平均・分散はpandasと同じくNaNになります。
+    """
+
+    def __init__(self, size: int):
+        if size < 1:
+            raise ValueError(f"ウィンドウ幅は1以上である必要があります: {size}")
+        self.size = size
+        self.buffer: deque = deque(maxlen=size)
+        self.shift = 0.0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.nan_count = 0
+        self.pushes = 0
+
+    def _next_totals(self, x: float) -> Tuple[float, float, int, int]:
+        """xを追加した後の合計・二乗和・NaN数・件数を計算（状態は変更しない）"""
+        total, total_sq, nan_count = self.total, self.total_sq, self.nan_count
+        count = len(self.buffer)
+
+        if count == self.size:
+            oldest = self.buffer[0]
+            if math.isnan(oldest):
+                nan_count -= 1
+            else:
+                d = oldest - self.shift
+                total -= d
+                total_sq -= d * d
+            count -= 1
+
+        if math.isnan(x):
+            nan_count += 1
+        else:
+            d = x - self.shift
+            total += d
+            total_sq += d * d
+        return total, total_sq, nan_count, count + 1
+
+    def push(self, x: float) -> None:
+        """値を追加（古い値はウィンドウから外れる）"""
+        if not self.buffer and not math.isnan(x):
+            self.shift = x
+        self.total, self.total_sq, self.nan_count, _ = self._next_totals(x)
+        self.buffer.append(x)
+
+        self.pushes += 1
+        if self.pushes >= self.size:
+            self._resync()
+
+    def _resync(self) -> None:
+        """バッファから合計を再計算し、基準値を現在の平均に合わせる"""
+        finite = [v for v in self.buffer if not math.isnan(v)]
+        self.shift = math.fsum(finite) / len(finite) if finite else 0.0
+        self.total = math.fsum(v - self.shift for v in finite)
+        self.total_sq = math.fsum((v - self.shift) ** 2 for v in finite)
+        self.nan_count = len(self.buffer) - len(finite)
+        self.pushes = 0
+
+    def _mean(self, total: float, nan_count: int, count: int) -> float:
+        if count < self.size or nan_count:
+            return math.nan
+        return self.shift + total / count
+
+    def mean(self, x: Optional[float] = None) -> float:
+        """ウィンドウ平均（xを渡した場合は追加した場合の値を評価）"""
+        if x is None:
+            return self._mean(self.total, self.nan_count, len(self.buffer))
+        total, _, nan_count, count = self._next_totals(x)
+        return self._mean(total, nan_count, count)
+
+    def sum(self, x: Optional[float] = None) -> float:
+        """ウィンドウ合計（xを渡した場合は追加した場合の値を評価）"""
+        mean = self.mean(x)
+        return mean * self.size
+
+    def variance(self, x: Optional[float] = None, ddof: int = 1) -> float:
+        """ウィンドウ分散（xを渡した場合は追加した場合の値を評価）"""
+        if x is None:
+            total, total_sq = self.total, self.total_sq
+            nan_count, count = self.nan_count, len(self.buffer)
+        else:
+            total, total_sq, nan_count, count = self._next_totals(x)
+        if count < self.size or nan_count or count - ddof < 1:
+            return math.nan
+        return max((total_sq - total * total / count) / (count - ddof), 0.0)
+
+    def to_state(self) -> Dict[str, Any]:
+        return {
+            "buffer": list(self.buffer),
+            "shift": self.shift,
+            "total": self.total,
+            "total_sq": self.total_sq,
+            "nan_count": self.nan_count,
+            "pushes": self.pushes
+        }
+
+    def load_state(self, state: Dict[str, Any]) -> None:
+        self.buffer = deque(state["buffer"], maxlen=self.size)
+        self.shift = state["shift"]
+        self.total = state["total"]
+        self.total_sq = state["total_sq"]
+        self.nan_count = state["nan_count"]
+        self.pushes = state["pushes"]
+
+
+class RollingExtremum:
+    """単調キューによるローリング最大・最小（1本あたり償却 O(1)）
+
+    バッチ計算（rolling.py・pandasの rolling().max()）と同じく、NaNを含む
+    ウィンドウの値はNaNです。
+    """
+
+    def __init__(self, size: int, mode: str):
+        if size < 1:
+            raise ValueError(f"ウィンドウ幅は1以上である必要があります: {size}")
+        if mode not in ("max", "min"):
+            raise ValueError(f"未対応のモード: {mode}")
+        self.size = size
+        self.mode = mode
+        self.queue: deque = deque()  # (インデックス, 値)
+        self.count = 0
+        self.last_nan: Optional[int] = None  # 最後に追加したNaNのインデックス
+
+    def _dominates(self, a: float, b: float) -> bool:
+        return a >= b if self.mode == "max" else a <= b
+
+    def push(self, x: float) -> None:
+        """値を追加"""
+        if math.isnan(x):
+            # NaNより前の値を含むウィンドウは全てNaNを含むため、キューは不要になる
+            self.queue.clear()
+            self.last_nan = self.count
+            self.count += 1
+            return
+        while self.queue and self._dominates(x, self.queue[-1][1]):
+            self.queue.pop()
+        self.queue.append((self.count, x))
+        self.count += 1
+        while self.queue[0][0] <= self.count - 1 - self.size:
+            self.queue.popleft()
+
+    def value(self, x: Optional[float] = None) -> float:
+        """ウィンドウの極値（xを渡した場合は追加した場合の値を評価）"""
+        count = self.count if x is None else self.count + 1
+        if count < self.size:
+            return math.nan
+
+        oldest = count - self.size
+        if (x is not None and math.isnan(x)) or (
+                self.last_nan is not None and self.last_nan >= oldest):
+            return math.nan
+
+        current = math.nan
+        for index, value in self.queue:
+            if index >= oldest:
+                current = value
+                break
+
+        if x is None:
+            return current
+        if math.isnan(current) or self._dominates(x, current):
+            return x
+        return current
+
+    def to_state(self) -> Dict[str, Any]:
+        return {"queue": [list(item) for item in self.queue], "count": self.count,
+                "last_nan": self.last_nan}
+
+    def load_state(self, state: Dict[str, Any]) -> None:
+        self.queue = deque((int(i), v) for i, v in state["queue"])
+        self.count = state["count"]
+        self.last_nan = state.get("last_nan")
+
+
+class ExponentialAverage:
+    """pandasの ewm(span=period, adjust=True).mean() と同じ指数移動平均"""
+
+    def __init__(self, period: int):
+        self.decay = 1.0 - 2.0 / (period + 1)
+        self.weighted_sum = 0.0
+        self.weight = 0.0
+
+    def value(self, x: Optional[float] = None) -> float:
+        """平均値（xを渡した場合は追加した場合の値を評価）"""
+        if x is None:
+            if not self.weight:
+                return math.nan
+            return self.weighted_sum / self.weight
+        return ((x + self.decay * self.weighted_sum) /
+                (1.0 + self.decay * self.weight))
+
+    def push(self, x: float) -> None:
+        """値を追加"""
+        self.weighted_sum = x + self.decay * self.weighted_sum
+        self.weight = 1.0 + self.decay * self.weight
+
+    def to_state(self) -> Dict[str, Any]:
+        return {"weighted_sum": self.weighted_sum, "weight": self.weight}
+
+    def load_state(self, state: Dict[str, Any]) -> None:
+        self.weighted_sum = state["weighted_sum"]
+        self.weight = state["weight"]
+
+
+class IncrementalIndicator(ABC):
+    """インクリメンタルインジケータの基底クラス
+
+    サブクラスは _step() で1本分の計算を行います。commit=False の場合は
+    状態を変更せずに値だけを返すため、update() と peek() で同じ計算式を共有します。
+    """
+
+    indicator_type: IndicatorType
+    decimals: int = 6
+
+    def __init__(self, **parameters):
+        self.parameters: Dict[str, Any] = parameters
+        self.last_timestamp: Optional[int] = None
+        self.last_close = math.nan
+
+    @property
+    def name(self) -> str:
+        """バッチ計算と同じ系列名"""
+        return self.indicator_type.value
+
+    @abstractmethod
+    def _step(
+        self,
+        high: float,
+        low: float,
+        close: float,
+        volume: float,
+        commit: bool
+    ) -> StepResult:
+        """1本分の計算（commit=Trueの場合のみ状態を進める）"""
+
+    @abstractmethod
+    def _components(self) -> Dict[str, Any]:
+        """状態を構成するバッファ・スカラーを取得"""
+
+    @abstractmethod
+    def _load_components(self, state: Dict[str, Any]) -> None:
+        """_components() で取得した状態を復元"""
+
+    def seed(self, data: MarketData) -> Optional[IndicatorValue]:
+        """履歴データから状態を構築し、最新の確定値を返す"""
+        if isinstance(data, list):
+            data = OHLCVFrame.from_points(data)
+
+        result: StepResult = None
+        for high, low, close, volume in zip(
+            data.high.tolist(), data.low.tolist(),
+            data.close.tolist(), data.volume.tolist()
+        ):
+            result = self._step(high, low, close, volume, commit=True)
+            self.last_close = close
+
+        if not len(data):
+            return None
+        self.last_timestamp = int(data.timestamp[-1])
+        return self._to_value(self.last_timestamp, result)
+
+    def update(self, bar: MarketDataPoint) -> Optional[IndicatorValue]:
+        """確定した足で状態を1本進め、最新値を返す"""
+        timestamp = pd.Timestamp(bar.timestamp).value
+        if self.last_timestamp is not None and timestamp <= self.last_timestamp:
+            raise ValueError(
+                f"確定済みの足より古いタイムスタンプです: {bar.timestamp}")
+
+        result = self._step(*self._unpack(bar), commit=True)
+        self.last_timestamp = timestamp
+        self.last_close = bar.close
+        return self._to_value(timestamp, result)
+
+    def peek(self, bar: MarketDataPoint) -> Optional[IndicatorValue]:
+        """形成中の足で評価した値を返す（状態は変更しない）"""
+        result = self._step(*self._unpack(bar), commit=False)
+        return self._to_value(pd.Timestamp(bar.timestamp).value, result)
+
+    def get_state(self) -> Dict[str, Any]:
+        """永続化用の状態をJSON互換の辞書として取得（NaNはNoneとして保存）"""
+        return {
+            "type": self.indicator_type.value,
+            "parameters": dict(self.parameters),
+            "last_timestamp": self.last_timestamp,
+            "last_close": _nan_to_none(self.last_close),
+            "state": _nan_to_none(self._components())
+        }
+
+    def _load_state(self, state: Dict[str, Any]) -> None:
+        self.last_timestamp = state["last_timestamp"]
+        self.last_close = _none_to_nan(state["last_close"])
+        self._load_components(_none_to_nan(state["state"]))
+
+    @staticmethod
+    def _unpack(bar: MarketDataPoint) -> Tuple[float, float, float, float]:
+        volume = math.nan if bar.volume is None else float(bar.volume)
+        return float(bar.high), float(bar.low), float(bar.close), volume
+
+    def _round(self, value: float, decimals: Optional[int] = None) -> float:
+        """バッチ計算（np.round）と同じ丸め"""
+        return float(np.round(value, self.decimals if decimals is None else decimals))
+
+    def _to_value(self, timestamp: int, result: StepResult) -> Optional[IndicatorValue]:
+        """計算結果をIndicatorValueに変換（値がNaNの場合はNone）"""
+        if result is None or math.isnan(result[0]):
+            return None
+
+        value, extras = result
+        parameters = dict(self.parameters)
+        for key, extra in extras.items():
+            parameters[key] = None if math.isnan(extra) else extra
+
+        return IndicatorValue(
+            name=self.name,
+            type=self.indicator_type.value,
+            timestamp=pd.Timestamp(timestamp, tz="UTC"),
+            value=self._round(value),
+            parameters=parameters
+        )
+
+
+class IncrementalSMA(IncrementalIndicator):
+    """単純移動平均（SMA）"""
+
+    indicator_type = IndicatorType.SMA
+
+    def __init__(self, period: int):
+        super().__init__(period=period)
+        self.window = RollingWindow(period)
+
+    @property
+    def name(self) -> str:
+        return f"SMA({self.parameters['period']})"
+
+    def _step(self, high, low, close, volume, commit) -> StepResult:
+        value = self.window.mean(close)
+        if commit:
+            self.window.push(close)
+        return value, {}
+
+    def _components(self):
+        return {"window": self.window.to_state()}
+
+    def _load_components(self, state):
+        self.window.load_state(state["window"])
+
+
+class IncrementalEMA(IncrementalIndicator):
+    """指数移動平均（EMA）"""
+
+    indicator_type = IndicatorType.EMA
+
+    def __init__(self, period: int):
+        super().__init__(period=period)
+        self.average = ExponentialAverage(period)
+
+    @property
+    def name(self) -> str:
+        return f"EMA({self.parameters['period']})"
+
+    def _step(self, high, low, close, volume, commit) -> StepResult:
+        value = self.average.value(close)
+        if commit:
+            self.average.push(close)
+        return value, {}
+
+    def _components(self):
+        return {"average": self.average.to_state()}
+
+    def _load_components(self, state):
+        self.average.load_state(state["average"])
+
+
+class IncrementalRSI(IncrementalIndicator):
+    """相対力指数（RSI）"""
+
+    indicator_type = IndicatorType.RSI
+    decimals = 2
+
+    def __init__(self, period: int = 14):
+        super().__init__(period=period)
+        self.gains = RollingWindow(period)
+        self.losses = RollingWindow(period)
+
+    @property
+    def name(self) -> str:
+        return f"RSI({self.parameters['period']})"
+
+    def _step(self, high, low, close, volume, commit) -> StepResult:
+        # 初回の足は価格変化なし（上昇・下落とも0）として扱う
+        delta = close - self.last_close
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+
+        average_gain = self.gains.mean(gain)
+        average_loss = self.losses.mean(loss)
+        if commit:
+            self.gains.push(gain)
+            self.losses.push(loss)
+
+        if average_loss == 0:
+            value = 100.0 if average_gain > 0 else math.nan
+        else:
+            value = 100 - (100 / (1 + average_gain / average_loss))
+        return value, {}
+
+    def _components(self):
+        return {"gains": self.gains.to_state(), "losses": self.losses.to_state()}
+
+    def _load_components(self, state):
+        self.gains.load_state(state["gains"])
+        self.losses.load_state(state["losses"])
+
+
+class IncrementalMACD(IncrementalIndicator):
+    """MACD（移動平均収束発散）"""
+
+    indicator_type = IndicatorType.MACD
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        super().__init__(fast=fast, slow=slow, signal=signal)
+        self.fast = ExponentialAverage(fast)
+        self.slow = ExponentialAverage(slow)
+        self.signal = ExponentialAverage(signal)
+
+    @property
+    def name(self) -> str:
+        return "MACD"
+
+    def _step(self, high, low, close, volume, commit) -> StepResult:
+        macd_line = self.fast.value(close) - self.slow.value(close)
+        signal_line = self.signal.value(macd_line)
+        if commit:
+            self.fast.push(close)
+            self.slow.push(close)
+            self.signal.push(macd_line)
+
+        return macd_line, {
+            "signal_value": self._round(signal_line, 6),
+            "histogram": self._round(macd_line - signal_line, 6)
+        }
+
+    def _components(self):
+        return {
+            "fast": self.fast.to_state(),
+            "slow": self.slow.to_state(),
+            "signal": self.signal.to_state()
+        }
+
+    def _load_components(self, state):
+        self.fast.load_state(state["fast"])
+        self.slow.load_state(state["slow"])
+        self.signal.load_state(state["signal"])
+
+
+class IncrementalATR(IncrementalIndicator):
+    """平均真の範囲（ATR）"""
+
+    indicator_type = IndicatorType.ATR
+
+    def __init__(self, period: int = 14):
+        super().__init__(period=period)
+        self.average = ExponentialAverage(period)
+
+    @property
+    def name(self) -> str:
+        return f"ATR({self.parameters['period']})"
+
+    def _step(self, high, low, close, volume, commit) -> StepResult:
+        # 初回の足は前日終値がないため高値-安値のみ
+        true_range = high - low
+        if not math.isnan(self.last_close):
+            true_range = max(true_range,
+                             abs(high - self.last_close),
+                             abs(low - self.last_close))
+
+        value = self.average.value(true_range)
+        if commit:
+            self.average.push(true_range)
+        return value, {}
+
+    def _components(self):
+        return {"average": self.average.to_state()}
+
+    def _load_components(self, state):
+        self.average.load_state(state["average"])
+
+
+class IncrementalBollingerBands(IncrementalIndicator):
+    """ボリンジャーバンド"""
+
+    indicator_type = IndicatorType.BOLLINGER_BANDS
+
+    def __init__(self, period: int = 20, std_dev: float = 2.0):
+        super().__init__(period=period, std_dev=std_dev)
+        self.window = RollingWindow(period)
+
+    @property
+    def name(self) -> str:
+        return (f"Bollinger Bands({self.parameters['period']}, "
+                f"{self.parameters['std_dev']})")
+
+    def _step(self, high, low, close, volume, commit) -> StepResult:
+        middle = self.window.mean(close)
+        std = math.sqrt(self.window.variance(close))
+        if commit:
+            self.window.push(close)
+
+        upper = middle + std * self.parameters["std_dev"]
+        lower = middle - std * self.parameters["std_dev"]
+        bandwidth = (upper - lower) / middle * 100 if middle else math.nan
+        return middle, {
+            "upper": self._round(upper, 6),
+            "lower": self._round(lower, 6),
+            "bandwidth": self._round(bandwidth, 2)
+        }
+
+    def _components(self):
+        return {"window": self.window.to_state()}
+
+    def _load_components(self, state):
+        self.window.load_state(state["window"])
+
+
+class IncrementalStochastic(IncrementalIndicator):
+    """ストキャスティクスオシレーター"""
+
+    indicator_type = IndicatorType.STOCHASTIC
+    decimals = 2
+
+    def __init__(self, k_period: int = 14, d_period: int = 3, slowing: int = 3):
+        super().__init__(k_period=k_period, d_period=d_period, slowing=slowing)
+        self.highest = RollingExtremum(k_period, "max")
+        self.lowest = RollingExtremum(k_period, "min")
+        self.k_window = RollingWindow(slowing)
+        self.d_window = RollingWindow(d_period)
+
+    @property
+    def name(self) -> str:
+        return (f"Stochastic({self.parameters['k_period']}, "
+                f"{self.parameters['d_period']}, {self.parameters['slowing']})")
+
+    def _step(self, high, low, close, volume, commit) -> StepResult:
+        highest_high = self.highest.value(high)
+        lowest_low = self.lowest.value(low)
+        price_range = highest_high - lowest_low
+        k_percent = (100 * (close - lowest_low) / price_range
+                     if price_range else math.nan)
+
+        k_slowed = self.k_window.mean(k_percent)
+        d_percent = self.d_window.mean(k_slowed)
+        if commit:
+            self.highest.push(high)
+            self.lowest.push(low)
+            self.k_window.push(k_percent)
+            self.d_window.push(k_slowed)
+
+        return k_slowed, {
+            "k_value": self._round(k_slowed, 2),
+            "d_value": self._round(d_percent, 2)
+        }
+
+    def _components(self):
+        return {
+            "highest": self.highest.to_state(),
+            "lowest": self.lowest.to_state(),
+            "k_window": self.k_window.to_state(),
+            "d_window": self.d_window.to_state()
+        }
+
+    def _load_components(self, state):
+        self.highest.load_state(state["highest"])
+        self.lowest.load_state(state["lowest"])
+        self.k_window.load_state(state["k_window"])
+        self.d_window.load_state(state["d_window"])
+
+
+class IncrementalWilliamsR(IncrementalIndicator):
+    """Williams %R"""
+
+    indicator_type = IndicatorType.WILLIAMS_R
+    decimals = 2
+
+    def __init__(self, period: int = 14):
+        super().__init__(period=period)
+        self.highest = RollingExtremum(period, "max")
+        self.lowest = RollingExtremum(period, "min")
+
+    @property
+    def name(self) -> str:
+        return f"Williams %R({self.parameters['period']})"
+
+    def _step(self, high, low, close, volume, commit) -> StepResult:
+        highest_high = self.highest.value(high)
+        lowest_low = self.lowest.value(low)
+        if commit:
+            self.highest.push(high)
+            self.lowest.push(low)
+
+        price_range = highest_high - lowest_low
+        if not price_range:
+            return math.nan, {}
+        return (highest_high - close) / price_range * -100, {}
+
+    def _components(self):
+        return {"highest": self.highest.to_state(), "lowest": self.lowest.to_state()}
+
+    def _load_components(self, state):
+        self.highest.load_state(state["highest"])
+        self.lowest.load_state(state["lowest"])
+
+
+class IncrementalOBV(IncrementalIndicator):
+    """OBV（On-Balance Volume）"""
+
+    indicator_type = IndicatorType.OBV
+    decimals = 2
+
+    def __init__(self, period: int = 20):
+        super().__init__(period=period)
+        self.obv = math.nan
+
+    @property
+    def name(self) -> str:
+        return f"OBV({self.parameters['period']})"
+
+    def _step(self, high, low, close, volume, commit) -> StepResult:
+        if math.isnan(self.obv):
+            # 初日は出来高そのもの
+            obv = volume
+        elif close > self.last_close:
+            obv = self.obv + volume
+        elif close < self.last_close:
+            obv = self.obv - volume
+        else:
+            obv = self.obv
+
+        if commit:
+            self.obv = obv
+        return obv, {}
+
+    def _components(self):
+        return {"obv": self.obv}
+
+    def _load_components(self, state):
+        self.obv = state["obv"]
+
+
+class IncrementalVWAP(IncrementalIndicator):
+    """VWAP（出来高加重平均価格、期間ローリング）"""
+
+    indicator_type = IndicatorType.VWAP
+    decimals = 2
+
+    def __init__(self, period: int = 20):
+        super().__init__(period=period)
+        self.volume_price = RollingWindow(period)
+        self.volume = RollingWindow(period)
+
+    @property
+    def name(self) -> str:
+        return f"VWAP({self.parameters['period']})"
+
+    def _step(self, high, low, close, volume, commit) -> StepResult:
+        volume_price = (high + low + close) / 3 * volume
+        cumulative_volume_price = self.volume_price.sum(volume_price)
+        cumulative_volume = self.volume.sum(volume)
+        if commit:
+            self.volume_price.push(volume_price)
+            self.volume.push(volume)
+
+        if not cumulative_volume:
+            return math.nan, {}
+        return cumulative_volume_price / cumulative_volume, {}
+
+    def _components(self):
+        return {
+            "volume_price": self.volume_price.to_state(),
+            "volume": self.volume.to_state()
+        }
+
+    def _load_components(self, state):
+        self.volume_price.load_state(state["volume_price"])
+        self.volume.load_state(state["volume"])
+
+
+class IncrementalParabolicSAR(IncrementalIndicator):
+    """Parabolic SAR"""
+
+    indicator_type = IndicatorType.PARABOLIC_SAR
+    decimals = 2
+
+    def __init__(self, acceleration: float = 0.02, maximum: float = 0.2):
+        super().__init__(acceleration=acceleration, maximum=maximum)
+        self.sar = math.nan
+        self.ep = math.nan
+        self.af = acceleration
+        self.trend_up = True
+        self.prev_high = math.nan
+        self.prev_low = math.nan
+
+    @property
+    def name(self) -> str:
+        return "Parabolic SAR"
+
+    def _step(self, high, low, close, volume, commit) -> StepResult:
+        acceleration = self.parameters["acceleration"]
+        maximum = self.parameters["maximum"]
+
+        if math.isnan(self.sar):
+            # 最初は上昇トレンドと仮定
+            sar, ep, af, trend_up = low, high, acceleration, True
+        else:
+            # kernels.parabolic_sar_kernel と同じ遷移
+            prev_sar, prev_ep = self.sar, self.ep
+            af, trend_up = self.af, self.trend_up
+            sar = prev_sar + af * (prev_ep - prev_sar)
+            ep = prev_ep
+            if trend_up:
+                sar = min(sar, self.prev_low)
+                if high > prev_ep:
+                    ep = high
+                    af = min(af + acceleration, maximum)
+                if low < prev_sar:
+                    trend_up, sar, ep, af = False, prev_ep, low, acceleration
+            else:
+                sar = max(sar, self.prev_high)
+                if low < prev_ep:
+                    ep = low
+                    af = min(af + acceleration, maximum)
+                if high > prev_sar:
+                    trend_up, sar, ep, af = True, prev_ep, high, acceleration
+
+        if commit:
+            self.sar, self.ep, self.af, self.trend_up = sar, ep, af, trend_up
+            self.prev_high, self.prev_low = high, low
+        return sar, {}
+
+    def _components(self):
+        return {
+            "sar": self.sar,
+            "ep": self.ep,
+            "af": self.af,
+            "trend_up": self.trend_up,
+            "prev_high": self.prev_high,
+            "prev_low": self.prev_low
+        }
+
+    def _load_components(self, state):
+        self.sar = state["sar"]
+        self.ep = state["ep"]
+        self.af = state["af"]
+        self.trend_up = state["trend_up"]
+        self.prev_high = state["prev_high"]
+        self.prev_low = state["prev_low"]
+
+
+# インジケータタイプとインクリメンタル実装の対応
+INCREMENTAL_INDICATORS: Dict[IndicatorType, Type[IncrementalIndicator]] = {
+    cls.indicator_type: cls
+    for cls in (
+        IncrementalSMA,
+        IncrementalEMA,
+        IncrementalRSI,
+        IncrementalMACD,
+        IncrementalATR,
+        IncrementalBollingerBands,
+        IncrementalStochastic,
+        IncrementalWilliamsR,
+        IncrementalOBV,
+        IncrementalVWAP,
+        IncrementalParabolicSAR,
+    )
+}
+
+
+def create_incremental(
+    indicator_type: IndicatorType,
+    **parameters
+) -> IncrementalIndicator:
+    """インクリメンタルインジケータを作成"""
+    if indicator_type not in INCREMENTAL_INDICATORS:
+        raise ValueError(f"インクリメンタル計算に未対応のインジケータタイプ: {indicator_type}")
+    return INCREMENTAL_INDICATORS[indicator_type](**parameters)
+
+
+def restore_incremental(state: Dict[str, Any]) -> IncrementalIndicator:
+    """get_state() で保存した状態からインクリメンタルインジケータを復元"""
+    indicator = create_incremental(IndicatorType(state["type"]), **state["parameters"])
+    indicator._load_state(state)
+    return indicator
+
+
+def supported_incremental_types() -> List[IndicatorType]:
+    """インクリメンタル計算に対応したインジケータタイプの一覧"""
+    return list(INCREMENTAL_INDICATORS)
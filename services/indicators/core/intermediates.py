@@ -0,0 +1,88 @@
+"""
+インジケータ間で共有する中間系列
+典型価格・真の値幅・EMA・移動平均・ローリング高値/安値をフレームごとに一度だけ計算いたします
+
+各インジケータはここで定義された関数から中間系列を取得します。結果は
+OHLCVFrame.intermediate() にキャッシュされるため、同じフレームで複数の
+インジケータを計算すると、共通の中間系列は最初の1回だけ計算されます。
+例えば ATR・ADX・Keltner Channel は true_range() を、CCI・MFI・VWAP・
+Keltner Channel は typical_price() を共有します。
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.models.ohlcv import OHLCVFrame
+
+from .rolling import rolling_max, rolling_min
+
+# 中間系列の入力として指定できる列
+SOURCES = ("open", "high", "low", "close", "volume", "typical_price", "true_range")
+
+
+def source(frame: OHLCVFrame, name: str) -> np.ndarray:
+    """入力列または派生列を取得"""
+    if name == "typical_price":
+        return typical_price(frame)
+    if name == "true_range":
+        return true_range(frame)
+    if name not in SOURCES:
+        raise ValueError(f"未対応の入力系列: {name}")
+    return getattr(frame, name)
+
+
+def typical_price(frame: OHLCVFrame) -> np.ndarray:
+    """典型価格 (High + Low + Close) / 3"""
+    return frame.intermediate(
+        ("typical_price",),
+        lambda: (frame.high + frame.low + frame.close) / 3
+    )
+
+
+def _true_range(frame: OHLCVFrame) -> np.ndarray:
+    prev_close = np.empty(len(frame))
+    prev_close[:1] = np.nan
+    prev_close[1:] = frame.close[:-1]
+
+    # 初日は前日終値がないため高値-安値のみ（fmaxはNaNを無視）
+    return np.fmax(
+        frame.high - frame.low,
+        np.fmax(np.abs(frame.high - prev_close), np.abs(frame.low - prev_close))
+    )
+
+
+def true_range(frame: OHLCVFrame) -> np.ndarray:
+    """真の値幅 max(High-Low, |High-前日Close|, |Low-前日Close|)"""
+    return frame.intermediate(("true_range",), lambda: _true_range(frame))
+
+
+def ema(frame: OHLCVFrame, span: int, of: str = "close") -> np.ndarray:
+    """指数移動平均（pandasの ewm(span=span).mean() と同じ）"""
+    return frame.intermediate(
+        ("ema", of, span),
+        lambda: pd.Series(source(frame, of)).ewm(span=span).mean().to_numpy()
+    )
+
+
+def sma(frame: OHLCVFrame, window: int, of: str = "close") -> np.ndarray:
+    """単純移動平均（pandasの rolling(window).mean() と同じ）"""
+    return frame.intermediate(
+        ("sma", of, window),
+        lambda: pd.Series(source(frame, of)).rolling(window=window).mean().to_numpy()
+    )
+
+
+def highest(frame: OHLCVFrame, window: int, of: str = "high") -> np.ndarray:
+    """期間内の最高値"""
+    return frame.intermediate(
+        ("highest", of, window),
+        lambda: rolling_max(source(frame, of), window)
+    )
+
+
+def lowest(frame: OHLCVFrame, window: int, of: str = "low") -> np.ndarray:
+    """期間内の最安値"""
+    return frame.intermediate(
+        ("lowest", of, window),
+        lambda: rolling_min(source(frame, of), window)
+    )
@@ -1,11 +1,8 @@
-from typing import List
-
-import pandas as pd
-
 from src.core.config import IndicatorType
-from src.models.schemas import IndicatorValue, MarketDataPoint
+from src.models.indicator_series import IndicatorResult, IndicatorSeriesGroup
 
-from .base_indicator import BaseIndicator
+from .base_indicator import BaseIndicator, MarketData
+from .intermediates import sma
 
 
 class KeltnerChannelIndicator(BaseIndicator):
@@ -17,66 +14,40 @@ class KeltnerChannelIndicator(BaseIndicator):
 
     def calculate(
         self,
-        data: List[MarketDataPoint],
+        data: MarketData,
         period: int = 20,
         multiplier: float = 2.0
-    ) -> List[IndicatorValue]:
+    ) -> IndicatorResult:
         """Keltner Channelを計算"""
-        df = self._to_dataframe(data)
+        frame = self._to_frame(data)
 
-        if len(df) < period:
+        if len(frame) < period:
             return []
 
-        # 典型価格（Typical Price）
-        typical_price = (df['high'] + df['low'] + df['price']) / 3
-
-        # 移動平均（中線）
-        middle_line = typical_price.rolling(window=period).mean()
-
-        # 平均真の範囲（ATR）
-        high_low = df['high'] - df['low']
-        high_close = abs(df['high'] - df['price'].shift(1))
-        low_close = abs(df['low'] - df['price'].shift(1))
+        # 典型価格（Typical Price）の移動平均（中線）
+        middle_line = sma(frame, period, of="typical_price")
 
-        true_range = pd.concat(
-            [high_low, high_close, low_close], axis=1
-        ).max(axis=1)
-        atr = true_range.rolling(window=period).mean()
+        # 平均真の範囲（True Rangeの単純移動平均）
+        atr = sma(frame, period, of="true_range")
 
         # 上線と下線
         upper_line = middle_line + (multiplier * atr)
         lower_line = middle_line - (multiplier * atr)
 
-        results = []
-
-        # 中線（移動平均）
-        for timestamp, value in zip(df['timestamp'], middle_line):
-            if not pd.isna(value):
-                results.append(self._create_indicator_value(
-                    timestamp=timestamp,
-                    value=round(value, 2),
-                    name=f"Keltner Middle({period})",
-                    parameters={"period": period, "multiplier": multiplier}
-                ))
-
-        # 上線
-        for timestamp, value in zip(df['timestamp'], upper_line):
-            if not pd.isna(value):
-                results.append(self._create_indicator_value(
-                    timestamp=timestamp,
-                    value=round(value, 2),
-                    name=f"Keltner Upper({period})",
-                    parameters={"period": period, "multiplier": multiplier}
-                ))
-
-        # 下線
-        for timestamp, value in zip(df['timestamp'], lower_line):
-            if not pd.isna(value):
-                results.append(self._create_indicator_value(
-                    timestamp=timestamp,
-                    value=round(value, 2),
-                    name=f"Keltner Lower({period})",
-                    parameters={"period": period, "multiplier": multiplier}
-                ))
-
-        return results
+        parameters = {"period": period, "multiplier": multiplier}
+        lines = [
+            ("Middle", middle_line),  # 中線（移動平均）
+            ("Upper", upper_line),    # 上線
+            ("Lower", lower_line),    # 下線
+        ]
+
+        return IndicatorSeriesGroup([
+            self._create_series(
+                frame.timestamp,
+                line,
+                name=f"Keltner {label}({period})",
+                parameters=parameters,
+                decimals=2
+            )
+            for label, line in lines
+        ])
@@ -0,0 +1,101 @@
+"""
+経路依存インジケータの計算カーネル
+pandasの.iloc操作を使わず、NumPy配列を直接処理いたします
+"""
+
+import numpy as np
+
+
+def obv_kernel(close: np.ndarray, volume: np.ndarray) -> np.ndarray:
+    """OBV（On-Balance Volume）を符号付き累積和として計算
+
+    初日は出来高そのもの、以降は価格上昇日に出来高を加算、
+    下落日に減算、変化なしの日は前日値を維持します。
+    """
+    close = np.asarray(close, dtype=np.float64)
+    volume = np.asarray(volume, dtype=np.float64)
+    if len(close) == 0:
+        return np.empty(0, dtype=np.float64)
+
+    price_change = np.diff(close)
+
+    # 変化なし・比較不能（NaN）の日は0を加算し、出来高のNaNを持ち込まない
+    signed_volume = np.empty(len(close), dtype=np.float64)
+    signed_volume[0] = volume[0]
+    signed_volume[1:] = np.where(
+        price_change > 0,
+        volume[1:],
+        np.where(price_change < 0, -volume[1:], 0.0)
+    )
+
+    return np.cumsum(signed_volume)
+
+
+def parabolic_sar_kernel(
+    high: np.ndarray,
+    low: np.ndarray,
+    acceleration: float = 0.02,
+    maximum: float = 0.2
+) -> np.ndarray:
+    """Parabolic SARを計算
+
+    SARは前日の状態に依存するため逐次計算が必要です。状態（SAR・極値・
+    加速因子・トレンド方向）はローカル変数に保持し、入力はPythonの
+    floatリストとして一度だけ取り出すことで、要素ごとのpandasアクセスを
+    避けています。最初は上昇トレンドと仮定します。
+    """
+    n = len(high)
+    if n == 0:
+        return np.empty(0, dtype=np.float64)
+
+    highs = np.asarray(high, dtype=np.float64).tolist()
+    lows = np.asarray(low, dtype=np.float64).tolist()
+    out = [0.0] * n
+
+    sar = lows[0]
+    ep = highs[0]      # Extreme Point
+    af = acceleration  # Acceleration Factor
+    trend_up = True
+    out[0] = sar
+
+    for i in range(1, n):
+        prev_sar = sar
+        prev_ep = ep
+        sar = prev_sar + af * (prev_ep - prev_sar)
+
+        if trend_up:
+            # 前日の安値を超えないように制限
+            if sar > lows[i - 1]:
+                sar = lows[i - 1]
+
+            # 極値の更新
+            if highs[i] > prev_ep:
+                ep = highs[i]
+                af = min(af + acceleration, maximum)
+
+            # トレンド転換チェック
+            if lows[i] < prev_sar:
+                trend_up = False
+                sar = prev_ep
+                ep = lows[i]
+                af = acceleration
+        else:
+            # 前日の高値を下回らないように制限
+            if sar < highs[i - 1]:
+                sar = highs[i - 1]
+
+            # 極値の更新
+            if lows[i] < prev_ep:
+                ep = lows[i]
+                af = min(af + acceleration, maximum)
+
+            # トレンド転換チェック
+            if highs[i] > prev_sar:
+                trend_up = True
+                sar = prev_ep
+                ep = highs[i]
+                af = acceleration
+
+        out[i] = sar
+
+    return np.array(out, dtype=np.float64)
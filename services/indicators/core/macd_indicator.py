@@ -2,14 +2,14 @@
 MACD（移動平均収束発散）インジケータ
 """
 
-from typing import List
-
+import numpy as np
 import pandas as pd
 
 from src.core.config import IndicatorType
-from src.models.schemas import IndicatorValue, MarketDataPoint
+from src.models.indicator_series import IndicatorResult
 
-from .base_indicator import BaseIndicator
+from .base_indicator import BaseIndicator, MarketData
+from .intermediates import ema
 
 
 class MACDIndicator(BaseIndicator):
@@ -21,49 +21,35 @@ class MACDIndicator(BaseIndicator):
 
     def calculate(
         self,
-        data: List[MarketDataPoint],
+        data: MarketData,
         fast: int = 12,
         slow: int = 26,
         signal: int = 9
-    ) -> List[IndicatorValue]:
+    ) -> IndicatorResult:
         """MACD（移動平均収束発散）を計算"""
-        df = self._to_dataframe(data)
+        frame = self._to_frame(data)
 
-        # EMAを計算
-        ema_fast = df['price'].ewm(span=fast).mean()
-        ema_slow = df['price'].ewm(span=slow).mean()
+        # EMAを計算（同じ期間のEMAインジケータと共有）
+        ema_fast = ema(frame, fast)
+        ema_slow = ema(frame, slow)
 
         # MACDラインを計算
         macd_line = ema_fast - ema_slow
 
         # シグナルラインを計算
-        signal_line = macd_line.ewm(span=signal).mean()
+        signal_line = pd.Series(macd_line).ewm(span=signal).mean().to_numpy()
 
         # ヒストグラムを計算
         histogram = macd_line - signal_line
 
-        results = []
-        for i, timestamp in enumerate(df['timestamp']):
-            if not pd.isna(macd_line.iloc[i]):
-                results.append(self._create_indicator_value(
-                    timestamp=timestamp,
-                    value=round(macd_line.iloc[i], 6),
-                    name="MACD",
-                    parameters={
-                        "fast": fast,
-                        "slow": slow,
-                        "signal": signal,
-                        "signal_value": (
-                            round(signal_line.iloc[i], 6)
-                            if not pd.isna(signal_line.iloc[i])
-                            else None
-                        ),
-                        "histogram": (
-                            round(histogram.iloc[i], 6)
-                            if not pd.isna(histogram.iloc[i])
-                            else None
-                        )
-                    }
-                ))
-
-        return results
+        return self._create_series(
+            frame.timestamp,
+            macd_line,
+            name="MACD",
+            parameters={"fast": fast, "slow": slow, "signal": signal},
+            decimals=6,
+            extras={
+                "signal_value": np.round(signal_line, 6),
+                "histogram": np.round(histogram, 6)
+            }
+        )
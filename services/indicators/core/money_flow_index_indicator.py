@@ -3,14 +3,13 @@ Money Flow Index (MFI) インジケータ
 出来高を考慮したRSIの改良版
 """
 
-from typing import List
-
 import pandas as pd
 
 from src.core.config import IndicatorType
-from src.models.schemas import IndicatorValue, MarketDataPoint
+from src.models.indicator_series import IndicatorResult
 
-from .base_indicator import BaseIndicator
+from .base_indicator import BaseIndicator, MarketData
+from .intermediates import typical_price
 
 
 class MoneyFlowIndexIndicator(BaseIndicator):
@@ -22,27 +21,28 @@ class MoneyFlowIndexIndicator(BaseIndicator):
 
     def calculate(
         self,
-        data: List[MarketDataPoint],
+        data: MarketData,
         period: int = 14
-    ) -> List[IndicatorValue]:
+    ) -> IndicatorResult:
         """MFIを計算"""
-        df = self._to_dataframe(data)
+        frame = self._to_frame(data)
+        df = frame.to_dataframe()
 
         if len(df) < period + 1:
             return []
 
         # 典型価格（Typical Price）
-        typical_price = (df['high'] + df['low'] + df['price']) / 3
+        tp = pd.Series(typical_price(frame), index=df.index)
 
         # マネーフロー（Money Flow）
-        money_flow = typical_price * df['volume']
+        money_flow = tp * df['volume']
 
         # 正のマネーフローと負のマネーフロー
         positive_flow = pd.Series(0.0, index=df.index)
         negative_flow = pd.Series(0.0, index=df.index)
 
         # 価格の変化を計算
-        price_change = typical_price.diff()
+        price_change = tp.diff()
 
         # 正の変化と負の変化を分離
         positive_flow[price_change > 0] = money_flow[price_change > 0]
@@ -58,14 +58,10 @@ class MoneyFlowIndexIndicator(BaseIndicator):
         # MFI計算
         mfi = 100 - (100 / (1 + money_ratio))
 
-        results = []
-        for timestamp, value in zip(df['timestamp'], mfi):
-            if not pd.isna(value):
-                results.append(self._create_indicator_value(
-                    timestamp=timestamp,
-                    value=round(value, 2),
-                    name=f"MFI({period})",
-                    parameters={"period": period}
-                ))
-
-        return results
+        return self._create_series(
+            df['timestamp'],
+            mfi,
+            name=f"MFI({period})",
+            parameters={"period": period},
+            decimals=2
+        )
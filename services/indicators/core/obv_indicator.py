@@ -3,14 +3,11 @@ OBV (On-Balance Volume) インジケータ
 価格と出来高の関係を分析するボリューム系インジケータ
 """
 
-from typing import List
-
-import pandas as pd
-
 from src.core.config import IndicatorType
-from src.models.schemas import IndicatorValue, MarketDataPoint
+from src.models.indicator_series import IndicatorResult
 
-from .base_indicator import BaseIndicator
+from .base_indicator import BaseIndicator, MarketData
+from .kernels import obv_kernel
 
 
 class OBVIndicator(BaseIndicator):
@@ -22,39 +19,22 @@ class OBVIndicator(BaseIndicator):
 
     def calculate(
         self,
-        data: List[MarketDataPoint],
+        data: MarketData,
         period: int = 20
-    ) -> List[IndicatorValue]:
+    ) -> IndicatorResult:
         """OBVを計算"""
-        df = self._to_dataframe(data)
+        frame = self._to_frame(data)
 
-        if len(df) < 2:
+        if len(frame) < 2:
             return []
 
-        # 価格変化を計算
-        price_change = df['price'].diff()
-
-        # OBVの初期値を設定
-        obv = pd.Series(0.0, index=df.index)
-        obv.iloc[0] = df['volume'].iloc[0]  # 最初の値は最初の出来高
-
-        # OBVを計算
-        for i in range(1, len(df)):
-            if price_change.iloc[i] > 0:  # 価格上昇
-                obv.iloc[i] = obv.iloc[i-1] + df['volume'].iloc[i]
-            elif price_change.iloc[i] < 0:  # 価格下降
-                obv.iloc[i] = obv.iloc[i-1] - df['volume'].iloc[i]
-            else:  # 価格変化なし
-                obv.iloc[i] = obv.iloc[i-1]
-
-        results = []
-        for timestamp, value in zip(df['timestamp'], obv):
-            if not pd.isna(value):
-                results.append(self._create_indicator_value(
-                    timestamp=timestamp,
-                    value=round(value, 2),
-                    name=f"OBV({period})",
-                    parameters={"period": period}
-                ))
-
-        return results
+        # 価格上昇日は出来高を加算、下落日は減算する符号付き累積和
+        obv = obv_kernel(frame.close, frame.volume)
+
+        return self._create_series(
+            frame.timestamp,
+            obv,
+            name=f"OBV({period})",
+            parameters={"period": period},
+            decimals=2
+        )
@@ -4,14 +4,11 @@ Open Interest（オープンインタレスト）インジケータ
 """
 
 import logging
-from typing import List
-
-import pandas as pd
 
 from src.core.config import IndicatorType
-from src.models.schemas import IndicatorValue, MarketDataPoint
+from src.models.indicator_series import IndicatorResult
 
-from .base_indicator import BaseIndicator
+from .base_indicator import BaseIndicator, MarketData
 
 logger = logging.getLogger(__name__)
 
@@ -25,9 +22,9 @@ class OpenInterestIndicator(BaseIndicator):
 
     def calculate(
         self,
-        data: List[MarketDataPoint],
+        data: MarketData,
         period: int = 20
-    ) -> List[IndicatorValue]:
+    ) -> IndicatorResult:
         """Open Interestを計算"""
         if len(data) < period:
             return []
@@ -54,19 +51,17 @@ class OpenInterestIndicator(BaseIndicator):
             else:
                 normalized_oi = rolling_price_change * 0
 
-            results = []
-            for timestamp, value in zip(df['timestamp'], normalized_oi):
-                if not pd.isna(value):
-                    results.append(self._create_indicator_value(
-                        timestamp=timestamp,
-                        value=round(value, 2),
-                        name="Open Interest",
-                        parameters={
-                            "period": period,
-                            "method": "price_volatility_based",
-                            "estimated": True
-                        }
-                    ))
+            results = self._create_series(
+                df['timestamp'],
+                normalized_oi,
+                name="Open Interest",
+                parameters={
+                    "period": period,
+                    "method": "price_volatility_based",
+                    "estimated": True
+                },
+                decimals=2
+            )
 
             logger.info(f"Open Interest計算完了: {len(results)}件")
             return results
@@ -3,14 +3,10 @@ Rate of Change (ROC) インジケータ
 価格の変化率を測定し、モメンタムの強さを判断
 """
 
-from typing import List
-
-import pandas as pd
-
 from src.core.config import IndicatorType
-from src.models.schemas import IndicatorValue, MarketDataPoint
+from src.models.indicator_series import IndicatorResult
 
-from .base_indicator import BaseIndicator
+from .base_indicator import BaseIndicator, MarketData
 
 
 class RateOfChangeIndicator(BaseIndicator):
@@ -22,9 +18,9 @@ class RateOfChangeIndicator(BaseIndicator):
 
     def calculate(
         self,
-        data: List[MarketDataPoint],
+        data: MarketData,
         period: int = 10
-    ) -> List[IndicatorValue]:
+    ) -> IndicatorResult:
         """ROCを計算"""
         df = self._to_dataframe(data)
 
@@ -38,14 +34,10 @@ class RateOfChangeIndicator(BaseIndicator):
         # ROC = ((現在価格 - n期間前の価格) / n期間前の価格) × 100
         roc = ((current_price - previous_price) / previous_price) * 100
 
-        results = []
-        for timestamp, value in zip(df['timestamp'], roc):
-            if not pd.isna(value):
-                results.append(self._create_indicator_value(
-                    timestamp=timestamp,
-                    value=round(value, 2),
-                    name=f"ROC({period})",
-                    parameters={"period": period}
-                ))
-
-        return results
+        return self._create_series(
+            df['timestamp'],
+            roc,
+            name=f"ROC({period})",
+            parameters={"period": period},
+            decimals=2
+        )
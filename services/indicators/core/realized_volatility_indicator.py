@@ -4,15 +4,13 @@
 """
 
 import logging
-from typing import List
 
 import numpy as np
-import pandas as pd
 
 from src.core.config import IndicatorType
-from src.models.schemas import IndicatorValue, MarketDataPoint
+from src.models.indicator_series import IndicatorResult
 
-from .base_indicator import BaseIndicator
+from .base_indicator import BaseIndicator, MarketData
 
 logger = logging.getLogger(__name__)
 
@@ -26,9 +24,9 @@ class RealizedVolatilityIndicator(BaseIndicator):
 
     def calculate(
         self,
-        data: List[MarketDataPoint],
+        data: MarketData,
         period: int = 20
-    ) -> List[IndicatorValue]:
+    ) -> IndicatorResult:
         """実現ボラティリティを計算"""
         if len(data) < period:
             return []
@@ -43,16 +41,13 @@ class RealizedVolatilityIndicator(BaseIndicator):
             realized_vol = log_returns.rolling(
                 window=period).std() * np.sqrt(252) * 100
 
-            results = []
-
-            for timestamp, value in zip(df['timestamp'], realized_vol):
-                if not pd.isna(value):
-                    results.append(self._create_indicator_value(
-                        timestamp=timestamp,
-                        value=round(value, 2),
-                        name="Realized Volatility (%)",
-                        parameters={"period": period, "annualized": True}
-                    ))
+            results = self._create_series(
+                df['timestamp'],
+                realized_vol,
+                name="Realized Volatility (%)",
+                parameters={"period": period, "annualized": True},
+                decimals=2
+            )
 
             logger.info(f"実現ボラティリティ計算完了: {len(results)}件")
             return results
@@ -61,7 +56,7 @@ class RealizedVolatilityIndicator(BaseIndicator):
             logger.error(f"実現ボラティリティ計算エラー: {str(e)}")
             return []
 
-    def calculate_parkinson_volatility(self, data: List[MarketDataPoint], period: int = 20) -> List[IndicatorValue]:
+    def calculate_parkinson_volatility(self, data: MarketData, period: int = 20) -> IndicatorResult:
         """Parkinsonボラティリティを計算（High-Lowデータ使用）"""
         if len(data) < period:
             return []
@@ -76,25 +71,20 @@ class RealizedVolatilityIndicator(BaseIndicator):
                 (log_hl ** 2).rolling(window=period).mean()
             ) * np.sqrt(252) * 100
 
-            results = []
-
-            for timestamp, value in zip(df['timestamp'], parkinson_vol):
-                if not pd.isna(value):
-                    results.append(self._create_indicator_value(
-                        timestamp=timestamp,
-                        value=round(value, 2),
-                        name="Parkinson Volatility (%)",
-                        parameters={"period": period,
-                                    "method": "high_low", "annualized": True}
-                    ))
-
-            return results
+            return self._create_series(
+                df['timestamp'],
+                parkinson_vol,
+                name="Parkinson Volatility (%)",
+                parameters={"period": period,
+                            "method": "high_low", "annualized": True},
+                decimals=2
+            )
 
         except Exception as e:
             logger.error(f"Parkinsonボラティリティ計算エラー: {str(e)}")
             return []
 
-    def calculate_garman_klass_volatility(self, data: List[MarketDataPoint], period: int = 20) -> List[IndicatorValue]:
+    def calculate_garman_klass_volatility(self, data: MarketData, period: int = 20) -> IndicatorResult:
         """Garman-Klassボラティリティを計算（OHLCデータ使用）"""
         if len(data) < period:
             return []
@@ -111,19 +101,14 @@ class RealizedVolatilityIndicator(BaseIndicator):
                  (log_co ** 2)).rolling(window=period).mean()
             ) * np.sqrt(252) * 100
 
-            results = []
-
-            for timestamp, value in zip(df['timestamp'], gk_vol):
-                if not pd.isna(value):
-                    results.append(self._create_indicator_value(
-                        timestamp=timestamp,
-                        value=round(value, 2),
-                        name="Garman-Klass Volatility (%)",
-                        parameters={"period": period,
-                                    "method": "ohlc", "annualized": True}
-                    ))
-
-            return results
+            return self._create_series(
+                df['timestamp'],
+                gk_vol,
+                name="Garman-Klass Volatility (%)",
+                parameters={"period": period,
+                            "method": "ohlc", "annualized": True},
+                decimals=2
+            )
 
         except Exception as e:
             logger.error(f"Garman-Klassボラティリティ計算エラー: {str(e)}")
@@ -0,0 +1,166 @@
+"""
+スライディングウィンドウ計算ツールキット
+ローリング最大・最小、合計、二乗和、分散、平均絶対偏差をNumPyで計算いたします
+
+いずれの関数も入力と同じ長さの float64 配列を返し、pandasの
+rolling(window) と同じく先頭の window-1 件と、NaNを含むウィンドウは NaN になります。
+"""
+
+from typing import Any, Iterator, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# ウィンドウ行列を一度に展開する最大要素数（メモリ使用量の上限）
+_MAX_WINDOW_ELEMENTS = 1 << 20
+
+
+def _as_array(values: Any) -> np.ndarray:
+    """入力をfloat64の1次元配列に変換"""
+    return np.asarray(values, dtype=np.float64).ravel()
+
+
+def _validate_window(window: int) -> None:
+    """ウィンドウ幅を検証"""
+    if window < 1:
+        raise ValueError(f"ウィンドウ幅は1以上である必要があります: {window}")
+
+
+def _block_scan(
+    x: np.ndarray,
+    window: int,
+    ufunc: np.ufunc
+) -> Tuple[np.ndarray, np.ndarray]:
+    """window幅のブロックごとに前方・後方の累積演算を行う
+
+    van Herk / Gil-Werman 法の前処理です。各ウィンドウ [i, i+window-1] は
+    「iを含むブロックの後方累積」と「i+window-1を含むブロックの前方累積」の
+    2つに分割できるため、全ウィンドウをO(n)で計算できます。
+    """
+    blocks = -(-len(x) // window)
+    padded = np.zeros(blocks * window, dtype=np.float64)
+    padded[:len(x)] = x
+    grid = padded.reshape(blocks, window)
+
+    prefix = ufunc.accumulate(grid, axis=1).ravel()
+    suffix = ufunc.accumulate(grid[:, ::-1], axis=1)[:, ::-1].ravel()
+    return prefix, suffix
+
+
+def _extremum(values: Any, window: int, ufunc: np.ufunc) -> np.ndarray:
+    """ローリング最大・最小の共通処理"""
+    _validate_window(window)
+    x = _as_array(values)
+    n = len(x)
+    out = np.full(n, np.nan)
+    if n < window:
+        return out
+    if window == 1:
+        return x.copy()
+
+    prefix, suffix = _block_scan(x, window, ufunc)
+    out[window - 1:] = ufunc(suffix[:n - window + 1], prefix[window - 1:n])
+    return out
+
+
+def rolling_max(values: Any, window: int) -> np.ndarray:
+    """ローリング最大値（O(n)）"""
+    return _extremum(values, window, np.maximum)
+
+
+def rolling_min(values: Any, window: int) -> np.ndarray:
+    """ローリング最小値（O(n)）"""
+    return _extremum(values, window, np.minimum)
+
+
+def rolling_sum(values: Any, window: int) -> np.ndarray:
+    """ローリング合計（O(n)）
+
+    全体の累積和の差分ではなくブロック内の累積和を組み合わせるため、
+    丸め誤差はウィンドウ内の加算回数分に収まり、系列の長さに応じて
+    蓄積することはありません。
+    """
+    _validate_window(window)
+    x = _as_array(values)
+    n = len(x)
+    out = np.full(n, np.nan)
+    if n < window:
+        return out
+    if window == 1:
+        return x.copy()
+
+    prefix, suffix = _block_scan(x, window, np.add)
+    starts = np.arange(n - window + 1)
+    # ブロック境界から始まるウィンドウは後方累積だけで全体を覆う
+    tail = np.where(starts % window == 0, 0.0, prefix[window - 1:n])
+    out[window - 1:] = suffix[:n - window + 1] + tail
+    return out
+
+
+def rolling_sum_of_squares(values: Any, window: int) -> np.ndarray:
+    """ローリング二乗和（O(n)）"""
+    x = _as_array(values)
+    return rolling_sum(x * x, window)
+
+
+def rolling_mean(values: Any, window: int) -> np.ndarray:
+    """ローリング平均（O(n)）"""
+    return rolling_sum(values, window) / window
+
+
+def _window_chunks(
+    x: np.ndarray,
+    window: int
+) -> Iterator[Tuple[int, np.ndarray]]:
+    """ウィンドウ行列（コピーなしのビュー）をメモリ上限ごとに分割して返す"""
+    view = sliding_window_view(x, window)
+    step = max(1, _MAX_WINDOW_ELEMENTS // window)
+    for start in range(0, len(view), step):
+        yield start, view[start:start + step]
+
+
+def _deviation_reduce(values: Any, window: int, ddof: int, power: int) -> np.ndarray:
+    """各ウィンドウ自身の平均からの偏差を集計する共通処理
+
+    偏差の基準となる平均がウィンドウごとに異なるため、ウィンドウ行列を
+    チャンク単位でベクトル演算します（Pythonレベルのループはチャンク数のみ）。
+    """
+    _validate_window(window)
+    x = _as_array(values)
+    n = len(x)
+    out = np.full(n, np.nan)
+    if n < window or window - ddof < 1:
+        return out
+
+    for start, chunk in _window_chunks(x, window):
+        mean = chunk.mean(axis=1, keepdims=True)
+        deviation = np.abs(chunk - mean)
+        if power == 2:
+            deviation = deviation * deviation
+        offset = window - 1 + start
+        out[offset:offset + len(chunk)] = (
+            deviation.sum(axis=1) / (window - ddof))
+    return out
+
+
+def rolling_variance(values: Any, window: int, ddof: int = 1) -> np.ndarray:
+    """ローリング分散（デフォルトはpandasと同じ不偏分散）
+
+    二乗和からの算出は価格水準が大きいと桁落ちするため、
+    ウィンドウ平均からの偏差で計算します。
+    """
+    return _deviation_reduce(values, window, ddof, power=2)
+
+
+def rolling_std(values: Any, window: int, ddof: int = 1) -> np.ndarray:
+    """ローリング標準偏差"""
+    return np.sqrt(rolling_variance(values, window, ddof))
+
+
+def rolling_mean_absolute_deviation(values: Any, window: int) -> np.ndarray:
+    """ローリング平均絶対偏差（CCI用）
+
+    rolling().apply(lambda x: abs(x - x.mean()).mean()) と同じ値を、
+    ウィンドウごとのPython関数呼び出しなしで計算します。
+    """
+    return _deviation_reduce(values, window, ddof=0, power=1)
@@ -2,14 +2,10 @@
 相対力指数（RSI）インジケータ
 """
 
-from typing import List
-
-import pandas as pd
-
 from src.core.config import IndicatorType
-from src.models.schemas import IndicatorValue, MarketDataPoint
+from src.models.indicator_series import IndicatorResult
 
-from .base_indicator import BaseIndicator
+from .base_indicator import BaseIndicator, MarketData
 
 
 class RSIIndicator(BaseIndicator):
@@ -21,9 +17,9 @@ class RSIIndicator(BaseIndicator):
 
     def calculate(
         self,
-        data: List[MarketDataPoint],
+        data: MarketData,
         period: int = 14
-    ) -> List[IndicatorValue]:
+    ) -> IndicatorResult:
         """相対力指数（RSI）を計算"""
         df = self._to_dataframe(data)
 
@@ -35,14 +31,10 @@ class RSIIndicator(BaseIndicator):
         rs = gain / loss
         rsi = 100 - (100 / (1 + rs))
 
-        results = []
-        for timestamp, value in zip(df['timestamp'], rsi):
-            if not pd.isna(value):
-                results.append(self._create_indicator_value(
-                    timestamp=timestamp,
-                    value=round(value, 2),
-                    name=f"RSI({period})",
-                    parameters={"period": period}
-                ))
-
-        return results
+        return self._create_series(
+            df['timestamp'],
+            rsi,
+            name=f"RSI({period})",
+            parameters={"period": period},
+            decimals=2
+        )
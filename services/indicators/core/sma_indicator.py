@@ -2,14 +2,11 @@
 単純移動平均（SMA）インジケータ
 """
 
-from typing import List
-
-import pandas as pd
-
 from src.core.config import IndicatorType
-from src.models.schemas import IndicatorValue, MarketDataPoint
+from src.models.indicator_series import IndicatorResult
 
-from .base_indicator import BaseIndicator
+from .base_indicator import BaseIndicator, MarketData
+from .intermediates import sma
 
 
 class SMAIndicator(BaseIndicator):
@@ -21,21 +18,16 @@ class SMAIndicator(BaseIndicator):
 
     def calculate(
         self,
-        data: List[MarketDataPoint],
+        data: MarketData,
         period: int
-    ) -> List[IndicatorValue]:
+    ) -> IndicatorResult:
         """単純移動平均（SMA）を計算"""
-        df = self._to_dataframe(data)
-        sma = df['price'].rolling(window=period).mean()
-
-        results = []
-        for i, (timestamp, value) in enumerate(zip(df['timestamp'], sma)):
-            if not pd.isna(value):
-                results.append(self._create_indicator_value(
-                    timestamp=timestamp,
-                    value=round(value, 6),
-                    name=f"SMA({period})",
-                    parameters={"period": period}
-                ))
-
-        return results
+        frame = self._to_frame(data)
+
+        return self._create_series(
+            frame.timestamp,
+            sma(frame, period),
+            name=f"SMA({period})",
+            parameters={"period": period},
+            decimals=6
+        )
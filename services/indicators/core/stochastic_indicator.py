@@ -2,14 +2,14 @@
 ストキャスティクスオシレーターインジケータ
 """
 
-from typing import List
-
-import pandas as pd
+import numpy as np
 
 from src.core.config import IndicatorType
-from src.models.schemas import IndicatorValue, MarketDataPoint
+from src.models.indicator_series import IndicatorResult
 
-from .base_indicator import BaseIndicator
+from .base_indicator import BaseIndicator, MarketData
+from .intermediates import highest, lowest
+from .rolling import rolling_mean
 
 
 class StochasticIndicator(BaseIndicator):
@@ -21,44 +21,39 @@ class StochasticIndicator(BaseIndicator):
 
     def calculate(
         self,
-        data: List[MarketDataPoint],
+        data: MarketData,
         k_period: int = 14,
         d_period: int = 3,
         slowing: int = 3
-    ) -> List[IndicatorValue]:
+    ) -> IndicatorResult:
         """ストキャスティクスオシレーターを計算"""
-        df = self._to_dataframe(data)
+        frame = self._to_frame(data)
 
         # %Kを計算
-        lowest_low = df['low'].rolling(window=k_period).min()
-        highest_high = df['high'].rolling(window=k_period).max()
-        k_percent = 100 * ((df['price'] - lowest_low) /
-                           (highest_high - lowest_low))
+        lowest_low = lowest(frame, k_period)
+        highest_high = highest(frame, k_period)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            k_percent = 100 * ((frame.close - lowest_low) /
+                               (highest_high - lowest_low))
 
         # スローイング
-        k_slowed = k_percent.rolling(window=slowing).mean()
+        k_slowed = rolling_mean(k_percent, slowing)
 
         # %Dを計算
-        d_percent = k_slowed.rolling(window=d_period).mean()
-
-        results = []
-        for i, timestamp in enumerate(df['timestamp']):
-            if not pd.isna(k_slowed.iloc[i]):
-                results.append(self._create_indicator_value(
-                    timestamp=timestamp,
-                    value=round(k_slowed.iloc[i], 2),
-                    name=f"Stochastic({k_period}, {d_period}, {slowing})",
-                    parameters={
-                        "k_period": k_period,
-                        "d_period": d_period,
-                        "slowing": slowing,
-                        "k_value": round(k_slowed.iloc[i], 2),
-                        "d_value": (
-                            round(d_percent.iloc[i], 2)
-                            if not pd.isna(d_percent.iloc[i])
-                            else None
-                        )
-                    }
-                ))
-
-        return results
+        d_percent = rolling_mean(k_slowed, d_period)
+
+        return self._create_series(
+            frame.timestamp,
+            k_slowed,
+            name=f"Stochastic({k_period}, {d_period}, {slowing})",
+            parameters={
+                "k_period": k_period,
+                "d_period": d_period,
+                "slowing": slowing
+            },
+            decimals=2,
+            extras={
+                "k_value": np.round(k_slowed, 2),
+                "d_value": np.round(d_percent, 2)
+            }
+        )
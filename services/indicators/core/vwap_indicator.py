@@ -3,14 +3,13 @@ VWAP (Volume Weighted Average Price) インジケータ
 出来高加重平均価格
 """
 
-from typing import List
-
 import pandas as pd
 
 from src.core.config import IndicatorType
-from src.models.schemas import IndicatorValue, MarketDataPoint
+from src.models.indicator_series import IndicatorResult
 
-from .base_indicator import BaseIndicator
+from .base_indicator import BaseIndicator, MarketData
+from .intermediates import typical_price
 
 
 class VWAPIndicator(BaseIndicator):
@@ -22,23 +21,20 @@ class VWAPIndicator(BaseIndicator):
 
     def calculate(
         self,
-        data: List[MarketDataPoint],
+        data: MarketData,
         period: int = 20
-    ) -> List[IndicatorValue]:
+    ) -> IndicatorResult:
         """VWAPを計算"""
-        df = self._to_dataframe(data)
+        frame = self._to_frame(data)
 
-        if len(df) < period:
+        if len(frame) < period:
             return []
 
-        # 典型価格（Typical Price）
-        typical_price = (df['high'] + df['low'] + df['price']) / 3
-
         # 出来高加重価格
-        volume_price = typical_price * df['volume']
+        volume_price = pd.Series(typical_price(frame) * frame.volume)
 
         # 累積出来高
-        cumulative_volume = df['volume'].rolling(window=period).sum()
+        cumulative_volume = pd.Series(frame.volume).rolling(window=period).sum()
 
         # 累積出来高加重価格
         cumulative_volume_price = volume_price.rolling(window=period).sum()
@@ -46,14 +42,10 @@ class VWAPIndicator(BaseIndicator):
         # VWAP計算
         vwap = cumulative_volume_price / cumulative_volume
 
-        results = []
-        for timestamp, value in zip(df['timestamp'], vwap):
-            if not pd.isna(value):
-                results.append(self._create_indicator_value(
-                    timestamp=timestamp,
-                    value=round(value, 2),
-                    name=f"VWAP({period})",
-                    parameters={"period": period}
-                ))
-
-        return results
+        return self._create_series(
+            frame.timestamp,
+            vwap,
+            name=f"VWAP({period})",
+            parameters={"period": period},
+            decimals=2
+        )
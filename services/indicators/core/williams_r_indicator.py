@@ -3,14 +3,13 @@ Williams %R インジケータ
 価格の過熱感・過冷感を測定するオシレーター系インジケータ
 """
 
-from typing import List
-
-import pandas as pd
+import numpy as np
 
 from src.core.config import IndicatorType
-from src.models.schemas import IndicatorValue, MarketDataPoint
+from src.models.indicator_series import IndicatorResult
 
-from .base_indicator import BaseIndicator
+from .base_indicator import BaseIndicator, MarketData
+from .intermediates import highest, lowest
 
 
 class WilliamsRIndicator(BaseIndicator):
@@ -22,31 +21,28 @@ class WilliamsRIndicator(BaseIndicator):
 
     def calculate(
         self,
-        data: List[MarketDataPoint],
+        data: MarketData,
         period: int = 14
-    ) -> List[IndicatorValue]:
+    ) -> IndicatorResult:
         """Williams %Rを計算"""
-        df = self._to_dataframe(data)
+        frame = self._to_frame(data)
 
-        if len(df) < period:
+        if len(frame) < period:
             return []
 
         # 最高値と最安値の期間内での最大・最小を計算
-        highest_high = df['high'].rolling(window=period).max()
-        lowest_low = df['low'].rolling(window=period).min()
+        highest_high = highest(frame, period)
+        lowest_low = lowest(frame, period)
 
         # Williams %R = (最高値 - 終値) / (最高値 - 最安値) * -100
-        williams_r = ((highest_high - df['price']) /
-                      (highest_high - lowest_low)) * -100
-
-        results = []
-        for timestamp, value in zip(df['timestamp'], williams_r):
-            if not pd.isna(value):
-                results.append(self._create_indicator_value(
-                    timestamp=timestamp,
-                    value=round(value, 2),
-                    name=f"Williams %R({period})",
-                    parameters={"period": period}
-                ))
-
-        return results
+        with np.errstate(divide='ignore', invalid='ignore'):
+            williams_r = ((highest_high - frame.close) /
+                          (highest_high - lowest_low)) * -100
+
+        return self._create_series(
+            frame.timestamp,
+            williams_r,
+            name=f"Williams %R({period})",
+            parameters={"period": period},
+            decimals=2
+        )
@@ -3,13 +3,15 @@
 分割されたクラスを使用して分析処理を行います
 """
 
+import asyncio
 import logging
 from datetime import datetime
-from typing import Dict, List
+from typing import Any, Dict, List, Optional
 
 import pytz
 
 from src.core.config import AppConfig, IndicatorType
+from src.models.ohlcv import OHLCVFrame
 from src.models.schemas import MultiIndicatorData
 
 from .indicator_aggregator import IndicatorAggregator
@@ -20,6 +22,39 @@ from .indicator_summary_generator import IndicatorSummaryGenerator
 
 logger = logging.getLogger(__name__)
 
+# APIで指定するインジケータ名とIndicatorTypeの対応
+INDICATOR_MAPPING = {
+    'sma': IndicatorType.SMA,
+    'ema': IndicatorType.EMA,
+    'rsi': IndicatorType.RSI,
+    'macd': IndicatorType.MACD,
+    'bollinger_bands': IndicatorType.BOLLINGER_BANDS,
+    'stochastic': IndicatorType.STOCHASTIC,
+    'atr': IndicatorType.ATR,
+    'williams_r': IndicatorType.WILLIAMS_R,
+    'cci': IndicatorType.CCI,
+    'adx': IndicatorType.ADX,
+    'obv': IndicatorType.OBV,
+    'vwap': IndicatorType.VWAP,
+    'parabolic_sar': IndicatorType.PARABOLIC_SAR,
+    'ichimoku': IndicatorType.ICHIMOKU,
+    'money_flow_index': IndicatorType.MONEY_FLOW_INDEX,
+    'rate_of_change': IndicatorType.RATE_OF_CHANGE,
+    'keltner_channel': IndicatorType.KELTNER_CHANNEL,
+    'donchian_channel': IndicatorType.DONCHIAN_CHANNEL,
+    'etf_flow': IndicatorType.ETF_FLOW,
+    'hash_rate': IndicatorType.HASH_RATE,
+    'active_addresses': IndicatorType.ACTIVE_ADDRESSES,
+    'funding_rate': IndicatorType.FUNDING_RATE,
+    'open_interest': IndicatorType.OPEN_INTEREST,
+    'fear_greed_index': IndicatorType.FEAR_GREED_INDEX,
+    'google_trends': IndicatorType.GOOGLE_TRENDS,
+    'correlation': IndicatorType.CORRELATION,
+    'beta': IndicatorType.BETA,
+    'realized_volatility': IndicatorType.REALIZED_VOLATILITY,
+    'implied_volatility': IndicatorType.IMPLIED_VOLATILITY
+}
+
 
 class IndicatorAnalysisService:
     """インジケータ分析サービス"""
@@ -151,6 +186,74 @@ class IndicatorAnalysisService:
             logger.error(f"詳細エラー: {traceback.format_exc()}")
             return None
 
+    async def analyze_many(
+            self, pair: str, indicators: List[str],
+            period: str = "1d", interval: str = "1d",
+            frame: Optional[OHLCVFrame] = None) -> Optional[Dict]:
+        """複数のインジケータを一括で分析
+
+        履歴データの取得とOHLCVフレームの構築は1回だけ行い、全インジケータで
+        同じフレーム（と共有の中間系列）を使って計算します。
+        呼び出し元で取得済みのフレームがあれば frame に渡すと再取得しません。
+        """
+        try:
+            logger.info(
+                f"一括インジケータ分析開始: {pair} - {len(indicators)}件 ({period}, {interval})")
+
+            if frame is None:
+                from services.data.data_service import data_service
+                frame = await data_service.get_historical_frame(
+                    pair, period, interval)
+
+            if frame is None or len(frame) == 0:
+                logger.warning(f"履歴データが取得できませんでした: {pair}")
+                return None
+
+            # 外部データを使うインジケータの取得は並行して実行
+            values = await asyncio.gather(*[
+                self._calculate_latest_value(frame, indicator, pair, interval)
+                for indicator in indicators
+            ])
+
+            snapshots = {}
+            unavailable = []
+            for indicator, value in zip(indicators, values):
+                if value is None:
+                    unavailable.append(indicator)
+                    continue
+
+                snapshots[indicator] = {
+                    "value": value,
+                    "signal": self._generate_signal_from_value(
+                        indicator, value),
+                    "strength": self._calculate_strength_from_value(
+                        indicator, value),
+                    "parameters": self._default_parameters(indicator)
+                }
+
+            logger.info(
+                f"一括インジケータ分析完了: {pair} - 成功={len(snapshots)}件, "
+                f"計算不可={len(unavailable)}件")
+
+            return {
+                "symbol": pair,
+                "period": period,
+                "interval": interval,
+                "timestamp": datetime.now(pytz.UTC),
+                "indicators": snapshots,
+                "unavailable": unavailable,
+                "metadata": {
+                    "note": "実際のデータから計算された値です",
+                    "data_points": len(frame)
+                }
+            }
+
+        except Exception as e:
+            logger.error(f"一括インジケータ分析エラー: {e}")
+            import traceback
+            logger.error(f"詳細エラー: {traceback.format_exc()}")
+            return None
+
     def _generate_test_value(self, indicator: str) -> float:
         """テスト用のインジケータ値を生成"""
         import hashlib
@@ -211,148 +314,123 @@ class IndicatorAnalysisService:
         try:
             # 履歴データを取得
             from services.data.data_service import data_service
-            historical_data = await data_service.get_historical_data(
+            frame = await data_service.get_historical_frame(
                 pair, period, interval)
 
-            if not historical_data or not historical_data.data:
+            if frame is None or len(frame) == 0:
                 logger.warning(f"履歴データが取得できませんでした: {pair}")
                 return None
 
-            # インジケータ名をIndicatorTypeにマッピング
-            indicator_mapping = {
-                'sma': IndicatorType.SMA,
-                'ema': IndicatorType.EMA,
-                'rsi': IndicatorType.RSI,
-                'macd': IndicatorType.MACD,
-                'bollinger_bands': IndicatorType.BOLLINGER_BANDS,
-                'stochastic': IndicatorType.STOCHASTIC,
-                'atr': IndicatorType.ATR,
-                'williams_r': IndicatorType.WILLIAMS_R,
-                'cci': IndicatorType.CCI,
-                'adx': IndicatorType.ADX,
-                'obv': IndicatorType.OBV,
-                'vwap': IndicatorType.VWAP,
-                'parabolic_sar': IndicatorType.PARABOLIC_SAR,
-                'ichimoku': IndicatorType.ICHIMOKU,
-                'money_flow_index': IndicatorType.MONEY_FLOW_INDEX,
-                'rate_of_change': IndicatorType.RATE_OF_CHANGE,
-                'keltner_channel': IndicatorType.KELTNER_CHANNEL,
-                'donchian_channel': IndicatorType.DONCHIAN_CHANNEL,
-                'etf_flow': IndicatorType.ETF_FLOW,
-                'hash_rate': IndicatorType.HASH_RATE,
-                'active_addresses': IndicatorType.ACTIVE_ADDRESSES,
-                'funding_rate': IndicatorType.FUNDING_RATE,
-                'open_interest': IndicatorType.OPEN_INTEREST,
-                'fear_greed_index': IndicatorType.FEAR_GREED_INDEX,
-                'google_trends': IndicatorType.GOOGLE_TRENDS,
-                'correlation': IndicatorType.CORRELATION,
-                'beta': IndicatorType.BETA,
-                'realized_volatility': IndicatorType.REALIZED_VOLATILITY,
-                'implied_volatility': IndicatorType.IMPLIED_VOLATILITY
-            }
+            # インジケータを計算（キャッシュ済みのフレームを再利用）
+            return await self._calculate_latest_value(
+                frame, indicator, pair, interval)
 
-            indicator_type = indicator_mapping.get(indicator.lower())
-            if not indicator_type:
-                logger.warning(f"未対応のインジケータ: {indicator}")
-                return None
+        except Exception as e:
+            logger.error(f"実際の値計算エラー: {e}")
+            return None
 
-            # インジケータファクトリーからインジケータを取得
-            try:
-                indicator_instance = indicator_factory.get_indicator(
-                    indicator_type)
-            except ValueError as e:
-                logger.warning(f"インジケータファクトリーエラー: {e}")
-                return None
+    async def _calculate_latest_value(
+            self, frame: OHLCVFrame, indicator: str,
+            pair: Optional[str] = None,
+            interval: Optional[str] = None) -> Optional[float]:
+        """フレームからインジケータの最新値を計算（結果はファクトリーでキャッシュ）"""
+        indicator_type = INDICATOR_MAPPING.get(indicator.lower())
+        if not indicator_type:
+            logger.warning(f"未対応のインジケータ: {indicator}")
+            return None
 
-            # インジケータを計算
-            try:
-                # デフォルトのパラメータを設定
-                params = {}
-                if indicator.lower() in ['sma', 'ema']:
-                    params['period'] = 20
-                elif indicator.lower() == 'rsi':
-                    params['period'] = 14
-                elif indicator.lower() == 'macd':
-                    params['fast'] = 12
-                    params['slow'] = 26
-                    params['signal'] = 9
-                elif indicator.lower() == 'bollinger_bands':
-                    params['period'] = 20
-                    params['std_dev'] = 2.0
-                elif indicator.lower() == 'stochastic':
-                    params['k_period'] = 14
-                    params['d_period'] = 3
-                elif indicator.lower() == 'atr':
-                    params['period'] = 14
-                elif indicator.lower() == 'williams_r':
-                    params['period'] = 14
-                elif indicator.lower() == 'cci':
-                    params['period'] = 14
-                elif indicator.lower() == 'adx':
-                    params['period'] = 14
-                elif indicator.lower() == 'obv':
-                    params = {}
-                elif indicator.lower() == 'vwap':
-                    params = {}
-                elif indicator.lower() == 'parabolic_sar':
-                    params['acceleration'] = 0.02
-                    params['maximum'] = 0.2
-                elif indicator.lower() == 'ichimoku':
-                    params['tenkan_period'] = 9
-                    params['kijun_period'] = 26
-                    params['senkou_span_b_period'] = 52
-                elif indicator.lower() == 'money_flow_index':
-                    params['period'] = 14
-                elif indicator.lower() == 'rate_of_change':
-                    params['period'] = 14
-                elif indicator.lower() == 'keltner_channel':
-                    params['period'] = 20
-                    params['multiplier'] = 2.0
-                elif indicator.lower() == 'donchian_channel':
-                    params['period'] = 20
-                elif indicator.lower() == 'etf_flow':
-                    params = {}
-                elif indicator.lower() == 'hash_rate':
-                    params = {}
-                elif indicator.lower() == 'active_addresses':
-                    params = {}
-                elif indicator.lower() == 'funding_rate':
-                    params = {}
-                elif indicator.lower() == 'open_interest':
-                    params['period'] = 20
-                elif indicator.lower() == 'fear_greed_index':
-                    params = {}
-                elif indicator.lower() == 'google_trends':
-                    params['period'] = 20
-                    params['search_terms'] = ['BTC', 'Bitcoin']
-                elif indicator.lower() == 'correlation':
-                    params = {}
-                elif indicator.lower() == 'beta':
-                    params['period'] = 20
-                elif indicator.lower() == 'realized_volatility':
-                    params['period'] = 20
-                elif indicator.lower() == 'implied_volatility':
-                    params['period'] = 20
-
-                # インジケータを計算
-                results = indicator_instance.calculate(
-                    historical_data.data, **params)
-
-                if results and len(results) > 0:
-                    # 最新の値を返す
-                    return results[-1].value
-                else:
-                    logger.warning(f"インジケータ計算結果が空: {indicator}")
-                    return None
-
-            except Exception as e:
-                logger.error(f"インジケータ計算エラー: {indicator} - {e}")
+        if not indicator_factory.is_supported(indicator_type):
+            logger.warning(f"インジケータファクトリーエラー: 未対応のインジケータタイプ: {indicator_type}")
+            return None
+
+        # インジケータを計算
+        try:
+            params = self._default_parameters(indicator)
+            results = await indicator_factory.calculate_async(
+                indicator_type, frame, symbol=pair, interval=interval, **params)
+
+            if results and len(results) > 0:
+                # 最新の値を返す
+                return results[-1].value
+            else:
+                logger.warning(f"インジケータ計算結果が空: {indicator}")
                 return None
 
         except Exception as e:
-            logger.error(f"実際の値計算エラー: {e}")
+            logger.error(f"インジケータ計算エラー: {indicator} - {e}")
             return None
 
+    def _default_parameters(self, indicator: str) -> Dict[str, Any]:
+        """インジケータのデフォルトパラメータを取得"""
+        params = {}
+        if indicator.lower() in ['sma', 'ema']:
+            params['period'] = 20
+        elif indicator.lower() == 'rsi':
+            params['period'] = 14
+        elif indicator.lower() == 'macd':
+            params['fast'] = 12
+            params['slow'] = 26
+            params['signal'] = 9
+        elif indicator.lower() == 'bollinger_bands':
+            params['period'] = 20
+            params['std_dev'] = 2.0
+        elif indicator.lower() == 'stochastic':
+            params['k_period'] = 14
+            params['d_period'] = 3
+        elif indicator.lower() == 'atr':
+            params['period'] = 14
+        elif indicator.lower() == 'williams_r':
+            params['period'] = 14
+        elif indicator.lower() == 'cci':
+            params['period'] = 14
+        elif indicator.lower() == 'adx':
+            params['period'] = 14
+        elif indicator.lower() == 'obv':
+            params = {}
+        elif indicator.lower() == 'vwap':
+            params = {}
+        elif indicator.lower() == 'parabolic_sar':
+            params['acceleration'] = 0.02
+            params['maximum'] = 0.2
+        elif indicator.lower() == 'ichimoku':
+            params['tenkan_period'] = 9
+            params['kijun_period'] = 26
+            params['senkou_span_b_period'] = 52
+        elif indicator.lower() == 'money_flow_index':
+            params['period'] = 14
+        elif indicator.lower() == 'rate_of_change':
+            params['period'] = 14
+        elif indicator.lower() == 'keltner_channel':
+            params['period'] = 20
+            params['multiplier'] = 2.0
+        elif indicator.lower() == 'donchian_channel':
+            params['period'] = 20
+        elif indicator.lower() == 'etf_flow':
+            params = {}
+        elif indicator.lower() == 'hash_rate':
+            params = {}
+        elif indicator.lower() == 'active_addresses':
+            params = {}
+        elif indicator.lower() == 'funding_rate':
+            params = {}
+        elif indicator.lower() == 'open_interest':
+            params['period'] = 20
+        elif indicator.lower() == 'fear_greed_index':
+            params = {}
+        elif indicator.lower() == 'google_trends':
+            params['period'] = 20
+            params['search_terms'] = ['BTC', 'Bitcoin']
+        elif indicator.lower() == 'correlation':
+            params = {}
+        elif indicator.lower() == 'beta':
+            params['period'] = 20
+        elif indicator.lower() == 'realized_volatility':
+            params['period'] = 20
+        elif indicator.lower() == 'implied_volatility':
+            params['period'] = 20
+
+        return params
+
     def _generate_signal_from_value(self, indicator: str, value: float) -> str:
         """実際の値からシグナルを生成"""
         if indicator.lower() == 'rsi':
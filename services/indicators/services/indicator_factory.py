@@ -3,15 +3,19 @@
 各インジケータのインスタンスを作成・管理します
 """
 
+import json
 import logging
-from typing import Dict
+from typing import Any, Dict, Optional
 
-from src.core.config import IndicatorType
+from src.core.cache import TTLCache
+from src.core.config import AppConfig, IndicatorType
+from src.models.indicator_series import IndicatorResult, result_nbytes
+from src.models.ohlcv import OHLCVFrame
 
 from ..core.active_addresses_indicator import ActiveAddressesIndicator
 from ..core.adx_indicator import ADXIndicator
 from ..core.atr_indicator import ATRIndicator
-from ..core.base_indicator import BaseIndicator
+from ..core.base_indicator import BaseIndicator, MarketData
 from ..core.beta_indicator import BetaIndicator
 from ..core.bollinger_bands_indicator import BollingerBandsIndicator
 from ..core.cci_indicator import CCIIndicator
@@ -27,6 +31,12 @@ from ..core.google_trends_indicator import GoogleTrendsIndicator
 from ..core.hash_rate_indicator import HashRateIndicator
 from ..core.ichimoku_indicator import IchimokuIndicator
 from ..core.implied_volatility_indicator import ImpliedVolatilityIndicator
+from ..core.incremental import (
+    INCREMENTAL_INDICATORS,
+    IncrementalIndicator,
+    create_incremental,
+    restore_incremental,
+)
 from ..core.keltner_channel_indicator import KeltnerChannelIndicator
 from ..core.macd_indicator import MACDIndicator
 from ..core.money_flow_index_indicator import MoneyFlowIndexIndicator
@@ -47,7 +57,13 @@ class IndicatorFactory:
 
     def __init__(self):
         self._indicators: Dict[IndicatorType, BaseIndicator] = {}
-        self._cache = {}  # 計算結果のキャッシュ
+        # 計算結果のキャッシュ（TTL・LRU）
+        self._cache = TTLCache(
+            ttl=AppConfig.get_cache_ttl(),
+            max_entries=AppConfig.INDICATOR_CACHE_MAX_ENTRIES,
+            max_bytes=AppConfig.INDICATOR_CACHE_MAX_BYTES,
+            sizeof=result_nbytes
+        )
         self._register_indicators()
 
     def _register_indicators(self):
@@ -109,6 +125,104 @@ class IndicatorFactory:
         """指定されたインジケータタイプがサポートされているかチェック"""
         return indicator_type in self._indicators
 
+    def calculate(
+        self,
+        indicator_type: IndicatorType,
+        data: MarketData,
+        symbol: Optional[str] = None,
+        interval: Optional[str] = None,
+        **parameters
+    ) -> IndicatorResult:
+        """インジケータを計算（同じデータ・パラメータの結果はキャッシュから返す）
+
+        キャッシュキーは (通貨ペア, 間隔, インジケータタイプ, 正規化したパラメータ,
+        データのフィンガープリント) です。データ内容が変わればキーも変わるため、
+        古い結果が返ることはありません。
+        """
+        indicator = self.get_indicator(indicator_type)
+        frame = indicator._to_frame(data)
+
+        if not AppConfig.CACHE_ENABLED:
+            return indicator.calculate(frame, **parameters)
+
+        key = self._cache_key(indicator_type, frame, symbol, interval, parameters)
+        result = self._cache.get(key)
+        if result is None:
+            result = indicator.calculate(frame, **parameters)
+            # 空の結果（データ不足・外部API障害など）はキャッシュしない
+            if result:
+                self._cache.set(key, result)
+        return result
+
+    async def calculate_async(
+        self,
+        indicator_type: IndicatorType,
+        data: MarketData,
+        symbol: Optional[str] = None,
+        interval: Optional[str] = None,
+        **parameters
+    ) -> IndicatorResult:
+        """インジケータを非同期で計算（キャッシュは calculate() と共通）
+
+        外部APIからデータを取得するインジケータは共有の非同期HTTPクライアントで
+        取得するため、複数のインジケータを asyncio.gather で並行して計算できます。
+        """
+        indicator = self.get_indicator(indicator_type)
+        frame = indicator._to_frame(data)
+
+        if not AppConfig.CACHE_ENABLED:
+            return await indicator.calculate_async(frame, **parameters)
+
+        key = self._cache_key(indicator_type, frame, symbol, interval, parameters)
+        result = self._cache.get(key)
+        if result is None:
+            result = await indicator.calculate_async(frame, **parameters)
+            if result:
+                self._cache.set(key, result)
+        return result
+
+    def _cache_key(
+        self,
+        indicator_type: IndicatorType,
+        frame: OHLCVFrame,
+        symbol: Optional[str],
+        interval: Optional[str],
+        parameters: Dict[str, Any]
+    ) -> tuple:
+        """キャッシュキーを作成"""
+        return (
+            symbol,
+            interval,
+            indicator_type.value,
+            self._canonical_parameters(parameters),
+            frame.fingerprint()
+        )
+
+    @staticmethod
+    def _canonical_parameters(parameters: Dict[str, Any]) -> str:
+        """パラメータをキャッシュキー用の文字列に正規化（順序・数値型の違いを吸収）"""
+        normalized = {
+            key: float(value) if isinstance(value, int) and not isinstance(value, bool) else value
+            for key, value in parameters.items()
+        }
+        return json.dumps(normalized, sort_keys=True, default=str)
+
+    def create_incremental(
+        self,
+        indicator_type: IndicatorType,
+        **parameters
+    ) -> IncrementalIndicator:
+        """ストリーミング用のインクリメンタルインジケータを作成"""
+        return create_incremental(indicator_type, **parameters)
+
+    def restore_incremental(self, state: Dict[str, Any]) -> IncrementalIndicator:
+        """保存した状態からインクリメンタルインジケータを復元"""
+        return restore_incremental(state)
+
+    def supports_incremental(self, indicator_type: IndicatorType) -> bool:
+        """インクリメンタル計算に対応しているかチェック"""
+        return indicator_type in INCREMENTAL_INDICATORS
+
     def clear_cache(self):
         """キャッシュをクリア"""
         self._cache.clear()
@@ -117,6 +231,10 @@ class IndicatorFactory:
         """キャッシュサイズを取得"""
         return len(self._cache)
 
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """キャッシュの統計情報（ヒット・ミス・退避数・バイト数）を取得"""
+        return self._cache.stats()
+
     def get_registered_count(self) -> int:
         """登録されたインジケータ数を取得"""
         return len(self._indicators)
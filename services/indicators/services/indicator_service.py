@@ -7,8 +7,8 @@ import logging
 from typing import List
 
 from src.core.config import IndicatorType
-from src.models.schemas import MarketDataPoint
 
+from ..core.base_indicator import MarketData
 from .indicator_factory import indicator_factory
 
 logger = logging.getLogger(__name__)
@@ -77,7 +77,7 @@ class IndicatorService:
     async def calculate_indicator(
         self,
         indicator_name: str,
-        data: List[MarketDataPoint],
+        data: MarketData,
         period: str = "1d",
         interval: str = "1d"
     ) -> dict:
@@ -94,7 +94,7 @@ class IndicatorService:
                 raise ValueError(f"インジケータ '{indicator_name}' が見つかりません")
 
             # インジケータの計算
-            result = indicator.calculate(data)
+            result = await indicator.calculate_async(data)
 
             logger.info(f"インジケータ計算完了: {indicator_name}")
             return result
@@ -108,6 +108,7 @@ class IndicatorService:
         return {
             "registered_indicators": self.factory.get_registered_count(),
             "cache_size": self.factory.get_cache_size(),
+            "cache_stats": self.factory.get_cache_stats(),
             "excluded_types": len(self._excluded_types),
             "service_status": "active"
         }
@@ -6,9 +6,15 @@
 import logging
 from typing import List
 
+import numpy as np
+import pandas as pd
+
 from src.core.config import IndicatorConfig, IndicatorType
-from src.models.schemas import IndicatorValue, MarketDataPoint, MultiIndicatorData
+from src.models.indicator_series import IndicatorResult, result_to_pandas
+from src.models.ohlcv import OHLCVFrame
+from src.models.schemas import MultiIndicatorData
 
+from ..core.base_indicator import MarketData
 from .indicator_factory import indicator_factory
 
 logger = logging.getLogger(__name__)
@@ -22,59 +28,59 @@ class NewIndicatorService:
 
     def calculate_sma(
         self,
-        data: List[MarketDataPoint],
+        data: MarketData,
         period: int
-    ) -> List[IndicatorValue]:
+    ) -> IndicatorResult:
         """単純移動平均（SMA）を計算"""
         indicator = self.factory.get_indicator(IndicatorType.SMA)
         return indicator.calculate(data, period=period)
 
     def calculate_ema(
         self,
-        data: List[MarketDataPoint],
+        data: MarketData,
         period: int
-    ) -> List[IndicatorValue]:
+    ) -> IndicatorResult:
         """指数移動平均（EMA）を計算"""
         indicator = self.factory.get_indicator(IndicatorType.EMA)
         return indicator.calculate(data, period=period)
 
     def calculate_rsi(
         self,
-        data: List[MarketDataPoint],
+        data: MarketData,
         period: int = 14
-    ) -> List[IndicatorValue]:
+    ) -> IndicatorResult:
         """相対力指数（RSI）を計算"""
         indicator = self.factory.get_indicator(IndicatorType.RSI)
         return indicator.calculate(data, period=period)
 
     def calculate_macd(
         self,
-        data: List[MarketDataPoint],
+        data: MarketData,
         fast: int = 12,
         slow: int = 26,
         signal: int = 9
-    ) -> List[IndicatorValue]:
+    ) -> IndicatorResult:
         """MACD（移動平均収束発散）を計算"""
         indicator = self.factory.get_indicator(IndicatorType.MACD)
         return indicator.calculate(data, fast=fast, slow=slow, signal=signal)
 
     def calculate_bollinger_bands(
         self,
-        data: List[MarketDataPoint],
+        data: MarketData,
         period: int = 20,
         std_dev: float = 2.0
-    ) -> List[IndicatorValue]:
+    ) -> IndicatorResult:
         """ボリンジャーバンドを計算"""
         indicator = self.factory.get_indicator(IndicatorType.BOLLINGER_BANDS)
         return indicator.calculate(data, period=period, std_dev=std_dev)
 
     def calculate_stochastic(
         self,
-        data: List[MarketDataPoint],
+        data: MarketData,
         k_period: int = 14,
         d_period: int = 3,
         slowing: int = 3
-    ) -> List[IndicatorValue]:
+    ) -> IndicatorResult:
         """ストキャスティクスオシレーターを計算"""
         indicator = self.factory.get_indicator(IndicatorType.STOCHASTIC)
         return indicator.calculate(
@@ -84,20 +90,24 @@ class NewIndicatorService:
             slowing=slowing
         )
 
-    def calculate_atr(self, data: List[MarketDataPoint], period: int = 14) -> List[IndicatorValue]:
+    def calculate_atr(self, data: MarketData, period: int = 14) -> IndicatorResult:
         """平均真の範囲（ATR）を計算"""
         indicator = self.factory.get_indicator(IndicatorType.ATR)
         return indicator.calculate(data, period=period)
 
     def calculate_multiple_indicators(
         self,
-        data: List[MarketDataPoint],
+        data: MarketData,
         indicator_configs: List[IndicatorConfig]
     ) -> List[MultiIndicatorData]:
         """複数のインジケータを一度に計算"""
         if not data:
             return []
 
+        # OHLCVフレームを一度だけ構築し、全インジケータで共有
+        if not isinstance(data, OHLCVFrame):
+            data = OHLCVFrame.from_points(data)
+
         # 各インジケータを計算
         all_indicators = {}
 
@@ -153,30 +163,30 @@ class NewIndicatorService:
                 logger.error(f"インジケータ計算エラー ({config.name}): {str(e)}")
                 continue
 
-        # タイムスタンプごとにデータを整理
-        timestamp_data = {}
+        if not all_indicators:
+            return []
 
+        # タイムスタンプごとにデータを整理（同一タイムスタンプは後の値を優先）
+        columns = {}
         for indicator_name, indicators in all_indicators.items():
-            for indicator in indicators:
-                timestamp_key = indicator.timestamp.isoformat()
-
-                if timestamp_key not in timestamp_data:
-                    timestamp_data[timestamp_key] = {
-                        "timestamp": indicator.timestamp,
-                        "values": {}
-                    }
+            series = result_to_pandas(indicators)
+            columns[indicator_name] = series[
+                ~series.index.duplicated(keep='last')]
 
-                timestamp_data[timestamp_key]["values"][indicator_name] = (
-                    indicator.value
-                )
+        table = pd.concat(columns, axis=1).sort_index()
 
         # MultiIndicatorDataのリストに変換
         results = []
-        for timestamp_key in sorted(timestamp_data.keys()):
-            data_point = timestamp_data[timestamp_key]
+        names = list(table.columns)
+        for timestamp, row in zip(table.index, table.to_numpy()):
+            values = {
+                name: float(value)
+                for name, value in zip(names, row)
+                if not np.isnan(value)
+            }
             results.append(MultiIndicatorData(
-                timestamp=data_point["timestamp"],
-                values=data_point["values"]
+                timestamp=timestamp,
+                values=values
             ))
 
         return results
@@ -0,0 +1,7 @@
+"""
+Refresh services module.
+"""
+
+from .refresh_service import refresh_service
+
+__all__ = ["refresh_service"]
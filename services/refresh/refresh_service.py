@@ -0,0 +1,252 @@
+"""
+市場データのバックグラウンド更新
+設定された全通貨について履歴データ・現在価格・インジケータ分析を定期的に計算し、
+メモリ上のスナップショットとして公開いたします
+
+ハンドラはスナップショットがあればそれを返すため、キャッシュの期限切れ後の
+最初のリクエストが上流への取得と全インジケータの計算を待つことはありません。
+更新間隔は足の長さ（1分足なら1分、日足なら上限の REFRESH_MAX_INTERVAL 秒）に合わせ、
+更新間隔の2倍より古いスナップショットは使わずに通常の取得にフォールバックします。
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from services.data.intervals import interval_offset
+from src.core.config import AppConfig
+from src.models.ohlcv import OHLCVFrame
+from src.models.schemas import CurrencyPairData
+
+logger = logging.getLogger(__name__)
+
+SeriesKey = Tuple[str, str, str]
+
+
+def refresh_interval(interval: str) -> float:
+    """足の長さに合わせた更新間隔（秒）"""
+    try:
+        offset = interval_offset(interval)
+    except ValueError:
+        return AppConfig.REFRESH_MAX_INTERVAL
+    seconds = (offset.total_seconds() if isinstance(offset, pd.Timedelta)
+               else AppConfig.REFRESH_MAX_INTERVAL)
+    return min(max(seconds, AppConfig.REFRESH_MIN_INTERVAL), AppConfig.REFRESH_MAX_INTERVAL)
+
+
+@dataclass(frozen=True)
+class MarketSnapshot:
+    """1系列分の事前計算結果"""
+    symbol: str
+    period: str
+    interval: str
+    frame: OHLCVFrame
+    analysis: Optional[Dict[str, Any]]
+    refreshed_at: float
+
+
+class RefreshService:
+    """市場データのバックグラウンド更新サービス
+
+    Args:
+        data_source: データ取得サービス（既定は data_service）
+        analyzer: インジケータ分析サービス（既定は indicator_analysis_service）
+        indicator_names: 計算するインジケータ名を返す関数
+        symbols: 更新する通貨（既定は AppConfig.VALID_CURRENCIES）
+        series: 更新する (期間, 間隔) の一覧（既定は AppConfig.REFRESH_SERIES）
+    """
+
+    def __init__(
+        self,
+        data_source=None,
+        analyzer=None,
+        indicator_names: Optional[Callable[[], Awaitable[List[str]]]] = None,
+        symbols: Optional[Sequence[str]] = None,
+        series: Optional[Sequence[Tuple[str, str]]] = None,
+        price_interval: float = AppConfig.REFRESH_PRICE_INTERVAL,
+        concurrency: int = AppConfig.REFRESH_CONCURRENCY
+    ):
+        self._data_source = data_source
+        self._analyzer = analyzer
+        self._indicator_names = indicator_names
+        self.symbols = list(symbols if symbols is not None else AppConfig.VALID_CURRENCIES)
+        self.series = list(series if series is not None else AppConfig.REFRESH_SERIES)
+        self.price_interval = price_interval
+        self.concurrency = concurrency
+        self._snapshots: Dict[SeriesKey, MarketSnapshot] = {}
+        self._prices: Dict[str, Tuple[CurrencyPairData, float]] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._stats = {"refreshes": 0, "errors": 0, "hits": 0, "misses": 0}
+
+    def start(self) -> None:
+        """系列ごとの更新タスクを開始（アプリ起動時）"""
+        if self._tasks:
+            return
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        loop = asyncio.get_running_loop()
+        for period, interval in self.series:
+            self._tasks.append(loop.create_task(self._run_series(period, interval)))
+        self._tasks.append(loop.create_task(self._run_prices()))
+        logger.info(
+            f"バックグラウンド更新開始: {len(self.symbols)}通貨 × {self.series}")
+
+    async def stop(self) -> None:
+        """更新タスクを停止（アプリ終了時）"""
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def get_snapshot(self, pair: str, period: str, interval: str) -> Optional[MarketSnapshot]:
+        """期限内のスナップショットを取得（なければ None）"""
+        key = (self._symbol(pair), period, interval)
+        snapshot = self._snapshots.get(key)
+        if snapshot is None or self._expired(snapshot.refreshed_at, refresh_interval(interval)):
+            self._stats["misses"] += 1
+            return None
+        self._stats["hits"] += 1
+        return snapshot
+
+    def get_frame(self, pair: str, period: str, interval: str) -> Optional[OHLCVFrame]:
+        snapshot = self.get_snapshot(pair, period, interval)
+        return snapshot.frame if snapshot else None
+
+    def get_analysis(
+        self, pair: str, names: Sequence[str], period: str, interval: str
+    ) -> Optional[Dict[str, Any]]:
+        """指定したインジケータの分析結果をスナップショットから取得"""
+        snapshot = self.get_snapshot(pair, period, interval)
+        if snapshot is None or not snapshot.analysis:
+            return None
+        analysis = snapshot.analysis
+        indicators = analysis["indicators"]
+        unavailable = analysis.get("unavailable", [])
+        # 事前計算していないインジケータを含む場合は通常の計算に任せる
+        if any(name not in indicators and name not in unavailable for name in names):
+            return None
+        return dict(
+            analysis,
+            indicators={name: indicators[name] for name in names if name in indicators},
+            unavailable=[name for name in names if name in unavailable]
+        )
+
+    def get_price(self, pair: str) -> Optional[CurrencyPairData]:
+        """期限内の現在価格を取得（なければ None）"""
+        entry = self._prices.get(self._symbol(pair))
+        if entry is None or self._expired(entry[1], self.price_interval):
+            return None
+        return entry[0]
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self._stats)
+        stats.update({
+            "running": bool(self._tasks),
+            "snapshots": len(self._snapshots),
+            "prices": len(self._prices)
+        })
+        return stats
+
+    async def refresh_series(self, period: str, interval: str) -> None:
+        """全通貨の1系列を更新"""
+        await asyncio.gather(*[
+            self._guarded(self.refresh_symbol, symbol, period, interval)
+            for symbol in self.symbols
+        ])
+
+    async def refresh_symbol(self, pair: str, period: str, interval: str) -> Optional[MarketSnapshot]:
+        """1通貨の1系列を更新し、インジケータ分析を再計算してスナップショットを置き換え"""
+        data_source = self._get_data_source()
+        frame = await data_source.refresh_historical_frame(pair, period, interval)
+        if frame is None or len(frame) == 0:
+            return None
+
+        analysis = await self._get_analyzer().analyze_many(
+            pair, await self._names(), period, interval)
+
+        snapshot = MarketSnapshot(
+            symbol=self._symbol(pair),
+            period=period,
+            interval=interval,
+            frame=frame,
+            analysis=analysis,
+            refreshed_at=time.monotonic()
+        )
+        self._snapshots[(snapshot.symbol, period, interval)] = snapshot
+        self._stats["refreshes"] += 1
+        return snapshot
+
+    async def refresh_price(self, pair: str) -> Optional[CurrencyPairData]:
+        """1通貨の現在価格を更新"""
+        data_source = self._get_data_source()
+        await data_source.refresh_historical_frame(pair, "5d", "1d")
+        price = await data_source.get_current_price(pair)
+        if price is not None:
+            self._prices[self._symbol(pair)] = (price, time.monotonic())
+        return price
+
+    async def _run_series(self, period: str, interval: str) -> None:
+        cadence = refresh_interval(interval)
+        while True:
+            started = time.monotonic()
+            await self.refresh_series(period, interval)
+            logger.info(
+                f"バックグラウンド更新完了: ({period}, {interval}) - "
+                f"{time.monotonic() - started:.1f}秒")
+            await asyncio.sleep(max(0.0, cadence - (time.monotonic() - started)))
+
+    async def _run_prices(self) -> None:
+        while True:
+            started = time.monotonic()
+            await asyncio.gather(*[
+                self._guarded(self.refresh_price, symbol) for symbol in self.symbols
+            ])
+            await asyncio.sleep(max(0.0, self.price_interval - (time.monotonic() - started)))
+
+    async def _guarded(self, refresh, *args) -> None:
+        """同時実行数を制限し、1通貨の失敗が他の通貨に影響しないようにする"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        async with self._semaphore:
+            try:
+                await refresh(*args)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._stats["errors"] += 1
+                logger.warning(f"バックグラウンド更新エラー: {args}: {e}")
+
+    @staticmethod
+    def _expired(refreshed_at: float, cadence: float) -> bool:
+        return time.monotonic() - refreshed_at > 2 * cadence
+
+    def _symbol(self, pair: str) -> str:
+        return self._get_data_source().to_symbol(pair)
+
+    async def _names(self) -> List[str]:
+        if self._indicator_names is not None:
+            return await self._indicator_names()
+        from services.indicators.services.indicator_service import indicator_service
+        return [info["name"] for info in await indicator_service.get_indicators()]
+
+    def _get_data_source(self):
+        if self._data_source is None:
+            from services.data.data_service import data_service
+            self._data_source = data_service
+        return self._data_source
+
+    def _get_analyzer(self):
+        if self._analyzer is None:
+            from services.indicators.services.indicator_analysis_service import (
+                indicator_analysis_service,
+            )
+            self._analyzer = indicator_analysis_service
+        return self._analyzer
+
+
+# シングルトンインスタンス
+refresh_service = RefreshService()
@@ -2,6 +2,7 @@
 Storage services module.
 """
 
+from .bar_store import bar_store
 from .storage_service import storage_service
 
-__all__ = ["storage_service"]
+__all__ = ["bar_store", "storage_service"]
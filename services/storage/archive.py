@@ -0,0 +1,272 @@
+"""
+月単位で分割した圧縮列指向アーカイブ
+保存済みのデータを (シンボル, データタイプ, 月) ごとに1ファイルへまとめます
+
+ディレクトリ構成:
+    {root}/{シンボル}/{データタイプ}/{YYYY-MM}.carc
+
+ファイル形式:
+    [列ブロック]...[フッター(JSON)][フッター長(uint32, リトルエンディアン)][MAGIC]
+
+各列ブロックはzlibで圧縮した列全体です。
+- timestamp 列: UTCエポックからのミリ秒（int64）の差分
+- 数値の列: float64（欠損はNaN）
+- それ以外の列: JSON配列
+フッターには行数・最小/最大時刻・各列の位置と種類を記録するため、
+期間外のファイルはフッターのみ、必要な列はその列のブロックのみを読み込みます。
+"""
+
+import json
+import logging
+import os
+import re
+import struct
+import threading
+import zlib
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"CRCARC01"
+SUFFIX = ".carc"
+FORMAT_VERSION = 1
+_TRAILER = struct.Struct("<I")
+
+_NAME_PATTERN = re.compile(r"^[A-Za-z0-9._^=-]+$")
+_MONTH_PATTERN = re.compile(r"^\d{4}-\d{2}$")
+
+
+def month_of(timestamp_ms: int) -> str:
+    """エポックミリ秒が属する月（YYYY-MM）"""
+    return datetime.fromtimestamp(timestamp_ms / 1000, tz=timezone.utc).strftime("%Y-%m")
+
+
+def is_partition_name(filename: str) -> bool:
+    """アーカイブのファイル名（YYYY-MM.carc）か"""
+    return filename.endswith(SUFFIX) and bool(_MONTH_PATTERN.match(filename[:-len(SUFFIX)]))
+
+
+def _is_missing(value: Any) -> bool:
+    return value is None or value == "" or (isinstance(value, float) and np.isnan(value))
+
+
+def _as_float(value: Any) -> Optional[float]:
+    if isinstance(value, bool):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _encode_column(name: str, values: Sequence[Any]) -> Tuple[str, bytes]:
+    """列を (種類, 圧縮済みバイト列) に変換"""
+    if name == "timestamp":
+        timestamps = np.asarray(values, dtype=np.int64)
+        deltas = np.diff(timestamps, prepend=np.int64(0))
+        return "i8-delta", zlib.compress(deltas.astype("<i8").tobytes())
+
+    present = [value for value in values if not _is_missing(value)]
+    if all(_as_float(value) is not None for value in present):
+        floats = np.array(
+            [np.nan if _is_missing(value) else _as_float(value) for value in values],
+            dtype="<f8")
+        return "f8", zlib.compress(floats.tobytes())
+
+    strings = [None if _is_missing(value) else str(value) for value in values]
+    return "json", zlib.compress(json.dumps(strings, ensure_ascii=False).encode("utf-8"))
+
+
+def _decode_column(kind: str, payload: bytes) -> List[Any]:
+    raw = zlib.decompress(payload)
+    if kind == "i8-delta":
+        return np.cumsum(np.frombuffer(raw, dtype="<i8")).tolist()
+    if kind == "f8":
+        floats = np.frombuffer(raw, dtype="<f8")
+        return [None if np.isnan(value) else value for value in floats.tolist()]
+    if kind == "json":
+        return json.loads(raw.decode("utf-8"))
+    raise ValueError(f"不明な列の種類: {kind}")
+
+
+def _row_key(timestamp: int, row: Dict) -> Tuple[int, str]:
+    """行の一意キー（SQLiteのレコードと同じく時刻とインジケータ名）"""
+    name = row.get("indicator_name")
+    return timestamp, "" if _is_missing(name) else str(name)
+
+
+class ColumnarArchive:
+    """月単位の圧縮列指向アーカイブ
+
+    Args:
+        root: 保存先ディレクトリ
+    """
+
+    def __init__(self, root: Union[str, Path]):
+        self.root = Path(root)
+        self._lock = threading.Lock()
+
+    def months(self, symbol: str, data_type: str) -> List[str]:
+        """アーカイブされている月の一覧（古い順）"""
+        directory = self._directory(symbol, data_type)
+        if not directory.exists():
+            return []
+        return sorted(
+            path.stem for path in directory.glob(f"*{SUFFIX}") if is_partition_name(path.name))
+
+    def partition_path(self, symbol: str, data_type: str, month: str) -> Path:
+        if not _MONTH_PATTERN.match(month):
+            raise ValueError(f"無効な月: {month}")
+        return self._directory(symbol, data_type) / f"{month}{SUFFIX}"
+
+    def read_footer(self, path: Path) -> Dict:
+        """フッター（行数・時刻の範囲・列の位置）を読み込み"""
+        with open(path, "rb") as f:
+            return self._read_footer(f)
+
+    def read_columns(
+        self,
+        symbol: str,
+        data_type: str,
+        month: str,
+        columns: Optional[Sequence[str]] = None
+    ) -> Dict[str, List[Any]]:
+        """月のデータを列ごとに読み込み（columns 指定時はその列と timestamp のみ）"""
+        path = self.partition_path(symbol, data_type, month)
+        with open(path, "rb") as f:
+            footer = self._read_footer(f)
+            names = [
+                name for name in footer["columns"]
+                if columns is None or name == "timestamp" or name in columns
+            ]
+            result = {}
+            for name in names:
+                meta = footer["columns"][name]
+                f.seek(meta["offset"])
+                result[name] = _decode_column(meta["kind"], f.read(meta["length"]))
+        return result
+
+    def iter_rows(
+        self,
+        symbol: str,
+        data_type: str,
+        month: str,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        columns: Optional[Sequence[str]] = None,
+        after: int = -1
+    ) -> Iterator[Tuple[int, Dict]]:
+        """期間 [start, end) の行を (行番号, 行データ) として時刻順に返す
+
+        期間がフッターの時刻の範囲と重ならない場合は列を読み込みません。
+        after を指定した場合は、その行番号より後の行から返します。
+        """
+        path = self.partition_path(symbol, data_type, month)
+        footer = self.read_footer(path)
+        if footer["rows"] == 0:
+            return
+        if start is not None and footer["max_timestamp"] < start:
+            return
+        if end is not None and footer["min_timestamp"] >= end:
+            return
+
+        data = self.read_columns(symbol, data_type, month, columns)
+        timestamps = np.asarray(data["timestamp"], dtype=np.int64)
+        lo = 0 if start is None else int(np.searchsorted(timestamps, start, side="left"))
+        hi = len(timestamps) if end is None else int(np.searchsorted(timestamps, end, side="left"))
+        names = list(data)
+        for index in range(max(lo, after + 1), hi):
+            row = {name: data[name][index] for name in names}
+            row["timestamp"] = datetime.fromtimestamp(
+                row["timestamp"] / 1000, tz=timezone.utc).isoformat()
+            yield index, row
+
+    def merge(self, symbol: str, data_type: str, rows: Iterable[Tuple[int, Dict]]) -> Dict[str, int]:
+        """(エポックミリ秒, 行データ) をアーカイブに追加し、月ごとの行数を返す
+
+        同じキー（時刻・インジケータ名）の行は追加した行で置き換えます。
+        """
+        by_month: Dict[str, List[Tuple[int, Dict]]] = {}
+        for timestamp, row in rows:
+            by_month.setdefault(month_of(timestamp), []).append((timestamp, row))
+
+        written = {}
+        with self._lock:
+            for month, new_rows in sorted(by_month.items()):
+                merged: Dict[Tuple[int, str], Dict] = {}
+                if self.partition_path(symbol, data_type, month).exists():
+                    existing = self.read_columns(symbol, data_type, month)
+                    for index, timestamp in enumerate(existing["timestamp"]):
+                        row = {name: values[index] for name, values in existing.items()}
+                        merged[_row_key(timestamp, row)] = row
+                for timestamp, row in new_rows:
+                    row = dict(row, timestamp=timestamp)
+                    merged[_row_key(timestamp, row)] = row
+
+                ordered = [merged[key] for key in sorted(merged)]
+                self._write_partition(symbol, data_type, month, ordered)
+                written[month] = len(ordered)
+        return written
+
+    def get_status(self) -> Dict:
+        """アーカイブの状態を取得"""
+        files = list(self.root.glob(f"*/*/*{SUFFIX}")) if self.root.exists() else []
+        return {
+            "root": str(self.root),
+            "partitions": len(files),
+            "bytes": sum(path.stat().st_size for path in files)
+        }
+
+    def _write_partition(self, symbol: str, data_type: str, month: str, rows: List[Dict]) -> None:
+        """月のファイルを書き直す（一時ファイルへの書き込み後に置き換え）"""
+        names = ["timestamp"] + sorted({name for row in rows for name in row} - {"timestamp"})
+        path = self.partition_path(symbol, data_type, month)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_suffix(f"{SUFFIX}.tmp")
+
+        timestamps = [row["timestamp"] for row in rows]
+        footer: Dict[str, Any] = {
+            "version": FORMAT_VERSION,
+            "rows": len(rows),
+            "min_timestamp": min(timestamps) if rows else None,
+            "max_timestamp": max(timestamps) if rows else None,
+            "compression": "zlib",
+            "columns": {}
+        }
+        with open(temporary, "wb") as f:
+            for name in names:
+                kind, payload = _encode_column(name, [row.get(name) for row in rows])
+                footer["columns"][name] = {"kind": kind, "offset": f.tell(), "length": len(payload)}
+                f.write(payload)
+            encoded = json.dumps(footer).encode("utf-8")
+            f.write(encoded)
+            f.write(_TRAILER.pack(len(encoded)))
+            f.write(MAGIC)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, path)
+        logger.info(f"アーカイブに書き込み: {path} - {len(rows)}行")
+
+    def _read_footer(self, f) -> Dict:
+        trailer_size = _TRAILER.size + len(MAGIC)
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        if size < trailer_size:
+            raise IOError("アーカイブのファイルが壊れています")
+        f.seek(size - trailer_size)
+        trailer = f.read(trailer_size)
+        if trailer[_TRAILER.size:] != MAGIC:
+            raise IOError("アーカイブのファイルではありません")
+        (length,) = _TRAILER.unpack(trailer[:_TRAILER.size])
+        f.seek(size - trailer_size - length)
+        return json.loads(f.read(length).decode("utf-8"))
+
+    def _directory(self, symbol: str, data_type: str) -> Path:
+        for name in (symbol, data_type):
+            if not _NAME_PATTERN.match(name) or name in (".", ".."):
+                raise ValueError(f"無効なシンボルまたはデータタイプ: {name}")
+        return self.root / symbol / data_type
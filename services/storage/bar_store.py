@@ -0,0 +1,367 @@
+"""
+OHLCVバーの列指向ストア
+(シンボル, 間隔) ごとに固定長バイナリの列ファイルへ追記し、読み込みはメモリマップで行います
+
+ディレクトリ構成:
+    {root}/{シンボル}/{間隔}/timestamp.i8   UTCエポックからのナノ秒（int64, リトルエンディアン）
+    {root}/{シンボル}/{間隔}/open.f8 など   float64（リトルエンディアン）
+
+各列は1本あたり8バイトの固定長のため、N本目の位置は N * 8 で決まります。
+追記は最後の足より新しい足のみを対象とし、既存の足は書き換えません。
+そのため読み込み時に返すメモリマップのビューは、後から追記されても内容が変わりません。
+"""
+
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from src.core.config import AppConfig
+from src.models.ohlcv import OHLCVFrame
+
+logger = logging.getLogger(__name__)
+
+# 列名 -> (ファイル名, dtype)
+COLUMNS: Dict[str, Tuple[str, str]] = {
+    "timestamp": ("timestamp.i8", "<i8"),
+    "open": ("open.f8", "<f8"),
+    "high": ("high.f8", "<f8"),
+    "low": ("low.f8", "<f8"),
+    "close": ("close.f8", "<f8"),
+    "volume": ("volume.f8", "<f8"),
+}
+ITEM_SIZE = 8
+METADATA_FILE = "meta.json"
+
+# 時刻の指定（ナノ秒・datetime・ISO 8601文字列）
+TimeLike = Union[int, datetime, str, pd.Timestamp]
+
+_NAME_PATTERN = re.compile(r"^[A-Za-z0-9._^=-]+$")
+# replace() の一時ディレクトリ・退避先の接尾辞（シンボル・間隔に使えない文字を含む）
+_STAGING_SUFFIX = "~new"
+_RETIRED_SUFFIX = "~old"
+
+
+def to_nanoseconds(value: TimeLike) -> int:
+    """時刻をUTCエポックからのナノ秒に変換（タイムゾーンなしはUTCとみなす）"""
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    timestamp = pd.Timestamp(value)
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.tz_localize("UTC")
+    return int(timestamp.value)
+
+
+class BarStore:
+    """追記専用・メモリマップ読み込みのOHLCVバーストア
+
+    Args:
+        root: 保存先ディレクトリ
+    """
+
+    def __init__(self, root: Union[str, Path] = AppConfig.BAR_STORE_DIR):
+        self.root = Path(root)
+        self._lock = threading.RLock()
+        # (シンボル, 間隔) -> (本数, 列名 -> メモリマップ)
+        self._maps: Dict[Tuple[str, str], Tuple[int, Dict[str, np.ndarray]]] = {}
+        self._repaired: set = set()
+
+    def append(self, symbol: str, interval: str, frame: OHLCVFrame) -> int:
+        """最後の足より新しい足を追記し、追記した本数を返す"""
+        if len(frame) == 0:
+            return 0
+
+        with self._lock:
+            self._recover(self._directory(symbol, interval))
+            directory = self._directory(symbol, interval, create=True)
+            self._repair(symbol, interval)
+
+            rows = self._new_rows(frame, self.last_timestamp(symbol, interval))
+            if len(rows) == 0:
+                return 0
+
+            # 時刻列を最後に書き込み、本数は時刻列を基準にする（途中で失敗しても
+            # 他の列が余るだけで、次回の_repairで切り詰められる）
+            try:
+                self._write_columns(directory, frame, rows, mode="ab")
+            except Exception:
+                self._repaired.discard((symbol, interval))
+                raise
+
+            logger.debug(f"バーを追記: {symbol} {interval} - {len(rows)}件")
+            return len(rows)
+
+    def read(
+        self,
+        symbol: str,
+        interval: str,
+        start: Optional[TimeLike] = None,
+        end: Optional[TimeLike] = None
+    ) -> OHLCVFrame:
+        """期間 [start, end) のバーを取得（メモリマップのゼロコピービュー）"""
+        count, columns = self._mapped(symbol, interval)
+        if count == 0:
+            return OHLCVFrame.empty()
+
+        timestamps = columns["timestamp"]
+        lo = 0 if start is None else int(
+            np.searchsorted(timestamps, to_nanoseconds(start), side="left"))
+        hi = count if end is None else int(
+            np.searchsorted(timestamps, to_nanoseconds(end), side="left"))
+        hi = max(lo, hi)
+
+        return OHLCVFrame(*(columns[name][lo:hi] for name in COLUMNS))
+
+    def tail(self, symbol: str, interval: str, count: int) -> OHLCVFrame:
+        """最新 count 本のバーを取得"""
+        total, columns = self._mapped(symbol, interval)
+        if total == 0 or count <= 0:
+            return OHLCVFrame.empty()
+        lo = max(0, total - count)
+        return OHLCVFrame(*(columns[name][lo:total] for name in COLUMNS))
+
+    def count(self, symbol: str, interval: str) -> int:
+        """保存されているバーの本数"""
+        return self._mapped(symbol, interval)[0]
+
+    def first_timestamp(self, symbol: str, interval: str) -> Optional[int]:
+        """最初の足の時刻（ナノ秒）"""
+        count, columns = self._mapped(symbol, interval)
+        return int(columns["timestamp"][0]) if count else None
+
+    def last_timestamp(self, symbol: str, interval: str) -> Optional[int]:
+        """最後の足の時刻（ナノ秒）"""
+        count, columns = self._mapped(symbol, interval)
+        return int(columns["timestamp"][count - 1]) if count else None
+
+    def get_metadata(self, symbol: str, interval: str) -> Dict:
+        """(シンボル, 間隔) のメタデータを取得"""
+        path = self._directory(symbol, interval) / METADATA_FILE
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def update_metadata(self, symbol: str, interval: str, **values) -> Dict:
+        """メタデータを更新（一時ファイルへの書き込み後に置き換え）"""
+        with self._lock:
+            metadata = self.get_metadata(symbol, interval)
+            metadata.update(values)
+            directory = self._directory(symbol, interval, create=True)
+            temporary = directory / f"{METADATA_FILE}.tmp"
+            with open(temporary, "w", encoding="utf-8") as f:
+                json.dump(metadata, f)
+            os.replace(temporary, directory / METADATA_FILE)
+            return metadata
+
+    def replace(self, symbol: str, interval: str, frame: OHLCVFrame) -> int:
+        """(シンボル, 間隔) のバーを全て置き換え（過去方向へ拡張する場合に使用）
+
+        新しい列ファイルとメタデータを隣の一時ディレクトリに書き込んで同期した後、
+        ディレクトリごと入れ替えます。途中で失敗しても既存のバーはそのまま残り、
+        読み込み済みのビューは入れ替え前の内容のまま有効です。メタデータは引き継ぎます。
+        """
+        with self._lock:
+            directory = self._directory(symbol, interval, create=True)
+            self._recover(directory)
+            staging = directory.with_name(f"{interval}{_STAGING_SUFFIX}")
+            retired = directory.with_name(f"{interval}{_RETIRED_SUFFIX}")
+            shutil.rmtree(staging, ignore_errors=True)
+            staging.mkdir()
+
+            try:
+                rows = self._new_rows(frame, None)
+                self._write_columns(staging, frame, rows, mode="wb", sync=True)
+                metadata = self.get_metadata(symbol, interval)
+                if metadata:
+                    with open(staging / METADATA_FILE, "w", encoding="utf-8") as f:
+                        json.dump(metadata, f)
+                        f.flush()
+                        os.fsync(f.fileno())
+                _fsync_directory(staging)
+            except BaseException:
+                shutil.rmtree(staging, ignore_errors=True)
+                raise
+
+            # ディレクトリは中身があると上書きできないため、既存分を退避してから入れ替える
+            os.replace(directory, retired)
+            os.replace(staging, directory)
+            _fsync_directory(directory.parent)
+            shutil.rmtree(retired, ignore_errors=True)
+
+            self._maps.pop((symbol, interval), None)
+            self._repaired.discard((symbol, interval))
+            logger.debug(f"バーを置き換え: {symbol} {interval} - {len(rows)}件")
+            return len(rows)
+
+    def series(self) -> List[Tuple[str, str]]:
+        """保存されている (シンボル, 間隔) の一覧"""
+        if not self.root.exists():
+            return []
+        return sorted(
+            (path.parent.parent.name, path.parent.name)
+            for path in self.root.glob(f"*/*/{COLUMNS['timestamp'][0]}")
+            if _NAME_PATTERN.match(path.parent.name)
+        )
+
+    def delete(self, symbol: str, interval: str) -> bool:
+        """(シンボル, 間隔) のバーを全て削除"""
+        with self._lock:
+            directory = self._directory(symbol, interval)
+            self._maps.pop((symbol, interval), None)
+            self._repaired.discard((symbol, interval))
+            for suffix in (_STAGING_SUFFIX, _RETIRED_SUFFIX):
+                shutil.rmtree(directory.with_name(f"{interval}{suffix}"), ignore_errors=True)
+            if not directory.exists():
+                return False
+            shutil.rmtree(directory)
+            return True
+
+    def get_status(self) -> Dict:
+        """ストアの状態を取得"""
+        series = self.series()
+        total_bytes = sum(
+            path.stat().st_size for path in self.root.glob("*/*/*") if path.is_file()
+        ) if self.root.exists() else 0
+        return {
+            "root": str(self.root),
+            "series": len(series),
+            "bars": sum(self.count(symbol, interval) for symbol, interval in series),
+            "bytes": total_bytes
+        }
+
+    def _directory(self, symbol: str, interval: str, create: bool = False) -> Path:
+        for name in (symbol, interval):
+            if not _NAME_PATTERN.match(name) or name in (".", ".."):
+                raise ValueError(f"無効なシンボルまたは間隔: {name}")
+        directory = self.root / symbol / interval
+        if create:
+            directory.mkdir(parents=True, exist_ok=True)
+        return directory
+
+    @staticmethod
+    def _new_rows(frame: OHLCVFrame, last: Optional[int]) -> np.ndarray:
+        """書き込む行（時刻順・同じ時刻は後の足・last より新しい足のみ）"""
+        timestamps = frame.timestamp
+        order = np.argsort(timestamps, kind="stable")
+        timestamps = timestamps[order]
+        # 同じ時刻の足は後のものを採用
+        keep = np.ones(len(timestamps), dtype=bool)
+        keep[:-1] = timestamps[1:] != timestamps[:-1]
+        if last is not None:
+            keep &= timestamps > last
+        return order[keep]
+
+    @staticmethod
+    def _write_columns(
+        directory: Path,
+        frame: OHLCVFrame,
+        rows: np.ndarray,
+        mode: str,
+        sync: bool = False
+    ) -> None:
+        for name in ("open", "high", "low", "close", "volume", "timestamp"):
+            filename, dtype = COLUMNS[name]
+            values = getattr(frame, name)[rows].astype(dtype, copy=False)
+            with open(directory / filename, mode) as f:
+                f.write(values.tobytes())
+                if sync:
+                    f.flush()
+                    os.fsync(f.fileno())
+
+    def _recover(self, directory: Path) -> None:
+        """replace() が入れ替えの途中で中断した場合の後始末
+
+        退避したディレクトリだけが残っている場合は元に戻し、
+        入れ替え済みの場合は退避したディレクトリを削除します。
+        """
+        retired = directory.with_name(f"{directory.name}{_RETIRED_SUFFIX}")
+        if not retired.exists():
+            return
+        if directory.exists() and any(directory.iterdir()):
+            shutil.rmtree(retired, ignore_errors=True)
+        else:
+            logger.warning(f"中断した置き換えを元に戻します: {directory}")
+            if directory.exists():
+                directory.rmdir()
+            os.replace(retired, directory)
+
+    def _stored_count(self, directory: Path) -> int:
+        try:
+            size = os.path.getsize(directory / COLUMNS["timestamp"][0])
+        except FileNotFoundError:
+            return 0
+        return size // ITEM_SIZE
+
+    def _repair(self, symbol: str, interval: str) -> None:
+        """書き込み途中で中断した場合に、時刻列より長い列を切り詰める"""
+        key = (symbol, interval)
+        if key in self._repaired:
+            return
+
+        directory = self._directory(symbol, interval)
+        count = self._stored_count(directory)
+        for filename, _ in COLUMNS.values():
+            path = directory / filename
+            if not path.exists():
+                path.touch()
+            size = path.stat().st_size
+            if size < count * ITEM_SIZE:
+                raise IOError(f"バーストアの列が不足しています: {path}")
+            if size > count * ITEM_SIZE:
+                logger.warning(f"バーストアの列を切り詰めます: {path}")
+                os.truncate(path, count * ITEM_SIZE)
+        self._repaired.add(key)
+
+    def _mapped(self, symbol: str, interval: str) -> Tuple[int, Dict[str, np.ndarray]]:
+        """列のメモリマップを取得（本数が変わっていれば再マップ）"""
+        key = (symbol, interval)
+        directory = self._directory(symbol, interval)
+
+        cached = self._maps.get(key)
+        if cached is not None and cached[0] == self._stored_count(directory):
+            return cached
+
+        with self._lock:
+            # 書き込み（replaceの入れ替えを含む）の完了後の本数で判定し直す
+            self._recover(directory)
+            count = self._stored_count(directory)
+            cached = self._maps.get(key)
+            if cached is not None and cached[0] == count:
+                return cached
+            if count == 0:
+                return 0, {}
+            self._repair(symbol, interval)
+            columns = {
+                name: np.memmap(directory / filename, dtype=dtype, mode="r", shape=(count,))
+                for name, (filename, dtype) in COLUMNS.items()
+            }
+            self._maps[key] = (count, columns)
+            return count, columns
+
+
+def _fsync_directory(directory: Path) -> None:
+    """ディレクトリのエントリ（作成・名前の変更）をディスクに同期"""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:  # pragma: no cover - ディレクトリを開けないプラットフォーム
+        return
+    try:
+        os.fsync(fd)
+    except OSError:  # pragma: no cover
+        pass
+    finally:
+        os.close(fd)
+
+
+# シングルトンインスタンス
+bar_store = BarStore()
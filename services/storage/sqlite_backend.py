@@ -0,0 +1,270 @@
+"""
+SQLiteストレージバックエンド
+WALモード・(symbol, data_type, timestamp) のインデックス・接続プールを使用いたします
+
+各レコードには保存ID（saved_at、保存時刻のミリ秒で保存ごとに増加）を記録し、
+CSV/JSONの「最新の保存ファイル」と同じく、最後の保存で書き込んだ行を取り出せます。
+"""
+
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS market_records (
+    symbol TEXT NOT NULL,
+    data_type TEXT NOT NULL,
+    timestamp INTEGER NOT NULL,
+    name TEXT NOT NULL DEFAULT '',
+    data TEXT NOT NULL,
+    saved_at INTEGER NOT NULL DEFAULT 0
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_market_records_key
+    ON market_records (symbol, data_type, timestamp, name);
+"""
+
+# saved_at 列の追加前に作成したデータベースでも、列を追加した後に作成する
+_SAVED_AT_INDEX = """
+CREATE INDEX IF NOT EXISTS idx_market_records_saved
+    ON market_records (symbol, data_type, saved_at);
+"""
+
+_DAY_MS = 86_400_000
+
+# 1行 = (symbol, data_type, timestamp[ms], name, data[JSON], saved_at[保存ID])
+Record = Tuple[str, str, int, str, str, int]
+
+
+def sqlite_path_from_url(url: str) -> str:
+    """sqlite:///./crypto_data.db 形式のURLからファイルパスを取得"""
+    prefix = "sqlite:///"
+    if not url.startswith(prefix):
+        raise ValueError(f"SQLiteのURLではありません: {url}")
+    return url[len(prefix):] or ":memory:"
+
+
+class SQLiteConnectionPool:
+    """上限付きのSQLite接続プール
+
+    接続は作成時にWALモードへ切り替え、読み込みと書き込みを並行して行えるようにします。
+
+    Args:
+        path: データベースファイルのパス
+        size: 最大接続数
+        timeout: 接続が空くまでの待機時間（秒）
+        synchronous: PRAGMA synchronous の値（"FULL" はコミットごとにfsync）
+    """
+
+    def __init__(
+        self,
+        path: str,
+        size: int = 4,
+        timeout: float = 30.0,
+        synchronous: str = "NORMAL"
+    ):
+        if synchronous not in ("OFF", "NORMAL", "FULL"):
+            raise ValueError(f"無効な synchronous の値: {synchronous}")
+        self.path = path
+        self.size = size
+        self.timeout = timeout
+        self.synchronous = synchronous
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """接続を借りる（ブロック内で例外が出た場合はロールバック）"""
+        connection = self._acquire()
+        try:
+            yield connection
+            connection.commit()
+        except BaseException:
+            connection.rollback()
+            raise
+        finally:
+            self._idle.put(connection)
+
+    def close(self) -> None:
+        """待機中の接続を全て閉じる"""
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+    def stats(self) -> Dict[str, int]:
+        return {"size": self.size, "created": self._created, "idle": self._idle.qsize()}
+
+    def _acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("接続プールは閉じられています")
+            create = self._created < self.size
+            if create:
+                self._created += 1
+
+        if create:
+            try:
+                return self._connect()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise TimeoutError("SQLiteの接続が空くまでにタイムアウトしました")
+
+    def _connect(self) -> sqlite3.Connection:
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(
+            self.path, timeout=self.timeout, check_same_thread=False)
+        connection.row_factory = sqlite3.Row
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(f"PRAGMA synchronous={self.synchronous}")
+        return connection
+
+
+class SQLiteStorage:
+    """市場データのレコードをSQLiteに保存"""
+
+    def __init__(self, pool: SQLiteConnectionPool):
+        self.pool = pool
+        with self.pool.connection() as connection:
+            connection.executescript(_SCHEMA)
+            self._migrate(connection)
+            connection.executescript(_SAVED_AT_INDEX)
+            self._last_save_id = connection.execute(
+                "SELECT COALESCE(MAX(saved_at), 0) FROM market_records").fetchone()[0]
+        self._save_lock = threading.Lock()
+
+    @staticmethod
+    def _migrate(connection: sqlite3.Connection) -> None:
+        """saved_at 列のないデータベースに列を追加
+
+        既存の行の保存IDはその行の時刻の日の始まりとするため、移行前の行は
+        従来どおり最新日の行がまとめて「最新の保存」として扱われます。
+        """
+        columns = {row["name"] for row in connection.execute("PRAGMA table_info(market_records)")}
+        if "saved_at" in columns:
+            return
+        logger.info("market_records に saved_at 列を追加します")
+        connection.execute(
+            "ALTER TABLE market_records ADD COLUMN saved_at INTEGER NOT NULL DEFAULT 0")
+        connection.execute(
+            "UPDATE market_records SET saved_at = timestamp - timestamp % ?", (_DAY_MS,))
+
+    def next_save_id(self) -> int:
+        """保存IDを発行（保存時刻のミリ秒。同じミリ秒の保存でも必ず増加）"""
+        with self._save_lock:
+            self._last_save_id = max(int(time.time() * 1000), self._last_save_id + 1)
+            return self._last_save_id
+
+    def insert(self, records: Sequence[Record]) -> int:
+        """レコードをまとめて挿入（同じキーのレコードは置き換え、保存IDも更新）"""
+        if not records:
+            return 0
+        with self.pool.connection() as connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO market_records "
+                "(symbol, data_type, timestamp, name, data, saved_at) VALUES (?, ?, ?, ?, ?, ?)",
+                records)
+        return len(records)
+
+    def query(
+        self,
+        symbol: str,
+        data_type: str,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        limit: Optional[int] = None,
+        saved_at: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """期間 [start, end) のレコードを時刻順に取得（インデックスによる範囲検索）"""
+        return [data for _, _, data in self.iter_query(
+            symbol, data_type, start, end, limit=limit, saved_at=saved_at)]
+
+    def iter_query(
+        self,
+        symbol: str,
+        data_type: str,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        after: Optional[Tuple[int, str]] = None,
+        limit: Optional[int] = None,
+        batch_size: int = 500,
+        saved_at: Optional[int] = None
+    ) -> Iterator[Tuple[int, str, Dict[str, Any]]]:
+        """期間 [start, end) のレコードを (時刻, 名前, データ) として順に返す
+
+        結果は batch_size 件ずつ取得するため、全件をメモリに載せません。
+        after を指定した場合は、そのキー (時刻, 名前) より後のレコードから返します。
+        saved_at を指定した場合は、その保存で書き込んだレコードのみを返します。
+        """
+        sql = "SELECT timestamp, name, data FROM market_records WHERE symbol = ? AND data_type = ?"
+        params: List[Any] = [symbol, data_type]
+        if start is not None:
+            sql += " AND timestamp >= ?"
+            params.append(start)
+        if end is not None:
+            sql += " AND timestamp < ?"
+            params.append(end)
+        if after is not None:
+            sql += " AND (timestamp, name) > (?, ?)"
+            params.extend(after)
+        if saved_at is not None:
+            sql += " AND saved_at = ?"
+            params.append(saved_at)
+        sql += " ORDER BY timestamp, name"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self.pool.connection() as connection:
+            cursor = connection.execute(sql, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield row["timestamp"], row["name"], json.loads(row["data"])
+
+    def latest_save(self, symbol: str, data_type: str) -> Optional[int]:
+        """最後の保存の保存ID"""
+        with self.pool.connection() as connection:
+            row = connection.execute(
+                "SELECT MAX(saved_at) AS latest FROM market_records "
+                "WHERE symbol = ? AND data_type = ?",
+                (symbol, data_type)).fetchone()
+        return row["latest"]
+
+    def delete_before(self, timestamp: int) -> int:
+        """指定時刻より前のレコードを削除"""
+        with self.pool.connection() as connection:
+            cursor = connection.execute(
+                "DELETE FROM market_records WHERE timestamp < ?", (timestamp,))
+            return cursor.rowcount
+
+    def count(self) -> int:
+        with self.pool.connection() as connection:
+            return connection.execute(
+                "SELECT COUNT(*) FROM market_records").fetchone()[0]
@@ -1,33 +1,95 @@
 """
 データ蓄積用ストレージサービス
 データベースまたはCSVファイルにデータを保存いたします
+
+非同期のハンドラからは save_market_data_async で書き込みキューに積み、
+ディスクへの書き込みはバックグラウンドでまとめて行います。
+保存したデータの読み込みは iter_stored_data で1行ずつ行い、
+期間の終わりや件数の上限に達した時点でファイルの読み込みを止めます。
+日次のCSV/JSONファイルは compact_daily_files で月単位の列指向アーカイブにまとめます。
 """
 
+import asyncio
 import csv
 import json
 import logging
 import os
-from datetime import datetime, timezone
+import re
+from contextlib import closing
+from datetime import datetime, timedelta, timezone
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+import pandas as pd
+
+from src.core.config import AppConfig
+
+from .archive import SUFFIX as ARCHIVE_SUFFIX
+from .archive import ColumnarArchive, is_partition_name, month_of
+from .sqlite_backend import (
+    Record,
+    SQLiteConnectionPool,
+    SQLiteStorage,
+    sqlite_path_from_url,
+)
+from .write_behind import WriteBehindQueue, WriteRequest
 
 logger = logging.getLogger(__name__)
 
+FSYNC_POLICIES = ("always", "batch", "none")
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_NAME_PATTERN = re.compile(r"^[A-Za-z0-9._^=-]+$")
+# ファイル名末尾の保存日時（CSVは日付、JSONは日付_時刻）
+_SAVED_AT_PATTERN = re.compile(r"^\d{8}(_\d{6})?$")
+# 日次ファイル名（{シンボル}_{データタイプ}_{保存日時}）
+_DAILY_FILE_PATTERN = re.compile(
+    r"^(?P<symbol>[^_]+)_(?P<data_type>.+)_(?P<saved_at>\d{8}(?:_\d{6})?)$")
+
 
 class StorageService:
     """データ蓄積用ストレージサービス"""
 
-    def __init__(self, storage_type: str = "csv", data_dir: str = "data"):
+    def __init__(
+        self,
+        storage_type: str = "csv",
+        data_dir: str = "data",
+        database_url: Optional[str] = None,
+        fsync: str = AppConfig.STORAGE_FSYNC
+    ):
         """
         初期化
 
         Args:
-            storage_type: ストレージタイプ ("csv" または "json")
+            storage_type: ストレージタイプ ("csv"・"json"・"sqlite")
             data_dir: データ保存ディレクトリ
+            database_url: SQLiteのURL（未指定の場合は AppConfig.get_database_url()）
+            fsync: fsyncの方針 ("always"・"batch"・"none")
         """
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"サポートされていないfsyncの方針: {fsync}")
+
         self.storage_type = storage_type
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(exist_ok=True)
+        self.fsync = fsync
+        self.archive = ColumnarArchive(self.data_dir / "archive")
+
+        self._sqlite: Optional[SQLiteStorage] = None
+        if storage_type == "sqlite":
+            path = sqlite_path_from_url(database_url or AppConfig.get_database_url())
+            # WALではコミットごとにfsyncされるのは FULL の場合のみ
+            self._sqlite = SQLiteStorage(SQLiteConnectionPool(
+                path, size=AppConfig.SQLITE_POOL_SIZE,
+                synchronous="NORMAL" if fsync == "none" else "FULL"))
+
+        self._writes = WriteBehindQueue(
+            self._write_batch,
+            max_size=AppConfig.STORAGE_QUEUE_MAX_SIZE,
+            batch_size=AppConfig.STORAGE_BATCH_SIZE,
+            flush_interval=AppConfig.STORAGE_FLUSH_INTERVAL
+        )
 
         logger.info(f"ストレージサービス初期化完了: {storage_type}, ディレクトリ: {data_dir}")
 
@@ -48,6 +110,8 @@ class StorageService:
                 return self._save_to_csv(symbol, data, data_type)
             elif self.storage_type == "json":
                 return self._save_to_json(symbol, data, data_type)
+            elif self.storage_type == "sqlite":
+                return self._save_to_sqlite(symbol, data, data_type)
             else:
                 logger.error(f"サポートされていないストレージタイプ: {self.storage_type}")
                 return False
@@ -56,8 +120,99 @@ class StorageService:
             logger.error(f"データ保存エラー: {str(e)}")
             return False
 
+    async def save_market_data_async(
+        self, symbol: str, data: Dict, data_type: str = "market"
+    ) -> None:
+        """
+        市場データを書き込みキューに積む（書き込みはバックグラウンドで実行）
+
+        キューが満杯の場合は空きができるまで待機します。
+        積んだ後のデータは書き込みが終わるまで変更しないでください。
+
+        Args:
+            symbol: 通貨ペアシンボル
+            data: 保存するデータ
+            data_type: データタイプ ("market", "historical", "indicators")
+        """
+        await self._writes.put(WriteRequest(symbol, data, data_type))
+
+    def start_writer(self) -> None:
+        """書き込みキューを開始（アプリ起動時）"""
+        self._writes.start()
+
+    async def flush(self) -> None:
+        """キューに積まれたデータが全て書き込まれるまで待機"""
+        await self._writes.flush()
+
+    async def close(self) -> None:
+        """キューに残ったデータを書き込んでから停止（アプリ終了時）"""
+        await self._writes.stop()
+
+    def _write_batch(self, requests: List[WriteRequest]) -> int:
+        """書き込みキューから受け取った要求をまとめて保存し、成功件数を返す"""
+        if self.storage_type == "sqlite":
+            return self._write_batch_to_sqlite(requests)
+
+        writers = {"csv": self._write_csv, "json": self._write_json}
+        writer = writers.get(self.storage_type)
+        if writer is None:
+            logger.error(f"サポートされていないストレージタイプ: {self.storage_type}")
+            return 0
+
+        written = 0
+        paths: Set[Path] = set()
+        for request in requests:
+            path = writer(request.symbol, request.data, request.data_type)
+            if path is not None:
+                paths.add(path)
+                written += 1
+
+        if self.fsync == "batch":
+            for path in paths:
+                self._fsync_path(path)
+        return written
+
+    def _write_batch_to_sqlite(self, requests: List[WriteRequest]) -> int:
+        """全ての要求のレコードを1つのトランザクションで挿入"""
+        records: List[Record] = []
+        written = 0
+        for request in requests:
+            rows = self._convert_to_rows(request.data, request.data_type)
+            if rows is None:
+                logger.error(f"サポートされていないデータタイプ: {request.data_type}")
+                continue
+            records.extend(self._to_records(
+                request.symbol, request.data_type, rows, self._sqlite.next_save_id()))
+            written += 1
+
+        self._sqlite.insert(records)
+        logger.info(f"SQLiteにまとめて保存完了: {written}件の要求 - {len(records)}レコード")
+        return written
+
+    def _sync_file(self, file) -> None:
+        """fsyncの方針が "always" の場合は書き込んだファイルをディスクに反映"""
+        if self.fsync == "always":
+            file.flush()
+            os.fsync(file.fileno())
+
+    @staticmethod
+    def _fsync_path(path: Path) -> None:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
     def _save_to_csv(self, symbol: str, data: Dict, data_type: str) -> bool:
         """CSVファイルにデータを保存"""
+        return self._write_csv(symbol, data, data_type) is not None
+
+    def _save_to_json(self, symbol: str, data: Dict, data_type: str) -> bool:
+        """JSONファイルにデータを保存"""
+        return self._write_json(symbol, data, data_type) is not None
+
+    def _write_csv(self, symbol: str, data: Dict, data_type: str) -> Optional[Path]:
+        """CSVファイルにデータを書き込み、書き込んだパスを返す（失敗時None）"""
         try:
             # ファイル名を生成
             timestamp = datetime.now(timezone.utc).strftime("%Y%m%d")
@@ -65,30 +220,26 @@ class StorageService:
             filepath = self.data_dir / filename
 
             # データをCSV形式に変換
-            if data_type == "market":
-                csv_data = self._convert_market_data_to_csv(data)
-            elif data_type == "historical" or data_type.startswith("historical_"):
-                csv_data = self._convert_historical_data_to_csv(data)
-            elif data_type == "indicators" or data_type.startswith("indicators_"):
-                csv_data = self._convert_indicators_data_to_csv(data)
-            else:
+            csv_data = self._convert_to_rows(data, data_type)
+            if csv_data is None:
                 logger.error(f"サポートされていないデータタイプ: {data_type}")
-                return False
+                return None
 
             # CSVファイルに書き込み
             with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
                 writer = csv.writer(csvfile)
                 writer.writerows(csv_data)
+                self._sync_file(csvfile)
 
             logger.info(f"CSVファイルに保存完了: {filepath}")
-            return True
+            return filepath
 
         except Exception as e:
             logger.error(f"CSV保存エラー: {str(e)}")
-            return False
+            return None
 
-    def _save_to_json(self, symbol: str, data: Dict, data_type: str) -> bool:
-        """JSONファイルにデータを保存"""
+    def _write_json(self, symbol: str, data: Dict, data_type: str) -> Optional[Path]:
+        """JSONファイルにデータを書き込み、書き込んだパスを返す（失敗時None）"""
         try:
             # ファイル名を生成
             timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
@@ -107,14 +258,71 @@ class StorageService:
             with open(filepath, 'w', encoding='utf-8') as jsonfile:
                 json.dump(data_with_meta, jsonfile,
                           ensure_ascii=False, indent=2)
+                self._sync_file(jsonfile)
 
             logger.info(f"JSONファイルに保存完了: {filepath}")
-            return True
+            return filepath
 
         except Exception as e:
             logger.error(f"JSON保存エラー: {str(e)}")
+            return None
+
+    def _save_to_sqlite(self, symbol: str, data: Dict, data_type: str) -> bool:
+        """SQLiteにデータを保存（1行ずつではなくまとめて挿入）"""
+        try:
+            rows = self._convert_to_rows(data, data_type)
+            if rows is None:
+                logger.error(f"サポートされていないデータタイプ: {data_type}")
+                return False
+
+            count = self._sqlite.insert(self._to_records(
+                symbol, data_type, rows, self._sqlite.next_save_id()))
+            logger.info(f"SQLiteに保存完了: {symbol} {data_type} - {count}件")
+            return True
+
+        except Exception as e:
+            logger.error(f"SQLite保存エラー: {str(e)}")
             return False
 
+    def _convert_to_rows(self, data: Dict, data_type: str) -> Optional[List[List]]:
+        """データタイプに応じて行形式（先頭はヘッダー）に変換"""
+        if data_type == "market":
+            return self._convert_market_data_to_csv(data)
+        elif data_type == "historical" or data_type.startswith("historical_"):
+            return self._convert_historical_data_to_csv(data)
+        elif data_type == "indicators" or data_type.startswith("indicators_"):
+            return self._convert_indicators_data_to_csv(data)
+        return None
+
+    def _to_records(
+        self,
+        symbol: str,
+        data_type: str,
+        rows: List[List],
+        save_id: int
+    ) -> List[Record]:
+        """行形式のデータを1回の保存（save_id）分のSQLiteのレコードに変換"""
+        header, body = rows[0], rows[1:]
+        saved_at = datetime.now(timezone.utc)
+        records = []
+        for row in body:
+            item = dict(zip(header, row))
+            timestamp = self._to_epoch_ms(item.get("timestamp"), saved_at)
+            name = str(item.get("indicator_name", ""))
+            records.append((
+                symbol, data_type, timestamp, name,
+                json.dumps(item, ensure_ascii=False, default=str), save_id
+            ))
+        return records
+
+    @staticmethod
+    def _to_epoch_ms(value: Any, default: datetime) -> int:
+        """時刻をUTCエポックからのミリ秒に変換（空の場合は default）"""
+        timestamp = pd.Timestamp(default if value in (None, "") else value)
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.tz_localize("UTC")
+        return int(timestamp.value // 1_000_000)
+
     def _convert_market_data_to_csv(self, data: Dict) -> List[List]:
         """市場データをCSV形式に変換"""
         csv_data = [
@@ -198,6 +406,8 @@ class StorageService:
                 return self._get_from_csv(symbol, data_type, date)
             elif self.storage_type == "json":
                 return self._get_from_json(symbol, data_type, date)
+            elif self.storage_type == "sqlite":
+                return self._get_from_sqlite(symbol, data_type, date)
             else:
                 logger.error(f"サポートされていないストレージタイプ: {self.storage_type}")
                 return []
@@ -254,16 +464,243 @@ class StorageService:
             logger.error(f"JSON読み込みエラー: {str(e)}")
             return []
 
-    def _read_csv_file(self, filepath: Path) -> List[Dict]:
-        """CSVファイルを読み込み"""
-        data_list = []
+    def _get_from_sqlite(self, symbol: str, data_type: str, date: Optional[str] = None) -> List[Dict]:
+        """SQLiteからデータを取得
+
+        未指定の場合はCSV/JSONの最新ファイルと同じく、最後の保存で書き込んだ行を返します。
+        日付を指定した場合は、その日（UTC）の時刻の行を範囲検索します。
+        """
+        try:
+            if not date:
+                latest = self._sqlite.latest_save(symbol, data_type)
+                if latest is None:
+                    return []
+                return self._sqlite.query(symbol, data_type, saved_at=latest)
+
+            day = datetime.strptime(date, "%Y%m%d").replace(tzinfo=timezone.utc)
+            start = int(day.timestamp() * 1000)
+            end = int((day + timedelta(days=1)).timestamp() * 1000)
+            return self._sqlite.query(symbol, data_type, start, end)
 
+        except Exception as e:
+            logger.error(f"SQLite読み込みエラー: {str(e)}")
+            return []
+
+    def iter_stored_data(
+        self,
+        symbol: str,
+        data_type: str,
+        start: Optional[Any] = None,
+        end: Optional[Any] = None,
+        columns: Optional[Sequence[str]] = None,
+        limit: Optional[int] = None
+    ) -> Iterator[Dict]:
+        """
+        保存されたデータを1行ずつ返すジェネレータ
+
+        Args:
+            symbol: 通貨ペアシンボル
+            data_type: データタイプ
+            start: 開始時刻（この時刻を含む）
+            end: 終了時刻（この時刻を含まない）
+            columns: 返す列（未指定の場合は全ての列）
+            limit: 最大行数
+
+        Yields:
+            行データ
+        """
+        rows = self._iter_rows(
+            symbol, data_type, self._bound_ms(start), self._bound_ms(end), columns=columns)
+        with closing(rows):
+            for _, row in islice(rows, limit):
+                yield self._project(row, columns)
+
+    async def get_stored_page(
+        self,
+        symbol: str,
+        data_type: str,
+        start: Optional[Any] = None,
+        end: Optional[Any] = None,
+        columns: Optional[Sequence[str]] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Dict:
+        """保存されたデータを1ページ分取得（続きは next_cursor を cursor に指定）"""
+        return await asyncio.to_thread(
+            self._read_page, symbol, data_type, start, end, columns, limit, cursor)
+
+    def _read_page(
+        self,
+        symbol: str,
+        data_type: str,
+        start: Optional[Any],
+        end: Optional[Any],
+        columns: Optional[Sequence[str]],
+        limit: int,
+        cursor: Optional[str]
+    ) -> Dict:
+        rows = self._iter_rows(
+            symbol, data_type, self._bound_ms(start), self._bound_ms(end), cursor, columns)
+        # 1行多く読み、次のページがあるかを判定
+        with closing(rows):
+            page = list(islice(rows, limit + 1))
+
+        next_cursor = page[limit - 1][0] if len(page) > limit else None
+        data = [self._project(row, columns) for _, row in page[:limit]]
+        return {
+            "symbol": symbol,
+            "data_type": data_type,
+            "data": data,
+            "count": len(data),
+            "next_cursor": next_cursor
+        }
+
+    def _iter_rows(
+        self,
+        symbol: str,
+        data_type: str,
+        start_ms: Optional[int],
+        end_ms: Optional[int],
+        after: Optional[str] = None,
+        columns: Optional[Sequence[str]] = None
+    ) -> Iterator[Tuple[str, Dict]]:
+        """(カーソル, 行データ) を保存順に返す（after のカーソルより後の行から）
+
+        CSV/JSONの場合はアーカイブの月ファイル（古い順）、日次ファイルの順に読みます。
+        アーカイブは columns 指定時にその列のみを読み込みます。
+        """
+        for name in (symbol, data_type):
+            if not _NAME_PATTERN.match(name):
+                raise ValueError(f"無効なシンボルまたはデータタイプ: {name}")
+
+        if self.storage_type == "sqlite":
+            key = self._parse_sqlite_cursor(after) if after else None
+            for timestamp, name, data in self._sqlite.iter_query(
+                    symbol, data_type, start_ms, end_ms, after=key):
+                yield f"{timestamp}:{name}", data
+            return
+
+        if self.storage_type not in ("csv", "json"):
+            raise ValueError(f"サポートされていないストレージタイプ: {self.storage_type}")
+
+        prefix = f"{symbol}_{data_type}_"
+        after_key, after_index = self._parse_file_cursor(after, prefix) if after else (None, -1)
+        start_day = None if start_ms is None else datetime.fromtimestamp(
+            start_ms / 1000, tz=timezone.utc).strftime("%Y%m%d")
+
+        for month in self.archive.months(symbol, data_type):
+            name = f"{month}{ARCHIVE_SUFFIX}"
+            if after_key is not None and self._source_key(name) < after_key:
+                continue
+            if start_ms is not None and month < month_of(start_ms):
+                continue
+            if end_ms is not None and month > month_of(end_ms - 1):
+                continue
+            skip = after_index if self._source_key(name) == after_key else -1
+            rows = self.archive.iter_rows(
+                symbol, data_type, month, start_ms, end_ms, columns, after=skip)
+            with closing(rows):
+                for index, row in rows:
+                    yield f"{name}:{index}", row
+
+        for path in sorted(self.data_dir.glob(f"{prefix}*.{self.storage_type}")):
+            saved_at = path.stem[len(prefix):]
+            if not _SAVED_AT_PATTERN.match(saved_at):
+                continue
+            # 保存日より後の時刻の行は含まれないため、開始日より前に保存されたファイルは読まない
+            if start_day is not None and saved_at[:8] < start_day:
+                continue
+            if after_key is not None and self._source_key(path.name) < after_key:
+                continue
+            skip = after_index if self._source_key(path.name) == after_key else -1
+
+            rows = (self._iter_csv_rows(path) if self.storage_type == "csv"
+                    else self._iter_json_rows(path, data_type))
+            with closing(rows):
+                for index, row in enumerate(rows):
+                    if index <= skip:
+                        continue
+                    if start_ms is not None or end_ms is not None:
+                        timestamp = self._row_ms(row)
+                        if timestamp is None or (start_ms is not None and timestamp < start_ms):
+                            continue
+                        # ファイル内の行は時刻順のため、終了時刻に達したら残りは読まない
+                        if end_ms is not None and timestamp >= end_ms:
+                            break
+                    yield f"{path.name}:{index}", row
+
+    @classmethod
+    def _parse_file_cursor(cls, cursor: str, prefix: str) -> Tuple[Tuple[int, str], int]:
+        filename, _, index = cursor.rpartition(":")
+        valid_file = filename.startswith(prefix) or is_partition_name(filename)
+        if not valid_file or not index.isdigit():
+            raise ValueError(f"無効なカーソル: {cursor}")
+        return cls._source_key(filename), int(index)
+
+    @staticmethod
+    def _source_key(filename: str) -> Tuple[int, str]:
+        """読み込み順の並び替えキー（アーカイブの月ファイル → 日次ファイル）"""
+        return (0 if is_partition_name(filename) else 1), filename
+
+    @staticmethod
+    def _parse_sqlite_cursor(cursor: str) -> Tuple[int, str]:
+        timestamp, _, name = cursor.partition(":")
+        try:
+            return int(timestamp), name
+        except ValueError:
+            raise ValueError(f"無効なカーソル: {cursor}")
+
+    @classmethod
+    def _bound_ms(cls, value: Optional[Any]) -> Optional[int]:
+        if value is None or value == "":
+            return None
+        try:
+            return cls._to_epoch_ms(value, None)
+        except (TypeError, ValueError):
+            raise ValueError(f"無効な時刻: {value}")
+
+    @staticmethod
+    def _row_ms(row: Dict) -> Optional[int]:
+        """行の時刻をエポックミリ秒に変換（空・不正な場合はNone）"""
+        value = row.get("timestamp")
+        if value in (None, ""):
+            return None
+        try:
+            timestamp = datetime.fromisoformat(str(value))
+        except ValueError:
+            try:
+                timestamp = pd.Timestamp(value).to_pydatetime()
+            except (TypeError, ValueError):
+                return None
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        return (timestamp - _EPOCH) // timedelta(milliseconds=1)
+
+    @staticmethod
+    def _project(row: Dict, columns: Optional[Sequence[str]]) -> Dict:
+        if not columns:
+            return row
+        return {column: row.get(column) for column in columns}
+
+    def _iter_csv_rows(self, filepath: Path) -> Iterator[Dict]:
+        """CSVファイルを1行ずつ読み込み"""
         with open(filepath, 'r', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                data_list.append(dict(row))
+            for row in csv.DictReader(csvfile):
+                yield dict(row)
+
+    def _iter_json_rows(self, filepath: Path, data_type: str) -> Iterator[Dict]:
+        """JSONファイルの保存データを行形式で返す（1ファイルは1回分の保存データ）"""
+        payload = self._read_json_file(filepath)
+        rows = self._convert_to_rows(payload.get("data", {}), data_type)
+        if not rows:
+            return
+        header = rows[0]
+        for row in rows[1:]:
+            yield dict(zip(header, row))
 
-        return data_list
+    def _read_csv_file(self, filepath: Path) -> List[Dict]:
+        """CSVファイルを読み込み"""
+        return list(self._iter_csv_rows(filepath))
 
     def _read_json_file(self, filepath: Path) -> Dict:
         """JSONファイルを読み込み"""
@@ -293,6 +730,9 @@ class StorageService:
                         deleted_count += 1
                         logger.info(f"古いファイルを削除: {filepath}")
 
+            if self._sqlite is not None:
+                deleted_count += self._sqlite.delete_before(int(cutoff_date * 1000))
+
             logger.info(f"古いデータファイルのクリーンアップ完了: {deleted_count}件削除")
             return deleted_count
 
@@ -300,6 +740,110 @@ class StorageService:
             logger.error(f"データクリーンアップエラー: {str(e)}")
             return 0
 
+    def compact_daily_files(self, before: Optional[str] = None) -> Dict:
+        """
+        日次のCSV/JSONファイルを月単位のアーカイブにまとめ、まとめたファイルを削除
+
+        Args:
+            before: この日付（YYYYMMDD）より前に保存されたファイルが対象（未指定の場合は当日）。
+                当日の日次ファイルはまだ書き込まれるため、当日より後の日付は指定できません
+
+        Returns:
+            まとめたファイル数・行数・書き込んだ月ファイル数
+
+        Raises:
+            ValueError: before の形式が不正、または当日より後の日付の場合
+        """
+        result = {"files": 0, "rows": 0, "partitions": 0}
+        today = datetime.now(timezone.utc).strftime("%Y%m%d")
+        if before is None:
+            before = today
+        elif not re.fullmatch(r"\d{8}", before) or not self._is_date(before):
+            raise ValueError(f"無効な日付です（YYYYMMDD形式）: {before}")
+        elif before > today:
+            raise ValueError(f"当日（{today}）より後の日付は指定できません: {before}")
+
+        if self.storage_type not in ("csv", "json"):
+            return result
+
+        groups: Dict[Tuple[str, str], List[Tuple[Path, str]]] = {}
+        for path in sorted(self.data_dir.glob(f"*.{self.storage_type}")):
+            match = _DAILY_FILE_PATTERN.match(path.stem)
+            if not match or match["saved_at"][:8] >= before:
+                continue
+            key = (match["symbol"], match["data_type"])
+            groups.setdefault(key, []).append((path, match["saved_at"]))
+
+        for (symbol, data_type), files in groups.items():
+            # 行形式に変換できないデータタイプはアーカイブできないため残す
+            valid_names = all(_NAME_PATTERN.match(name) for name in (symbol, data_type))
+            if not valid_names or self._convert_to_rows({}, data_type) is None:
+                logger.warning(f"アーカイブできないファイルを残します: {symbol} {data_type}")
+                continue
+
+            rows = []
+            for path, saved_at in files:
+                saved = datetime.strptime(saved_at[:8], "%Y%m%d").replace(tzinfo=timezone.utc)
+                source = (self._iter_csv_rows(path) if self.storage_type == "csv"
+                          else self._iter_json_rows(path, data_type))
+                rows.extend(
+                    (self._to_epoch_ms(row.get("timestamp"), saved), row) for row in source)
+
+            partitions = self.archive.merge(symbol, data_type, rows)
+            for path, _ in files:
+                path.unlink()
+
+            result["files"] += len(files)
+            result["rows"] += len(rows)
+            result["partitions"] += len(partitions)
+            logger.info(
+                f"日次ファイルをアーカイブにまとめました: {symbol} {data_type} - "
+                f"{len(files)}ファイル → {len(partitions)}か月")
+
+        return result
+
+    @staticmethod
+    def _is_date(value: str) -> bool:
+        try:
+            datetime.strptime(value, "%Y%m%d")
+            return True
+        except ValueError:
+            return False
+
+    async def compact(self, before: Optional[str] = None) -> Dict:
+        """キューを書き込んでから日次ファイルをアーカイブにまとめる"""
+        await self.flush()
+        return await asyncio.to_thread(self.compact_daily_files, before)
+
+    async def get_status(self) -> Dict:
+        """ストレージの状態を取得（ファイル数・サイズ・書き込みキュー）"""
+        status = await asyncio.to_thread(self._collect_status)
+        status["write_queue"] = self._writes.stats()
+        return status
+
+    async def cleanup(self, days_to_keep: int = 30) -> Dict:
+        """キューを書き込んでから古いデータを削除"""
+        await self.flush()
+        deleted = await asyncio.to_thread(self.cleanup_old_data, days_to_keep)
+        return {"deleted": deleted, "days_to_keep": days_to_keep}
+
+    def _collect_status(self) -> Dict:
+        files = [path for path in self.data_dir.iterdir() if path.is_file()]
+        status = {
+            "storage_type": self.storage_type,
+            "data_dir": str(self.data_dir),
+            "fsync": self.fsync,
+            "files": len(files),
+            "bytes": sum(path.stat().st_size for path in files),
+            "archive": self.archive.get_status()
+        }
+        if self._sqlite is not None:
+            status["sqlite"] = {
+                "records": self._sqlite.count(),
+                "pool": self._sqlite.pool.stats()
+            }
+        return status
+
 
 # グローバルインスタンス
-storage_service = StorageService()
+storage_service = StorageService(storage_type=AppConfig.STORAGE_TYPE)
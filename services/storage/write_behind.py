@@ -0,0 +1,169 @@
+"""
+ストレージの書き込み遅延（write-behind）キュー
+保存要求をメモリ上のキューに積み、バックグラウンドでまとめて書き込みます
+
+保存要求はキューに積んだ時点で呼び出し元に戻るため、リクエストの応答時間は
+ディスクの遅延に左右されません。キューは件数の上限を持ち、満杯の場合は
+空きができるまで呼び出し元を待たせます（バックプレッシャー）。
+書き込みは件数（batch_size）または時間（flush_interval）のどちらかに達した時点で
+まとめて行い、ディスクへの書き込みはイベントループとは別のスレッドで実行します。
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WriteRequest:
+    """保存要求"""
+    symbol: str
+    data: Dict
+    data_type: str = "market"
+
+
+@dataclass
+class WriteBehindStats:
+    """書き込みキューの統計情報"""
+    enqueued: int = 0
+    written: int = 0
+    failed: int = 0
+    batches: int = 0
+    backpressure_waits: int = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        return dict(self.__dict__)
+
+
+class _Stop:
+    """停止の合図（これより前に積まれた要求は全て書き込む）"""
+
+
+class WriteBehindQueue:
+    """上限付きの書き込み遅延キュー
+
+    Args:
+        writer: 保存要求のリストを書き込み、成功件数を返す関数（別スレッドで実行）
+        max_size: キューの最大件数
+        batch_size: 1回にまとめて書き込む最大件数
+        flush_interval: 最初の要求から書き込みまでの最大待ち時間（秒）
+    """
+
+    def __init__(
+        self,
+        writer: Callable[[List[WriteRequest]], int],
+        max_size: int = 10000,
+        batch_size: int = 100,
+        flush_interval: float = 1.0
+    ):
+        self._writer = writer
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stats = WriteBehindStats()
+
+    @property
+    def running(self) -> bool:
+        return self._worker is not None and not self._worker.done()
+
+    def start(self) -> None:
+        """現在のイベントループで書き込みタスクを開始"""
+        loop = asyncio.get_running_loop()
+        if self.running and self._loop is loop:
+            return
+        if self.running and self._queue.qsize():
+            logger.warning(
+                f"別のイベントループの書き込みキューを破棄: {self._queue.qsize()}件")
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=self.max_size)
+        self._worker = loop.create_task(self._run())
+        logger.info(
+            f"書き込みキュー開始: 最大{self.max_size}件, "
+            f"{self.batch_size}件または{self.flush_interval}秒ごとに書き込み")
+
+    async def put(self, request: WriteRequest) -> None:
+        """保存要求をキューに積む（満杯の場合は空きができるまで待機）"""
+        self.start()
+
+        if self._queue.full():
+            self._stats.backpressure_waits += 1
+        await self._queue.put(request)
+        self._stats.enqueued += 1
+
+    async def flush(self) -> None:
+        """キューに積まれた要求が全て書き込まれるまで待機"""
+        if self._active():
+            await self._queue.join()
+
+    async def stop(self) -> None:
+        """残りの要求を書き込んでから停止（シャットダウン時）"""
+        if not self._active():
+            return
+        await self._queue.put(_Stop())
+        await self._worker
+        self._worker = None
+        logger.info(f"書き込みキュー停止: {self._stats.to_dict()}")
+
+    def stats(self) -> Dict[str, Any]:
+        """統計情報を取得"""
+        stats = self._stats.to_dict()
+        stats.update({
+            "running": self.running,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "max_size": self.max_size,
+            "batch_size": self.batch_size,
+            "flush_interval": self.flush_interval
+        })
+        return stats
+
+    def _active(self) -> bool:
+        """現在のイベントループで書き込みタスクが動いているか"""
+        return self.running and self._loop is asyncio.get_running_loop()
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if isinstance(item, _Stop):
+                self._queue.task_done()
+                break
+
+            batch = [item]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self._queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                if isinstance(item, _Stop):
+                    self._queue.task_done()
+                    stopping = True
+                    break
+                batch.append(item)
+
+            await self._write(batch)
+            for _ in batch:
+                self._queue.task_done()
+
+    async def _write(self, batch: List[WriteRequest]) -> None:
+        try:
+            written = await asyncio.to_thread(self._writer, batch)
+        except Exception as e:
+            logger.error(f"書き込みキューの書き込みエラー: {e}")
+            written = 0
+        self._stats.batches += 1
+        self._stats.written += written
+        self._stats.failed += len(batch) - written
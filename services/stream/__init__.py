@@ -0,0 +1,7 @@
+"""
+Stream services module.
+"""
+
+from .stream_service import stream_service
+
+__all__ = ["stream_service"]
@@ -0,0 +1,280 @@
+"""
+価格・インジケータ更新のプッシュ配信（Server-Sent Events）
+(シンボル, 期間, 間隔) ごとに1つの取得タスクで最新の足を確認し、
+変化した足とインジケータの値だけを購読中のクライアントに送信いたします
+
+- 取得タスクは購読者がいる間だけ動き、クライアント数に関わらず1つです。
+  確認は足の確定時刻の直後（STREAM_BAR_CLOSE_DELAY 秒後）と、
+  STREAM_POLL_INTERVAL 秒ごとの形成中の足の確認で行います。
+- クライアントごとの未送信の更新は1つにまとめられ、同じ足・インジケータの
+  更新は新しい値で上書きされます。送信が遅いクライアントがいても取得タスクは
+  待たされず、未送信の足が STREAM_MAX_PENDING_BARS を超えた場合は
+  resync イベントで再取得を促します。
+- 送信する更新がない間は STREAM_HEARTBEAT_INTERVAL 秒ごとにコメント行のみ送ります。
+"""
+
+import asyncio
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from services.data.intervals import interval_offset, utc_now
+from src.core.config import AppConfig
+from src.models.ohlcv import OHLCVFrame
+
+logger = logging.getLogger(__name__)
+
+TopicKey = Tuple[str, str, str]
+
+
+def format_event(event: str, data: Dict[str, Any]) -> str:
+    """SSEのイベント形式に変換"""
+    payload = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+def _bars(frame: OHLCVFrame, count: int) -> Dict[int, Dict[str, Any]]:
+    """直近 count 本の足を 時刻 -> 足 の辞書に変換"""
+    recent = frame.take(slice(max(0, len(frame) - count), len(frame)))
+    bars = {}
+    for index, timestamp in enumerate(recent.timestamp.tolist()):
+        bar = {"timestamp": datetime.fromtimestamp(timestamp / 1e9, tz=timezone.utc).isoformat()}
+        for name in ("open", "high", "low", "close", "volume"):
+            value = float(getattr(recent, name)[index])
+            bar[name] = None if np.isnan(value) else value
+        bars[timestamp] = bar
+    return bars
+
+
+class Subscriber:
+    """1クライアント分の未送信の更新
+
+    Args:
+        max_pending_bars: 未送信の足の上限（超えた場合は再取得を促す）
+    """
+
+    def __init__(self, max_pending_bars: int = AppConfig.STREAM_MAX_PENDING_BARS):
+        self.max_pending_bars = max_pending_bars
+        self._bars: Dict[int, Dict[str, Any]] = {}
+        self._indicators: Dict[str, Dict[str, Any]] = {}
+        self._resync = False
+        self._ready = asyncio.Event()
+        self.coalesced = 0
+
+    def offer(self, bars: Dict[int, Dict[str, Any]], indicators: Dict[str, Dict[str, Any]]) -> None:
+        """更新を未送信の更新にまとめる（待機しない）"""
+        if self._ready.is_set():
+            self.coalesced += 1
+        if not self._resync:
+            self._bars.update(bars)
+            self._indicators.update(indicators)
+            if len(self._bars) > self.max_pending_bars:
+                self._bars.clear()
+                self._indicators.clear()
+                self._resync = True
+        self._ready.set()
+
+    async def next(self, timeout: float) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """次に送る (イベント名, データ) を取得（timeout 秒以内に更新がなければ None）"""
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        self._ready.clear()
+
+        if self._resync:
+            self._resync = False
+            return "resync", {}
+
+        bars = [self._bars[timestamp] for timestamp in sorted(self._bars)]
+        indicators = self._indicators
+        self._bars, self._indicators = {}, {}
+        return "update", {"bars": bars, "indicators": indicators}
+
+
+class _Topic:
+    """(シンボル, 期間, 間隔) ごとの購読者と直近に送信した状態"""
+
+    def __init__(self, key: TopicKey):
+        self.key = key
+        self.subscribers: Set[Subscriber] = set()
+        self.task: Optional[asyncio.Task] = None
+        self.bars: Dict[int, Dict[str, Any]] = {}
+        self.indicators: Dict[str, Dict[str, Any]] = {}
+        self.last_timestamp: Optional[int] = None
+        self.refreshes = 0
+
+
+class StreamService:
+    """価格・インジケータ更新のプッシュ配信サービス
+
+    Args:
+        data_source: refresh_historical_frame を持つデータ取得サービス
+        analyzer: analyze_many を持つインジケータ分析サービス
+        indicator_names: 配信するインジケータ名を返す関数
+    """
+
+    def __init__(
+        self,
+        data_source=None,
+        analyzer=None,
+        indicator_names: Optional[Callable[[], Awaitable[List[str]]]] = None,
+        poll_interval: float = AppConfig.STREAM_POLL_INTERVAL,
+        bar_close_delay: float = AppConfig.STREAM_BAR_CLOSE_DELAY,
+        heartbeat_interval: float = AppConfig.STREAM_HEARTBEAT_INTERVAL,
+        snapshot_bars: int = AppConfig.STREAM_SNAPSHOT_BARS
+    ):
+        self._data_source = data_source
+        self._analyzer = analyzer
+        self._indicator_names = indicator_names
+        self.poll_interval = poll_interval
+        self.bar_close_delay = bar_close_delay
+        self.heartbeat_interval = heartbeat_interval
+        self.snapshot_bars = snapshot_bars
+        self._topics: Dict[TopicKey, _Topic] = {}
+
+    async def events(self, pair: str, period: str, interval: str) -> AsyncIterator[str]:
+        """SSEのイベントを返す非同期ジェネレータ（切断時に購読を解除）"""
+        key = (pair.upper(), period, interval)
+        subscriber = self.subscribe(key)
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                message = await subscriber.next(self.heartbeat_interval)
+                if message is None:
+                    yield ": keepalive\n\n"
+                    continue
+                yield format_event(*message)
+        finally:
+            self.unsubscribe(key, subscriber)
+
+    def subscribe(self, key: TopicKey) -> Subscriber:
+        """購読を開始（取得タスクがなければ開始し、取得済みの状態を最初に送る）"""
+        topic = self._topics.get(key)
+        if topic is None:
+            topic = self._topics[key] = _Topic(key)
+
+        subscriber = Subscriber()
+        topic.subscribers.add(subscriber)
+        if topic.bars:
+            subscriber.offer(topic.bars, topic.indicators)
+        if topic.task is None or topic.task.done():
+            topic.task = asyncio.get_running_loop().create_task(self._run(topic))
+        logger.info(f"配信の購読開始: {key} - 購読者{len(topic.subscribers)}件")
+        return subscriber
+
+    def unsubscribe(self, key: TopicKey, subscriber: Subscriber) -> None:
+        """購読を解除（購読者がいなくなった場合は取得タスクを停止）"""
+        topic = self._topics.get(key)
+        if topic is None:
+            return
+        topic.subscribers.discard(subscriber)
+        if not topic.subscribers:
+            if topic.task is not None:
+                topic.task.cancel()
+            del self._topics[key]
+        logger.info(f"配信の購読解除: {key} - 購読者{len(topic.subscribers)}件")
+
+    async def close(self) -> None:
+        """全ての取得タスクを停止（アプリ終了時）"""
+        tasks = [topic.task for topic in self._topics.values() if topic.task is not None]
+        self._topics.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """配信の統計情報を取得"""
+        return {
+            "topics": len(self._topics),
+            "subscribers": sum(len(topic.subscribers) for topic in self._topics.values()),
+            "refreshes": {
+                "/".join(key): topic.refreshes for key, topic in self._topics.items()
+            }
+        }
+
+    async def _run(self, topic: _Topic) -> None:
+        """購読者がいる間、最新の足を確認して変化を配信"""
+        while topic.subscribers:
+            try:
+                await self._refresh(topic)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"配信データの更新エラー: {topic.key}: {e}")
+            await asyncio.sleep(self._next_delay(topic))
+
+    async def _refresh(self, topic: _Topic) -> None:
+        pair, period, interval = topic.key
+        frame = await self._get_data_source().refresh_historical_frame(pair, period, interval)
+        topic.refreshes += 1
+        if frame is None or len(frame) == 0:
+            return
+
+        bars = _bars(frame, self.snapshot_bars)
+        changed_bars = {
+            timestamp: bar for timestamp, bar in bars.items() if topic.bars.get(timestamp) != bar
+        }
+        topic.bars = bars
+        topic.last_timestamp = int(frame.timestamp[-1])
+        if not changed_bars and topic.indicators:
+            return
+
+        # インジケータは足が変化した場合のみ再計算
+        changed_indicators = {}
+        analysis = await self._get_analyzer().analyze_many(
+            pair, await self._names(), period, interval)
+        if analysis:
+            indicators = analysis["indicators"]
+            changed_indicators = {
+                name: snapshot for name, snapshot in indicators.items()
+                if topic.indicators.get(name) != snapshot
+            }
+            topic.indicators = dict(indicators)
+
+        for subscriber in list(topic.subscribers):
+            subscriber.offer(changed_bars, changed_indicators)
+
+    def _next_delay(self, topic: _Topic) -> float:
+        """次の足の確定直後か、形成中の足の確認間隔のうち早い方まで待つ"""
+        if topic.last_timestamp is None:
+            return self.poll_interval
+        _, _, interval = topic.key
+        try:
+            closes_at = pd.Timestamp(topic.last_timestamp, tz="UTC") + interval_offset(interval)
+        except ValueError:
+            return self.poll_interval
+        until_close = (closes_at - utc_now()).total_seconds()
+        if until_close > -self.poll_interval:
+            # 確定直後の足が上流に反映されるまでは短い間隔で再確認
+            return min(self.poll_interval, max(until_close, 0) + self.bar_close_delay)
+        # 長く更新されていない系列（取引時間外など）は通常の間隔で確認
+        return self.poll_interval
+
+    async def _names(self) -> List[str]:
+        if self._indicator_names is not None:
+            return await self._indicator_names()
+        from services.indicators.services.indicator_service import indicator_service
+        return [info["name"] for info in await indicator_service.get_indicators()]
+
+    def _get_data_source(self):
+        if self._data_source is None:
+            from services.data.data_service import data_service
+            self._data_source = data_service
+        return self._data_source
+
+    def _get_analyzer(self):
+        if self._analyzer is None:
+            from services.indicators.services.indicator_analysis_service import (
+                indicator_analysis_service,
+            )
+            self._analyzer = indicator_analysis_service
+        return self._analyzer
+
+
+# シングルトンインスタンス
+stream_service = StreamService()
@@ -0,0 +1,143 @@
+"""
+履歴データのバイナリ形式（Arrow IPC / MessagePack）
+Accept ヘッダーでバイナリ形式が要求された場合に、OHLCVフレームの配列を
+そのまま書き出します（足ごとのPythonオブジェクトは作りません）
+
+- Arrow IPC ストリーム（application/vnd.apache.arrow.stream）:
+  timestamp（UTCのナノ秒）と open/high/low/close/volume（float64）の
+  1つのレコードバッチ。symbol/period/interval はスキーマのメタデータに入ります。
+- MessagePack（application/msgpack）:
+  JSONの列指向形式と同じ構造で、各列は {"dtype": "<f8", "data": <bin>} です。
+  クライアントは numpy.frombuffer(data, dtype) でそのまま配列にできます。
+  timestamp はISO文字列ではなくUTCエポックからのナノ秒（<i8）です。
+ページング時の next_cursor は Arrow ではスキーマのメタデータ、MessagePackでは
+トップレベルのキーに入ります。
+
+pyarrow・msgpack はどちらも任意で、インストールされていない形式は
+ネゴシエーションの対象になりません（JSONで応答します）。
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.models.ohlcv import OHLCVFrame
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+except ImportError:  # pragma: no cover - pyarrow は任意
+    pyarrow = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - msgpack は任意
+    msgpack = None
+
+JSON_MEDIA_TYPE = "application/json"
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+# Accept ヘッダーの値 -> 応答するメディアタイプ
+_ALIASES = {
+    ARROW_MEDIA_TYPE: ARROW_MEDIA_TYPE,
+    "application/vnd.apache.arrow.file": ARROW_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPE: MSGPACK_MEDIA_TYPE,
+    "application/x-msgpack": MSGPACK_MEDIA_TYPE,
+}
+PRICE_COLUMNS = ("open", "high", "low", "close", "volume")
+
+
+def available_media_types() -> List[str]:
+    """インストール済みのライブラリで書き出せるバイナリ形式"""
+    types = []
+    if pyarrow is not None:
+        types.append(ARROW_MEDIA_TYPE)
+    if msgpack is not None:
+        types.append(MSGPACK_MEDIA_TYPE)
+    return types
+
+
+def negotiate(accept: Optional[str]) -> Optional[str]:
+    """Accept ヘッダーから応答するバイナリ形式を選択（JSONで応答する場合は None）
+
+    品質値（q）の高い順に見て、JSONやワイルドカードより優先されている
+    書き出し可能なバイナリ形式があればそれを返します。
+    """
+    if not accept:
+        return None
+    available = available_media_types()
+    for media_type, _ in _parse_accept(accept):
+        resolved = _ALIASES.get(media_type)
+        if resolved in available:
+            return resolved
+        if media_type in (JSON_MEDIA_TYPE, "application/*", "*/*"):
+            return None
+    return None
+
+
+def encode_historical_binary(
+    media_type: str,
+    symbol: str,
+    period: str,
+    interval: str,
+    frame: OHLCVFrame,
+    next_cursor: Optional[str] = None
+) -> bytes:
+    """履歴データを指定したバイナリ形式で書き出す"""
+    metadata = {"symbol": symbol, "period": period, "interval": interval}
+    if next_cursor is not None:
+        metadata["next_cursor"] = next_cursor
+    if media_type == ARROW_MEDIA_TYPE:
+        return _encode_arrow(metadata, frame)
+    if media_type == MSGPACK_MEDIA_TYPE:
+        return _encode_msgpack(metadata, frame)
+    raise ValueError(f"未対応のメディアタイプ: {media_type}")
+
+
+def _encode_arrow(metadata: Dict[str, str], frame: OHLCVFrame) -> bytes:
+    columns = [pyarrow.array(frame.timestamp.view("datetime64[ns]")).cast(
+        pyarrow.timestamp("ns", tz="UTC"))]
+    columns += [pyarrow.array(getattr(frame, name)) for name in PRICE_COLUMNS]
+    schema = pyarrow.schema(
+        [pyarrow.field("timestamp", pyarrow.timestamp("ns", tz="UTC"))]
+        + [pyarrow.field(name, pyarrow.float64()) for name in PRICE_COLUMNS],
+        metadata=metadata)
+    batch = pyarrow.record_batch(columns, schema=schema)
+
+    sink = pyarrow.BufferOutputStream()
+    with pyarrow.ipc.new_stream(sink, schema) as writer:
+        writer.write_batch(batch)
+    return sink.getvalue().to_pybytes()
+
+
+def _encode_msgpack(metadata: Dict[str, str], frame: OHLCVFrame) -> bytes:
+    data: Dict[str, Dict] = {"timestamp": _packed_column(frame.timestamp, "<i8")}
+    for name in PRICE_COLUMNS:
+        data[name] = _packed_column(getattr(frame, name), "<f8")
+    return msgpack.packb(dict(
+        metadata, data_count=len(frame), format="columnar", data=data))
+
+
+def _packed_column(values: np.ndarray, dtype: str) -> Dict:
+    array = np.ascontiguousarray(values, dtype=dtype)
+    return {"dtype": dtype, "data": memoryview(array).cast("B")}
+
+
+def _parse_accept(accept: str) -> List[Tuple[str, float]]:
+    """Accept ヘッダーを (メディアタイプ, q) の一覧に変換（qの高い順、q=0は除外）"""
+    entries = []
+    for index, item in enumerate(accept.split(",")):
+        media_type, *params = [part.strip() for part in item.split(";")]
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if media_type and quality > 0:
+            entries.append((index, media_type.lower(), quality))
+    entries.sort(key=lambda entry: (-entry[2], entry[0]))
+    return [(media_type, quality) for _, media_type, quality in entries]
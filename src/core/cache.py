@@ -0,0 +1,169 @@
+"""
+TTL・LRU付きのインメモリキャッシュ
+エントリ数とバイト数の上限を超えた場合は最も古く使われたエントリから削除いたします
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+@dataclass
+class CacheStats:
+    """キャッシュの統計情報"""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    entries: int = 0
+    bytes: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "entries": self.entries,
+            "bytes": self.bytes,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+
+class TTLCache:
+    """TTLとLRU退避を備えたスレッドセーフなキャッシュ
+
+    Args:
+        ttl: エントリの有効期間（秒）
+        max_entries: 最大エントリ数（Noneの場合は無制限）
+        max_bytes: 合計サイズの上限（Noneの場合は無制限）
+        sizeof: 値のサイズ（バイト数）を見積もる関数
+    """
+
+    _MISSING = object()
+
+    def __init__(
+        self,
+        ttl: float,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        sizeof: Optional[Callable[[Any], int]] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof or (lambda value: 0)
+        self._clock = clock
+        # キー -> (値, 有効期限, サイズ)。末尾が最も新しく使われたエントリ
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """値を取得（期限切れ・未登録の場合はdefault）"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] <= self._clock():
+                self._remove(key)
+                self._stats.expirations += 1
+                self._stats.entries = len(self._entries)
+                entry = None
+
+            if entry is None:
+                self._stats.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            return entry[0]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """値を登録（上限を超えた分は古いエントリから退避）"""
+        size = self._sizeof(value)
+        expires_at = self._clock() + (self.ttl if ttl is None else ttl)
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            # 単体で上限を超える値はキャッシュしない
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+
+            self._entries[key] = (value, expires_at, size)
+            self._stats.bytes += size
+            self._evict()
+            self._stats.entries = len(self._entries)
+
+    def get_or_set(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """キャッシュにあれば返し、なければ計算して登録"""
+        value = self.get(key, self._MISSING)
+        if value is self._MISSING:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def delete(self, key: Hashable) -> bool:
+        """エントリを削除"""
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._remove(key)
+            self._stats.entries = len(self._entries)
+            return True
+
+    def clear(self) -> None:
+        """全エントリを削除（統計のカウンタは保持）"""
+        with self._lock:
+            self._entries.clear()
+            self._stats.entries = 0
+            self._stats.bytes = 0
+
+    def purge_expired(self) -> int:
+        """期限切れのエントリを削除し、削除件数を返す"""
+        with self._lock:
+            now = self._clock()
+            expired = [k for k, (_, expires_at, _) in self._entries.items()
+                       if expires_at <= now]
+            for key in expired:
+                self._remove(key)
+            self._stats.expirations += len(expired)
+            self._stats.entries = len(self._entries)
+            return len(expired)
+
+    def stats(self) -> Dict[str, Any]:
+        """統計情報を取得"""
+        with self._lock:
+            stats = self._stats.to_dict()
+        stats.update({
+            "ttl": self.ttl,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes
+        })
+        return stats
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry[1] > self._clock()
+
+    def _remove(self, key: Hashable) -> None:
+        _, _, size = self._entries.pop(key)
+        self._stats.bytes -= size
+
+    def _evict(self) -> None:
+        """上限を超えている間、最も古く使われたエントリを退避"""
+        while self._entries and (
+            (self.max_entries is not None and len(self._entries) > self.max_entries)
+            or (self.max_bytes is not None and self._stats.bytes > self.max_bytes)
+        ):
+            key = next(iter(self._entries))
+            self._remove(key)
+            self._stats.evictions += 1
@@ -80,6 +80,41 @@ class AppConfig:
 
     # キャッシュ設定
     CACHE_TTL = 300  # 5分
+    INDICATOR_CACHE_MAX_ENTRIES = int(
+        os.getenv("INDICATOR_CACHE_MAX_ENTRIES", "1024"))
+    INDICATOR_CACHE_MAX_BYTES = int(
+        os.getenv("INDICATOR_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    DATA_CACHE_MAX_BYTES = int(
+        os.getenv("DATA_CACHE_MAX_BYTES", str(128 * 1024 * 1024)))
+
+    # プッシュ配信設定（秒）
+    STREAM_POLL_INTERVAL = float(os.getenv("STREAM_POLL_INTERVAL", "30"))
+    STREAM_BAR_CLOSE_DELAY = float(os.getenv("STREAM_BAR_CLOSE_DELAY", "2"))
+    STREAM_HEARTBEAT_INTERVAL = float(os.getenv("STREAM_HEARTBEAT_INTERVAL", "15"))
+    # 初回に送る足の本数・クライアントごとに溜める未送信の足の上限
+    STREAM_SNAPSHOT_BARS = int(os.getenv("STREAM_SNAPSHOT_BARS", "100"))
+    STREAM_MAX_PENDING_BARS = int(os.getenv("STREAM_MAX_PENDING_BARS", "1000"))
+
+    # バックグラウンド更新設定
+    REFRESH_ENABLED = os.getenv("REFRESH_ENABLED", "true").lower() == "true"
+    # 事前計算する (期間:間隔) のカンマ区切り
+    REFRESH_SERIES = [
+        tuple(item.split(":", 1))
+        for item in os.getenv("REFRESH_SERIES", "1mo:1d").split(",") if ":" in item
+    ]
+    # 更新間隔は足の長さに合わせ、この範囲に収める（秒）
+    REFRESH_MIN_INTERVAL = float(os.getenv("REFRESH_MIN_INTERVAL", "60"))
+    REFRESH_MAX_INTERVAL = float(os.getenv("REFRESH_MAX_INTERVAL", "300"))
+    REFRESH_PRICE_INTERVAL = float(os.getenv("REFRESH_PRICE_INTERVAL", "60"))
+    REFRESH_CONCURRENCY = int(os.getenv("REFRESH_CONCURRENCY", "4"))
+
+    # 履歴データのページング（1ページの既定・最大の本数）
+    HISTORICAL_PAGE_SIZE = int(os.getenv("HISTORICAL_PAGE_SIZE", "1000"))
+    HISTORICAL_MAX_PAGE_SIZE = int(os.getenv("HISTORICAL_MAX_PAGE_SIZE", "10000"))
+
+    # 複数通貨の一括取得（1リクエストの最大通貨数・上流への同時取得数）
+    BATCH_MAX_SYMBOLS = int(os.getenv("BATCH_MAX_SYMBOLS", "50"))
+    BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "8"))
 
     # デフォルト設定
     DEFAULT_PERIOD = "5d"
@@ -107,15 +142,52 @@ class AppConfig:
 
     # データベース設定
     DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./crypto_data.db")
+    SQLITE_POOL_SIZE = int(os.getenv("SQLITE_POOL_SIZE", "4"))
+
+    # ストレージ設定（"csv"・"json"・"sqlite"）
+    STORAGE_TYPE = os.getenv("STORAGE_TYPE", "csv")
+    # 書き込みキュー（件数上限・まとめて書き込む件数・最大待ち時間[秒]）
+    STORAGE_QUEUE_MAX_SIZE = int(os.getenv("STORAGE_QUEUE_MAX_SIZE", "10000"))
+    STORAGE_BATCH_SIZE = int(os.getenv("STORAGE_BATCH_SIZE", "100"))
+    STORAGE_FLUSH_INTERVAL = float(os.getenv("STORAGE_FLUSH_INTERVAL", "1.0"))
+    # fsyncの方針（"always": 保存ごと・"batch": まとめて書き込むごと・"none": OSに任せる）
+    STORAGE_FSYNC = os.getenv("STORAGE_FSYNC", "batch")
 
     # 外部API設定
-    YAHOO_FINANCE_BASE_URL = "https://query1.finance.yahoo.com"
+    YAHOO_FINANCE_BASE_URL = os.getenv(
+        "YAHOO_FINANCE_BASE_URL", "https://query1.finance.yahoo.com")
+    BINANCE_FUTURES_BASE_URL = os.getenv(
+        "BINANCE_FUTURES_BASE_URL", "https://fapi.binance.com")
+    FEAR_GREED_BASE_URL = os.getenv(
+        "FEAR_GREED_BASE_URL", "https://api.alternative.me")
+    BLOCKCHAIN_INFO_BASE_URL = os.getenv(
+        "BLOCKCHAIN_INFO_BASE_URL", "https://api.blockchain.info")
     ALPHA_VANTAGE_API_KEY = os.getenv("ALPHA_VANTAGE_API_KEY", "")
     COINGECKO_API_KEY = os.getenv("COINGECKO_API_KEY", "")
 
+    # 外部API用HTTPクライアント設定
+    HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "10"))
+    HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+    HTTP_MAX_CONNECTIONS_PER_HOST = int(
+        os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "8"))
+    HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+    HTTP_USER_AGENT = os.getenv("HTTP_USER_AGENT", "Mozilla/5.0")
+
     # レート制限設定
     RATE_LIMIT_PER_MINUTE = int(os.getenv("RATE_LIMIT_PER_MINUTE", "60"))
     RATE_LIMIT_PER_HOUR = int(os.getenv("RATE_LIMIT_PER_HOUR", "1000"))
+    RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+    # 全クライアント合計の1分あたりの上限
+    RATE_LIMIT_GLOBAL_PER_MINUTE = int(os.getenv("RATE_LIMIT_GLOBAL_PER_MINUTE", "600"))
+    # インジケータ分析・一括取得の同時実行数の上限
+    RATE_LIMIT_EXPENSIVE_CONCURRENCY = int(
+        os.getenv("RATE_LIMIT_EXPENSIVE_CONCURRENCY", "8"))
+    RATE_LIMIT_MAX_CLIENTS = int(os.getenv("RATE_LIMIT_MAX_CLIENTS", "10000"))
+    # X-Forwarded-For を付ける信頼できるプロキシの段数（nginx の背後では 1、0 の場合はヘッダーを使わない）
+    # 従来の RATE_LIMIT_TRUST_FORWARDED=true は 1 段として扱う
+    RATE_LIMIT_TRUSTED_PROXIES = int(os.getenv(
+        "RATE_LIMIT_TRUSTED_PROXIES",
+        "1" if os.getenv("RATE_LIMIT_TRUST_FORWARDED", "false").lower() == "true" else "0"))
 
     # キャッシュ設定
     REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
@@ -142,6 +214,7 @@ class AppConfig:
     # データ保持設定
     DATA_RETENTION_DAYS = int(os.getenv("DATA_RETENTION_DAYS", "365"))
     CLEANUP_INTERVAL_HOURS = int(os.getenv("CLEANUP_INTERVAL_HOURS", "24"))
+    BAR_STORE_DIR = os.getenv("BAR_STORE_DIR", "data/bars")
 
     # 通知設定
     NOTIFICATION_ENABLED = os.getenv(
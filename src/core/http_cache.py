@@ -0,0 +1,62 @@
+"""
+HTTPの条件付きリクエストとキャッシュヘッダー
+データのバージョン（最後の足の時刻・フレームの内容）とリクエストのパラメータから
+ETagを作成し、If-None-Match が一致する場合は本文を作らずに 304 を返します
+
+max-age は足の更新間隔に合わせるため、ブラウザや前段のプロキシ（nginx）は
+期限内は再取得せず、期限後も 304 の確認のみで済みます。
+"""
+
+import hashlib
+from typing import Any, Dict, Optional
+
+from fastapi import Request, Response
+
+from src.core.config import AppConfig
+from src.models.ohlcv import OHLCVFrame
+
+
+def make_etag(*parts: Any) -> str:
+    """パラメータからETag（引用符付き）を作成"""
+    digest = hashlib.blake2b(digest_size=12)
+    for part in (AppConfig.API_VERSION,) + parts:
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\0")
+    return f'"{digest.hexdigest()}"'
+
+
+def frame_etag(frame: OHLCVFrame, *parts: Any) -> str:
+    """フレームのデータバージョンとパラメータからETagを作成
+
+    形成中の足は時刻が変わらずに値だけ更新されるため、最後の足の時刻に加えて
+    フレームの内容のハッシュ（フレームごとに1回のみ計算）も含めます。
+    """
+    last = int(frame.timestamp[-1]) if len(frame) else None
+    return make_etag(last, len(frame), frame.fingerprint(), *parts)
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """If-None-Match がETagと一致するか（弱い比較）"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(_opaque(tag) == etag for tag in header.split(","))
+
+
+def cache_headers(etag: str, max_age: float, vary: Optional[str] = None) -> Dict[str, str]:
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={int(max_age)}"}
+    if vary:
+        headers["Vary"] = vary
+    return headers
+
+
+def not_modified_response(etag: str, max_age: float, vary: Optional[str] = None) -> Response:
+    """本文なしの 304 レスポンス"""
+    return Response(status_code=304, headers=cache_headers(etag, max_age, vary))
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
@@ -0,0 +1,160 @@
+"""
+外部API用の非同期HTTPクライアント
+キープアライブの接続プールとホストごとの同時接続数制限を共有いたします
+
+外部データを取得するインジケータ（ファンディングレート・Fear & Greed Index・
+ハッシュレート・アクティブアドレス数・相関係数のベンチマーク）は、このクライアントを
+経由して取得するため、イベントループを塞がずに並行して実行できます。
+"""
+
+import asyncio
+import logging
+import threading
+import weakref
+from typing import Any, Coroutine, Dict, Optional, TypeVar
+from urllib.parse import urlsplit
+
+import httpx
+
+from .config import AppConfig
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class _LoopState:
+    """イベントループごとのクライアントとホスト別セマフォ"""
+
+    def __init__(self, client: httpx.AsyncClient):
+        self.client = client
+        self.host_limits: Dict[str, asyncio.Semaphore] = {}
+
+
+class AsyncHTTPClient:
+    """接続プール付きの共有非同期HTTPクライアント
+
+    httpx.AsyncClient はイベントループに紐づくため、ループごとに1つ作成して
+    再利用します（通常はuvicornのループ1つのみ）。
+
+    Args:
+        timeout: リクエストのタイムアウト（秒）
+        max_connections: 全体の最大接続数
+        max_connections_per_host: ホストごとの最大同時リクエスト数
+        keepalive_expiry: アイドル接続を保持する時間（秒）
+        transport: テスト用のトランスポート（Noneの場合は通常のネットワーク接続）
+    """
+
+    def __init__(
+        self,
+        timeout: float = AppConfig.HTTP_TIMEOUT,
+        max_connections: int = AppConfig.HTTP_MAX_CONNECTIONS,
+        max_connections_per_host: int = AppConfig.HTTP_MAX_CONNECTIONS_PER_HOST,
+        keepalive_expiry: float = AppConfig.HTTP_KEEPALIVE_EXPIRY,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.keepalive_expiry = keepalive_expiry
+        self._transport = transport
+        self._states: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState]" = (
+            weakref.WeakKeyDictionary())
+        self._lock = threading.Lock()
+
+    async def get_json(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None
+    ) -> Any:
+        """GETリクエストを送信してJSONを返す（ステータスが4xx/5xxの場合は例外）"""
+        response = await self.request(
+            "GET", url, params=params, headers=headers, timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        timeout: Optional[float] = None,
+        **kwargs
+    ) -> httpx.Response:
+        """リクエストを送信（ホストごとの同時接続数を制限）"""
+        state = self._state()
+        host = urlsplit(url).netloc
+        semaphore = state.host_limits.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_connections_per_host)
+            state.host_limits[host] = semaphore
+
+        async with semaphore:
+            return await state.client.request(
+                method, url,
+                timeout=self.timeout if timeout is None else timeout,
+                **kwargs)
+
+    async def aclose(self) -> None:
+        """現在のイベントループのクライアントを閉じる"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            state = self._states.pop(loop, None)
+        if state is not None:
+            await state.client.aclose()
+
+    def _state(self) -> _LoopState:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            state = self._states.get(loop)
+            if state is None:
+                state = _LoopState(httpx.AsyncClient(
+                    limits=httpx.Limits(
+                        max_connections=self.max_connections,
+                        max_keepalive_connections=self.max_connections,
+                        keepalive_expiry=self.keepalive_expiry
+                    ),
+                    headers={"User-Agent": AppConfig.HTTP_USER_AGENT},
+                    transport=self._transport,
+                    follow_redirects=True
+                ))
+                self._states[loop] = state
+            return state
+
+
+def run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """コルーチンを同期的に実行（同期APIとの互換用）
+
+    イベントループ内から呼ばれた場合は別スレッドで実行します。その間呼び出し元の
+    ループは待機するため、非同期のコードからは直接 await してください。
+    """
+    async def run() -> T:
+        try:
+            return await coro
+        finally:
+            await http_client.aclose()
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(run())
+
+    result: Dict[str, Any] = {}
+
+    def target():
+        try:
+            result["value"] = asyncio.run(run())
+        except BaseException as e:
+            result["error"] = e
+
+    thread = threading.Thread(target=target, name="http-client-sync")
+    thread.start()
+    thread.join()
+    if "error" in result:
+        raise result["error"]
+    return result["value"]
+
+
+# シングルトンインスタンス
+http_client = AsyncHTTPClient()
@@ -0,0 +1,135 @@
+"""
+高速なJSONエンコード
+OHLCVフレームの配列から直接JSONを書き出し、足ごとのpydanticモデルの
+検証・シリアライズを省きます
+
+orjson がインストールされていれば配列をそのまま渡して書き出し、
+インストールされていない場合は標準の json モジュールを使用します。
+出力は HistoricalData をpydanticでシリアライズした場合と同じ形式です
+（時刻はISO 8601、欠損値は null）。
+"""
+
+import json
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from src.models.ohlcv import OHLCVFrame
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson は任意
+    orjson = None
+
+PRICE_COLUMNS = ("open", "high", "low", "close", "volume")
+
+
+def dumps(value: Any) -> bytes:
+    """JSONのバイト列に変換（NumPy配列はそのまま渡せる）"""
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"),
+                      default=_to_builtin).encode("utf-8")
+
+
+def _to_builtin(value: Any) -> Any:
+    if isinstance(value, np.ndarray):
+        return _column_list(value)
+    raise TypeError(f"JSONに変換できない型: {type(value).__name__}")
+
+
+def _column_list(values: np.ndarray) -> List[Any]:
+    """配列をリストに変換（NaNは None）"""
+    items = values.tolist()
+    if values.dtype.kind == "f":
+        for index in np.flatnonzero(np.isnan(values)).tolist():
+            items[index] = None
+    return items
+
+
+def iso_timestamps(frame: OHLCVFrame) -> List[str]:
+    """時刻をISO 8601文字列に変換（フレームごとにキャッシュ）"""
+    def compute() -> np.ndarray:
+        timestamps = frame.timestamp.view("datetime64[ns]")
+        # datetime.isoformat() と同じく、秒未満がなければ秒単位で出力
+        whole_seconds = not np.any(frame.timestamp % 1_000_000_000)
+        unit = "s" if whole_seconds else "us"
+        text = np.datetime_as_string(timestamps.astype(f"datetime64[{unit}]"), unit=unit)
+        return np.char.add(text, "+00:00").astype(object)
+
+    return frame.intermediate(("iso_timestamps",), compute, dtype=object).tolist()
+
+
+def frame_columns(frame: OHLCVFrame) -> Dict[str, Any]:
+    """列指向の形式 {"timestamp": [...], "open": [...], ...}"""
+    columns: Dict[str, Any] = {"timestamp": iso_timestamps(frame)}
+    for name in PRICE_COLUMNS:
+        columns[name] = getattr(frame, name) if orjson is not None else _column_list(
+            getattr(frame, name))
+    return columns
+
+
+def frame_rows(frame: OHLCVFrame) -> List[Dict[str, Any]]:
+    """行形式 [{"timestamp": ..., "open": ..., ...}, ...]"""
+    columns = [iso_timestamps(frame)] + [
+        _column_list(getattr(frame, name)) for name in PRICE_COLUMNS]
+    return [
+        {"timestamp": t, "open": o, "high": h, "low": l, "close": c, "volume": v}
+        for t, o, h, l, c, v in zip(*columns)
+    ]
+
+
+def encode_historical(
+    symbol: str,
+    period: str,
+    interval: str,
+    frame: OHLCVFrame,
+    columnar: bool = False,
+    next_cursor: Optional[str] = None
+) -> bytes:
+    """履歴データのレスポンスを書き出す
+
+    columnar=True の場合は data を列ごとの配列にした形式で返します。
+    """
+    return dumps(historical_body(symbol, period, interval, frame, columnar, next_cursor))
+
+
+def encode_historical_batch(
+    period: str,
+    interval: str,
+    frames: Dict[str, Optional[OHLCVFrame]],
+    columnar: bool = False
+) -> bytes:
+    """複数通貨の履歴データのレスポンスを書き出す（データのない通貨は missing に入る）"""
+    data = {
+        symbol: historical_body(symbol, period, interval, frame, columnar)
+        for symbol, frame in frames.items() if frame is not None and len(frame) > 0
+    }
+    return dumps({
+        "period": period,
+        "interval": interval,
+        "data": data,
+        "missing": [symbol for symbol in frames if symbol not in data]
+    })
+
+
+def historical_body(
+    symbol: str,
+    period: str,
+    interval: str,
+    frame: OHLCVFrame,
+    columnar: bool = False,
+    next_cursor: Optional[str] = None
+) -> Dict[str, Any]:
+    body: Dict[str, Any] = {
+        "symbol": symbol,
+        "period": period,
+        "interval": interval,
+        "data_count": len(frame),
+        "data": frame_columns(frame) if columnar else frame_rows(frame),
+        "indicators": None,
+        "next_cursor": next_cursor
+    }
+    if columnar:
+        body["format"] = "columnar"
+    return body
@@ -0,0 +1,270 @@
+"""
+トークンバケットによるレート制限と負荷制御
+APIへのリクエストを、ハンドラ（インジケータ計算や上流への取得）に入る前に
+受け付けるかどうか判定いたします
+
+- クライアントごとに1分・1時間のバケット（RATE_LIMIT_PER_MINUTE / RATE_LIMIT_PER_HOUR）
+- 全体のバケット（RATE_LIMIT_GLOBAL_PER_MINUTE）
+- 重いエンドポイント（インジケータ分析・複数通貨の一括取得）の同時実行数の上限
+  （RATE_LIMIT_EXPENSIVE_CONCURRENCY）
+
+バケットが空の場合は 429、重いエンドポイントが上限まで実行中の場合は 503 を
+Retry-After 付きで即座に返します。待たせずに断るため、過剰に送ってくる
+クライアントがいても、他のクライアントの応答時間は延びません。
+"""
+
+import logging
+import math
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from starlette.responses import JSONResponse
+
+from .config import AppConfig
+
+logger = logging.getLogger(__name__)
+
+# レート制限の対象（静的ファイル・画面・ヘルスチェックは対象外）
+LIMITED_PREFIX = "/api/"
+# 同時実行数を制限する重いエンドポイント
+EXPENSIVE_PREFIXES = ("/api/analysis/",)
+EXPENSIVE_PATHS = ("/api/historical", "/api/prices")
+
+
+class TokenBucket:
+    """トークンバケット
+
+    Args:
+        capacity: バケットの容量（連続して受け付けられる最大数）
+        refill_per_second: 1秒あたりに補充されるトークン数
+    """
+
+    __slots__ = ("capacity", "refill_per_second", "tokens", "updated_at")
+
+    def __init__(self, capacity: float, refill_per_second: float, now: float):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.tokens = capacity
+        self.updated_at = now
+
+    def wait_time(self, now: float, cost: float = 1.0) -> float:
+        """cost 分のトークンが溜まるまでの秒数（今すぐ取れる場合は 0）"""
+        self._refill(now)
+        if self.tokens >= cost:
+            return 0.0
+        return (cost - self.tokens) / self.refill_per_second
+
+    def consume(self, now: float, cost: float = 1.0) -> None:
+        self._refill(now)
+        self.tokens -= cost
+
+    def is_full(self, now: float) -> bool:
+        self._refill(now)
+        return self.tokens >= self.capacity
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self.updated_at
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_per_second)
+            self.updated_at = now
+
+
+@dataclass
+class Admission:
+    """受け付けの判定結果"""
+    allowed: bool
+    status_code: int = 200
+    retry_after: int = 0
+    expensive: bool = False
+    remaining: Optional[int] = None
+
+
+class RateLimiter:
+    """クライアントごと・全体のトークンバケットと重いエンドポイントの同時実行数
+
+    Args:
+        per_minute: クライアントごとの1分あたりの上限（0以下で無効）
+        per_hour: クライアントごとの1時間あたりの上限（0以下で無効）
+        global_per_minute: 全体の1分あたりの上限（0以下で無効）
+        expensive_concurrency: 重いエンドポイントの同時実行数（0以下で無効）
+        max_clients: 保持するクライアントの上限（超えた場合は満杯のバケットを破棄）
+        clock: 現在時刻（秒）を返す関数
+    """
+
+    def __init__(
+        self,
+        per_minute: int = AppConfig.get_rate_limit()["per_minute"],
+        per_hour: int = AppConfig.get_rate_limit()["per_hour"],
+        global_per_minute: int = AppConfig.RATE_LIMIT_GLOBAL_PER_MINUTE,
+        expensive_concurrency: int = AppConfig.RATE_LIMIT_EXPENSIVE_CONCURRENCY,
+        max_clients: int = AppConfig.RATE_LIMIT_MAX_CLIENTS,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.per_minute = per_minute
+        self.per_hour = per_hour
+        self.expensive_concurrency = expensive_concurrency
+        self.max_clients = max_clients
+        self._clock = clock
+        self._clients: Dict[str, List[TokenBucket]] = {}
+        self._global = (
+            TokenBucket(global_per_minute, global_per_minute / 60, clock())
+            if global_per_minute > 0 else None)
+        self._expensive_running = 0
+        self._stats = {"allowed": 0, "limited": 0, "shed": 0}
+
+    @staticmethod
+    def applies(path: str) -> bool:
+        return path.startswith(LIMITED_PREFIX)
+
+    @staticmethod
+    def is_expensive(path: str) -> bool:
+        return path.startswith(EXPENSIVE_PREFIXES) or path in EXPENSIVE_PATHS
+
+    def admit(self, client: str, path: str) -> Admission:
+        """リクエストを受け付けるか判定（受け付けた場合はトークンを消費）"""
+        now = self._clock()
+        buckets = self._buckets(client, now)
+        if self._global is not None:
+            buckets = buckets + [self._global]
+
+        # 全てのバケットにトークンがある場合のみ消費する（断ったリクエストは数えない）
+        wait = max((bucket.wait_time(now) for bucket in buckets), default=0.0)
+        if wait > 0:
+            self._stats["limited"] += 1
+            return Admission(False, 429, retry_after=max(1, math.ceil(wait)))
+
+        expensive = self.is_expensive(path)
+        if (expensive and self.expensive_concurrency > 0
+                and self._expensive_running >= self.expensive_concurrency):
+            self._stats["shed"] += 1
+            return Admission(False, 503, retry_after=1)
+
+        for bucket in buckets:
+            bucket.consume(now)
+        if expensive:
+            self._expensive_running += 1
+        self._stats["allowed"] += 1
+        remaining = int(buckets[0].tokens) if self.per_minute > 0 else None
+        return Admission(True, expensive=expensive, remaining=remaining)
+
+    def release(self, admission: Admission) -> None:
+        """重いエンドポイントの実行終了を記録"""
+        if admission.allowed and admission.expensive:
+            self._expensive_running -= 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self._stats)
+        stats.update({
+            "clients": len(self._clients),
+            "expensive_running": self._expensive_running,
+            "per_minute": self.per_minute,
+            "per_hour": self.per_hour
+        })
+        return stats
+
+    def _buckets(self, client: str, now: float) -> List[TokenBucket]:
+        buckets = self._clients.get(client)
+        if buckets is None:
+            if len(self._clients) >= self.max_clients:
+                self._prune(now)
+            buckets = []
+            if self.per_minute > 0:
+                buckets.append(TokenBucket(self.per_minute, self.per_minute / 60, now))
+            if self.per_hour > 0:
+                buckets.append(TokenBucket(self.per_hour, self.per_hour / 3600, now))
+            self._clients[client] = buckets
+        return buckets
+
+    def _prune(self, now: float) -> None:
+        """満杯まで回復したクライアント（しばらくリクエストのないクライアント）を破棄"""
+        idle = [
+            client for client, buckets in self._clients.items()
+            if all(bucket.is_full(now) for bucket in buckets)
+        ]
+        for client in idle:
+            del self._clients[client]
+        logger.debug(f"レート制限のクライアントを破棄: {len(idle)}件")
+
+
+class RateLimitMiddleware:
+    """ハンドラの前でレート制限を適用するASGIミドルウェア
+
+    Args:
+        app: ASGIアプリケーション
+        limiter: レート制限（既定は rate_limiter）
+        trusted_proxies: X-Forwarded-For を付ける信頼できるプロキシの段数（0 の場合はヘッダーを使わない）
+    """
+
+    def __init__(
+        self,
+        app,
+        limiter: Optional[RateLimiter] = None,
+        trusted_proxies: int = AppConfig.RATE_LIMIT_TRUSTED_PROXIES
+    ):
+        self.app = app
+        self.limiter = limiter if limiter is not None else rate_limiter
+        self.trusted_proxies = trusted_proxies
+
+    async def __call__(self, scope, receive, send) -> None:
+        if (not AppConfig.RATE_LIMIT_ENABLED or scope["type"] != "http"
+                or not self.limiter.applies(scope["path"])):
+            await self.app(scope, receive, send)
+            return
+
+        admission = self.limiter.admit(self._client(scope), scope["path"])
+        if not admission.allowed:
+            await self._reject(admission, scope, receive, send)
+            return
+
+        async def send_with_headers(message) -> None:
+            if message["type"] == "http.response.start" and admission.remaining is not None:
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-ratelimit-limit", str(self.limiter.per_minute).encode()),
+                    (b"x-ratelimit-remaining", str(admission.remaining).encode()),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            self.limiter.release(admission)
+
+    def _client(self, scope) -> str:
+        """レート制限のキーにするクライアントのアドレス
+
+        X-Forwarded-For の左側はクライアントが自由に書けるため、信頼できるプロキシが
+        右端から追加した分だけを数え、最も外側のプロキシが接続を受けたアドレスを使います。
+        """
+        if self.trusted_proxies > 0:
+            forwarded = [
+                address.strip()
+                for name, value in scope.get("headers", [])
+                if name == b"x-forwarded-for"
+                for address in value.decode("latin-1").split(",")
+                if address.strip()
+            ]
+            if forwarded:
+                return forwarded[-min(self.trusted_proxies, len(forwarded))]
+        client: Optional[Tuple[str, int]] = scope.get("client")
+        return client[0] if client else "unknown"
+
+    @staticmethod
+    async def _reject(admission: Admission, scope, receive, send) -> None:
+        error = ("リクエストが多すぎます" if admission.status_code == 429
+                 else "サーバーが混み合っています")
+        response = JSONResponse(
+            status_code=admission.status_code,
+            content={
+                "error": error,
+                "status_code": admission.status_code,
+                "timestamp": datetime.now(timezone.utc).isoformat()
+            },
+            headers={"Retry-After": str(admission.retry_after)}
+        )
+        await response(scope, receive, send)
+
+
+# シングルトンインスタンス
+rate_limiter = RateLimiter()
@@ -7,27 +7,51 @@ import logging
 import os
 import sys
 import time
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
-from typing import List
+from typing import List, Optional
 
 from fastapi import FastAPI, HTTPException, Query, Request
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
-from services import data_service, indicator_service, storage_service
+from services import (
+    data_service,
+    indicator_service,
+    refresh_service,
+    storage_service,
+    stream_service,
+)
 from services.indicators.services.indicator_analysis_service import (
+    INDICATOR_MAPPING,
     indicator_analysis_service,
 )
+from services.data.pagination import page_frame, range_period, resolve_range
+from services.refresh.refresh_service import refresh_interval
 
 from .core.config import AppConfig
+from .core.binary_encoding import encode_historical_binary, negotiate
+from .core.http_cache import (
+    cache_headers,
+    frame_etag,
+    is_not_modified,
+    make_etag,
+    not_modified_response,
+)
+from .core.http_client import http_client
+from .core.json_encoding import encode_historical, encode_historical_batch
+from .core.rate_limit import RateLimitMiddleware, rate_limiter
 from .models.schemas import (
+    BatchHistoricalData,
+    BatchPriceData,
     CurrencyPairData,
     ErrorResponse,
     HealthCheck,
     HistoricalData,
     IndicatorAnalysis,
     IndicatorInfo,
+    MultiIndicatorAnalysis,
 )
 
 # プロジェクトルートをPythonパスに追加
@@ -49,12 +73,33 @@ logger = logging.getLogger(__name__)
 # アプリ起動時刻
 start_time = time.time()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """アプリのライフサイクル管理"""
+    storage_service.start_writer()
+    # 設定された全通貨の履歴データ・インジケータ分析をバックグラウンドで事前計算
+    if AppConfig.REFRESH_ENABLED:
+        refresh_service.start()
+    yield
+    # 更新・配信のタスクを止め、書き込みキューに残ったデータを保存してから終了
+    await refresh_service.stop()
+    await stream_service.close()
+    await storage_service.close()
+    # 外部API用HTTPクライアントの接続プールを閉じる
+    await http_client.aclose()
+
+
 app = FastAPI(
     title=AppConfig.API_TITLE,
     description=AppConfig.API_DESCRIPTION,
-    version=AppConfig.API_VERSION
+    version=AppConfig.API_VERSION,
+    lifespan=lifespan
 )
 
+# APIへのリクエストはハンドラに入る前にレート制限・同時実行数の上限を適用
+app.add_middleware(RateLimitMiddleware)
+
 # 静的ファイルとテンプレートの設定
 app.mount(
     "/static", StaticFiles(directory="/workspaces/discord-bot-v3/static"), name="static")
@@ -117,20 +162,42 @@ async def debug_config():
     }
 
 
+@app.get("/debug/cache")
+async def debug_cache():
+    """キャッシュ統計のデバッグ用エンドポイント"""
+    return {
+        "data": data_service.get_cache_stats(),
+        "indicators": indicator_service.get_factory_stats()["cache_stats"],
+        "refresh": refresh_service.get_stats(),
+        "stream": stream_service.get_stats(),
+        "rate_limit": rate_limiter.get_stats()
+    }
+
+
 # ========================================
 # 価格データエンドポイント
 # ========================================
 
 @app.get("/api/price/{pair}", response_model=CurrencyPairData)
 async def get_current_price(
+    request: Request,
+    response: Response,
     pair: str
 ):
     """現在価格と基本情報を取得"""
     try:
-        data = await data_service.get_current_price(pair)
+        # 事前計算済みのスナップショットがあればそれを返す
+        data = refresh_service.get_price(pair) or await data_service.get_current_price(pair)
         if not data:
             raise HTTPException(
                 status_code=404, detail=f"通貨ペア '{pair}' のデータが見つかりません")
+
+        # 取得時刻以外の値が変わっていなければ 304
+        etag = make_etag(data.symbol, data.price, data.volume, data.change_24h)
+        max_age = AppConfig.REFRESH_PRICE_INTERVAL
+        if is_not_modified(request, etag):
+            return not_modified_response(etag, max_age)
+        response.headers.update(cache_headers(etag, max_age))
         return data
     except HTTPException:
         raise
@@ -141,23 +208,82 @@ async def get_current_price(
 
 @app.get("/api/historical/{pair}", response_model=HistoricalData)
 async def get_historical_data(
+    request: Request,
     pair: str,
-    period: str = Query("1d", description="期間"),
-    interval: str = Query("1m", description="間隔")
+    period: Optional[str] = Query(
+        None, description="期間（省略時は start を含む最も短い期間、start もなければ 1d）"),
+    interval: str = Query("1m", description="間隔"),
+    format: str = Query(
+        "rows", pattern="^(rows|columnar)$",
+        description="rows: 足ごとのオブジェクト / columnar: 列ごとの配列"),
+    start: Optional[str] = Query(None, description="開始時刻（ISO 8601）"),
+    end: Optional[str] = Query(None, description="終了時刻（ISO 8601、この時刻を含まない）"),
+    limit: Optional[int] = Query(
+        None, ge=1, le=AppConfig.HISTORICAL_MAX_PAGE_SIZE, description="1ページの最大件数"),
+    cursor: Optional[str] = Query(None, description="前のページの next_cursor")
 ):
-    """履歴データを取得"""
+    """履歴データを取得（フレームの配列から直接JSONを書き出す）
+
+    Accept ヘッダーで application/vnd.apache.arrow.stream または application/msgpack を
+    要求した場合は、列ごとの配列をバイナリ形式で返します。
+    start・end・limit・cursor のいずれかを指定した場合は1ページ分のみを返し、
+    続きがあれば next_cursor を返します。指定された期間が範囲を含まない場合は400を返します。
+    """
     try:
         # パラメータ検証
-        if period not in AppConfig.VALID_PERIODS:
+        if period is not None and period not in AppConfig.VALID_PERIODS:
             raise HTTPException(status_code=400, detail=f"無効な期間: {period}")
         if interval not in AppConfig.VALID_INTERVALS:
             raise HTTPException(status_code=400, detail=f"無効な間隔: {interval}")
 
-        data = await data_service.get_historical_data(pair, period, interval)
-        if not data:
+        paged = any(value is not None for value in (start, end, limit, cursor))
+        start_ns = end_ns = None
+        if paged:
+            try:
+                start_ns, end_ns = resolve_range(start, end, cursor)
+                period = range_period(period, start_ns, end_ns)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+        elif period is None:
+            period = "1d"
+
+        frame = refresh_service.get_frame(pair, period, interval)
+        if frame is None and paged:
+            # 保存済みの足から範囲内だけを読み込む（期間全体は構築しない）
+            frame = await data_service.get_historical_range(
+                pair, period, interval, start_ns, end_ns)
+        elif frame is None:
+            frame = await data_service.get_historical_frame(pair, period, interval)
+        if frame is None or (len(frame) == 0 and not paged):
             raise HTTPException(
                 status_code=404, detail=f"通貨ペア '{pair}' の履歴データが見つかりません")
-        return data
+
+        next_cursor = None
+        if paged:
+            frame, next_cursor = page_frame(
+                frame, limit or AppConfig.HISTORICAL_PAGE_SIZE, start_ns, end_ns)
+
+        symbol = data_service.to_symbol(pair)
+        binary_type = negotiate(request.headers.get("accept"))
+        etag = frame_etag(frame, symbol, period, interval, binary_type or format, next_cursor)
+        max_age = refresh_interval(interval)
+        if is_not_modified(request, etag):
+            return not_modified_response(etag, max_age, vary="Accept")
+        headers = cache_headers(etag, max_age, vary="Accept")
+
+        if binary_type:
+            return Response(
+                encode_historical_binary(
+                    binary_type, symbol, period, interval, frame, next_cursor),
+                media_type=binary_type,
+                headers=headers
+            )
+        return Response(
+            encode_historical(symbol, period, interval, frame,
+                              columnar=format == "columnar", next_cursor=next_cursor),
+            media_type="application/json",
+            headers=headers
+        )
     except HTTPException:
         raise
     except Exception as e:
@@ -165,6 +291,93 @@ async def get_historical_data(
         raise HTTPException(status_code=500, detail="履歴データの取得に失敗しました")
 
 
+@app.get("/api/prices", response_model=BatchPriceData)
+async def get_current_prices(
+    request: Request,
+    response: Response,
+    pairs: str = Query(..., description="カンマ区切りの通貨ペア（例: BTC-USD,ETH-USD）")
+):
+    """複数通貨の現在価格を一括取得（上流への取得は1回にまとめる）"""
+    try:
+        symbols = _parse_pairs(pairs)
+        prices = {symbol: refresh_service.get_price(symbol) for symbol in symbols}
+        pending = [symbol for symbol, price in prices.items() if price is None]
+        if pending:
+            prices.update(await data_service.get_current_prices(pending))
+
+        found = {symbol: price for symbol, price in prices.items() if price is not None}
+        etag = make_etag(*(
+            (price.symbol, price.price, price.volume, price.change_24h)
+            for price in found.values()))
+        max_age = AppConfig.REFRESH_PRICE_INTERVAL
+        if is_not_modified(request, etag):
+            return not_modified_response(etag, max_age)
+        response.headers.update(cache_headers(etag, max_age))
+        return BatchPriceData(
+            prices=found, missing=[symbol for symbol in symbols if symbol not in found])
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"一括価格データ取得エラー: {e}")
+        raise HTTPException(status_code=500, detail="価格データの取得に失敗しました")
+
+
+@app.get("/api/historical", response_model=BatchHistoricalData)
+async def get_historical_batch(
+    request: Request,
+    pairs: str = Query(..., description="カンマ区切りの通貨ペア（例: BTC-USD,ETH-USD）"),
+    period: Optional[str] = Query(
+        None, description="期間（省略時は start を含む最も短い期間、start もなければ 1d）"),
+    interval: str = Query("1m", description="間隔"),
+    format: str = Query(
+        "rows", pattern="^(rows|columnar)$",
+        description="rows: 足ごとのオブジェクト / columnar: 列ごとの配列")
+):
+    """複数通貨の履歴データを一括取得（上流への取得は1回にまとめる）"""
+    try:
+        # パラメータ検証
+        if period not in AppConfig.VALID_PERIODS:
+            raise HTTPException(status_code=400, detail=f"無効な期間: {period}")
+        if interval not in AppConfig.VALID_INTERVALS:
+            raise HTTPException(status_code=400, detail=f"無効な間隔: {interval}")
+
+        symbols = _parse_pairs(pairs)
+        frames = {symbol: refresh_service.get_frame(symbol, period, interval) for symbol in symbols}
+        pending = [symbol for symbol, frame in frames.items() if frame is None]
+        if pending:
+            frames.update(await data_service.get_historical_frames(pending, period, interval))
+
+        etag = make_etag(period, interval, format, *(
+            (symbol, None if frame is None else frame_etag(frame))
+            for symbol, frame in frames.items()))
+        max_age = refresh_interval(interval)
+        if is_not_modified(request, etag):
+            return not_modified_response(etag, max_age)
+        return Response(
+            encode_historical_batch(period, interval, frames, columnar=format == "columnar"),
+            media_type="application/json",
+            headers=cache_headers(etag, max_age)
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"一括履歴データ取得エラー: {e}")
+        raise HTTPException(status_code=500, detail="履歴データの取得に失敗しました")
+
+
+def _parse_pairs(pairs: str) -> List[str]:
+    """カンマ区切りの通貨ペアをシンボルの一覧に変換（重複は除く）"""
+    symbols = list(dict.fromkeys(
+        data_service.to_symbol(pair) for pair in pairs.split(",") if pair.strip()))
+    if not symbols:
+        raise HTTPException(status_code=400, detail="通貨ペアが指定されていません")
+    if len(symbols) > AppConfig.BATCH_MAX_SYMBOLS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"通貨ペアは{AppConfig.BATCH_MAX_SYMBOLS}件までです: {len(symbols)}件")
+    return symbols
+
+
 # ========================================
 # インジケーターエンドポイント
 # ========================================
@@ -196,8 +409,58 @@ async def get_indicator_info(indicator: str):
         raise HTTPException(status_code=500, detail="インジケーター情報の取得に失敗しました")
 
 
+@app.get("/api/analysis/{pair}", response_model=MultiIndicatorAnalysis)
+async def analyze_indicators(
+    request: Request,
+    response: Response,
+    pair: str,
+    indicators: Optional[str] = Query(
+        None, description="カンマ区切りのインジケーター名（省略時は全インジケーター）"),
+    period: str = Query("1d", description="期間"),
+    interval: str = Query("1m", description="間隔")
+):
+    """複数インジケーターを一括で分析（履歴データの取得は1回のみ）"""
+    try:
+        # パラメータ検証
+        if period not in AppConfig.VALID_PERIODS:
+            raise HTTPException(status_code=400, detail=f"無効な期間: {period}")
+        if interval not in AppConfig.VALID_INTERVALS:
+            raise HTTPException(status_code=400, detail=f"無効な間隔: {interval}")
+
+        if indicators:
+            names = [name.strip().lower()
+                     for name in indicators.split(",") if name.strip()]
+            unknown = [name for name in names if name not in INDICATOR_MAPPING]
+            if unknown:
+                raise HTTPException(
+                    status_code=400, detail=f"無効なインジケーター: {', '.join(unknown)}")
+        else:
+            names = [info["name"] for info in await indicator_service.get_indicators()]
+
+        # インジケーターを計算する前に、元データが変わっていなければ 304
+        etag, max_age, frame = await _analysis_etag(pair, period, interval, names)
+        if is_not_modified(request, etag):
+            return not_modified_response(etag, max_age)
+        response.headers.update(cache_headers(etag, max_age))
+
+        # ETagの作成に使ったフレームをそのまま分析に使う（履歴データの取得は1回のみ）
+        analysis = (refresh_service.get_analysis(pair, names, period, interval)
+                    or await indicator_analysis_service.analyze_many(
+                        pair, names, period, interval, frame=frame))
+        if not analysis:
+            raise HTTPException(status_code=404, detail="分析データが見つかりません")
+        return analysis
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"一括インジケーター分析エラー: {e}")
+        raise HTTPException(status_code=500, detail="インジケーター分析に失敗しました")
+
+
 @app.get("/api/analysis/{pair}/{indicator}", response_model=IndicatorAnalysis)
 async def analyze_indicator(
+    request: Request,
+    response: Response,
     pair: str,
     indicator: str,
     period: str = Query("1d", description="期間"),
@@ -211,6 +474,11 @@ async def analyze_indicator(
         if interval not in AppConfig.VALID_INTERVALS:
             raise HTTPException(status_code=400, detail=f"無効な間隔: {interval}")
 
+        etag, max_age, _ = await _analysis_etag(pair, period, interval, [indicator.lower()])
+        if is_not_modified(request, etag):
+            return not_modified_response(etag, max_age)
+        response.headers.update(cache_headers(etag, max_age))
+
         # 実際のインジケータ分析サービスを呼び出し
         analysis_result = await indicator_analysis_service.analyze(pair, indicator, period, interval)
 
@@ -226,6 +494,40 @@ async def analyze_indicator(
         raise HTTPException(status_code=500, detail="インジケーター分析に失敗しました")
 
 
+async def _analysis_etag(pair: str, period: str, interval: str, names: List[str]):
+    """分析の元になるフレームのバージョンから (ETag, max-age, フレーム) を作成"""
+    frame = refresh_service.get_frame(pair, period, interval)
+    if frame is None:
+        frame = await data_service.get_historical_frame(pair, period, interval)
+    if frame is None or len(frame) == 0:
+        raise HTTPException(status_code=404, detail="分析データが見つかりません")
+    etag = frame_etag(frame, data_service.to_symbol(pair), period, interval, ",".join(names))
+    return etag, refresh_interval(interval), frame
+
+
+# ========================================
+# ストリーミングエンドポイント
+# ========================================
+
+@app.get("/api/stream/{pair}")
+async def stream_updates(
+    pair: str,
+    period: str = Query("1mo", description="期間"),
+    interval: str = Query("1d", description="間隔")
+):
+    """価格・インジケーターの更新をServer-Sent Eventsで配信（変化した足と値のみ）"""
+    if period not in AppConfig.VALID_PERIODS:
+        raise HTTPException(status_code=400, detail=f"無効な期間: {period}")
+    if interval not in AppConfig.VALID_INTERVALS:
+        raise HTTPException(status_code=400, detail=f"無効な間隔: {interval}")
+
+    return StreamingResponse(
+        stream_service.events(pair, period, interval),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 # ========================================
 # ストレージエンドポイント
 # ========================================
@@ -252,6 +554,45 @@ async def cleanup_storage():
         raise HTTPException(status_code=500, detail="ストレージクリーンアップに失敗しました")
 
 
+@app.post("/api/storage/compact")
+async def compact_storage(
+    before: Optional[str] = Query(None, description="この日付（YYYYMMDD、当日まで）より前に保存されたファイルが対象")
+):
+    """日次のデータファイルを月単位のアーカイブにまとめる"""
+    try:
+        result = await storage_service.compact(before)
+        return {"message": "アーカイブへのまとめが完了しました", "details": result}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"ストレージのアーカイブエラー: {e}")
+        raise HTTPException(status_code=500, detail="アーカイブへのまとめに失敗しました")
+
+
+@app.get("/api/storage/data/{symbol}")
+async def get_stored_data_page(
+    symbol: str,
+    data_type: str = Query("historical", description="データタイプ"),
+    start: Optional[str] = Query(None, description="開始時刻（ISO 8601）"),
+    end: Optional[str] = Query(None, description="終了時刻（ISO 8601、この時刻を含まない）"),
+    columns: Optional[str] = Query(None, description="取得する列（カンマ区切り）"),
+    limit: int = Query(100, ge=1, le=1000, description="1ページの最大件数"),
+    cursor: Optional[str] = Query(None, description="前のページの next_cursor")
+):
+    """保存されたデータをページ単位で取得"""
+    try:
+        return await storage_service.get_stored_page(
+            symbol, data_type, start=start, end=end,
+            columns=[c.strip() for c in columns.split(",") if c.strip()] if columns else None,
+            limit=limit, cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"保存データ取得エラー: {e}")
+        raise HTTPException(status_code=500, detail="保存データの取得に失敗しました")
+
+
 # ========================================
 # エラーハンドリング
 # ========================================
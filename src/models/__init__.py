@@ -2,6 +2,8 @@
 Data models and schemas module.
 """
 
+from .indicator_series import IndicatorSeries, IndicatorSeriesGroup
+from .ohlcv import OHLCVFrame
 from .schemas import (
     AnalysisResult,
     BasicInfo,
@@ -13,8 +15,10 @@ from .schemas import (
     HistoricalData,
     IndicatorAnalysis,
     IndicatorInfo,
+    IndicatorSnapshot,
     IndicatorValue,
     MarketDataPoint,
+    MultiIndicatorAnalysis,
     MultiIndicatorData,
     StatusType,
     StorageStatus,
@@ -24,12 +28,17 @@ from .schemas import (
 __all__ = [
     "StatusType",
     "MarketDataPoint",
+    "OHLCVFrame",
     "CurrencyPairData",
     "HistoricalData",
     "IndicatorValue",
+    "IndicatorSeries",
+    "IndicatorSeriesGroup",
     "MultiIndicatorData",
     "IndicatorInfo",
     "IndicatorAnalysis",
+    "IndicatorSnapshot",
+    "MultiIndicatorAnalysis",
     "HealthCheck",
     "ErrorResponse",
     "BasicInfo",
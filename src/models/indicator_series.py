@@ -0,0 +1,210 @@
+"""
+配列ベースのインジケータ計算結果
+系列のメタデータを一度だけ保持し、値はNumPy配列で管理いたします
+"""
+
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .schemas import IndicatorValue
+
+
+class IndicatorSeries:
+    """1本のインジケータ系列
+
+    name/type/parameters は系列全体で共有し、timestamp（UTCエポックナノ秒）と
+    value の配列を保持します。MACDのシグナル値のようにポイントごとに変わる
+    付随値は extras に名前付き配列として保持します。
+
+    リストと同様に len()・インデックス・イテレーションに対応しており、
+    アクセスされたポイントだけが IndicatorValue として生成されます。
+    """
+
+    __slots__ = ("name", "type", "parameters", "timestamp", "values", "extras")
+
+    def __init__(
+        self,
+        name: str,
+        type: str,
+        parameters: Dict[str, Any],
+        timestamp: np.ndarray,
+        values: np.ndarray,
+        extras: Optional[Dict[str, np.ndarray]] = None
+    ):
+        self.name = name
+        self.type = type
+        self.parameters = parameters
+        self.timestamp = np.asarray(timestamp, dtype=np.int64)
+        self.values = np.asarray(values, dtype=np.float64)
+        self.extras = {
+            key: np.asarray(array, dtype=np.float64)
+            for key, array in (extras or {}).items()
+        }
+
+        if len(self.timestamp) != len(self.values):
+            raise ValueError("timestampとvalueの長さが一致しません")
+        for key, array in self.extras.items():
+            if len(array) != len(self.values):
+                raise ValueError(f"extras '{key}' の長さが一致しません")
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __bool__(self) -> bool:
+        return len(self.values) > 0
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return IndicatorSeries(
+                self.name,
+                self.type,
+                self.parameters,
+                self.timestamp[index],
+                self.values[index],
+                {key: array[index] for key, array in self.extras.items()}
+            )
+        return self._materialize(range(len(self))[index])
+
+    def __iter__(self) -> Iterator[IndicatorValue]:
+        for i in range(len(self)):
+            yield self._materialize(i)
+
+    def _materialize(self, i: int) -> IndicatorValue:
+        """i番目のポイントをIndicatorValueとして生成"""
+        parameters = self.parameters
+        if self.extras:
+            parameters = dict(parameters)
+            for key, array in self.extras.items():
+                value = array[i]
+                parameters[key] = None if np.isnan(value) else float(value)
+
+        return IndicatorValue(
+            name=self.name,
+            type=self.type,
+            timestamp=pd.Timestamp(int(self.timestamp[i]), tz="UTC"),
+            value=float(self.values[i]),
+            parameters=parameters
+        )
+
+    def timestamps(self) -> pd.DatetimeIndex:
+        """タイムスタンプをUTCのDatetimeIndexとして取得"""
+        return pd.to_datetime(self.timestamp, unit="ns", utc=True)
+
+    @property
+    def nbytes(self) -> int:
+        """配列の合計バイト数"""
+        return (self.timestamp.nbytes + self.values.nbytes +
+                sum(array.nbytes for array in self.extras.values()))
+
+    def latest(self) -> Optional[IndicatorValue]:
+        """最新のポイントを取得"""
+        if not len(self):
+            return None
+        return self._materialize(len(self) - 1)
+
+    def to_values(self) -> List[IndicatorValue]:
+        """全ポイントをIndicatorValueのリストとして生成（APIレスポンス用）"""
+        return list(self)
+
+    def to_pandas(self) -> pd.Series:
+        """タイムスタンプをインデックスとするSeriesに変換"""
+        return pd.Series(self.values, index=self.timestamps(), name=self.name)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """列指向のJSON互換辞書に変換"""
+        return {
+            "name": self.name,
+            "type": self.type,
+            "parameters": self.parameters,
+            "timestamp": [ts.isoformat() for ts in self.timestamps()],
+            "values": self.values.tolist(),
+            "extras": {
+                key: [None if np.isnan(v) else v for v in array.tolist()]
+                for key, array in self.extras.items()
+            }
+        }
+
+
+class IndicatorSeriesGroup:
+    """複数のインジケータ系列（上線・中線・下線など）をまとめたもの
+
+    イテレーション順は従来の連結リストと同じく、系列ごとに順番に並びます。
+    """
+
+    __slots__ = ("series",)
+
+    def __init__(self, series: List[IndicatorSeries]):
+        self.series = series
+
+    def __len__(self) -> int:
+        return sum(len(s) for s in self.series)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __getitem__(self, index: int) -> IndicatorValue:
+        index = range(len(self))[index]
+        for s in self.series:
+            if index < len(s):
+                return s[index]
+            index -= len(s)
+        raise IndexError(index)
+
+    def __iter__(self) -> Iterator[IndicatorValue]:
+        for s in self.series:
+            yield from s
+
+    @property
+    def nbytes(self) -> int:
+        """配列の合計バイト数"""
+        return sum(s.nbytes for s in self.series)
+
+    def get(self, name: str) -> Optional[IndicatorSeries]:
+        """名前で系列を取得"""
+        for s in self.series:
+            if s.name == name:
+                return s
+        return None
+
+    def to_values(self) -> List[IndicatorValue]:
+        """全ポイントをIndicatorValueのリストとして生成（APIレスポンス用）"""
+        return list(self)
+
+    def to_pandas(self) -> pd.Series:
+        """全系列を連結したSeriesに変換"""
+        if not self.series:
+            return pd.Series(dtype=np.float64)
+        return pd.concat([s.to_pandas() for s in self.series])
+
+    def to_dict(self) -> Dict[str, Any]:
+        """系列名をキーとする列指向の辞書に変換"""
+        return {s.name: s.to_dict() for s in self.series}
+
+
+# インジケータの計算結果として返される型
+IndicatorResult = Union[IndicatorSeries, IndicatorSeriesGroup, List[IndicatorValue]]
+
+
+def result_to_pandas(result: IndicatorResult) -> pd.Series:
+    """計算結果をタイムスタンプインデックスのSeriesに変換"""
+    if isinstance(result, (IndicatorSeries, IndicatorSeriesGroup)):
+        return result.to_pandas()
+    if not result:
+        return pd.Series(dtype=np.float64)
+    return pd.Series(
+        [v.value for v in result],
+        index=pd.to_datetime([v.timestamp for v in result], utc=True)
+    )
+
+
+# IndicatorValue 1件あたりのおおよそのメモリ使用量（モデル本体とparameters辞書）
+_INDICATOR_VALUE_NBYTES = 512
+
+
+def result_nbytes(result: IndicatorResult) -> int:
+    """計算結果のおおよそのメモリ使用量（キャッシュの容量管理用）"""
+    if isinstance(result, (IndicatorSeries, IndicatorSeriesGroup)):
+        return result.nbytes
+    return len(result) * _INDICATOR_VALUE_NBYTES
@@ -0,0 +1,187 @@
+"""
+列指向のOHLCVデータコンテナ
+履歴データ取得ごとに一度だけ構築し、全インジケータで共有いたします
+"""
+
+import hashlib
+from datetime import timezone
+from typing import Callable, Dict, Hashable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .schemas import MarketDataPoint
+
+
+class OHLCVFrame:
+    """NumPy配列ベースのOHLCVコンテナ
+
+    open/high/low/close/volume は連続した float64 配列、
+    timestamp は UTC エポックからのナノ秒（int64）で保持します。
+    """
+
+    __slots__ = (
+        "timestamp", "open", "high", "low", "close", "volume",
+        "_dataframe", "_intermediates", "_fingerprint"
+    )
+
+    def __init__(
+        self,
+        timestamp: np.ndarray,
+        open: np.ndarray,
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+        volume: np.ndarray
+    ):
+        self.timestamp = np.ascontiguousarray(timestamp, dtype=np.int64)
+        self.open = np.ascontiguousarray(open, dtype=np.float64)
+        self.high = np.ascontiguousarray(high, dtype=np.float64)
+        self.low = np.ascontiguousarray(low, dtype=np.float64)
+        self.close = np.ascontiguousarray(close, dtype=np.float64)
+        self.volume = np.ascontiguousarray(volume, dtype=np.float64)
+        self._dataframe: Optional[pd.DataFrame] = None
+        self._intermediates: Dict[Hashable, np.ndarray] = {}
+        self._fingerprint: Optional[str] = None
+
+        length = len(self.timestamp)
+        for column in (self.open, self.high, self.low, self.close, self.volume):
+            if len(column) != length:
+                raise ValueError("OHLCVの各列の長さが一致しません")
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    @classmethod
+    def empty(cls) -> "OHLCVFrame":
+        """空のフレームを作成"""
+        return cls(*(np.empty(0) for _ in range(6)))
+
+    @classmethod
+    def from_points(cls, points: List[MarketDataPoint]) -> "OHLCVFrame":
+        """MarketDataPointのリストからフレームを構築"""
+        count = len(points)
+        timestamp = pd.to_datetime(
+            [p.timestamp for p in points], utc=True).asi8
+        open_ = np.fromiter((p.open for p in points), np.float64, count)
+        high = np.fromiter((p.high for p in points), np.float64, count)
+        low = np.fromiter((p.low for p in points), np.float64, count)
+        close = np.fromiter((p.close for p in points), np.float64, count)
+        volume = np.fromiter(
+            (np.nan if p.volume is None else p.volume for p in points),
+            np.float64, count)
+        return cls(timestamp, open_, high, low, close, volume)
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> "OHLCVFrame":
+        """yfinance形式（DatetimeIndex + Open/High/Low/Close/Volume列）のDataFrameから構築"""
+        index = pd.DatetimeIndex(df.index)
+        if index.tz is None:
+            index = index.tz_localize(timezone.utc)
+        timestamp = index.tz_convert(timezone.utc).asi8
+        volume = (
+            df["Volume"].to_numpy(dtype=np.float64)
+            if "Volume" in df.columns
+            else np.full(len(df), np.nan)
+        )
+        return cls(
+            timestamp,
+            df["Open"].to_numpy(dtype=np.float64),
+            df["High"].to_numpy(dtype=np.float64),
+            df["Low"].to_numpy(dtype=np.float64),
+            df["Close"].to_numpy(dtype=np.float64),
+            volume
+        )
+
+    @classmethod
+    def concat(cls, frames: List["OHLCVFrame"]) -> "OHLCVFrame":
+        """複数のフレームを順に連結"""
+        if not frames:
+            return cls.empty()
+        return cls(*(
+            np.concatenate([getattr(frame, name) for frame in frames])
+            for name in ("timestamp", "open", "high", "low", "close", "volume")
+        ))
+
+    def take(self, indexer) -> "OHLCVFrame":
+        """行を選択した新しいフレームを作成（スライスの場合はビュー）"""
+        return type(self)(
+            self.timestamp[indexer], self.open[indexer], self.high[indexer],
+            self.low[indexer], self.close[indexer], self.volume[indexer])
+
+    def timestamps(self) -> pd.DatetimeIndex:
+        """タイムスタンプをUTCのDatetimeIndexとして取得"""
+        return pd.to_datetime(self.timestamp, unit="ns", utc=True)
+
+    def fingerprint(self) -> str:
+        """データ内容のハッシュ（キャッシュキー用、初回のみ計算）"""
+        if self._fingerprint is None:
+            digest = hashlib.blake2b(digest_size=16)
+            for column in (self.timestamp, self.open, self.high,
+                           self.low, self.close, self.volume):
+                digest.update(column.data)
+            self._fingerprint = digest.hexdigest()
+        return self._fingerprint
+
+    @property
+    def nbytes(self) -> int:
+        """配列の合計バイト数"""
+        return sum(column.nbytes for column in (
+            self.timestamp, self.open, self.high,
+            self.low, self.close, self.volume))
+
+    def intermediate(
+        self,
+        key: Hashable,
+        compute: Callable[[], np.ndarray],
+        dtype: type = np.float64
+    ) -> np.ndarray:
+        """派生系列（典型価格・真の値幅など）を一度だけ計算してキャッシュ
+
+        同じフレームを共有する全インジケータで再利用されるため、
+        返す配列は読み取り専用です。
+        """
+        array = self._intermediates.get(key)
+        if array is None:
+            array = np.asarray(compute(), dtype=dtype)
+            array.flags.writeable = False
+            self._intermediates[key] = array
+        return array
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """インジケータ計算用のDataFrameを取得
+
+        DataFrameは初回のみ構築してキャッシュし、呼び出し側には
+        浅いコピーを返すため、列の追加が他の呼び出し側に影響しません。
+        """
+        if self._dataframe is None:
+            self._dataframe = pd.DataFrame({
+                'timestamp': self.timestamps(),
+                'open': self.open,
+                'high': self.high,
+                'low': self.low,
+                'price': self.close,
+                'volume': self.volume
+            }, copy=False)
+        return self._dataframe.copy(deep=False)
+
+    def to_points(self) -> List[MarketDataPoint]:
+        """MarketDataPointのリストに変換（APIレスポンス用）"""
+        timestamps = self.timestamps().to_pydatetime()
+        volumes = [
+            None if np.isnan(v) else v for v in self.volume.tolist()
+        ]
+        return [
+            MarketDataPoint(
+                timestamp=ts, open=o, high=h, low=l, close=c, volume=v
+            )
+            for ts, o, h, l, c, v in zip(
+                timestamps,
+                self.open.tolist(),
+                self.high.tolist(),
+                self.low.tolist(),
+                self.close.tolist(),
+                volumes
+            )
+        ]
+
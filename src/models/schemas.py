@@ -69,6 +69,22 @@ class HistoricalData(BaseModel):
     data_count: int
     data: List[MarketDataPoint]
     indicators: Optional[Dict[str, Any]] = None
+    # ページング時の次のページのカーソル（最後のページ・ページングなしは None）
+    next_cursor: Optional[str] = None
+
+
+class BatchPriceData(BaseModel):
+    """複数通貨の現在価格"""
+    prices: Dict[str, CurrencyPairData]
+    missing: List[str] = []
+
+
+class BatchHistoricalData(BaseModel):
+    """複数通貨の履歴データ"""
+    period: str
+    interval: str
+    data: Dict[str, HistoricalData]
+    missing: List[str] = []
 
 
 class IndicatorValue(BaseModel):
@@ -137,6 +153,33 @@ class IndicatorAnalysis(BaseModel):
         return value.isoformat()
 
 
+class IndicatorSnapshot(BaseModel):
+    """一括分析における1インジケータ分の結果"""
+    value: float
+    signal: str
+    strength: float
+    parameters: Dict[str, Any]
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class MultiIndicatorAnalysis(BaseModel):
+    """複数インジケータの一括分析結果"""
+    symbol: str
+    period: str
+    interval: str
+    timestamp: datetime
+    indicators: Dict[str, IndicatorSnapshot]
+    unavailable: List[str] = []
+    metadata: Optional[Dict[str, Any]] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+    @field_serializer('timestamp')
+    def serialize_timestamp(self, value: datetime) -> str:
+        return value.isoformat()
+
+
 class HealthCheck(BaseModel):
     """ヘルスチェックレスポンス"""
     status: str
@@ -5,6 +5,9 @@ class DashboardCore {
     constructor() {
         this.isInitialized = false;
         this.updateInterval = null;
+        this.eventSource = null;
+        this.currentData = null;
+        this.indicatorsData = null;
         this.init();
     }
 
@@ -57,7 +60,7 @@ class DashboardCore {
             // 現在価格、履歴データ、インジケータを並行して取得
             const [currentData, historicalData, indicatorsData] = await Promise.all([
                 DataFetcher.fetchCurrentPrice(),
-                DataFetcher.fetchHistoricalData(),
+                DataFetcher.fetchHistoricalData('BTC-USD', '1mo', '1d', 'columnar'),
                 DataFetcher.fetchIndicators()
             ]);
 
@@ -67,6 +70,10 @@ class DashboardCore {
                 indicatorsData: !!indicatorsData
             });
 
+            // 配信の差分を反映できるよう最新のデータを保持
+            this.currentData = currentData;
+            this.indicatorsData = indicatorsData;
+
             // UIを更新
             this.updateUI(currentData, historicalData, indicatorsData);
 
@@ -141,7 +148,13 @@ class DashboardCore {
             clearInterval(this.updateInterval);
         }
 
-        // 5分ごとに自動更新
+        // サーバーからの配信（変化した足とインジケータのみ）を受け取る
+        if (window.EventSource) {
+            this.setupStream();
+            return;
+        }
+
+        // 配信に対応していないブラウザは5分ごとに自動更新
         this.updateInterval = setInterval(() => {
             this.refreshData();
         }, 5 * 60 * 1000);
@@ -149,12 +162,62 @@ class DashboardCore {
         console.log('DashboardCore: 自動更新設定完了（5分間隔）');
     }
 
+    // 更新の配信を購読（切断時はブラウザが自動で再接続）
+    setupStream(symbol = 'BTC-USD', period = '1mo', interval = '1d') {
+        if (this.eventSource) {
+            this.eventSource.close();
+        }
+
+        this.eventSource = new EventSource(
+            `/api/stream/${symbol}?period=${period}&interval=${interval}`);
+
+        this.eventSource.addEventListener('update', (event) => {
+            this.applyStreamUpdate(JSON.parse(event.data));
+        });
+
+        // 未送信の更新が溜まりすぎた場合は全データを取得し直す
+        this.eventSource.addEventListener('resync', () => {
+            this.loadInitialData();
+        });
+
+        console.log('DashboardCore: 更新の配信を購読開始');
+    }
+
+    // 配信された差分を保持中のデータに反映してUIを更新
+    applyStreamUpdate(update) {
+        if (!this.currentData || !this.indicatorsData) {
+            return;
+        }
+
+        const bars = update.bars || [];
+        if (bars.length > 0) {
+            const latest = bars[bars.length - 1];
+            this.currentData = {
+                ...this.currentData,
+                price: latest.close,
+                timestamp: latest.timestamp
+            };
+        }
+
+        const analysis = this.indicatorsData.analysis || {};
+        for (const [name, snapshot] of Object.entries(update.indicators || {})) {
+            analysis[name] = { ...(analysis[name] || {}), ...snapshot };
+        }
+        this.indicatorsData.analysis = analysis;
+
+        this.updateUI(this.currentData, null, this.indicatorsData);
+    }
+
     // クリーンアップ
     destroy() {
         if (this.updateInterval) {
             clearInterval(this.updateInterval);
             this.updateInterval = null;
         }
+        if (this.eventSource) {
+            this.eventSource.close();
+            this.eventSource = null;
+        }
         this.isInitialized = false;
         console.log('DashboardCore: クリーンアップ完了');
     }
@@ -106,7 +106,10 @@ document.addEventListener('DOMContentLoaded', function () {
     }, 1000); // より長めに待機
 
     // 自動更新の設定（5分ごと）
-    setInterval(loadDashboardData, 5 * 60 * 1000);
+    // 配信に対応したブラウザでは DashboardCore が更新の配信を購読するため不要
+    if (!window.EventSource) {
+        setInterval(loadDashboardData, 5 * 60 * 1000);
+    }
 });
 
 // イベントリスナーの設定
@@ -1,8 +1,10 @@
 // データ取得に関する機能
 
 // 履歴データの取得
-async function fetchHistoricalData(symbol = 'BTC-USD', period = '1mo', interval = '1d') {
-    const response = await fetch(`/api/historical/${symbol}?period=${period}&interval=${interval}`);
+// format = 'columnar' の場合は data が列ごとの配列（{timestamp: [...], close: [...]}）になる
+async function fetchHistoricalData(symbol = 'BTC-USD', period = '1mo', interval = '1d', format = 'rows') {
+    const response = await fetch(
+        `/api/historical/${symbol}?period=${period}&interval=${interval}&format=${format}`);
     if (!response.ok) {
         throw new Error('履歴データの取得に失敗いたしました');
     }
@@ -10,27 +12,35 @@ async function fetchHistoricalData(symbol = 'BTC-USD', period = '1mo', interval
 }
 
 // インジケータデータの取得
+// 一覧と一括分析を並行して取得し、履歴データの取得はサーバー側で1回のみ行う
 async function fetchIndicators(symbol = 'BTC-USD', period = '1mo', interval = '1d') {
     try {
-        // インジケータ一覧を取得
-        const indicatorsResponse = await fetch('/api/indicators');
+        const [indicatorsResponse, analysisResponse] = await Promise.all([
+            fetch('/api/indicators'),
+            fetch(`/api/analysis/${symbol}?period=${period}&interval=${interval}`)
+        ]);
         if (!indicatorsResponse.ok) {
             throw new Error('インジケータ一覧の取得に失敗いたしました');
         }
         const indicators = await indicatorsResponse.json();
 
-        // 各インジケータの分析データを取得
+        // 一括分析の結果をインジケータごとの分析データに展開
         const indicatorData = {};
-        for (const indicator of indicators) {
-            try {
-                const analysisResponse = await fetch(`/api/analysis/${symbol}/${indicator.name}?period=${period}&interval=${interval}`);
-                if (analysisResponse.ok) {
-                    const analysis = await analysisResponse.json();
-                    indicatorData[indicator.name] = analysis;
-                }
-            } catch (error) {
-                console.warn(`${indicator.name}の分析データ取得エラー:`, error);
+        if (analysisResponse.ok) {
+            const analysis = await analysisResponse.json();
+            for (const [name, snapshot] of Object.entries(analysis.indicators)) {
+                indicatorData[name] = {
+                    symbol: analysis.symbol,
+                    indicator: name,
+                    period: analysis.period,
+                    interval: analysis.interval,
+                    timestamp: analysis.timestamp,
+                    metadata: analysis.metadata,
+                    ...snapshot
+                };
             }
+        } else {
+            console.warn('インジケータの一括分析データ取得エラー:', analysisResponse.status);
         }
 
         return {
@@ -52,6 +62,16 @@ async function fetchCurrentPrice(symbol = 'BTC-USD', period = '1d', interval = '
     return await response.json();
 }
 
+// 複数通貨の現在価格を1リクエストで取得（{prices: {シンボル: 価格}, missing: [...]}）
+async function fetchCurrentPrices(symbols = ['BTC-USD']) {
+    const pairs = symbols.map(encodeURIComponent).join(',');
+    const response = await fetch(`/api/prices?pairs=${pairs}`);
+    if (!response.ok) {
+        throw new Error('現在価格の取得に失敗いたしました');
+    }
+    return await response.json();
+}
+
 // 一年分データ取得
 async function fetchYearlyData(symbol = 'BTC-USD') {
     try {
@@ -64,7 +84,8 @@ async function fetchYearlyData(symbol = 'BTC-USD') {
         const progressBar = progressDiv?.querySelector('.progress-bar');
 
         // 各期間のデータを順次取得
-        const periods = ['1mo', '3mo', '6mo', '1y'];
+        // 最長の期間を先に取得すると、残りの期間はサーバー側の保存済みデータから返される
+        const periods = ['1y', '6mo', '3mo', '1mo'];
         let completed = 0;
 
         for (const period of periods) {
@@ -100,5 +121,6 @@ window.DataFetcher = {
     fetchHistoricalData,
     fetchIndicators,
     fetchCurrentPrice,
+    fetchCurrentPrices,
     fetchYearlyData
 };
@@ -35,11 +35,12 @@ function updateInfoDisplay(data) {
 // 価格変動の計算
 async function calculatePriceChange() {
     try {
-        const historicalData = await DataFetcher.fetchHistoricalData('BTC-USD', '5d', '1d');
+        const historicalData = await DataFetcher.fetchHistoricalData('BTC-USD', '5d', '1d', 'columnar');
+        const closes = historicalData.data ? historicalData.data.close : null;
 
-        if (historicalData.data && historicalData.data.length >= 2) {
-            const currentPrice = historicalData.data[historicalData.data.length - 1].close;
-            const previousPrice = historicalData.data[historicalData.data.length - 2].close;
+        if (closes && closes.length >= 2) {
+            const currentPrice = closes[closes.length - 1];
+            const previousPrice = closes[closes.length - 2];
 
             if (isNaN(currentPrice) || isNaN(previousPrice)) {
                 console.error('価格データがNaNです');
@@ -68,7 +69,7 @@ async function calculatePriceChange() {
 async function loadHistoricalData() {
     try {
         // 固定の期間・間隔でデータを取得
-        await DataFetcher.fetchHistoricalData('BTC-USD', '1mo', '1d');
+        await DataFetcher.fetchHistoricalData('BTC-USD', '1mo', '1d', 'columnar');
 
     } catch (error) {
         console.error('履歴データ読み込みエラー:', error);
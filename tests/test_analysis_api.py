@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+複数インジケーターの一括分析エンドポイント（/api/analysis/{pair}）のテスト
+"""
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from src.models.ohlcv import OHLCVFrame
+
+URL = "/api/analysis/BTC-USD"
+
+
+def _frame(count: int = 5) -> OHLCVFrame:
+    closes = 100.0 + np.arange(count, dtype=float)
+    timestamps = (np.arange(count, dtype=np.int64) + 19_000) * 86_400 * 10**9
+    return OHLCVFrame(timestamps, closes, closes + 2, closes - 2, closes,
+                      np.full(count, 1000.0))
+
+
+@pytest.fixture
+def api(monkeypatch):
+    state = {"frame": _frame(), "fetches": 0, "snapshot": None}
+
+    async def get_historical_frame(pair, period, interval):
+        state["fetches"] += 1
+        return state["frame"]
+
+    monkeypatch.setattr(main.refresh_service, "get_frame", lambda *args: None)
+    monkeypatch.setattr(main.refresh_service, "get_analysis", lambda *args: state["snapshot"])
+    monkeypatch.setattr(main.data_service, "get_historical_frame", get_historical_frame)
+    return TestClient(main.app), state
+
+
+def test_unknown_indicator_is_rejected(api):
+    client, state = api
+    response = client.get(URL, params={"indicators": "rsi,nope,Bogus", "period": "1mo"})
+    assert response.status_code == 400
+    assert response.json()["error"] == "無効なインジケーター: nope, bogus"
+    assert state["fetches"] == 0
+
+
+def test_uncomputable_indicators_are_listed(api):
+    """データ不足で計算できないインジケーターは unavailable に入れ、残りは返す"""
+    client, _ = api
+    response = client.get(URL, params={
+        "indicators": "sma, OBV,atr,rsi", "period": "1mo", "interval": "1d"})
+    assert response.status_code == 200
+    body = response.json()
+    assert sorted(body["indicators"]) == ["atr", "obv"]
+    assert body["unavailable"] == ["sma", "rsi"]
+    assert body["indicators"]["obv"]["value"] == 5000.0
+    assert body["metadata"]["data_points"] == 5
+
+
+def test_frame_is_fetched_once_for_all_indicators(api):
+    """インジケーターの数によらず、履歴データの取得はETagと分析で共有の1回のみ"""
+    client, state = api
+    response = client.get(URL, params={
+        "indicators": "obv,atr,macd,vwap,parabolic_sar", "period": "1mo", "interval": "1d"})
+    assert response.status_code == 200
+    body = response.json()
+    assert len(body["indicators"]) + len(body["unavailable"]) == 5
+    assert state["fetches"] == 1
+
+
+def test_refresher_snapshot_is_used_first(api, monkeypatch):
+    """リフレッシャーの計算済みの結果があれば分析せずに返し、なければ分析する"""
+    client, state = api
+    calls = []
+
+    async def analyze_many(pair, names, period, interval, frame=None):
+        calls.append(names)
+        return {"symbol": "BTC-USD", "period": period, "interval": interval,
+                "timestamp": "2022-01-08T00:00:00+00:00", "indicators": {},
+                "unavailable": names}
+
+    monkeypatch.setattr(main.indicator_analysis_service, "analyze_many", analyze_many)
+    state["snapshot"] = {
+        "symbol": "BTC-USD", "period": "1mo", "interval": "1d",
+        "timestamp": "2022-01-08T00:00:00+00:00",
+        "indicators": {"obv": {"value": 1.0, "signal": "bullish", "strength": 0.5,
+                               "parameters": {}}}}
+    params = {"indicators": "obv", "period": "1mo", "interval": "1d"}
+
+    response = client.get(URL, params=params)
+    assert response.status_code == 200
+    assert response.json()["indicators"]["obv"]["value"] == 1.0
+    assert calls == []
+
+    state["snapshot"] = None
+    response = client.get(URL, params=params)
+    assert response.status_code == 200
+    assert response.json()["unavailable"] == ["obv"]
+    assert calls == [["obv"]]
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+列指向バーストアのテスト
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from services.storage.bar_store import COLUMNS, BarStore
+from src.models.ohlcv import OHLCVFrame
+
+
+def _make_frame(start: str, count: int, freq: str = "min") -> OHLCVFrame:
+    index = pd.date_range(start, periods=count, freq=freq, tz="UTC")
+    close = np.arange(count, dtype=float) + 100
+    return OHLCVFrame(index.asi8, close, close + 1, close - 1, close,
+                      np.full(count, 10.0))
+
+
+def test_append_only_adds_newer_bars(tmp_path):
+    """追記は最後の足より新しい足のみ"""
+    store = BarStore(tmp_path)
+    assert store.append("BTC-USD", "1m", _make_frame("2024-01-01", 100)) == 100
+    # 50本が既存、50本が新規
+    assert store.append("BTC-USD", "1m", _make_frame("2024-01-01 00:50", 100)) == 50
+    assert store.count("BTC-USD", "1m") == 150
+
+    frame = store.read("BTC-USD", "1m")
+    assert np.all(np.diff(frame.timestamp) > 0)
+    assert store.last_timestamp("BTC-USD", "1m") == frame.timestamp[-1]
+    assert store.series() == [("BTC-USD", "1m")]
+
+
+def test_range_read_is_zero_copy_and_stable(tmp_path):
+    """範囲読み込みは二分探索した区間のビューを返し、追記後も内容が変わらない"""
+    store = BarStore(tmp_path)
+    store.append("ETH-USD", "1m", _make_frame("2024-01-01", 1440))
+
+    frame = store.read("ETH-USD", "1m", "2024-01-01 01:00", "2024-01-01 02:00")
+    assert len(frame) == 60
+    assert frame.timestamps()[0] == pd.Timestamp("2024-01-01 01:00", tz="UTC")
+    assert not frame.close.flags.writeable
+    _, columns = store._mapped("ETH-USD", "1m")
+    assert np.shares_memory(frame.close, columns["close"])
+
+    before = frame.close.copy()
+    store.append("ETH-USD", "1m", _make_frame("2024-01-02", 10))
+    assert np.array_equal(frame.close, before)
+    assert len(store.read("ETH-USD", "1m", start="2024-01-02")) == 10
+
+
+def test_partial_write_is_repaired(tmp_path):
+    """時刻列より長い列（書き込み中断）は次回の読み込みで切り詰める"""
+    store = BarStore(tmp_path)
+    store.append("BTC-USD", "1d", _make_frame("2024-01-01", 5, "D"))
+    with open(tmp_path / "BTC-USD" / "1d" / COLUMNS["close"][0], "ab") as f:
+        f.write(np.zeros(3).tobytes())
+
+    reopened = BarStore(tmp_path)
+    frame = reopened.read("BTC-USD", "1d")
+    assert len(frame) == 5
+    assert reopened.append("BTC-USD", "1d", _make_frame("2024-01-06", 1, "D")) == 1
+    assert reopened.read("BTC-USD", "1d").close[-1] == 100.0
+
+
+def test_append_failing_midway_is_repaired_before_next_append(tmp_path, monkeypatch):
+    """追記が列の途中で失敗しても、同じストアの次の追記の前に余った列を切り詰める"""
+    store = BarStore(tmp_path)
+    store.append("BTC-USD", "1d", _make_frame("2024-01-01", 5, "D"))
+
+    def fail_midway(directory, frame, rows, mode, sync=False):
+        for name in ("open", "high"):
+            filename, dtype = COLUMNS[name]
+            with open(directory / filename, mode) as f:
+                f.write(np.zeros(len(rows), dtype=dtype).tobytes())
+        raise OSError("disk full")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(BarStore, "_write_columns", staticmethod(fail_midway))
+        with pytest.raises(OSError):
+            store.append("BTC-USD", "1d", _make_frame("2024-01-06", 3, "D"))
+    assert store.count("BTC-USD", "1d") == 5
+
+    assert store.append("BTC-USD", "1d", _make_frame("2024-01-06", 3, "D")) == 3
+    frame = store.read("BTC-USD", "1d")
+    assert np.array_equal(frame.open, np.r_[np.arange(5.0), np.arange(3.0)] + 100)
+    assert np.array_equal(frame.high, frame.open + 1)
+    assert np.array_equal(frame.timestamp, pd.date_range(
+        "2024-01-01", periods=8, freq="D", tz="UTC").asi8)
+
+
+def test_replace_swaps_series_and_keeps_metadata(tmp_path):
+    """置き換えは新しい列とメタデータを一度に入れ替え、一時ディレクトリを残さない"""
+    store = BarStore(tmp_path)
+    store.append("BTC-USD", "1h", _make_frame("2024-01-02", 24, "h"))
+    store.update_metadata("BTC-USD", "1h", covered_from=123)
+    old = store.read("BTC-USD", "1h")
+    before = old.close.copy()
+
+    assert store.replace("BTC-USD", "1h", _make_frame("2024-01-01", 48, "h")) == 48
+    assert store.count("BTC-USD", "1h") == 48
+    assert store.first_timestamp("BTC-USD", "1h") == pd.Timestamp("2024-01-01", tz="UTC").value
+    assert store.get_metadata("BTC-USD", "1h") == {"covered_from": 123}
+    # 読み込み済みのビューは入れ替え前の内容のまま
+    assert np.array_equal(old.close, before)
+    assert sorted(os.listdir(tmp_path / "BTC-USD")) == ["1h"]
+    assert store.series() == [("BTC-USD", "1h")]
+
+
+def test_failed_replace_leaves_existing_bars(tmp_path, monkeypatch):
+    """一時ディレクトリへの書き込みに失敗しても既存のバーは変わらない"""
+    store = BarStore(tmp_path)
+    store.append("BTC-USD", "1h", _make_frame("2024-01-02", 24, "h"))
+
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(BarStore, "_write_columns", staticmethod(fail))
+    with pytest.raises(OSError):
+        store.replace("BTC-USD", "1h", _make_frame("2024-01-01", 48, "h"))
+
+    assert store.count("BTC-USD", "1h") == 24
+    assert sorted(os.listdir(tmp_path / "BTC-USD")) == ["1h"]
+
+
+def test_interrupted_swap_is_recovered(tmp_path):
+    """既存分の退避後・入れ替え前に中断した場合は退避した列を元に戻す"""
+    store = BarStore(tmp_path)
+    store.append("BTC-USD", "1h", _make_frame("2024-01-02", 24, "h"))
+    os.replace(tmp_path / "BTC-USD" / "1h", tmp_path / "BTC-USD" / "1h~old")
+
+    reopened = BarStore(tmp_path)
+    assert reopened.count("BTC-USD", "1h") == 24
+    assert reopened.append("BTC-USD", "1h", _make_frame("2024-01-03", 1, "h")) == 1
+    assert sorted(os.listdir(tmp_path / "BTC-USD")) == ["1h"]
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+履歴データのバイナリ形式（Arrow IPC / MessagePack）とネゴシエーションのテスト
+"""
+
+import numpy as np
+import pytest
+
+from src.core import binary_encoding
+from src.core.binary_encoding import (
+    ARROW_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPE,
+    encode_historical_binary,
+    negotiate,
+)
+from src.models.ohlcv import OHLCVFrame
+
+
+def _frame(count: int = 20) -> OHLCVFrame:
+    timestamps = (np.arange(count, dtype=np.int64) + 19_000) * 86_400 * 10**9
+    close = np.linspace(100.0, 120.0, count)
+    volume = close * 2
+    volume[1] = np.nan
+    return OHLCVFrame(timestamps, close - 1, close + 1, close - 2, close, volume)
+
+
+def test_negotiate_respects_quality_and_availability(monkeypatch):
+    monkeypatch.setattr(binary_encoding, "pyarrow", object())
+    monkeypatch.setattr(binary_encoding, "msgpack", object())
+    assert negotiate(None) is None
+    assert negotiate("text/html,application/xhtml+xml,*/*;q=0.8") is None
+    assert negotiate(ARROW_MEDIA_TYPE) == ARROW_MEDIA_TYPE
+    assert negotiate("application/x-msgpack") == MSGPACK_MEDIA_TYPE
+    assert negotiate(f"application/json;q=0.5, {MSGPACK_MEDIA_TYPE}") == MSGPACK_MEDIA_TYPE
+    assert negotiate(f"application/json, {MSGPACK_MEDIA_TYPE};q=0.9") is None
+    assert negotiate(f"{ARROW_MEDIA_TYPE};q=0, */*") is None
+
+    # ライブラリがない形式は選ばずにJSONで応答
+    monkeypatch.setattr(binary_encoding, "pyarrow", None)
+    assert negotiate(ARROW_MEDIA_TYPE) is None
+    assert negotiate(f"{ARROW_MEDIA_TYPE}, {MSGPACK_MEDIA_TYPE};q=0.5") == MSGPACK_MEDIA_TYPE
+
+
+def test_msgpack_columns_round_trip():
+    msgpack = pytest.importorskip("msgpack")
+    frame = _frame()
+    body = msgpack.unpackb(encode_historical_binary(
+        MSGPACK_MEDIA_TYPE, "BTC-USD", "1mo", "1d", frame))
+
+    assert body["symbol"] == "BTC-USD"
+    assert body["data_count"] == len(frame)
+    columns = {name: np.frombuffer(column["data"], dtype=column["dtype"])
+               for name, column in body["data"].items()}
+    np.testing.assert_array_equal(columns["timestamp"], frame.timestamp)
+    np.testing.assert_array_equal(columns["close"], frame.close)
+    assert np.isnan(columns["volume"][1])
+
+
+def test_arrow_stream_round_trip():
+    pyarrow = pytest.importorskip("pyarrow")
+    import pyarrow.ipc
+
+    frame = _frame()
+    table = pyarrow.ipc.open_stream(encode_historical_binary(
+        ARROW_MEDIA_TYPE, "BTC-USD", "1mo", "1d", frame)).read_all()
+
+    assert table.schema.metadata[b"symbol"] == b"BTC-USD"
+    assert table.column_names == ["timestamp", "open", "high", "low", "close", "volume"]
+    np.testing.assert_array_equal(
+        table.column("timestamp").to_numpy().view(np.int64), frame.timestamp)
+    np.testing.assert_array_equal(table.column("close").to_numpy(), frame.close)
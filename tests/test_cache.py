@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+TTL・LRU付きキャッシュ（src/core/cache.py）とインジケータ計算結果のキャッシュのテスト
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from services.indicators.services.indicator_factory import IndicatorFactory
+from src.core.cache import TTLCache
+from src.core.config import AppConfig, IndicatorType
+from src.models.ohlcv import OHLCVFrame
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_lru_eviction_keeps_recently_used_entries():
+    cache = TTLCache(ttl=60, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # a を最近使われたエントリにする
+    cache.set("c", 3)
+
+    assert "b" not in cache
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_expiry():
+    clock = FakeClock()
+    cache = TTLCache(ttl=10, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=30)
+
+    clock.now = 9.9
+    assert cache.get("a") == 1
+    clock.now = 10.0
+    assert cache.get("a") is None
+    assert "a" not in cache
+    assert cache.get("b") == 2
+
+    clock.now = 30.0
+    assert cache.purge_expired() == 1
+    assert len(cache) == 0
+    stats = cache.stats()
+    assert stats["expirations"] == 2
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+
+
+def test_byte_budget():
+    cache = TTLCache(ttl=60, max_bytes=100, sizeof=len)
+    cache.set("a", b"x" * 40)
+    cache.set("b", b"x" * 40)
+    assert cache.stats()["bytes"] == 80
+
+    # 上限を超えた分は最も古く使われたエントリから退避
+    cache.set("c", b"x" * 40)
+    assert "a" not in cache
+    assert cache.stats()["bytes"] == 80
+
+    # 単体で上限を超える値はキャッシュしない（既存のエントリは残る）
+    cache.set("huge", b"x" * 101)
+    assert "huge" not in cache
+    assert "b" in cache and "c" in cache
+
+    # 同じキーの上書きでサイズを二重に数えない
+    cache.set("b", b"x" * 10)
+    assert cache.stats()["bytes"] == 50
+
+    cache.clear()
+    assert cache.stats()["bytes"] == 0
+
+
+def test_get_or_set_computes_once():
+    cache = TTLCache(ttl=60)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return None  # None も値としてキャッシュされる
+
+    assert cache.get_or_set("a", compute) is None
+    assert cache.get_or_set("a", compute) is None
+    assert len(calls) == 1
+
+
+def _frame(closes) -> OHLCVFrame:
+    closes = np.asarray(closes, dtype=np.float64)
+    timestamps = pd.date_range("2024-01-01", periods=len(closes), freq="h", tz="UTC").asi8
+    return OHLCVFrame(timestamps, closes, closes + 1, closes - 1, closes, np.ones(len(closes)))
+
+
+@pytest.fixture
+def factory(monkeypatch):
+    monkeypatch.setattr(AppConfig, "CACHE_ENABLED", True)
+    factory = IndicatorFactory()
+    indicator = factory.get_indicator(IndicatorType.SMA)
+    calls = []
+    original = indicator.calculate
+
+    def counting_calculate(data, **parameters):
+        calls.append(parameters)
+        return original(data, **parameters)
+
+    monkeypatch.setattr(indicator, "calculate", counting_calculate)
+    factory.calls = calls
+    return factory
+
+
+def test_factory_cache_key_follows_frame_fingerprint(factory):
+    closes = np.arange(50, dtype=np.float64) + 100
+    first = factory.calculate(IndicatorType.SMA, _frame(closes), symbol="BTC", period=20)
+
+    # 内容が同じ別のフレームはキャッシュから返す
+    again = factory.calculate(IndicatorType.SMA, _frame(closes.copy()), symbol="BTC", period=20)
+    assert again is first
+    assert len(factory.calls) == 1
+
+    # 形成中の足の値だけが変わった場合も再計算する
+    changed = closes.copy()
+    changed[-1] += 1
+    result = factory.calculate(IndicatorType.SMA, _frame(changed), symbol="BTC", period=20)
+    assert len(factory.calls) == 2
+    assert result.values[-1] != first.values[-1]
+
+    # 通貨ペア・間隔もキーに含まれる
+    factory.calculate(IndicatorType.SMA, _frame(closes), symbol="ETH", period=20)
+    factory.calculate(IndicatorType.SMA, _frame(closes), symbol="BTC", interval="1h", period=20)
+    assert len(factory.calls) == 4
+
+
+def test_factory_cache_key_uses_canonical_parameters(factory):
+    frame = _frame(np.arange(50, dtype=np.float64) + 100)
+    factory.calculate(IndicatorType.SMA, frame, period=20)
+    # int と float の違いは同じキー
+    factory.calculate(IndicatorType.SMA, frame, period=20.0)
+    assert len(factory.calls) == 1
+
+    factory.calculate(IndicatorType.SMA, frame, period=21)
+    assert len(factory.calls) == 2
+
+    assert (factory._canonical_parameters({"fast": 12, "slow": 26})
+            == factory._canonical_parameters({"slow": 26.0, "fast": 12}))
+
+
+def test_factory_does_not_cache_empty_results(factory):
+    frame = _frame([100.0, 101.0])
+    assert not factory.calculate(IndicatorType.SMA, frame, period=20)
+    assert not factory.calculate(IndicatorType.SMA, frame, period=20)
+    assert len(factory.calls) == 2
+    assert factory.get_cache_size() == 0
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+データサービスのキャッシュ・リクエスト集約・差分バックフィルのテスト
+"""
+
+import asyncio
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from services.data.data_service import DataService
+from services.data.intervals import period_start
+from services.storage.bar_store import BarStore
+from src.models.ohlcv import OHLCVFrame
+
+
+def _make_frame(days: int = 400) -> OHLCVFrame:
+    """現在時刻までの日足（最後の1本は形成中）"""
+    end = pd.Timestamp.now(tz="UTC").floor("D")
+    index = pd.date_range(end=end, periods=days, freq="D")
+    close = np.linspace(100.0, 100.0 + days - 1, days)
+    return OHLCVFrame.from_dataframe(pd.DataFrame({
+        "Open": close - 1, "High": close + 2, "Low": close - 2,
+        "Close": close, "Volume": np.full(days, 1000.0)
+    }, index=index))
+
+
+class StubUpstream:
+    """上流（Yahoo Finance）の代わりに固定のフレームを返す"""
+
+    def __init__(self, service: DataService, frame: OHLCVFrame, delay: float = 0.0):
+        self.frame = frame
+        self.delay = delay
+        self.calls = []
+        self.lock = threading.Lock()
+        service._fetch_history = self.fetch_history
+        service._fetch_range = self.fetch_range
+
+    def fetch_history(self, symbol, period, interval):
+        with self.lock:
+            self.calls.append(("period", symbol, period, interval))
+        time.sleep(self.delay)
+        start = period_start(period)
+        if start is None:
+            return self.frame
+        return self.frame.take(self.frame.timestamp >= start)
+
+    def fetch_range(self, symbol, interval, start, end):
+        with self.lock:
+            self.calls.append(("range", symbol, interval))
+        mask = self.frame.timestamp >= start
+        if end is not None:
+            mask &= self.frame.timestamp < end
+        return self.frame.take(mask)
+
+
+def test_concurrent_requests_share_one_fetch(tmp_path):
+    """同時の同一リクエストは上流への取得を1回だけ行う"""
+    service = DataService(BarStore(tmp_path))
+    upstream = StubUpstream(service, _make_frame(), delay=0.05)
+
+    async def run():
+        return await asyncio.gather(*[
+            service.get_historical_frame("BTC-USD", "1mo", "1d") for _ in range(20)
+        ])
+
+    results = asyncio.run(run())
+
+    assert upstream.calls == [("period", "BTC-USD", "1mo", "1d")]
+    assert all(r is results[0] for r in results)
+    stats = service.get_cache_stats()
+    assert stats["upstream_requests"] == 1
+    assert stats["coalesced_requests"] == 19
+    assert stats["inflight"] == 0
+
+
+def test_results_are_cached_and_keyed_by_symbol(tmp_path):
+    """取得結果はキャッシュされ、BTC と BTC-USD は同じキーになる"""
+    service = DataService(BarStore(tmp_path))
+    upstream = StubUpstream(service, _make_frame())
+
+    async def run():
+        first = await service.get_historical_data("BTC", "1mo", "1d")
+        frame = await service.get_historical_frame("btc-usd", "1mo", "1d")
+        return first, frame
+
+    first, frame = asyncio.run(run())
+
+    assert first.symbol == "BTC-USD"
+    assert len(frame) == first.data_count
+    assert first.data[-1].close == frame.close[-1]
+    assert len(upstream.calls) == 1
+    # キャッシュにはフレームのみを保持し、足ごとのポイントは保持しない
+    assert service.get_cache_stats()["bytes"] == frame.nbytes
+
+
+def test_backfill_fetches_only_missing_bars(tmp_path):
+    """保存済みの足は再取得せず、不足している先頭と最新の差分のみを取得する"""
+    full = _make_frame()
+    store = BarStore(tmp_path)
+    service = DataService(store)
+    upstream = StubUpstream(service, full)
+
+    async def run(period):
+        service.clear_cache()
+        return await service.get_historical_frame("ETH-USD", period, "1d")
+
+    one_year = asyncio.run(run("1y"))
+    # 形成中の最新足は保存しない
+    assert store.count("ETH-USD", "1d") == len(one_year) - 1
+    bars_after_first = service.get_cache_stats()["upstream_bars"]
+
+    # 短い期間は保存済みの範囲内なので、最新の差分だけを取得
+    one_month = asyncio.run(run("1mo"))
+    assert upstream.calls[-1] == ("range", "ETH-USD", "1d")
+    assert service.get_cache_stats()["upstream_bars"] - bars_after_first == 2
+    assert np.array_equal(one_month.close, one_year.close[-len(one_month):])
+    assert one_month.close[-1] == full.close[-1]
+
+
+def test_failures_are_not_cached(tmp_path):
+    """取得失敗は全ての待機者にNoneを返し、キャッシュしない"""
+    service = DataService(BarStore(tmp_path))
+    calls = []
+
+    def fail(symbol, period, interval):
+        calls.append(symbol)
+        time.sleep(0.01)
+        raise RuntimeError("rate limited")
+
+    service._fetch_history = fail
+
+    async def run():
+        results = await asyncio.gather(*[
+            service.get_historical_data("ETH-USD", "1mo", "1d") for _ in range(5)
+        ])
+        retry = await service.get_historical_data("ETH-USD", "1mo", "1d")
+        return results, retry
+
+    results, retry = asyncio.run(run())
+
+    assert results == [None] * 5
+    assert retry is None
+    assert len(calls) == 2
+
+
+def test_current_price_uses_latest_bars(tmp_path):
+    """現在価格は直近の日足から算出する"""
+    service = DataService(BarStore(tmp_path))
+    full = _make_frame()
+    StubUpstream(service, full)
+
+    price = asyncio.run(service.get_current_price("BTC"))
+
+    assert price.symbol == "BTC-USD"
+    assert price.currency == "USD"
+    assert price.price == full.close[-1]
+    assert price.change_24h == full.close[-1] - full.close[-2]
+
+
+def test_batch_request_uses_one_upstream_call(tmp_path):
+    """複数通貨の取得は上流への一括取得1回にまとめ、結果は通貨ごとにキャッシュする"""
+    service = DataService(BarStore(tmp_path))
+    full = _make_frame()
+    upstream = StubUpstream(service, full)
+    batches = []
+
+    def fetch_batch(symbols, interval, period, start):
+        batches.append((tuple(symbols), "period" if start is None else "range"))
+        lower = period_start(period) if start is None else start
+        return {symbol: full.take(full.timestamp >= lower) for symbol in symbols}
+
+    service._fetch_batch = fetch_batch
+    pairs = ["BTC", "ETH-USD", "SOL-USD", "BTC-USD"]
+
+    prices = asyncio.run(service.get_current_prices(pairs))
+    assert list(prices) == ["BTC-USD", "ETH-USD", "SOL-USD"]
+    assert all(price.price == full.close[-1] for price in prices.values())
+    assert batches == [(("BTC-USD", "ETH-USD", "SOL-USD"), "period")]
+    assert upstream.calls == []
+
+    # キャッシュ済みの通貨は上流に問い合わせない
+    asyncio.run(service.get_current_prices(pairs))
+    assert len(batches) == 1
+    assert asyncio.run(service.get_current_price("ETH")).price == prices["ETH-USD"].price
+    assert upstream.calls == []
+
+    # キャッシュの期限切れ後は、保存済みの最後の足以降のみを一括で取得
+    service.clear_cache()
+    frames = asyncio.run(service.get_historical_frames(pairs[:3], "5d", "1d"))
+    assert batches[-1] == (("BTC-USD", "ETH-USD", "SOL-USD"), "range")
+    assert all(frame.close[-1] == full.close[-1] for frame in frames.values())
+    assert upstream.calls == []
+    assert service.get_cache_stats()["batch_requests"] == 2
+
+
+class LimitedUpstream(StubUpstream):
+    """1分足の取得制限（30日より前は取得不可・1リクエスト7日まで）を再現する上流"""
+
+    def fetch_range(self, symbol, interval, start, end):
+        now = pd.Timestamp.now(tz="UTC")
+        if start < (now - pd.Timedelta(days=30)).value:
+            raise ValueError("1m data not available for startTime older than 30 days")
+        stop = now.value if end is None else end
+        if stop - start > pd.Timedelta(days=7).value:
+            raise ValueError("Only 7 days worth of 1m granularity data are allowed")
+        return super().fetch_range(symbol, interval, start, end)
+
+
+def _minute_frame(days: int) -> OHLCVFrame:
+    """現在時刻までの1分足（最後の1本は形成中）"""
+    end = pd.Timestamp.now(tz="UTC").floor("min")
+    index = pd.date_range(end=end, periods=days * 1440, freq="min")
+    close = np.arange(len(index), dtype=float) + 100
+    return OHLCVFrame.from_dataframe(pd.DataFrame({
+        "Open": close, "High": close + 1, "Low": close - 1,
+        "Close": close, "Volume": np.ones(len(index))
+    }, index=index))
+
+
+def _seed_store(store: BarStore, full: OHLCVFrame, stale_days: int) -> None:
+    """stale_days 日前までの足を保存済みの状態にする"""
+    cutoff = (pd.Timestamp.now(tz="UTC") - pd.Timedelta(days=stale_days)).value
+    stored = full.take(full.timestamp < cutoff)
+    store.append("BTC-USD", "1m", stored)
+    store.update_metadata("BTC-USD", "1m", covered_from=int(stored.timestamp[0]))
+
+
+def test_stale_intraday_tail_is_fetched_in_allowed_windows(tmp_path):
+    """最後の足からの差分は、上流の1リクエストの上限ごとに分割して取得する"""
+    full = _minute_frame(45)
+    store = BarStore(tmp_path)
+    _seed_store(store, full, stale_days=10)
+    service = DataService(store)
+    upstream = LimitedUpstream(service, full)
+
+    frame = asyncio.run(service.get_historical_frame("BTC-USD", "5d", "1m"))
+
+    assert upstream.calls == [("range", "BTC-USD", "1m")] * 2
+    stored = store.read("BTC-USD", "1m")
+    assert np.all(np.diff(stored.timestamp) == pd.Timedelta(minutes=1).value)
+    assert stored.timestamp[-1] == full.timestamp[-2]
+    assert frame.close[-1] == full.close[-1]
+
+
+def test_series_older_than_lookback_is_reset(tmp_path):
+    """最後の足が上流の遡れる範囲より古い場合は、期間全体を取得し直して置き換える"""
+    full = _minute_frame(45)
+    store = BarStore(tmp_path)
+    _seed_store(store, full, stale_days=40)
+    service = DataService(store)
+    upstream = LimitedUpstream(service, full)
+
+    frame = asyncio.run(service.get_historical_frame("BTC-USD", "5d", "1m"))
+
+    assert upstream.calls == [("period", "BTC-USD", "5d", "1m")]
+    stored = store.read("BTC-USD", "1m")
+    assert np.all(np.diff(stored.timestamp) == pd.Timedelta(minutes=1).value)
+    assert stored.timestamp[0] >= period_start("5d") - pd.Timedelta(minutes=1).value
+    covered_from = store.get_metadata("BTC-USD", "1m")["covered_from"]
+    assert covered_from > (pd.Timestamp.now(tz="UTC") - pd.Timedelta(days=6)).value
+    assert frame.close[-1] == full.close[-1]
+
+    # 置き換え後は最新の差分のみを取得する
+    service.clear_cache()
+    asyncio.run(service.get_historical_frame("BTC-USD", "5d", "1m"))
+    assert upstream.calls[-1] == ("range", "BTC-USD", "1m")
+
+
+def test_batch_tail_groups_symbols_by_last_bar(tmp_path):
+    """一括取得は最後の足が近い通貨ごとにまとめ、離れた通貨は通貨ごとの取得に任せる"""
+    full = _minute_frame(45)
+    store = BarStore(tmp_path)
+    now = pd.Timestamp.now(tz="UTC")
+    cutoffs = {
+        "BTC-USD": now - pd.Timedelta(minutes=30),
+        "ETH-USD": now - pd.Timedelta(minutes=90),
+        "SOL-USD": now - pd.Timedelta(days=3),  # 他の通貨から離れている
+        "XRP-USD": now - pd.Timedelta(days=3, minutes=20),
+        "ADA-USD": now - pd.Timedelta(days=40),  # 上流の遡れる範囲外
+    }
+    for symbol, cutoff in cutoffs.items():
+        stored = full.take(full.timestamp < cutoff.value)
+        store.append(symbol, "1m", stored)
+        store.update_metadata(symbol, "1m", covered_from=int(stored.timestamp[0]))
+
+    service = DataService(store)
+    upstream = LimitedUpstream(service, full)
+    batches = []
+
+    def fetch_batch(symbols, interval, period, start):
+        # 上流と同じく30日より前・7日を超える範囲は拒否する
+        assert start >= (pd.Timestamp.now(tz="UTC") - pd.Timedelta(days=30)).value
+        assert pd.Timestamp.now(tz="UTC").value - start <= pd.Timedelta(days=7).value
+        batches.append(tuple(symbols))
+        return {symbol: full.take(full.timestamp >= start) for symbol in symbols}
+
+    service._fetch_batch = fetch_batch
+    frames = asyncio.run(service.get_historical_frames(list(cutoffs), "5d", "1m"))
+
+    assert sorted(batches) == [("ETH-USD", "BTC-USD"), ("XRP-USD", "SOL-USD")]
+    assert upstream.calls == [("period", "ADA-USD", "5d", "1m")]
+    for symbol in cutoffs:
+        assert frames[symbol].close[-1] == full.close[-1]
+        stored = store.read(symbol, "1m")
+        assert np.all(np.diff(stored.timestamp) == pd.Timedelta(minutes=1).value)
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+条件付きリクエスト（ETag・304）とキャッシュヘッダーのテスト
+"""
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from src.core.http_cache import frame_etag
+from src.models.ohlcv import OHLCVFrame
+
+
+def _frame(last_close: float = 3.0) -> OHLCVFrame:
+    closes = np.array([1.0, 2.0, last_close])
+    timestamps = (np.arange(3, dtype=np.int64) + 19_000) * 86_400 * 10**9
+    return OHLCVFrame(timestamps, closes, closes, closes, closes, np.ones(3))
+
+
+@pytest.fixture
+def api(monkeypatch):
+    state = {"frame": _frame(), "analyses": 0}
+
+    async def get_historical_frame(pair, period, interval):
+        return state["frame"]
+
+    async def analyze(pair, indicator, period, interval):
+        state["analyses"] += 1
+        return {"symbol": "BTC-USD", "indicator": indicator, "period": period,
+                "interval": interval, "timestamp": "2022-01-08T00:00:00+00:00",
+                "value": 50.0, "signal": "neutral", "strength": 0.0, "parameters": {}}
+
+    monkeypatch.setattr(main.refresh_service, "get_frame", lambda *args: None)
+    monkeypatch.setattr(main.data_service, "get_historical_frame", get_historical_frame)
+    monkeypatch.setattr(main.indicator_analysis_service, "analyze", analyze)
+    return TestClient(main.app), state
+
+
+def test_frame_etag_changes_with_forming_bar():
+    """最後の足の時刻が同じでも値が更新されればETagが変わる"""
+    assert frame_etag(_frame(), "1d") == frame_etag(_frame(), "1d")
+    assert frame_etag(_frame(), "1d") != frame_etag(_frame(3.5), "1d")
+    assert frame_etag(_frame(), "1d") != frame_etag(_frame(), "1h")
+
+
+def test_historical_revalidates_with_etag(api):
+    client, state = api
+    url = "/api/historical/BTC-USD?period=1mo&interval=1d"
+    first = client.get(url)
+    assert first.status_code == 200
+    assert first.headers["cache-control"] == "public, max-age=300"
+    etag = first.headers["etag"]
+
+    second = client.get(url, headers={"If-None-Match": f"W/{etag}"})
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["etag"] == etag
+
+    # 形式が違えば別のETag
+    columnar = client.get(url + "&format=columnar", headers={"If-None-Match": etag})
+    assert columnar.status_code == 200
+    assert columnar.headers["etag"] != etag
+
+    state["frame"] = _frame(3.5)
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_analysis_not_modified_skips_computation(api):
+    """ETagが一致すればインジケーターを計算しない"""
+    client, state = api
+    url = "/api/analysis/BTC-USD/rsi?period=1mo&interval=1d"
+    first = client.get(url)
+    assert first.status_code == 200
+    assert state["analyses"] == 1
+    etag = first.headers["etag"]
+
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert state["analyses"] == 1
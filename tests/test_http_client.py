@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+外部API用の非同期HTTPクライアントと外部データ系インジケータのテスト
+ローカルのスタンドインサーバーに対して実行します
+"""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from services.indicators.services.indicator_factory import indicator_factory
+from src.core.config import AppConfig, IndicatorType
+from src.core.http_client import AsyncHTTPClient
+from src.models.ohlcv import OHLCVFrame
+
+DELAY = 0.3
+
+START = 1_700_000_000
+PAYLOADS = {
+    "/fapi/v1/fundingRate": [
+        {"fundingTime": (START + i * 28800) * 1000, "fundingRate": "0.0001"}
+        for i in range(3)
+    ],
+    "/fng/": {"data": [
+        {"timestamp": str(START + i * 86400), "value": "55",
+         "value_classification": "Greed"}
+        for i in range(3)
+    ]},
+    "/charts/hash-rate": {"values": [
+        {"x": START + i * 86400, "y": 5e20} for i in range(3)
+    ]},
+    "/charts/n-unique-addresses": {"values": [
+        {"x": START + i * 86400, "y": 800000} for i in range(3)
+    ]},
+    "/v8/finance/chart/SPY": {"chart": {"result": [{
+        "timestamp": [START + i * 86400 for i in range(40)],
+        "indicators": {"quote": [{"close": [400.0 + i for i in range(40)]}]}
+    }]}},
+}
+
+
+class StandInServer:
+    """外部APIの代わりに固定のJSONを遅延付きで返すサーバー"""
+
+    def __init__(self):
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                with server.lock:
+                    server.active += 1
+                    server.max_active = max(server.max_active, server.active)
+                time.sleep(DELAY)
+                with server.lock:
+                    server.active -= 1
+
+                body = json.dumps(PAYLOADS.get(urlsplit(self.path).path, {})).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def server(monkeypatch):
+    server = StandInServer()
+    for name in ("BINANCE_FUTURES_BASE_URL", "FEAR_GREED_BASE_URL",
+                 "BLOCKCHAIN_INFO_BASE_URL", "YAHOO_FINANCE_BASE_URL"):
+        monkeypatch.setattr(AppConfig, name, server.url)
+    monkeypatch.setattr(AppConfig, "CACHE_ENABLED", False)
+    yield server
+    server.close()
+
+
+def _make_frame(count: int = 40) -> OHLCVFrame:
+    index = pd.date_range("2024-01-01", periods=count, freq="D", tz="UTC")
+    close = np.linspace(100.0, 140.0, count)
+    return OHLCVFrame.from_dataframe(pd.DataFrame({
+        "Open": close, "High": close + 1, "Low": close - 1,
+        "Close": close, "Volume": np.full(count, 1000.0)
+    }, index=index))
+
+
+def test_external_indicators_run_concurrently_without_blocking(server):
+    """外部データ系インジケータは並行して取得され、イベントループを塞がない"""
+    frame = _make_frame()
+    types = [IndicatorType.FUNDING_RATE, IndicatorType.FEAR_GREED_INDEX,
+             IndicatorType.HASH_RATE, IndicatorType.ACTIVE_ADDRESSES,
+             IndicatorType.CORRELATION]
+
+    async def run():
+        ticks = 0
+        done = asyncio.Event()
+
+        async def ticker():
+            nonlocal ticks
+            while not done.is_set():
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        ticker_task = asyncio.create_task(ticker())
+        start = time.perf_counter()
+        results = await asyncio.gather(*[
+            indicator_factory.calculate_async(t, frame) for t in types
+        ])
+        elapsed = time.perf_counter() - start
+        done.set()
+        await ticker_task
+        return results, elapsed, ticks
+
+    results, elapsed, ticks = asyncio.run(run())
+
+    assert all(len(r) == 3 for r in results[:4])
+    assert results[0][-1].value == 0.01
+    assert results[2][-1].value == 5e8
+    # 価格・ベンチマークとも線形に増加するため相関は1
+    assert abs(results[4].values[-1] - 1.0) < 1e-9
+    # 逐次なら 5 * DELAY 以上かかる
+    assert elapsed < 2 * DELAY
+    # 取得中もループ上の他のタスクが動いている
+    assert ticks >= 10
+
+
+def test_sync_calculate_still_works(server):
+    """同期APIの calculate() も従来どおり結果を返す"""
+    indicator = indicator_factory.get_indicator(IndicatorType.FEAR_GREED_INDEX)
+    results = indicator.calculate(_make_frame())
+    assert [r.value for r in results] == [55, 55, 55]
+
+
+def test_per_host_concurrency_limit(server):
+    """ホストごとの同時リクエスト数は上限を超えない"""
+    client = AsyncHTTPClient(max_connections_per_host=2)
+
+    async def run():
+        try:
+            return await asyncio.gather(*[
+                client.get_json(f"{server.url}/charts/hash-rate") for _ in range(6)
+            ])
+        finally:
+            await client.aclose()
+
+    results = asyncio.run(run())
+
+    assert len(results) == 6
+    assert server.max_active == 2
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+インクリメンタルインジケータ（services/indicators/core/incremental.py）のテスト
+seed → update の結果がバッチ計算（calculate）と一致すること、peek が状態を
+変更しないこと、状態の保存・復元がJSONを経由しても一致することを確認します
+"""
+
+import json
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from scripts.benchmark_indicator_kernels import make_bars
+from services.indicators.core.incremental import (
+    RollingExtremum,
+    create_incremental,
+    restore_incremental,
+    supported_incremental_types,
+)
+from services.indicators.core.rolling import rolling_max, rolling_min
+from services.indicators.services.indicator_factory import indicator_factory
+from src.core.config import IndicatorType
+from src.models.ohlcv import OHLCVFrame
+
+SIZE = 200
+SEED_BARS = 60
+
+PARAMETERS = {
+    IndicatorType.SMA: {"period": 20},
+    IndicatorType.EMA: {"period": 12},
+}
+TYPES = supported_incremental_types()
+
+
+def _frame(size: int = SIZE) -> OHLCVFrame:
+    df = make_bars(size, seed=11)
+    timestamps = pd.date_range("2024-01-01", periods=size, freq="h", tz="UTC").asi8
+    return OHLCVFrame(timestamps, df["price"].to_numpy(), df["high"].to_numpy(),
+                      df["low"].to_numpy(), df["price"].to_numpy(), df["volume"].to_numpy())
+
+
+def _create(indicator_type: IndicatorType):
+    return create_incremental(indicator_type, **PARAMETERS.get(indicator_type, {}))
+
+
+def _assert_same_value(actual, expected, decimals: int) -> None:
+    tolerance = 1.5 * 10 ** -decimals
+    assert actual.name == expected.name
+    assert actual.timestamp == expected.timestamp
+    assert actual.value == pytest.approx(expected.value, abs=tolerance)
+    assert actual.parameters.keys() == expected.parameters.keys()
+    for key, value in expected.parameters.items():
+        if isinstance(value, float):
+            assert actual.parameters[key] == pytest.approx(value, abs=tolerance)
+        else:
+            assert actual.parameters[key] == value
+
+
+@pytest.mark.parametrize("indicator_type", TYPES, ids=lambda t: t.name)
+def test_seed_then_update_matches_batch(indicator_type):
+    frame = _frame()
+    batch = indicator_factory.calculate(
+        indicator_type, frame, **PARAMETERS.get(indicator_type, {}))
+    expected = {int(ts): point for ts, point in zip(batch.timestamp, batch)}
+
+    indicator = _create(indicator_type)
+    seeded = indicator.seed(frame.take(slice(0, SEED_BARS)))
+    _assert_same_value(seeded, expected[int(frame.timestamp[SEED_BARS - 1])],
+                       indicator.decimals)
+
+    compared = 0
+    for bar in frame.take(slice(SEED_BARS, SIZE)).to_points():
+        value = indicator.update(bar)
+        timestamp = pd.Timestamp(bar.timestamp).value
+        if timestamp not in expected:
+            assert value is None
+            continue
+        _assert_same_value(value, expected[timestamp], indicator.decimals)
+        compared += 1
+    assert compared == SIZE - SEED_BARS
+
+
+@pytest.mark.parametrize("indicator_type", TYPES, ids=lambda t: t.name)
+def test_peek_does_not_mutate_state(indicator_type):
+    frame = _frame()
+    bars = frame.take(slice(SEED_BARS, SEED_BARS + 2)).to_points()
+
+    indicator = _create(indicator_type)
+    indicator.seed(frame.take(slice(0, SEED_BARS)))
+    before = json.dumps(indicator.get_state(), sort_keys=True)
+
+    forming = bars[0].model_copy(update={"close": bars[0].close * 1.05})
+    indicator.peek(forming)
+    assert json.dumps(indicator.get_state(), sort_keys=True) == before
+
+    # peek は同じ足を update した場合と同じ値を返す
+    assert indicator.peek(bars[0]) == indicator.update(bars[0])
+
+
+@pytest.mark.parametrize("indicator_type", TYPES, ids=lambda t: t.name)
+def test_state_round_trips_through_json(indicator_type):
+    frame = _frame()
+    indicator = _create(indicator_type)
+    indicator.seed(frame.take(slice(0, SEED_BARS)))
+
+    text = json.dumps(indicator.get_state(), allow_nan=False)
+    restored = restore_incremental(json.loads(text))
+    assert restored.get_state() == indicator.get_state()
+
+    for bar in frame.take(slice(SEED_BARS, SEED_BARS + 30)).to_points():
+        assert restored.update(bar) == indicator.update(bar)
+
+
+def test_state_encodes_nan_as_none():
+    """NaNを含むウィンドウ・未初期化の値は None として保存される"""
+    frame = _frame(30)
+    close = frame.close.copy()
+    close[-3] = np.nan
+    frame = OHLCVFrame(frame.timestamp, frame.open, frame.high, frame.low, close, frame.volume)
+
+    indicator = create_incremental(IndicatorType.SMA, period=5)
+    indicator.seed(frame)
+    state = indicator.get_state()
+    assert None in state["state"]["window"]["buffer"]
+    json.dumps(state, allow_nan=False)
+
+    restored = restore_incremental(json.loads(json.dumps(state)))
+    assert math.isnan(restored.window.buffer[-3])
+
+    empty = create_incremental(IndicatorType.PARABOLIC_SAR).get_state()
+    assert empty["last_close"] is None
+    assert empty["state"]["sar"] is None
+    restored = restore_incremental(json.loads(json.dumps(empty, allow_nan=False)))
+    assert math.isnan(restored.sar)
+
+
+@pytest.mark.parametrize("mode", ["max", "min"])
+def test_rolling_extremum_matches_batch_with_nan(mode):
+    """NaNを含むウィンドウはバッチ計算・pandasと同じくNaN"""
+    values = make_bars(80, seed=5)["high"].to_numpy()
+    values[[10, 11, 40, 79]] = np.nan
+    batch = (rolling_max if mode == "max" else rolling_min)(values, 7)
+    expected = getattr(pd.Series(values).rolling(7), mode)().to_numpy()
+    np.testing.assert_array_equal(batch, expected)
+
+    extremum = RollingExtremum(7, mode)
+    for i, x in enumerate(values):
+        peeked = extremum.value(x)
+        extremum.push(x)
+        assert extremum.value() == pytest.approx(batch[i], nan_ok=True)
+        assert peeked == pytest.approx(batch[i], nan_ok=True)
+
+    restored = RollingExtremum(7, mode)
+    restored.load_state(json.loads(json.dumps(extremum.to_state(), allow_nan=False)))
+    restored.push(1.0)
+    assert math.isnan(restored.value())
+
+
+@pytest.mark.parametrize("indicator_type", [IndicatorType.STOCHASTIC, IndicatorType.WILLIAMS_R],
+                         ids=lambda t: t.name)
+def test_nan_bar_matches_batch(indicator_type):
+    """高値・安値が欠けた足を含んでも、update の結果はバッチ計算と一致する"""
+    frame = _frame()
+    high, low = frame.high.copy(), frame.low.copy()
+    high[SEED_BARS + 10] = np.nan
+    low[SEED_BARS + 40] = np.nan
+    frame = OHLCVFrame(frame.timestamp, frame.open, high, low, frame.close, frame.volume)
+
+    batch = indicator_factory.calculate(indicator_type, frame)
+    expected = {int(ts): point for ts, point in zip(batch.timestamp, batch)}
+
+    indicator = _create(indicator_type)
+    indicator.seed(frame.take(slice(0, SEED_BARS)))
+    skipped = 0
+    for bar in frame.take(slice(SEED_BARS, SIZE)).to_points():
+        value = indicator.update(bar)
+        timestamp = pd.Timestamp(bar.timestamp).value
+        if timestamp not in expected:
+            assert value is None
+            skipped += 1
+            continue
+        _assert_same_value(value, expected[timestamp], indicator.decimals)
+    assert skipped > 0
+
+
+@pytest.mark.parametrize("indicator_type", TYPES, ids=lambda t: t.name)
+def test_rejects_out_of_order_and_duplicate_bars(indicator_type):
+    frame = _frame()
+    indicator = _create(indicator_type)
+    indicator.seed(frame.take(slice(0, SEED_BARS)))
+    points = frame.take(slice(SEED_BARS - 2, SEED_BARS + 1)).to_points()
+    before = indicator.get_state()
+
+    with pytest.raises(ValueError):
+        indicator.update(points[1])  # 確定済みの最後の足と同じ時刻
+    with pytest.raises(ValueError):
+        indicator.update(points[0])  # 確定済みの足より古い時刻
+    assert indicator.get_state() == before
+
+    assert indicator.update(points[2]) is not None
+    with pytest.raises(ValueError):
+        indicator.update(points[2])
+
+
+def test_seed_accepts_points_and_empty_data():
+    frame = _frame(40)
+    from_frame = create_incremental(IndicatorType.SMA, period=10)
+    from_points = create_incremental(IndicatorType.SMA, period=10)
+    assert from_frame.seed(frame) == from_points.seed(frame.to_points())
+
+    assert create_incremental(IndicatorType.SMA, period=10).seed([]) is None
+
+
+def test_unsupported_type():
+    with pytest.raises(ValueError):
+        create_incremental(IndicatorType.CCI)
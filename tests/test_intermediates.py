@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+共有の中間系列を使うインジケータが旧実装（pandasの式）と一致すること、
+中間系列がフレームごとに一度だけ計算されることのテスト
+"""
+
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+import pytest
+from numpy.testing import assert_allclose
+
+from scripts.benchmark_indicator_kernels import make_bars
+from services.indicators.core.atr_indicator import ATRIndicator
+from services.indicators.core.cci_indicator import CCIIndicator
+from services.indicators.core.intermediates import source
+from services.indicators.core.keltner_channel_indicator import KeltnerChannelIndicator
+from services.indicators.core.money_flow_index_indicator import MoneyFlowIndexIndicator
+from services.indicators.core.stochastic_indicator import StochasticIndicator
+from services.indicators.core.vwap_indicator import VWAPIndicator
+from services.indicators.core.williams_r_indicator import WilliamsRIndicator
+from src.models.ohlcv import OHLCVFrame
+
+# 小数第2位に丸めた値の比較（丸めの境界で1単位ずれることがある）
+ROUNDED = 0.01 + 1e-9
+
+
+def _bars() -> pd.DataFrame:
+    return make_bars(300, seed=3)
+
+
+def _frame(df: pd.DataFrame) -> OHLCVFrame:
+    timestamps = (np.arange(len(df), dtype=np.int64) + 19_000) * 86_400 * 10**9
+    return OHLCVFrame(timestamps, df["price"].to_numpy(), df["high"].to_numpy(),
+                      df["low"].to_numpy(), df["price"].to_numpy(), df["volume"].to_numpy())
+
+
+def _true_range(df: pd.DataFrame) -> pd.Series:
+    high_low = df["high"] - df["low"]
+    high_close = np.abs(df["high"] - df["price"].shift(1))
+    low_close = np.abs(df["low"] - df["price"].shift(1))
+    return pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
+
+
+def _typical_price(df: pd.DataFrame) -> pd.Series:
+    return (df["high"] + df["low"] + df["price"]) / 3
+
+
+def _legacy_cci(df: pd.DataFrame, period: int) -> pd.Series:
+    tp = _typical_price(df)
+    sma_tp = tp.rolling(window=period).mean()
+    mean_deviation = tp.rolling(window=period).apply(lambda x: abs(x - x.mean()).mean())
+    return (tp - sma_tp) / (0.015 * mean_deviation)
+
+
+def _legacy_atr(df: pd.DataFrame, period: int) -> pd.Series:
+    return _true_range(df).ewm(span=period).mean()
+
+
+def _legacy_keltner(df: pd.DataFrame, period: int, multiplier: float):
+    middle = _typical_price(df).rolling(window=period).mean()
+    atr = _true_range(df).rolling(window=period).mean()
+    return middle, middle + multiplier * atr, middle - multiplier * atr
+
+
+def _legacy_stochastic(df: pd.DataFrame, k_period: int, d_period: int, slowing: int):
+    lowest_low = df["low"].rolling(window=k_period).min()
+    highest_high = df["high"].rolling(window=k_period).max()
+    k_percent = 100 * ((df["price"] - lowest_low) / (highest_high - lowest_low))
+    k_slowed = k_percent.rolling(window=slowing).mean()
+    return k_slowed, k_slowed.rolling(window=d_period).mean()
+
+
+def _legacy_williams_r(df: pd.DataFrame, period: int) -> pd.Series:
+    highest_high = df["high"].rolling(window=period).max()
+    lowest_low = df["low"].rolling(window=period).min()
+    return ((highest_high - df["price"]) / (highest_high - lowest_low)) * -100
+
+
+def _assert_series(series, expected: pd.Series) -> None:
+    expected = expected.to_numpy()
+    expected = expected[~np.isnan(expected)]
+    assert len(series.values) == len(expected)
+    assert_allclose(series.values, expected, rtol=0, atol=ROUNDED)
+
+
+def test_cci_matches_legacy():
+    df = _bars()
+    _assert_series(CCIIndicator().calculate(_frame(df), period=20), _legacy_cci(df, 20))
+
+
+def test_atr_matches_legacy():
+    df = _bars()
+    _assert_series(ATRIndicator().calculate(_frame(df), period=14), _legacy_atr(df, 14))
+
+
+def test_keltner_matches_legacy():
+    df = _bars()
+    result = KeltnerChannelIndicator().calculate(_frame(df), period=20, multiplier=2.0)
+    for series, expected in zip(result.series, _legacy_keltner(df, 20, 2.0)):
+        _assert_series(series, expected)
+
+
+def test_stochastic_matches_legacy():
+    df = _bars()
+    series = StochasticIndicator().calculate(_frame(df), k_period=14, d_period=3, slowing=3)
+    k_slowed, d_percent = _legacy_stochastic(df, 14, 3, 3)
+    _assert_series(series, k_slowed)
+    # %D は %K の先頭の足では未確定（NaN）
+    assert_allclose(series.extras["d_value"], d_percent.dropna().reindex(
+        k_slowed.dropna().index).to_numpy(), rtol=0, atol=ROUNDED)
+
+
+def test_williams_r_matches_legacy():
+    df = _bars()
+    _assert_series(WilliamsRIndicator().calculate(_frame(df), period=14),
+                   _legacy_williams_r(df, 14))
+
+
+@pytest.mark.parametrize("name", ["typical_price", "true_range"])
+def test_shared_series_match_pandas(name):
+    df = _bars()
+    frame = _frame(df)
+    expected = _typical_price(df) if name == "typical_price" else _true_range(df)
+    assert_allclose(source(frame, name), expected.to_numpy(), rtol=1e-12)
+
+
+def test_intermediates_are_computed_once_per_frame(monkeypatch):
+    """同じフレームで複数のインジケータを計算しても、中間系列の計算は各1回"""
+    requested, computed = Counter(), Counter()
+    original = OHLCVFrame.intermediate
+
+    def counting(self, key, compute, dtype=np.float64):
+        requested[key] += 1
+
+        def wrapped():
+            computed[key] += 1
+            return compute()
+        return original(self, key, wrapped, dtype)
+
+    monkeypatch.setattr(OHLCVFrame, "intermediate", counting)
+
+    frame = _frame(_bars())
+    indicators = [
+        (CCIIndicator(), {"period": 20}),
+        (ATRIndicator(), {"period": 14}),
+        (KeltnerChannelIndicator(), {"period": 20}),
+        (StochasticIndicator(), {}),
+        (WilliamsRIndicator(), {"period": 14}),
+        (MoneyFlowIndexIndicator(), {}),
+        (VWAPIndicator(), {}),
+    ]
+    for _ in range(2):
+        for indicator, params in indicators:
+            assert indicator.calculate(frame, **params)
+
+    assert computed and set(computed.values()) == {1}
+    # 共有の中間系列は複数のインジケータから参照されている（メモのヒット）
+    assert requested[("typical_price",)] > 2
+    assert requested[("true_range",)] >= 2
+    assert requested[("sma", "typical_price", 20)] >= 4
+    assert requested[("highest", "high", 14)] >= 4
+
+    # 別のフレームでは改めて計算する
+    CCIIndicator().calculate(_frame(_bars()), period=20)
+    assert computed[("typical_price",)] == 2
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+履歴データの高速JSONエンコードのテスト
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from src.core import json_encoding
+from src.core.json_encoding import encode_historical
+from src.models.ohlcv import OHLCVFrame
+from src.models.schemas import HistoricalData
+
+
+def _frame(count: int = 50) -> OHLCVFrame:
+    timestamps = (np.arange(count, dtype=np.int64) * 60 + 1_700_000_000) * 10**9
+    close = np.linspace(100.0, 200.0, count)
+    volume = close * 3
+    volume[3] = np.nan
+    return OHLCVFrame(timestamps, close - 1, close + 1, close - 2, close, volume)
+
+
+@pytest.fixture(params=["orjson", "json"])
+def encoder(request, monkeypatch):
+    if request.param == "json":
+        monkeypatch.setattr(json_encoding, "orjson", None)
+    elif json_encoding.orjson is None:
+        pytest.skip("orjson がインストールされていません")
+    return encode_historical
+
+
+def test_rows_match_pydantic_serialization(encoder):
+    """行形式の出力は HistoricalData をpydanticでシリアライズした結果と同じ"""
+    frame = _frame()
+    expected = HistoricalData(
+        symbol="BTC-USD", period="1d", interval="1m",
+        data_count=len(frame), data=frame.to_points()).model_dump_json()
+
+    assert json.loads(encoder("BTC-USD", "1d", "1m", frame)) == json.loads(expected)
+
+
+def test_columnar_shape(encoder):
+    """列指向の形式は列ごとの配列で、欠損値は null"""
+    frame = _frame()
+    body = json.loads(encoder("BTC-USD", "1d", "1m", frame, columnar=True))
+
+    assert body["format"] == "columnar"
+    assert body["data_count"] == len(frame)
+    assert list(body["data"]) == ["timestamp", "open", "high", "low", "close", "volume"]
+    assert body["data"]["timestamp"][0] == "2023-11-14T22:13:20+00:00"
+    assert body["data"]["close"] == frame.close.tolist()
+    assert body["data"]["volume"][3] is None
+
+    rows = encoder("BTC-USD", "1d", "1m", frame)
+    assert len(encoder("BTC-USD", "1d", "1m", frame, columnar=True)) < 0.8 * len(rows)
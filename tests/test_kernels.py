@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+経路依存インジケータのカーネル（OBV・Parabolic SAR）が旧実装と一致することのテスト
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from scripts.benchmark_indicator_kernels import (
+    legacy_obv,
+    legacy_parabolic_sar,
+    make_bars,
+)
+from services.indicators.core.kernels import obv_kernel, parabolic_sar_kernel
+
+
+def _zigzag(size: int = 60) -> pd.DataFrame:
+    """上昇と下落を繰り返し、トレンド転換が何度も起きる足"""
+    close = 100 + 10 * np.sign(np.sin(np.arange(size) / 3)) + np.arange(size) % 5
+    return pd.DataFrame({
+        "high": close + 1, "low": close - 1, "price": close, "volume": np.arange(size) + 1.0
+    })
+
+
+def _flat(size: int = 30) -> pd.DataFrame:
+    close = np.full(size, 100.0)
+    return pd.DataFrame({"high": close, "low": close, "price": close, "volume": np.ones(size)})
+
+
+def _with_nan() -> pd.DataFrame:
+    df = make_bars(200, seed=7)
+    df.loc[[5, 6, 50], "price"] = np.nan
+    df.loc[[10, 120], "volume"] = np.nan
+    df.loc[[30, 90], ["high", "low"]] = np.nan
+    return df
+
+
+CASES = {
+    "random": make_bars(2000),
+    "zigzag": _zigzag(),
+    "flat": _flat(),
+    "nan": _with_nan(),
+    "single": make_bars(1),
+}
+
+
+@pytest.mark.parametrize("name", CASES)
+def test_obv_kernel_matches_legacy_loop(name):
+    df = CASES[name]
+    expected = legacy_obv(df).to_numpy()
+    actual = obv_kernel(df["price"].to_numpy(), df["volume"].to_numpy())
+    np.testing.assert_array_equal(actual, expected)
+
+
+@pytest.mark.parametrize("name", CASES)
+@pytest.mark.parametrize("acceleration,maximum", [(0.02, 0.2), (0.1, 0.3)])
+def test_parabolic_sar_kernel_matches_legacy_loop(name, acceleration, maximum):
+    df = CASES[name]
+    expected = legacy_parabolic_sar(df, acceleration, maximum).to_numpy()
+    actual = parabolic_sar_kernel(
+        df["high"].to_numpy(), df["low"].to_numpy(), acceleration, maximum)
+    np.testing.assert_array_equal(actual, expected)
+
+
+def test_zigzag_reverses_trend():
+    """テストデータでトレンド転換（SARが価格の反対側に移る）が起きていること"""
+    df = CASES["zigzag"]
+    sar = parabolic_sar_kernel(df["high"].to_numpy(), df["low"].to_numpy())
+    above = sar > df["price"].to_numpy()
+    assert above.any() and (~above).any()
+
+
+def test_empty_input():
+    assert len(obv_kernel(np.array([]), np.array([]))) == 0
+    assert len(parabolic_sar_kernel(np.array([]), np.array([]))) == 0
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+履歴データのページング（時刻の範囲・件数・カーソル）のテスト
+"""
+
+import asyncio
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from services.data.data_service import DataService
+from services.data.pagination import decode_cursor, encode_cursor, page_frame, range_period
+from services.storage.bar_store import BarStore
+from src.models.ohlcv import OHLCVFrame
+
+HOUR_NS = 60 * 60 * 10**9
+START_NS = 1_700_000_000 * 10**9
+
+
+def _frame(count: int = 10) -> OHLCVFrame:
+    timestamps = START_NS + np.arange(count, dtype=np.int64) * HOUR_NS
+    closes = np.arange(count, dtype=float)
+    return OHLCVFrame(timestamps, closes, closes, closes, closes, np.ones(count))
+
+
+def test_cursor_walks_range_in_pages():
+    """カーソルをたどると期間内の足を重複・欠落なく1ページずつ返す"""
+    frame = _frame()
+    start = "2023-11-14T23:13:20Z"  # 2本目
+    end = "2023-11-15T06:13:20+00:00"  # 9本目（含まない）
+
+    closes, cursor = [], None
+    for _ in range(10):
+        page, cursor = page_frame(frame, 3, start, end, cursor)
+        assert len(page) <= 3
+        # ページはキャッシュ済みフレームのビュー
+        assert np.shares_memory(page.close, frame.close)
+        closes.extend(page.close.tolist())
+        if cursor is None:
+            break
+    assert closes == [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0]
+
+
+def test_page_without_bounds_and_empty_range():
+    frame = _frame()
+    page, cursor = page_frame(frame, 20)
+    assert len(page) == 10 and cursor is None
+
+    page, cursor = page_frame(frame, 5, start="2030-01-01")
+    assert len(page) == 0 and cursor is None
+
+
+def test_invalid_parameters_raise_value_error():
+    assert decode_cursor(encode_cursor(START_NS, None)) == (START_NS, None)
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor!")
+    with pytest.raises(ValueError):
+        page_frame(_frame(), 5, start="yesterday-ish")
+
+
+def test_range_period_derives_or_rejects_period():
+    now = pd.Timestamp("2024-06-01", tz="UTC")
+    start = pd.Timestamp("2024-04-15", tz="UTC").value
+    assert range_period(None, None, None, now) == "1d"
+    assert range_period(None, start, None, now) == "3mo"
+    assert range_period(None, pd.Timestamp("2000-01-01", tz="UTC").value, None, now) == "max"
+    assert range_period("1y", start, None, now) == "1y"
+    with pytest.raises(ValueError):
+        range_period("1mo", start, None, now)
+    with pytest.raises(ValueError):
+        range_period("1d", None, start, now)
+
+
+@pytest.fixture
+def stored_api(tmp_path, monkeypatch):
+    """1年分の日足を保存済みのデータサービスで履歴エンドポイントを呼び出す"""
+    days = 365
+    end = pd.Timestamp.now(tz="UTC").floor("D")
+    index = pd.date_range(end=end, periods=days, freq="D")
+    closes = np.arange(days, dtype=float)
+    full = OHLCVFrame.from_dataframe(pd.DataFrame({
+        "Open": closes, "High": closes, "Low": closes, "Close": closes,
+        "Volume": np.ones(days)}, index=index))
+
+    service = DataService(BarStore(tmp_path))
+    calls = []
+
+    def fetch_history(symbol, period, interval):
+        calls.append(period)
+        return full
+
+    def fetch_range(symbol, interval, start, end):
+        calls.append("range")
+        return full.take(full.timestamp >= start)
+
+    service._fetch_history = fetch_history
+    service._fetch_range = fetch_range
+    asyncio.run(service.get_historical_frame("BTC-USD", "max", "1d"))
+    service.clear_cache()
+
+    monkeypatch.setattr(main, "data_service", service)
+    monkeypatch.setattr(main.refresh_service, "get_frame", lambda *args: None)
+    return TestClient(main.app), service, index
+
+
+def test_historical_range_outside_default_period(stored_api):
+    """period を省略した範囲指定は範囲を含む期間から返す（空の200にしない）"""
+    client, service, index = stored_api
+    start, end = index[-60], index[-30]
+    response = client.get("/api/historical/BTC-USD", params={
+        "interval": "1d", "start": start.isoformat(), "end": end.isoformat(), "limit": 20})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["period"] == "3mo"
+    assert body["data_count"] == 20
+    assert body["data"][0]["close"] == 305.0
+
+    rest = client.get("/api/historical/BTC-USD", params={
+        "interval": "1d", "cursor": body["next_cursor"]}).json()
+    assert [point["close"] for point in rest["data"]] == list(np.arange(325.0, 335.0))
+    assert rest["next_cursor"] is None
+    # 範囲は保存済みの足から読み込み、期間全体のフレームはキャッシュしない
+    assert service.get_cache_stats()["entries"] == 0
+
+
+def test_historical_range_outside_explicit_period_is_rejected(stored_api):
+    client, _, index = stored_api
+    response = client.get("/api/historical/BTC-USD", params={
+        "period": "1mo", "interval": "1d", "start": index[-60].isoformat()})
+    assert response.status_code == 400
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+トークンバケットによるレート制限と負荷制御のテスト
+"""
+
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.core.rate_limit import RateLimiter, RateLimitMiddleware
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_client_buckets_refill_and_isolate_clients():
+    """クライアントごとに上限があり、時間の経過で回復する"""
+    clock = FakeClock()
+    limiter = RateLimiter(per_minute=3, per_hour=100, global_per_minute=0, clock=clock)
+
+    assert all(limiter.admit("a", "/api/price/BTC").allowed for _ in range(3))
+    rejected = limiter.admit("a", "/api/price/BTC")
+    assert (rejected.allowed, rejected.status_code, rejected.retry_after) == (False, 429, 20)
+    # 他のクライアントは影響を受けない
+    assert limiter.admit("b", "/api/price/BTC").allowed
+
+    clock.now = 20.0
+    assert limiter.admit("a", "/api/price/BTC").allowed
+    assert not limiter.admit("a", "/api/price/BTC").allowed
+
+
+def test_hourly_and_global_limits():
+    clock = FakeClock()
+    limiter = RateLimiter(per_minute=100, per_hour=2, global_per_minute=0, clock=clock)
+    assert limiter.admit("a", "/api/x").allowed and limiter.admit("a", "/api/x").allowed
+    assert limiter.admit("a", "/api/x").retry_after == 1800
+
+    limiter = RateLimiter(per_minute=100, per_hour=100, global_per_minute=2, clock=clock)
+    assert limiter.admit("a", "/api/x").allowed and limiter.admit("b", "/api/x").allowed
+    assert limiter.admit("c", "/api/x").status_code == 429
+
+
+def test_expensive_endpoints_shed_when_busy():
+    """重いエンドポイントは同時実行数の上限を超えると即座に 503"""
+    limiter = RateLimiter(per_minute=100, per_hour=100, global_per_minute=0,
+                          expensive_concurrency=1, clock=FakeClock())
+    running = limiter.admit("a", "/api/analysis/BTC-USD/rsi")
+    assert running.allowed
+    assert limiter.admit("b", "/api/analysis/BTC-USD").status_code == 503
+    # 軽いエンドポイントは受け付ける
+    assert limiter.admit("b", "/api/price/BTC-USD").allowed
+
+    limiter.release(running)
+    assert limiter.admit("b", "/api/analysis/BTC-USD").allowed
+
+
+def test_middleware_rejects_before_handler():
+    calls = []
+    app = FastAPI()
+    limiter = RateLimiter(per_minute=2, per_hour=100, global_per_minute=0, clock=FakeClock())
+    app.add_middleware(RateLimitMiddleware, limiter=limiter)
+
+    @app.get("/api/analysis/{pair}")
+    async def analysis(pair: str):
+        calls.append(pair)
+        await asyncio.sleep(0)
+        return {"pair": pair}
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    client = TestClient(app)
+    first = client.get("/api/analysis/BTC")
+    assert first.status_code == 200
+    assert first.headers["x-ratelimit-remaining"] == "1"
+    assert client.get("/api/analysis/BTC").status_code == 200
+
+    response = client.get("/api/analysis/BTC")
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "30"
+    assert response.json()["status_code"] == 429
+    assert calls == ["BTC", "BTC"]
+    assert limiter.get_stats()["expensive_running"] == 0
+    # API以外は対象外
+    assert client.get("/health").status_code == 200
+
+
+def test_spoofed_forwarded_for_does_not_bypass_limit():
+    """クライアントが X-Forwarded-For の左側を変えても、プロキシが追加したアドレスで数える"""
+    app = FastAPI()
+    limiter = RateLimiter(per_minute=2, per_hour=100, global_per_minute=0, clock=FakeClock())
+    app.add_middleware(RateLimitMiddleware, limiter=limiter, trusted_proxies=1)
+
+    @app.get("/api/price/{pair}")
+    async def price(pair: str):
+        return {"pair": pair}
+
+    client = TestClient(app)
+    # nginx は受け取ったヘッダーの右端に接続元（203.0.113.7）を追加する
+    statuses = [
+        client.get("/api/price/BTC", headers={
+            "X-Forwarded-For": f"198.51.100.{i}, 203.0.113.7"}).status_code
+        for i in range(4)
+    ]
+    assert statuses == [200, 200, 429, 429]
+    # 別の接続元は別のクライアント
+    assert client.get("/api/price/BTC", headers={
+        "X-Forwarded-For": "198.51.100.1, 203.0.113.8"}).status_code == 200
+
+
+def test_client_address_uses_trusted_hops():
+    def scope(*values):
+        return {"headers": [(b"x-forwarded-for", value.encode()) for value in values],
+                "client": ("10.0.0.1", 1234)}
+
+    direct = RateLimitMiddleware(None, limiter=RateLimiter(), trusted_proxies=0)
+    assert direct._client(scope("1.1.1.1")) == "10.0.0.1"
+
+    one = RateLimitMiddleware(None, limiter=RateLimiter(), trusted_proxies=1)
+    assert one._client(scope("6.6.6.6, 1.1.1.1")) == "1.1.1.1"
+    assert one._client(scope("6.6.6.6", "1.1.1.1")) == "1.1.1.1"
+    assert one._client(scope()) == "10.0.0.1"
+
+    # CDN → nginx の2段構成では、右から2番目が CDN の受けた接続元
+    two = RateLimitMiddleware(None, limiter=RateLimiter(), trusted_proxies=2)
+    assert two._client(scope("6.6.6.6, 1.1.1.1, 172.16.0.2")) == "1.1.1.1"
+    assert two._client(scope("1.1.1.1")) == "1.1.1.1"
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+バックグラウンド更新（スナップショットの作成・期限・フォールバック）のテスト
+"""
+
+import asyncio
+import time
+
+import numpy as np
+
+from services.refresh.refresh_service import RefreshService, refresh_interval
+from src.models.ohlcv import OHLCVFrame
+from src.models.schemas import CurrencyPairData
+
+DAY_NS = 24 * 60 * 60 * 10**9
+
+
+class FakeSource:
+    """data_service の代わりに固定のフレームを返す"""
+
+    def __init__(self):
+        closes = np.array([1.0, 2.0, 3.0])
+        self.frame = OHLCVFrame(
+            np.arange(3, dtype=np.int64) * DAY_NS, closes, closes, closes, closes, closes)
+        self.refreshed = []
+
+    def to_symbol(self, pair):
+        return pair if "-" in pair else f"{pair}-USD"
+
+    async def refresh_historical_frame(self, pair, period, interval):
+        self.refreshed.append((pair, period, interval))
+        return None if pair == "BAD" else self.frame
+
+    async def get_current_price(self, pair):
+        return CurrencyPairData(
+            symbol=self.to_symbol(pair), price=3.0, currency="USD",
+            timestamp="2024-01-03T00:00:00+00:00")
+
+
+class FakeAnalyzer:
+    def __init__(self):
+        self.calls = 0
+
+    async def analyze_many(self, pair, names, period, interval):
+        self.calls += 1
+        return {"symbol": pair, "indicators": {name: {"value": 1.0} for name in names[:-1]},
+                "unavailable": names[-1:]}
+
+
+def _service():
+    async def names():
+        return ["rsi", "macd", "hash_rate"]
+
+    source, analyzer = FakeSource(), FakeAnalyzer()
+    service = RefreshService(
+        data_source=source, analyzer=analyzer, indicator_names=names,
+        symbols=["BTC", "ETH", "BAD"], series=[("1mo", "1d")], concurrency=2)
+    return service, source, analyzer
+
+
+def test_refresh_publishes_snapshots_for_all_symbols():
+    """全通貨の履歴データとインジケータ分析を事前計算し、失敗した通貨は省く"""
+    service, source, analyzer = _service()
+    asyncio.run(service.refresh_series("1mo", "1d"))
+
+    assert analyzer.calls == 2
+    assert len(service.get_frame("BTC-USD", "1mo", "1d")) == 3
+    assert service.get_snapshot("ETH", "1mo", "1d").symbol == "ETH-USD"
+    assert service.get_frame("BAD", "1mo", "1d") is None
+    # 事前計算していない系列はスナップショットを使わない
+    assert service.get_frame("BTC", "3mo", "1d") is None
+
+    analysis = service.get_analysis("BTC", ["macd", "hash_rate"], "1mo", "1d")
+    assert analysis["indicators"] == {"macd": {"value": 1.0}}
+    assert analysis["unavailable"] == ["hash_rate"]
+    assert service.get_analysis("BTC", ["unknown"], "1mo", "1d") is None
+
+
+def test_snapshot_expires_after_two_refresh_intervals(monkeypatch):
+    """更新が止まったスナップショットは使わない"""
+    service, _, _ = _service()
+    asyncio.run(service.refresh_symbol("BTC", "1mo", "1d"))
+    asyncio.run(service.refresh_price("BTC"))
+    assert service.get_price("BTC").price == 3.0
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 2 * refresh_interval("1d") + 1)
+    assert service.get_frame("BTC", "1mo", "1d") is None
+    assert service.get_price("BTC") is None
+
+
+def test_refresh_interval_follows_bar_length():
+    assert refresh_interval("1m") == 60
+    assert refresh_interval("5m") == 300
+    assert refresh_interval("1d") == 300
+    assert refresh_interval("1mo") == 300
+
+
+def test_start_and_stop_in_lifespan():
+    """開始すると直ちに更新し、停止するとタスクが終了する"""
+    async def scenario():
+        service, source, _ = _service()
+        service.start()
+        await asyncio.sleep(0.05)
+        assert service.get_stats()["running"]
+        await service.stop()
+        assert not service.get_stats()["running"]
+        return source.refreshed
+
+    refreshed = asyncio.run(scenario())
+    assert ("BTC", "1mo", "1d") in refreshed
+    assert ("BTC", "5d", "1d") in refreshed
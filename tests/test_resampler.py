@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+OHLCVリサンプリングのテスト
+"""
+
+import asyncio
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from services.data.data_service import DataService
+from services.data.resampler import resample
+from services.storage.bar_store import BarStore
+from src.models.ohlcv import OHLCVFrame
+
+from test_data_service import StubUpstream
+
+
+def _random_frame(start: str, count: int, freq: str) -> OHLCVFrame:
+    rng = np.random.default_rng(0)
+    index = pd.date_range(start, periods=count, freq=freq, tz="UTC")
+    # 欠けている足（取引のない時間帯）を含める
+    index = index[rng.random(count) > 0.1]
+    close = rng.random(len(index)) * 100 + 100
+    open_ = close + rng.standard_normal(len(index))
+    return OHLCVFrame(index.asi8, open_, np.maximum(open_, close) + 1,
+                      np.minimum(open_, close) - 1, close, rng.random(len(index)))
+
+
+def _pandas_resample(frame: OHLCVFrame, rule: str, **kwargs) -> pd.DataFrame:
+    df = pd.DataFrame({
+        "open": frame.open, "high": frame.high, "low": frame.low,
+        "close": frame.close, "volume": frame.volume
+    }, index=frame.timestamps())
+    return df.resample(rule, closed="left", label="left", **kwargs).agg({
+        "open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"
+    }).dropna(subset=["open"])
+
+
+@pytest.mark.parametrize("interval, source, rule, kwargs", [
+    ("5m", "min", "5min", {"origin": "epoch"}),
+    ("90m", "min", "90min", {"origin": "epoch"}),
+    ("1d", "min", "1D", {}),
+    ("1wk", "D", "7D", {"origin": pd.Timestamp("1970-01-05", tz="UTC")}),
+    ("1mo", "D", "MS", {}),
+    ("3mo", "D", "QS", {}),
+])
+def test_resample_matches_pandas(interval, source, rule, kwargs):
+    """OHLCVの集計とバケットの境界がpandasのresampleと一致する"""
+    frame = _random_frame("2023-03-05 13:07", 5000 if source == "min" else 1500, source)
+    result = resample(frame, interval)
+    expected = _pandas_resample(frame, rule, **kwargs)
+
+    assert np.array_equal(result.timestamp, expected.index.asi8)
+    for column in ("open", "high", "low", "close", "volume"):
+        assert np.allclose(getattr(result, column), expected[column])
+
+
+def test_coarser_interval_is_derived_locally(tmp_path):
+    """1分足を保存済みであれば、5分足は上流に問い合わせずに作成する"""
+    end = pd.Timestamp.now(tz="UTC").floor("min")
+    index = pd.date_range(end=end, periods=3 * 24 * 60, freq="min")
+    close = np.arange(len(index), dtype=float)
+    minute_bars = OHLCVFrame(index.asi8, close, close + 1, close - 1, close,
+                             np.ones(len(index)))
+
+    service = DataService(BarStore(tmp_path))
+    upstream = StubUpstream(service, minute_bars)
+
+    async def run():
+        minutes = await service.get_historical_frame("BTC-USD", "1d", "1m")
+        five = await service.get_historical_frame("BTC-USD", "1d", "5m")
+        return minutes, five
+
+    minutes, five = asyncio.run(run())
+
+    assert upstream.calls == [("period", "BTC-USD", "1d", "1m")]
+    assert np.all(five.timestamp % (5 * 60 * 10**9) == 0)
+    assert five.close[-1] == minutes.close[-1]
+    assert five.volume.sum() <= minutes.volume.sum()
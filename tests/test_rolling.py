@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+スライディングウィンドウ計算（services/indicators/core/rolling.py）が
+pandas の rolling(window) と一致することのテスト
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from services.indicators.core.rolling import (
+    rolling_max,
+    rolling_mean,
+    rolling_mean_absolute_deviation,
+    rolling_min,
+    rolling_std,
+    rolling_sum,
+    rolling_sum_of_squares,
+    rolling_variance,
+)
+
+SIZE = 50
+
+
+def _random() -> np.ndarray:
+    return np.random.default_rng(3).normal(0, 5, SIZE)
+
+
+def _negative() -> np.ndarray:
+    """全て負の値（ブロックの詰め物の 0 が最大値に混ざらないこと）"""
+    return -np.abs(_random()) - 1
+
+
+def _with_nan() -> np.ndarray:
+    values = _random()
+    values[[0, 7, 8, 30, SIZE - 1]] = np.nan
+    return values
+
+
+CASES = {
+    "random": _random(),
+    "negative": _negative(),
+    "nan": _with_nan(),
+}
+WINDOWS = [1, 2, 7, SIZE, SIZE + 5]
+
+
+def _mad(window: np.ndarray) -> float:
+    return float(np.mean(np.abs(window - window.mean())))
+
+
+EXPECTED = {
+    rolling_max: lambda r: r.max(),
+    rolling_min: lambda r: r.min(),
+    rolling_sum: lambda r: r.sum(),
+    rolling_mean: lambda r: r.mean(),
+    rolling_variance: lambda r: r.var(),
+    rolling_std: lambda r: r.std(),
+    rolling_mean_absolute_deviation: lambda r: r.apply(_mad, raw=True),
+}
+
+
+@pytest.mark.parametrize("window", WINDOWS)
+@pytest.mark.parametrize("case", CASES)
+@pytest.mark.parametrize("func", EXPECTED, ids=lambda func: func.__name__)
+def test_matches_pandas_rolling(func, case, window):
+    values = CASES[case]
+    expected = EXPECTED[func](pd.Series(values).rolling(window)).to_numpy()
+
+    result = func(values, window)
+
+    assert result.dtype == np.float64
+    assert len(result) == len(values)
+    np.testing.assert_allclose(result, expected, rtol=1e-9, atol=1e-9, equal_nan=True)
+
+
+@pytest.mark.parametrize("window", WINDOWS)
+@pytest.mark.parametrize("case", CASES)
+def test_sum_of_squares_matches_pandas(case, window):
+    values = CASES[case]
+    expected = pd.Series(values * values).rolling(window).sum().to_numpy()
+    np.testing.assert_allclose(
+        rolling_sum_of_squares(values, window), expected, rtol=1e-9, equal_nan=True)
+
+
+@pytest.mark.parametrize("ddof", [0, 1])
+def test_variance_ddof(ddof):
+    values = _random()
+    expected = pd.Series(values).rolling(5).var(ddof=ddof).to_numpy()
+    np.testing.assert_allclose(rolling_variance(values, 5, ddof=ddof), expected, equal_nan=True)
+
+
+@pytest.mark.parametrize("window", [2, 7, SIZE])
+def test_variance_at_large_price_level(window):
+    """価格水準が大きく分散が小さい値でも、各ウィンドウの2パス計算と一致する
+
+    pandas（オンライン更新）はこの条件で相対誤差が1e-4程度まで広がるため、
+    ウィンドウごとに np.var で計算した値と比較します。
+    """
+    values = 1e6 + _random() * 1e-3
+    windows = np.lib.stride_tricks.sliding_window_view(values, window)
+    expected = np.concatenate([np.full(window - 1, np.nan), windows.var(axis=1, ddof=1)])
+    np.testing.assert_allclose(rolling_variance(values, window), expected, rtol=1e-6)
+
+
+def test_variance_window_one_is_nan_with_sample_ddof():
+    """不偏分散（ddof=1）は1本のウィンドウでは定義されないため NaN"""
+    assert np.isnan(rolling_variance(_random(), 1)).all()
+
+
+def test_window_larger_than_series_is_all_nan():
+    values = _random()
+    for func in EXPECTED:
+        assert np.isnan(func(values, SIZE + 1)).all()
+
+
+def test_nan_only_affects_windows_containing_it():
+    values = np.arange(10, dtype=float)
+    values[4] = np.nan
+    result = rolling_max(values, 3)
+    assert np.isnan(result[:2]).all()
+    assert result[3] == 3.0
+    assert np.isnan(result[4:7]).all()
+    assert result[7] == 7.0
+
+
+def test_large_series_spans_multiple_chunks():
+    """ウィンドウ行列がメモリ上限で分割される長さでも一致する"""
+    values = np.random.default_rng(5).normal(100, 1, 300_000)
+    expected = pd.Series(values).rolling(20).std().to_numpy()
+    np.testing.assert_allclose(rolling_std(values, 20), expected, rtol=1e-9, equal_nan=True)
+
+
+def test_invalid_window():
+    with pytest.raises(ValueError):
+        rolling_max(_random(), 0)
+    with pytest.raises(ValueError):
+        rolling_variance(_random(), -1)
+
+
+def test_empty_input():
+    assert len(rolling_max([], 3)) == 0
+    assert len(rolling_mean_absolute_deviation([], 3)) == 0
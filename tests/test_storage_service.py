@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+ストレージサービス（SQLiteバックエンド）のテスト
+"""
+
+import asyncio
+import csv
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from services.storage.sqlite_backend import SQLiteConnectionPool
+from services.storage.storage_service import StorageService
+from services.storage.write_behind import WriteBehindQueue, WriteRequest
+
+
+def _historical(day: str, hours: int = 24):
+    return {"data": [
+        {"timestamp": f"{day}T{hour:02d}:00:00+00:00", "open": 1.0 + hour,
+         "high": 2.0 + hour, "low": 0.5 + hour, "close": 1.5 + hour, "volume": 10.0}
+        for hour in range(hours)
+    ]}
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return StorageService(
+        storage_type="sqlite", data_dir=str(tmp_path),
+        database_url=f"sqlite:///{tmp_path / 'market.db'}")
+
+
+def test_sqlite_save_and_range_query(storage):
+    """保存したデータを日付で範囲検索できる（未指定の場合は最新日）"""
+    assert storage.save_market_data("BTC-USD", _historical("2024-01-01"), "historical")
+    assert storage.save_market_data("BTC-USD", _historical("2024-01-02", 6), "historical")
+
+    first_day = storage.get_stored_data("BTC-USD", "historical", "20240101")
+    assert len(first_day) == 24
+    assert first_day[0]["close"] == 1.5
+
+    latest = storage.get_stored_data("BTC-USD", "historical")
+    assert len(latest) == 6
+    assert storage.get_stored_data("ETH-USD", "historical") == []
+
+
+def test_sqlite_resave_replaces_rows(storage):
+    """同じ時刻のデータを再保存しても重複しない"""
+    storage.save_market_data("BTC-USD", _historical("2024-01-01"), "historical")
+    storage.save_market_data("BTC-USD", _historical("2024-01-01"), "historical")
+    assert storage._sqlite.count() == 24
+
+
+@pytest.mark.parametrize("backend", ["csv", "json", "sqlite"])
+def test_latest_returns_rows_of_last_save(backend, tmp_path):
+    """日付未指定の場合は、どのバックエンドも最後の保存で書き込んだ行を返す"""
+    storage = StorageService(
+        storage_type=backend, data_dir=str(tmp_path),
+        database_url=f"sqlite:///{tmp_path / 'market.db'}")
+    # 1回目は2日分、2回目は1日目の一部のみ（最新日の行でも最後の保存ではない行がある）
+    storage.save_market_data("BTC-USD", {"data": (
+        _historical("2024-01-01")["data"] + _historical("2024-01-02")["data"])}, "historical")
+    time.sleep(1.1 if backend == "json" else 0)  # JSONのファイル名は秒単位
+    storage.save_market_data("BTC-USD", _historical("2024-01-01", 3), "historical")
+
+    latest = storage.get_stored_data("BTC-USD", "historical")
+    if backend == "json":
+        latest = latest[0]["data"]["data"]
+    assert [row["timestamp"][:19] for row in latest] == [
+        f"2024-01-01T{hour:02d}:00:00" for hour in range(3)]
+
+
+def test_sqlite_migrates_databases_without_saved_at(tmp_path):
+    """saved_at 列のない既存のデータベースは列を追加し、最新日の行を最新の保存とみなす"""
+    path = tmp_path / "legacy.db"
+    connection = sqlite3.connect(path)
+    connection.executescript("""
+        CREATE TABLE market_records (
+            symbol TEXT NOT NULL, data_type TEXT NOT NULL, timestamp INTEGER NOT NULL,
+            name TEXT NOT NULL DEFAULT '', data TEXT NOT NULL);
+        CREATE UNIQUE INDEX idx_market_records_key
+            ON market_records (symbol, data_type, timestamp, name);
+    """)
+    day = 86_400_000
+    connection.executemany(
+        "INSERT INTO market_records VALUES ('BTC-USD', 'historical', ?, '', ?)",
+        [(day * 10 + hour * 3_600_000, f'{{"hour": {hour}}}') for hour in range(3)]
+        + [(day * 9, '{"hour": -1}')])
+    connection.commit()
+    connection.close()
+
+    storage = StorageService(
+        storage_type="sqlite", data_dir=str(tmp_path), database_url=f"sqlite:///{path}")
+    assert [row["hour"] for row in storage.get_stored_data("BTC-USD", "historical")] == [0, 1, 2]
+
+    storage.save_market_data("BTC-USD", _historical("2024-01-01", 2), "historical")
+    assert len(storage.get_stored_data("BTC-USD", "historical")) == 2
+
+
+def test_sqlite_uses_wal_and_index(storage):
+    """WALモードで、検索は (symbol, data_type, timestamp) のインデックスを使う"""
+    with storage._sqlite.pool.connection() as connection:
+        assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        plan = " ".join(str(tuple(row)) for row in connection.execute(
+            "EXPLAIN QUERY PLAN SELECT data FROM market_records "
+            "WHERE symbol = ? AND data_type = ? AND timestamp >= ? AND timestamp < ?",
+            ("BTC-USD", "historical", 0, 1)))
+    assert "idx_market_records_key" in plan
+
+
+def test_connection_pool_is_bounded(tmp_path):
+    """接続数はプールの上限を超えない"""
+    pool = SQLiteConnectionPool(str(tmp_path / "pool.db"), size=2, timeout=5)
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def work():
+        with pool.connection() as connection:
+            with lock:
+                active.append(connection)
+                peak.append(len(active))
+            connection.execute("SELECT 1")
+            with lock:
+                active.remove(connection)
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert max(peak) <= 2
+    assert pool.stats()["created"] <= 2
+    pool.close()
+
+
+def test_write_behind_batches_and_flushes_on_close(storage):
+    """キューに積んだデータはまとめて書き込まれ、停止時に残りも保存される"""
+    async def scenario():
+        storage.start_writer()
+        for day in range(1, 6):
+            await storage.save_market_data_async(
+                "BTC-USD", _historical(f"2024-01-0{day}", 4), "historical")
+        await storage.close()
+
+    asyncio.run(scenario())
+    stats = storage._writes.stats()
+    assert storage._sqlite.count() == 20
+    assert stats["written"] == 5
+    assert stats["batches"] < 5
+
+
+def test_write_behind_applies_backpressure():
+    """キューが満杯の場合、呼び出し元は書き込みが進むまで待たされる"""
+    release = threading.Event()
+    written = []
+
+    def slow_writer(batch):
+        release.wait(5)
+        written.extend(batch)
+        return len(batch)
+
+    async def scenario():
+        queue = WriteBehindQueue(slow_writer, max_size=2, batch_size=1, flush_interval=0)
+        await queue.put(WriteRequest("BTC-USD", {"i": 0}))
+        await asyncio.sleep(0.05)
+        for i in (1, 2):
+            await queue.put(WriteRequest("BTC-USD", {"i": i}))
+
+        started = time.monotonic()
+        # 書き込み中の1件 + キューの2件で満杯のため、次の put は待たされる
+        blocked = asyncio.ensure_future(queue.put(WriteRequest("BTC-USD", {"i": 3})))
+        await asyncio.sleep(0.05)
+        assert not blocked.done()
+        assert time.monotonic() - started < 1
+
+        release.set()
+        await blocked
+        await queue.stop()
+        return queue.stats()
+
+    stats = asyncio.run(scenario())
+    assert [request.data["i"] for request in written] == [0, 1, 2, 3]
+    assert stats["backpressure_waits"] == 1
+    assert stats["written"] == 4
+
+
+@pytest.fixture
+def csv_storage(tmp_path):
+    storage = StorageService(storage_type="csv", data_dir=str(tmp_path))
+    # 保存日ごとのファイル（2日目のファイルには1日目の時刻の行も含まれる）
+    for saved_at, day in (("20240101", "2024-01-01"), ("20240102", "2024-01-02")):
+        rows = storage._convert_to_rows(_historical(day), "historical")
+        with open(tmp_path / f"BTC-USD_historical_{saved_at}.csv", "w", newline="") as f:
+            csv.writer(f).writerows(rows)
+    return storage
+
+
+def test_iter_stored_data_filters_range_and_projects(csv_storage):
+    """期間・列・件数を指定して1行ずつ読み込める"""
+    rows = list(csv_storage.iter_stored_data(
+        "BTC-USD", "historical", start="2024-01-02T03:00:00Z", end="2024-01-02T06:00:00Z",
+        columns=["timestamp", "close"]))
+    assert [row["timestamp"] for row in rows] == [
+        f"2024-01-02T0{hour}:00:00+00:00" for hour in (3, 4, 5)]
+    assert rows[0] == {"timestamp": "2024-01-02T03:00:00+00:00", "close": "4.5"}
+
+    limited = list(csv_storage.iter_stored_data("BTC-USD", "historical", limit=5))
+    assert len(limited) == 5
+
+
+def test_iter_stored_data_stops_at_end(csv_storage, monkeypatch):
+    """終了時刻に達したらファイルの残りの行は読まない"""
+    parsed = []
+    original = StorageService._row_ms
+
+    def counting(row):
+        parsed.append(row["timestamp"])
+        return original(row)
+
+    monkeypatch.setattr(StorageService, "_row_ms", staticmethod(counting))
+    rows = list(csv_storage.iter_stored_data(
+        "BTC-USD", "historical", start="2024-01-02T00:00:00Z", end="2024-01-02T02:00:00Z"))
+    assert len(rows) == 2
+    # 1日目のファイルは開始日より前に保存されたため読まず、2日目は3行目で止まる
+    assert len(parsed) == 3
+
+
+@pytest.mark.parametrize("backend", ["csv", "sqlite"])
+def test_stored_page_cursor_walks_all_rows(backend, csv_storage, storage):
+    """next_cursor をたどると全ての行を重複なく取得できる"""
+    target = csv_storage if backend == "csv" else storage
+    if backend == "sqlite":
+        storage.save_market_data("BTC-USD", _historical("2024-01-01"), "historical")
+        storage.save_market_data("BTC-USD", _historical("2024-01-02"), "historical")
+
+    seen = []
+    cursor = None
+    while True:
+        page = asyncio.run(target.get_stored_page(
+            "BTC-USD", "historical", columns=["timestamp"], limit=10, cursor=cursor))
+        seen.extend(row["timestamp"] for row in page["data"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert len(seen) == 48
+    assert len(set(seen)) == 48
+
+    with pytest.raises(ValueError):
+        asyncio.run(target.get_stored_page("BTC-USD", "historical", cursor="bogus"))
+
+
+def test_compaction_folds_daily_files_into_monthly_archive(tmp_path):
+    """日次ファイルを月単位のアーカイブにまとめても、同じ行を読み込める"""
+    storage = StorageService(storage_type="csv", data_dir=str(tmp_path))
+    days = [f"2024-01-{day:02d}" for day in range(1, 32)] + ["2024-02-01", "2024-02-02"]
+    for day in days:
+        rows = storage._convert_to_rows(_historical(day, 4), "historical")
+        with open(tmp_path / f"BTC-USD_historical_{day.replace('-', '')}.csv", "w", newline="") as f:
+            csv.writer(f).writerows(rows)
+    # 当日以降のファイルは対象外
+    with open(tmp_path / "BTC-USD_historical_20240203.csv", "w", newline="") as f:
+        csv.writer(f).writerows(storage._convert_to_rows(_historical("2024-02-03", 4), "historical"))
+
+    before = list(storage.iter_stored_data("BTC-USD", "historical"))
+    result = storage.compact_daily_files(before="20240203")
+
+    assert result == {"files": 33, "rows": 132, "partitions": 2}
+    assert storage.archive.months("BTC-USD", "historical") == ["2024-01", "2024-02"]
+    assert sorted(path.name for path in tmp_path.glob("*.csv")) == ["BTC-USD_historical_20240203.csv"]
+
+    after = list(storage.iter_stored_data("BTC-USD", "historical"))
+    assert len(after) == len(before) == 136
+    assert [row["timestamp"] for row in after] == [row["timestamp"] for row in before]
+    assert after[0]["close"] == 1.5
+
+    # 期間外の月ファイルはフッターのみ読み、列は指定したもののみ返す
+    february = list(storage.iter_stored_data(
+        "BTC-USD", "historical", start="2024-02-02T00:00:00Z", columns=["close"]))
+    assert [list(row) for row in february] == [["close"]] * 8
+    # アーカイブの数値列は数値、日次CSVは文字列のまま返す
+    assert [float(row["close"]) for row in february] == [1.5, 2.5, 3.5, 4.5] * 2
+
+    # 再度まとめても重複しない
+    with open(tmp_path / "BTC-USD_historical_20240115.csv", "w", newline="") as f:
+        csv.writer(f).writerows(storage._convert_to_rows(_historical("2024-01-15", 4), "historical"))
+    storage.compact_daily_files(before="20240203")
+    assert storage.archive.read_footer(
+        storage.archive.partition_path("BTC-USD", "historical", "2024-01"))["rows"] == 124
+
+
+def test_compaction_rejects_future_and_invalid_dates(tmp_path):
+    """当日の日次ファイルはまだ書き込まれるため、当日より後の日付ではまとめない"""
+    storage = StorageService(storage_type="csv", data_dir=str(tmp_path))
+    assert storage.save_market_data("BTC-USD", _historical("2024-01-01", 2), "historical")
+    tomorrow = (datetime.now(timezone.utc) + timedelta(days=1)).strftime("%Y%m%d")
+
+    for before in (tomorrow, "2024-01-01", "20241301", "2024011"):
+        with pytest.raises(ValueError):
+            storage.compact_daily_files(before=before)
+    assert len(list(tmp_path.glob("*.csv"))) == 1
+
+    today = datetime.now(timezone.utc).strftime("%Y%m%d")
+    assert storage.compact_daily_files(before=today)["files"] == 0
+    assert len(list(tmp_path.glob("*.csv"))) == 1
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+プッシュ配信（差分の配信・クライアントごとの集約・購読解除）のテスト
+"""
+
+import asyncio
+
+import numpy as np
+
+from services.stream.stream_service import StreamService, Subscriber
+from src.models.ohlcv import OHLCVFrame
+
+DAY_NS = 24 * 60 * 60 * 10**9
+
+
+def _frame(closes) -> OHLCVFrame:
+    closes = np.asarray(closes, dtype=float)
+    timestamps = np.arange(len(closes), dtype=np.int64) * DAY_NS
+    return OHLCVFrame(timestamps, closes, closes + 1, closes - 1, closes, np.ones(len(closes)))
+
+
+class FakeSource:
+    """最新の足を返す data_service の代わり"""
+
+    def __init__(self, frame: OHLCVFrame):
+        self.frame = frame
+        self.calls = 0
+
+    async def refresh_historical_frame(self, pair, period, interval):
+        self.calls += 1
+        return self.frame
+
+
+class FakeAnalyzer:
+    """最後の終値をそのままインジケータ値として返す"""
+
+    def __init__(self, source: FakeSource):
+        self.source = source
+        self.calls = 0
+
+    async def analyze_many(self, pair, names, period, interval):
+        self.calls += 1
+        close = float(self.source.frame.close[-1])
+        return {"indicators": {
+            "last": {"value": close},
+            "constant": {"value": 1.0},
+        }}
+
+
+def _service(frame: OHLCVFrame):
+    source = FakeSource(frame)
+    analyzer = FakeAnalyzer(source)
+
+    async def names():
+        return ["last", "constant"]
+
+    service = StreamService(
+        data_source=source, analyzer=analyzer, indicator_names=names,
+        poll_interval=0.01, heartbeat_interval=0.05, snapshot_bars=10)
+    return service, source, analyzer
+
+
+def test_stream_sends_only_changed_bars_and_indicators():
+    """同じ系列の購読者は1つの取得タスクを共有し、変化した足と値のみ受け取る"""
+    async def scenario():
+        service, source, analyzer = _service(_frame([1.0, 2.0, 3.0]))
+        first = service.subscribe(("BTC-USD", "1mo", "1d"))
+        second = service.subscribe(("BTC-USD", "1mo", "1d"))
+
+        event, initial = await first.next(1)
+        assert event == "update"
+        assert [bar["close"] for bar in initial["bars"]] == [1.0, 2.0, 3.0]
+        assert set(initial["indicators"]) == {"last", "constant"}
+        assert (await second.next(1))[1] == initial
+
+        # 変化がない間は何も送らない（インジケータも再計算しない）
+        await asyncio.sleep(0.05)
+        assert await first.next(0.01) is None
+        assert analyzer.calls == 1
+
+        # 最新の足が更新されたら、その足と変化したインジケータのみ送る
+        source.frame = _frame([1.0, 2.0, 3.5])
+        event, update = await first.next(1)
+        assert [bar["close"] for bar in update["bars"]] == [3.5]
+        assert update["indicators"] == {"last": {"value": 3.5}}
+
+        assert len(service._topics) == 1
+        service.unsubscribe(("BTC-USD", "1mo", "1d"), first)
+        service.unsubscribe(("BTC-USD", "1mo", "1d"), second)
+        assert service._topics == {}
+        calls = source.calls
+        await asyncio.sleep(0.05)
+        # 購読者がいなくなったら取得を止める
+        assert source.calls == calls
+
+    asyncio.run(scenario())
+
+
+def test_slow_subscriber_coalesces_and_resyncs():
+    """受け取りが遅いクライアントの更新は1つにまとめ、溜まりすぎたら再取得を促す"""
+    async def scenario():
+        subscriber = Subscriber(max_pending_bars=3)
+        subscriber.offer({1: {"close": 1.0}}, {"rsi": {"value": 10.0}})
+        subscriber.offer({1: {"close": 1.5}, 2: {"close": 2.0}}, {"rsi": {"value": 20.0}})
+        event, data = await subscriber.next(1)
+        assert event == "update"
+        assert data == {"bars": [{"close": 1.5}, {"close": 2.0}],
+                        "indicators": {"rsi": {"value": 20.0}}}
+        assert subscriber.coalesced == 1
+
+        subscriber.offer({i: {"close": float(i)} for i in range(5)}, {})
+        subscriber.offer({9: {"close": 9.0}}, {})
+        assert await subscriber.next(1) == ("resync", {})
+        assert await subscriber.next(0.01) is None
+
+    asyncio.run(scenario())
+
+
+def test_events_are_formatted_as_sse_with_heartbeat():
+    """SSEのイベント形式で送り、更新がない間はコメント行を送る"""
+    async def scenario():
+        service, _, _ = _service(_frame([1.0]))
+        events = service.events("btc-usd", "1mo", "1d")
+        assert await events.__anext__() == "retry: 5000\n\n"
+        update = await events.__anext__()
+        assert update.startswith("event: update\ndata: {")
+        assert update.endswith("\n\n")
+        assert await events.__anext__() == ": keepalive\n\n"
+        await events.aclose()
+        assert service._topics == {}
+
+    asyncio.run(scenario())